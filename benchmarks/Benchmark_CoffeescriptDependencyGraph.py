@@ -0,0 +1,79 @@
+# Benchmark_CoffeescriptDependencyGraph.py [BENCHMARK]
+# (C) 2016
+# Scott Ernst
+
+""" Measures a rebuild of an unchanged tree of CoffeeScript files by a CoffeescriptBuilder, where
+    every dependency is assembled from its cache file, both scanning every source file for its
+    dependencies and reading them from the saved CoffeescriptDependencyGraph.
+
+    Usage: python Benchmark_CoffeescriptDependencyGraph.py [fileCount] [targetCount] """
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import io
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from pyaid.web.coffeescript.CoffeescriptBuilder import CoffeescriptBuilder
+
+#___________________________________________________________________________________________________ createFiles
+def createFiles(rootPath, fileCount, targetCount):
+    """ Writes fileCount modules that each import up to three earlier modules and targetCount
+        exec files that each import five random modules into the app package of the root path. """
+    folder = os.path.join(rootPath, 'app')
+    os.makedirs(folder)
+
+    rand = random.Random(0)
+    for i in range(fileCount):
+        lines = ['# import app.Module%s' % j for j in rand.sample(range(i), min(i, 3))]
+        lines.extend(['class Module%s' % i, '    run: -> %s' % i])
+        with open(os.path.join(folder, 'Module%s.coffee' % i), 'w') as fh:
+            fh.write('\n'.join(lines) + '\n')
+
+    for i in range(targetCount):
+        lines = ['# import app.Module%s' % rand.randrange(fileCount) for j in range(5)]
+        with open(os.path.join(folder, 'run%s-exec.coffee' % i), 'w') as fh:
+            fh.write('\n'.join(lines + ['x = %s' % i]) + '\n')
+
+#___________________________________________________________________________________________________ runBenchmark
+def runBenchmark(rootPath, scan =False):
+    """ Constructs every target in the root path, returning the elapsed time and the builder. """
+    stdout     = sys.stdout
+    sys.stdout = io.StringIO()
+    try:
+        start   = time.time()
+        builder = CoffeescriptBuilder('app', rootPath, buildOnly=True)
+        if scan:
+            builder.dependencyGraph.clear()
+        builder.construct()
+        return time.time() - start, builder
+    finally:
+        sys.stdout = stdout
+
+####################################################################################################
+####################################################################################################
+
+if __name__ == '__main__':
+    fileCount   = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    targetCount = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    folder = tempfile.mkdtemp()
+    try:
+        rootPath = folder + os.sep
+        createFiles(rootPath, fileCount, targetCount)
+        built, builder = runBenchmark(rootPath)
+        scanned, builder = runBenchmark(rootPath, scan=True)
+        restored, builder = runBenchmark(rootPath)
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    graph = builder.dependencyGraph
+    print('Rebuild of %s targets importing from %s files' % (targetCount, fileCount))
+    print('    %8.3f sec initial build' % built)
+    print('    %8.3f sec rebuild scanning dependencies' % scanned)
+    print('    %8.3f sec rebuild from graph (%s hits, %s misses)' % (
+        restored, graph.hits, graph.misses))
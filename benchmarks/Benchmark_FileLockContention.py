@@ -0,0 +1,85 @@
+# Benchmark_FileLockContention.py [BENCHMARK]
+# (C) 2016
+# Scott Ernst
+
+""" Measures FileLock acquisition latency for each backend while many processes contend for
+    the same lock, each briefly holding it to append a line to the locked file.
+
+    Usage: python Benchmark_FileLockContention.py [processCount] [acquisitionsPerProcess] """
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from pyaid.file.FileLock import FileLock
+from pyaid.file.FileLockBackendEnum import FileLockBackendEnum
+
+#___________________________________________________________________________________________________ runContender
+def runContender(path, backend, count, startEvent, results):
+    latencies = []
+    startEvent.wait()
+    for i in range(count):
+        start = time.time()
+        with FileLock(path, 'a', timeout=None, backend=backend) as lock:
+            latencies.append(time.time() - start)
+            lock.file.write('%s %s\n' % (os.getpid(), i))
+    results.put(latencies)
+
+#___________________________________________________________________________________________________ runBenchmark
+def runBenchmark(backend, processCount, count):
+    folder = tempfile.mkdtemp()
+    try:
+        path       = os.path.join(folder, 'contended.txt')
+        startEvent = multiprocessing.Event()
+        results    = multiprocessing.Queue()
+        processes  = [
+            multiprocessing.Process(
+                target=runContender, args=(path, backend, count, startEvent, results))
+            for i in range(processCount) ]
+
+        for p in processes:
+            p.start()
+        start = time.time()
+        startEvent.set()
+
+        latencies = []
+        for p in processes:
+            latencies.extend(results.get())
+        for p in processes:
+            p.join()
+        elapsed = time.time() - start
+
+        with open(path, 'r') as f:
+            lineCount = len(f.read().strip().split('\n'))
+
+        latencies.sort()
+        return dict(
+            elapsed=elapsed,
+            intact=lineCount == processCount*count,
+            mean=sum(latencies)/len(latencies),
+            median=latencies[len(latencies)//2],
+            p99=latencies[min(len(latencies) - 1, int(0.99*len(latencies)))],
+            worst=latencies[-1])
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+####################################################################################################
+####################################################################################################
+
+if __name__ == '__main__':
+    processCount = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    count        = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    print('FileLock contention: %s processes x %s acquisitions' % (processCount, count))
+    for backend in [FileLockBackendEnum.LOCKFILE, FileLockBackendEnum.KERNEL]:
+        r = runBenchmark(backend, processCount, count)
+        print('    %-10s total %6.2fs  mean %7.3fms  median %7.3fms  p99 %7.3fms  max %7.3fms' % (
+            backend, r['elapsed'], 1000*r['mean'], 1000*r['median'], 1000*r['p99'],
+            1000*r['worst']))
+        if not r['intact']:
+            print('    [WARNING]: %s lock failed to serialize writes' % backend)
@@ -0,0 +1,91 @@
+# Benchmark_LineTextAnalyzer.py [BENCHMARK]
+# (C) 2016
+# Scott Ernst
+
+""" Measures a full pass over the lines of a LineTextAnalyzer, reading the flags and indentation
+    of every line as the CoffeescriptBuilder does, along with the memory allocated for the lines.
+    The lines are rows of a table of integer arrays with LineMetadata views created on demand,
+    so the memory per line should stay at a few bytes per column.
+
+    Usage: python Benchmark_LineTextAnalyzer.py [lineCount] [passCount] """
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import sys
+import time
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+from pyaid.web.coffeescript.CoffeescriptAnalyzer import CoffeescriptAnalyzer
+
+#___________________________________________________________________________________________________ createSource
+def createSource(lineCount):
+    """ Creates a CoffeeScript source of lineCount lines mixing code, comments and strings. """
+    lines = []
+    index = 0
+    while len(lines) < lineCount:
+        lines.extend([
+            '# Section %s' % index,
+            'class Widget%s extends Base' % index,
+            '    ###',
+            '    Block comment for "Widget%s"' % index,
+            '    ###',
+            '    constructor: (@name) ->',
+            '        @label = "Widget %s"' % index,
+            '        @items = [1, 2, (3)]',
+            '' ])
+        index += 1
+    return '\n'.join(lines[:lineCount])
+
+#___________________________________________________________________________________________________ runBenchmark
+def runBenchmark(analyzer):
+    """ Reads the flags and indentation of every line, returning the elapsed time. """
+    # An empty insert discards the line data cached by earlier passes
+    analyzer.insertCharacters(0, 0, '')
+
+    start = time.time()
+    for line in analyzer:
+        if line.isSignificant:
+            len(line.indent)
+    return time.time() - start
+
+#___________________________________________________________________________________________________ getLineMemory
+def getLineMemory(snapshot):
+    """ Returns the number of bytes allocated by the line modules in the snapshot. """
+    total = 0
+    for stat in snapshot.statistics('filename'):
+        fileName = stat.traceback[0].filename
+        if any(name in fileName for name in ['LineMetadata', 'LineTextAnalyzer', 'TextLineIndex']):
+            total += stat.size
+    return total
+
+####################################################################################################
+####################################################################################################
+
+if __name__ == '__main__':
+    lineCount = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    passCount = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    # Memory is measured after a first pass and the passes are timed without tracing
+    if tracemalloc:
+        tracemalloc.start()
+
+    analyzer = CoffeescriptAnalyzer(createSource(lineCount))
+    analyzer.analyze()
+    runBenchmark(analyzer)
+
+    memory = None
+    if tracemalloc:
+        memory = getLineMemory(tracemalloc.take_snapshot())
+        tracemalloc.stop()
+
+    elapsed = min(runBenchmark(analyzer) for i in range(passCount))
+
+    print('LineTextAnalyzer full pass over %s lines' % analyzer.lineCount)
+    print('    %8.3f sec %8.3f us/line' % (elapsed, 1000000*elapsed/analyzer.lineCount))
+    if memory is not None:
+        print('    %8.2f MB line memory %8.1f bytes/line' % (
+            memory/1000000, memory/analyzer.lineCount))
@@ -0,0 +1,71 @@
+# Benchmark_LoggerFileModes.py [BENCHMARK]
+# (C) 2016
+# Scott Ernst
+
+""" Compares Logger write throughput, in lines per second, between the per-flush FileLock path
+    and the persistent O_APPEND file handle while several processes append to the same log
+    file.
+
+    Usage: python Benchmark_LoggerFileModes.py [processCount] [linesPerProcess] """
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from pyaid.debug.Logger import Logger
+
+#___________________________________________________________________________________________________ runWriter
+def runWriter(logFolder, lineCount, persistentFile, startEvent):
+    logger = Logger(
+        'benchmark', logFolder=logFolder, headerless=True, timestampFileSuffix=False,
+        persistentFile=persistentFile)
+    startEvent.wait()
+    for i in range(lineCount):
+        logger.write('[%s] Benchmark line %s' % (os.getpid(), i))
+    logger.close()
+
+#___________________________________________________________________________________________________ runBenchmark
+def runBenchmark(persistentFile, processCount, lineCount):
+    logFolder = tempfile.mkdtemp()
+    try:
+        startEvent = multiprocessing.Event()
+        processes = [
+            multiprocessing.Process(
+                target=runWriter, args=(logFolder, lineCount, persistentFile, startEvent))
+            for i in range(processCount) ]
+
+        for p in processes:
+            p.start()
+
+        start = time.time()
+        startEvent.set()
+        for p in processes:
+            p.join()
+        elapsed = time.time() - start
+
+        # Every line must have been written intact, without interleaving
+        with open(os.path.join(logFolder, 'benchmark.log'), 'r') as f:
+            lines = [l for l in f.read().split('\n') if l]
+        intact = len([l for l in lines if l.find('] Benchmark line ') != -1])
+
+        return processCount*lineCount/elapsed, intact == processCount*lineCount
+    finally:
+        shutil.rmtree(logFolder, ignore_errors=True)
+
+####################################################################################################
+####################################################################################################
+
+if __name__ == '__main__':
+    processCount = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    lineCount    = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    print('Logger file modes: %s processes x %s lines' % (processCount, lineCount))
+    for label, persistent in [('FileLock', False), ('Persistent O_APPEND', True)]:
+        rate, intact = runBenchmark(persistent, processCount, lineCount)
+        print('    %-20s %10.0f lines/sec  [%s]' % (
+            label, rate, 'INTACT' if intact else 'CORRUPTED'))
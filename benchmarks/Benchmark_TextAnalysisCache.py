@@ -0,0 +1,56 @@
+# Benchmark_TextAnalysisCache.py [BENCHMARK]
+# (C) 2016
+# Scott Ernst
+
+""" Measures the creation of a ready to query CoffeescriptAnalyzer by analyzing the source and by
+    restoring its analysis from a TextAnalysisCache, along with the size of the cache entry. The
+    restored analysis skips the block scan but still redacts the source and indexes its lines.
+
+    Usage: python Benchmark_TextAnalysisCache.py [lineCount] [passCount] """
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import shutil
+import sys
+import tempfile
+import time
+
+from pyaid.text.TextAnalysisCache import TextAnalysisCache
+from pyaid.web.coffeescript.CoffeescriptAnalyzer import CoffeescriptAnalyzer
+
+from Benchmark_LineTextAnalyzer import createSource
+
+#___________________________________________________________________________________________________ runBenchmark
+def runBenchmark(source, cache =None):
+    """ Creates and analyzes an analyzer for the source, returning the elapsed time. """
+    start    = time.time()
+    analyzer = CoffeescriptAnalyzer(source)
+    if cache:
+        cache.analyze(analyzer)
+    else:
+        analyzer.analyze()
+    return time.time() - start
+
+####################################################################################################
+####################################################################################################
+
+if __name__ == '__main__':
+    lineCount = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    passCount = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    source = createSource(lineCount)
+    folder = tempfile.mkdtemp()
+    try:
+        cache    = TextAnalysisCache(folder)
+        analyzed = min(runBenchmark(source) for i in range(passCount))
+        stored   = runBenchmark(source, cache)
+        restored = min(runBenchmark(source, cache) for i in range(passCount))
+        size     = cache.size
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    print('CoffeescriptAnalyzer of %s lines' % lineCount)
+    print('    %8.3f sec analyzed' % analyzed)
+    print('    %8.3f sec analyzed and stored' % stored)
+    print('    %8.3f sec restored (%s hits)' % (restored, cache.hits))
+    print('    %8.1f KB cache entry' % (size/1000))
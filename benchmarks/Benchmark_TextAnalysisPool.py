@@ -0,0 +1,70 @@
+# Benchmark_TextAnalysisPool.py [BENCHMARK]
+# (C) 2016
+# Scott Ernst
+
+""" Measures the analysis of many independent CoffeeScript files, one after another within a
+    single process and fanned out over the worker processes of a TextAnalysisPool, and lists the
+    slowest files reported by the pool. The speedup approaches the number of processors once the
+    files are large enough to outweigh the cost of pickling their results.
+
+    Usage: python Benchmark_TextAnalysisPool.py [fileCount] [lineCount] [maxWorkers] """
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import codecs
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from pyaid.text.TextAnalysisPool import TextAnalysisPool
+from pyaid.web.coffeescript.CoffeescriptAnalyzer import CoffeescriptAnalyzer
+
+#___________________________________________________________________________________________________ createFiles
+def createFiles(folder, fileCount, lineCount):
+    """ Writes fileCount CoffeeScript files of up to lineCount lines into the folder. """
+    paths = []
+    for i in range(fileCount):
+        lines = []
+        for j in range(max(1, lineCount*(i % 4 + 1)//4)//4):
+            lines.extend([
+                '# Widget %s %s' % (i, j),
+                'class Widget%s extends Base' % j,
+                '    constructor: (@name) -> @label = "Widget %s"' % j,
+                '    items: [1, 2, (3)]' ])
+        paths.append(os.path.join(folder, 'Widget%s.coffee' % i))
+        with codecs.open(paths[-1], 'w', 'utf-8') as fh:
+            fh.write('\n'.join(lines))
+    return paths
+
+####################################################################################################
+####################################################################################################
+
+if __name__ == '__main__':
+    fileCount  = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    lineCount  = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    maxWorkers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+
+    folder = tempfile.mkdtemp()
+    try:
+        paths = createFiles(folder, fileCount, lineCount)
+
+        start = time.time()
+        for path in paths:
+            with codecs.open(path, 'r', 'utf-8') as fh:
+                CoffeescriptAnalyzer(fh.read()).analyze()
+        serial = time.time() - start
+
+        pool    = TextAnalysisPool(CoffeescriptAnalyzer, maxWorkers=maxWorkers)
+        results = pool.analyzePaths(paths)
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    print('Analysis of %s files' % fileCount)
+    print('    %8.3f sec serial' % serial)
+    print('    %8.3f sec pool (%s cpus)' % (pool.elapsed, str(os.cpu_count())
+                                            if hasattr(os, 'cpu_count') else '?'))
+    print('Slowest files')
+    for result in TextAnalysisPool.getSlowestResults(results, 5):
+        print('    %8.3f sec %s' % (result.elapsed, os.path.basename(result.path)))
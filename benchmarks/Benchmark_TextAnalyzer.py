@@ -0,0 +1,64 @@
+# Benchmark_TextAnalyzer.py [BENCHMARK]
+# (C) 2016
+# Scott Ernst
+
+""" Measures block analysis time for each TextAnalyzer scan engine on a generated CoffeeScript
+    source, verifying that both engines identify the same blocks.
+
+    Usage: python Benchmark_TextAnalyzer.py [lineCount] """
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import sys
+import time
+
+from pyaid.text.TextScanEngineEnum import TextScanEngineEnum
+from pyaid.web.coffeescript.CoffeescriptAnalyzer import CoffeescriptAnalyzer
+
+#___________________________________________________________________________________________________ createSource
+def createSource(lineCount):
+    """ Creates a CoffeeScript source of roughly lineCount lines mixing code, comments, strings
+        and regular expressions. """
+    lines = []
+    index = 0
+    while len(lines) < lineCount:
+        lines.extend([
+            '# Section %s (generated)' % index,
+            'class Widget%s extends Base' % index,
+            '    ###',
+            '    Block comment for "Widget%s" with [brackets]' % index,
+            '    ###',
+            '    constructor: (@name, options ={}) ->',
+            '        @items = [1, 2, [3, 4], {a:(5)}]',
+            '        @label = "Widget \\"%s\\" #{@name}"' % index,
+            '        @other = \'single \\\' quoted\'',
+            '        @ratio = (@items.length / 2) / 3',
+            '        @match = /wid(get)?[0-9]+/g',
+            '        @call(1, (x) -> x*2)',
+            '' ])
+        index += 1
+    return '\n'.join(lines[:lineCount])
+
+#___________________________________________________________________________________________________ runBenchmark
+def runBenchmark(source, scanEngine):
+    analyzer = CoffeescriptAnalyzer(source, scanEngine=scanEngine)
+    start    = time.time()
+    analyzer.analyze()
+    elapsed  = time.time() - start
+    return elapsed, [(b.name, b.start, b.end) for b in analyzer.blocks]
+
+####################################################################################################
+####################################################################################################
+
+if __name__ == '__main__':
+    lineCount = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    source    = createSource(lineCount)
+
+    print('TextAnalyzer scan engines: %s lines (%s characters)' % (lineCount, len(source)))
+    results = []
+    for engine in [TextScanEngineEnum.CHARACTER, TextScanEngineEnum.REGEX]:
+        elapsed, blocks = runBenchmark(source, engine)
+        results.append(blocks)
+        print('    %-10s %8.3f sec  [%s blocks]' % (engine, elapsed, len(blocks)))
+
+    print('    Block lists %s' % ('MATCH' if results[0] == results[1] else 'DIFFER'))
@@ -0,0 +1,54 @@
+# Benchmark_TextLookArounds.py [BENCHMARK]
+# (C) 2016
+# Scott Ernst
+
+""" Measures TextAnalyzer block analysis time on quoted-string-heavy sources of doubling size
+    using the CoffeeScript string, regular expression and parens block definitions. Every quote
+    is checked for escapes and every division operator outside of a string is checked against the
+    look back requirement of the regular expression definition, so the time per line should
+    remain constant as the source grows rather than growing with it.
+
+    Usage: python Benchmark_TextLookArounds.py [startLineCount] [doublings] """
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import sys
+import time
+
+from pyaid.text.BlockDefinition import BlockDefinition
+from pyaid.text.TextAnalyzer import TextAnalyzer
+
+#___________________________________________________________________________________________________ createSource
+def createSource(lineCount):
+    """ Creates a source of lineCount lines dominated by quoted strings and division. """
+    lines = []
+    for i in range(lineCount):
+        lines.append(
+            '@path%s = "root/%s" + \'/file\' + "\\"quoted\\"" + (total / %s) / "x".length' % (
+                i, i, i + 1))
+    return '\n'.join(lines)
+
+#___________________________________________________________________________________________________ runBenchmark
+def runBenchmark(lineCount):
+    analyzer = TextAnalyzer(createSource(lineCount), blockDefs=[
+        BlockDefinition.createRegexDef(BlockDefinition.BLOCKED),
+        BlockDefinition.createQuoteDef(BlockDefinition.BLOCKED),
+        BlockDefinition.createLiteralDef(BlockDefinition.BLOCKED),
+        BlockDefinition.createParensDef() ])
+    start    = time.time()
+    analyzer.analyze()
+    return time.time() - start
+
+####################################################################################################
+####################################################################################################
+
+if __name__ == '__main__':
+    lineCount = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    doublings = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    print('TextAnalyzer look arounds on quoted-string-heavy sources')
+    for i in range(doublings + 1):
+        elapsed = runBenchmark(lineCount)
+        print('    %8s lines %8.3f sec %8.3f ms/1000 lines' % (
+            lineCount, elapsed, 1000000*elapsed/lineCount))
+        lineCount *= 2
@@ -0,0 +1,61 @@
+# Benchmark_TextRedactionEdits.py [BENCHMARK]
+# (C) 2016
+# Scott Ernst
+
+""" Measures the time taken by RedactionTextAnalyzer.insertCharacters on generated sources with
+    thousands of string literals and comments. Each insert only re-redacts the blocks around it,
+    so the time per insert should grow far slower than the source, particularly in edit mode
+    where neither the source nor the redacted text is copied by an insert.
+
+    Usage: python Benchmark_TextRedactionEdits.py [startLineCount] [doublings] [insertCount] """
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import random
+import sys
+import time
+
+from pyaid.text.BlockDefinition import BlockDefinition
+from pyaid.text.RedactionTextAnalyzer import RedactionTextAnalyzer
+
+#___________________________________________________________________________________________________ createSource
+def createSource(lineCount):
+    """ Creates a source of lineCount lines that each contain string literals and a comment. """
+    lines = []
+    for i in range(lineCount):
+        lines.append('value%s = "item %s" + \'/path\' + call(%s) // trailing comment %s' % (
+            i, i, i, i))
+    return '\n'.join(lines)
+
+#___________________________________________________________________________________________________ runBenchmark
+def runBenchmark(lineCount, insertCount, editMode):
+    analyzer = RedactionTextAnalyzer(createSource(lineCount), editMode=editMode, blockDefs=[
+        BlockDefinition.createQuoteDef(BlockDefinition.BLOCKED),
+        BlockDefinition.createLiteralDef(BlockDefinition.BLOCKED),
+        BlockDefinition.createCStyleDef(BlockDefinition.BLOCKED),
+        BlockDefinition.createParensDef() ])
+    analyzer.analyze()
+
+    rand  = random.Random(lineCount)
+    start = time.time()
+    for i in range(insertCount):
+        index = rand.randint(0, len(analyzer.source))
+        analyzer.insertCharacters(index, index, 'x')
+    return time.time() - start
+
+####################################################################################################
+####################################################################################################
+
+if __name__ == '__main__':
+    lineCount   = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    doublings   = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    insertCount = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+
+    print('RedactionTextAnalyzer inserts on string-literal-heavy sources')
+    for i in range(doublings + 1):
+        for editMode in [False, True]:
+            elapsed = runBenchmark(lineCount, insertCount, editMode)
+            print('    %8s lines %10s %8.3f sec %8.3f ms/insert' % (
+                lineCount, 'edit mode' if editMode else 'default', elapsed,
+                1000*elapsed/insertCount))
+        lineCount *= 2
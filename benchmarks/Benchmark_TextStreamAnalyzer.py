@@ -0,0 +1,92 @@
+# Benchmark_TextStreamAnalyzer.py [BENCHMARK]
+# (C) 2016
+# Scott Ernst
+
+""" Measures TextStreamAnalyzer throughput and peak memory when streaming a generated CoffeeScript
+    file, which is repeated to the requested size, compared with analyzing the entire file at once.
+    The peak memory of the stream should stay nearly constant as the file grows.
+
+    Usage: python Benchmark_TextStreamAnalyzer.py [megabytes] """
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import codecs
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+from pyaid.text.TextAnalyzer import TextAnalyzer
+from pyaid.text.TextStreamAnalyzer import TextStreamAnalyzer
+from pyaid.web.coffeescript.CoffeescriptAnalyzer import CoffeescriptAnalyzer
+
+#___________________________________________________________________________________________________ createSource
+def createSource(path, megabytes):
+    """ Writes a CoffeeScript source of roughly the specified size to the path. """
+    part = '\n'.join([
+        '# Section (generated)',
+        'class Widget extends Base',
+        '    ###',
+        '    Block comment for "Widget" with [brackets]',
+        '    ###',
+        '    constructor: (@name, options ={}) ->',
+        '        @items = [1, 2, [3, 4], {a:(5)}]',
+        '        @label = "Widget #{@name}"',
+        '        @call(1, (x) -> x*2)',
+        '' ])*1000
+
+    with codecs.open(path, 'w', 'utf-8') as fh:
+        for i in range(int(1000000*megabytes/len(part)) + 1):
+            fh.write(part)
+
+#___________________________________________________________________________________________________ runBenchmark
+def runBenchmark(label, function):
+    """ Times the function and then runs it again while tracing memory allocations, which would
+        otherwise slow the timed run, to find its peak memory. """
+    start   = time.time()
+    count   = function()
+    elapsed = time.time() - start
+
+    peak = None
+    if tracemalloc:
+        tracemalloc.start()
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    print('    %10s %8s blocks %8.3f sec %s' % (
+        label, count, elapsed, '' if peak is None else '%8.1f MB peak' % (peak/1000000)))
+
+####################################################################################################
+####################################################################################################
+
+if __name__ == '__main__':
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    blockDefs = CoffeescriptAnalyzer()._blockDefs
+    folder    = tempfile.mkdtemp()
+    path      = os.path.join(folder, 'source.coffee')
+
+    try:
+        createSource(path, megabytes)
+
+        def analyzeStream():
+            events = TextStreamAnalyzer(path, blockDefs=blockDefs).streamBlockEvents()
+            return sum(1 for e in events if e.eventType == e.OPEN)
+
+        def analyzeFile():
+            with codecs.open(path, 'r', 'utf-8') as fh:
+                analyzer = TextAnalyzer(fh.read(), blockDefs=blockDefs)
+            analyzer.analyze()
+            return len(analyzer.blocks)
+
+        print('TextStreamAnalyzer on a %s MB file' % megabytes)
+        runBenchmark('stream', analyzeStream)
+        runBenchmark('entire', analyzeFile)
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
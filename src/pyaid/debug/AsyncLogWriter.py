@@ -0,0 +1,252 @@
+# AsyncLogWriter.py
+# (C)2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import atexit
+import collections
+import threading
+import time
+
+from pyaid.debug.LogQueuePolicyEnum import LogQueuePolicyEnum
+
+#___________________________________________________________________________________________________ AsyncLogWriter
+class AsyncLogWriter(threading.Thread):
+    """ A dedicated writer thread that drains a bounded queue of log message dictionaries and
+        hands them in batches to a write handler. Messages that cannot be queued are handled
+        according to the LogQueuePolicyEnum policy and counted as dropped. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    _ACTIVE_WRITERS = []
+    _ACTIVE_LOCK    = threading.Lock()
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(
+            self, writeHandler, syncHandler =None, maxSize =1000, policy =None, batchSize =256,
+            fsyncInterval =1.0, blockTimeout =None, name =None
+    ):
+        """ Creates the writer thread, which must be started before messages are consumed.
+
+            writeHandler:   Called on the writer thread with a list of queued items.
+            syncHandler:    Called on the writer thread, at most once every fsyncInterval
+                            seconds, after items have been written. """
+
+        threading.Thread.__init__(self, name=name if name else 'AsyncLogWriter')
+        self.daemon = True
+
+        self._writeHandler  = writeHandler
+        self._syncHandler   = syncHandler
+        self._maxSize       = max(1, int(maxSize))
+        self._policy        = policy if policy else LogQueuePolicyEnum.BLOCK
+        self._batchSize     = max(1, int(batchSize))
+        self._fsyncInterval = max(0.0, float(fsyncInterval))
+        self._blockTimeout  = blockTimeout
+        self._queue         = collections.deque()
+        self._condition     = threading.Condition(threading.Lock())
+        self._inFlight      = 0
+        self._droppedCount  = 0
+        self._writtenCount  = 0
+        self._unsynced      = False
+        self._lastSync      = time.time()
+        self._closing       = False
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: droppedCount
+    @property
+    def droppedCount(self):
+        """ The number of messages discarded because the queue was full. """
+        return self._droppedCount
+
+#___________________________________________________________________________________________________ GS: writtenCount
+    @property
+    def writtenCount(self):
+        """ The number of messages handed to the write handler. """
+        return self._writtenCount
+
+#___________________________________________________________________________________________________ GS: pendingCount
+    @property
+    def pendingCount(self):
+        with self._condition:
+            return len(self._queue) + self._inFlight
+
+#___________________________________________________________________________________________________ GS: policy
+    @property
+    def policy(self):
+        return self._policy
+
+#___________________________________________________________________________________________________ GS: isClosing
+    @property
+    def isClosing(self):
+        return self._closing
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ start
+    def start(self):
+        with AsyncLogWriter._ACTIVE_LOCK:
+            AsyncLogWriter._ACTIVE_WRITERS.append(self)
+        threading.Thread.start(self)
+
+#___________________________________________________________________________________________________ enqueue
+    def enqueue(self, item):
+        """ Adds the item to the queue, applying the backpressure policy if the queue is full.
+            Returns False if an item, either this one or an older one, was dropped. """
+
+        with self._condition:
+            if self._closing:
+                self._droppedCount += 1
+                return False
+
+            if len(self._queue) < self._maxSize:
+                self._queue.append(item)
+                self._condition.notify_all()
+                return True
+
+            if self._policy == LogQueuePolicyEnum.DROP_NEWEST:
+                self._droppedCount += 1
+                return False
+
+            if self._policy == LogQueuePolicyEnum.DROP_OLDEST:
+                self._queue.popleft()
+                self._queue.append(item)
+                self._droppedCount += 1
+                self._condition.notify_all()
+                return False
+
+            # BLOCK policy: wait for the writer thread to make room
+            deadline = None if self._blockTimeout is None else time.time() + self._blockTimeout
+            while len(self._queue) >= self._maxSize and not self._closing:
+                if deadline is None:
+                    self._condition.wait()
+                    continue
+
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+            if self._closing or len(self._queue) >= self._maxSize:
+                self._droppedCount += 1
+                return False
+
+            self._queue.append(item)
+            self._condition.notify_all()
+            return True
+
+#___________________________________________________________________________________________________ drain
+    def drain(self, timeout =None):
+        """ Blocks until every queued item has been handed to the write handler. Returns True
+            if the queue was emptied before the timeout expired. """
+
+        if not self.is_alive():
+            return not self._queue
+
+        deadline = None if timeout is None else time.time() + timeout
+        with self._condition:
+            self._condition.notify_all()
+            while self._queue or self._inFlight:
+                if deadline is None:
+                    self._condition.wait()
+                    continue
+
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+#___________________________________________________________________________________________________ close
+    def close(self, timeout =None):
+        """ Stops accepting new items, writes everything still queued and stops the thread. """
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join(timeout)
+
+        with AsyncLogWriter._ACTIVE_LOCK:
+            if self in AsyncLogWriter._ACTIVE_WRITERS:
+                AsyncLogWriter._ACTIVE_WRITERS.remove(self)
+
+#___________________________________________________________________________________________________ run
+    def run(self):
+        while True:
+            with self._condition:
+                while not self._queue and not self._closing:
+                    if not self._unsynced:
+                        self._condition.wait()
+                        continue
+
+                    remaining = self._lastSync + self._fsyncInterval - time.time()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                batch = []
+                while self._queue and len(batch) < self._batchSize:
+                    batch.append(self._queue.popleft())
+                self._inFlight = len(batch)
+                done = self._closing and not self._queue
+                self._condition.notify_all()
+
+            if batch:
+                self._write(batch)
+
+            if self._unsynced and (done or time.time() - self._lastSync >= self._fsyncInterval):
+                self._sync()
+
+            with self._condition:
+                self._inFlight = 0
+                self._condition.notify_all()
+
+            if done:
+                return
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _write
+    def _write(self, batch):
+        try:
+            self._writeHandler(batch)
+        except Exception as err:
+            print('LOGGER ERROR: Asynchronous write failed.')
+            print(err)
+
+        self._writtenCount += len(batch)
+        self._unsynced = True
+
+#___________________________________________________________________________________________________ _sync
+    def _sync(self):
+        self._unsynced = False
+        self._lastSync = time.time()
+        if not self._syncHandler:
+            return
+
+        try:
+            self._syncHandler()
+        except Exception as err:
+            print('LOGGER ERROR: Asynchronous sync failed.')
+            print(err)
+
+#___________________________________________________________________________________________________ closeAll
+    @classmethod
+    def closeAll(cls, timeout =None):
+        """ Drains and stops every running writer. Registered to run at interpreter shutdown. """
+        with cls._ACTIVE_LOCK:
+            writers = list(cls._ACTIVE_WRITERS)
+
+        for writer in writers:
+            try:
+                writer.close(timeout)
+            except Exception:
+                pass
+
+atexit.register(AsyncLogWriter.closeAll)
@@ -0,0 +1,154 @@
+# LogArchiveCompressor.py
+# (C)2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import atexit
+import collections
+import gzip
+import os
+import shutil
+import threading
+import time
+
+#___________________________________________________________________________________________________ LogArchiveCompressor
+class LogArchiveCompressor(threading.Thread):
+    """ A background thread that gzip-compresses rotated log segments so that the logging write
+        path never waits on compression. Segments are compressed once they are older than the
+        grace delay, giving writers in other processes time to notice the rotation and stop
+        appending to the renamed file. A single shared instance serves every LogRotator in the
+        process. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    GRACE_DELAY = 5.0
+
+    _INSTANCE      = None
+    _INSTANCE_LOCK = threading.Lock()
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, graceDelay =None):
+        """Creates a new instance of LogArchiveCompressor."""
+        threading.Thread.__init__(self, name='LogArchiveCompressor')
+        self.daemon = True
+
+        self._graceDelay = self.GRACE_DELAY if graceDelay is None else graceDelay
+        self._queue      = collections.deque()
+        self._condition  = threading.Condition(threading.Lock())
+        self._closing    = False
+        self._busy       = False
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ enqueue
+    def enqueue(self, path, callback =None):
+        """ Schedules the segment at path for compression. The optional callback is called with
+            the archive path once compression completes. Once the compressor is closing, which
+            happens at interpreter shutdown, the segment is compressed on the calling thread. """
+        with self._condition:
+            if not self._closing:
+                self._queue.append((time.time() + self._graceDelay, path, callback))
+                self._condition.notify_all()
+                return
+
+        archivePath = self.compress(path)
+        if callback:
+            callback(archivePath)
+
+#___________________________________________________________________________________________________ drain
+    def drain(self, timeout =None):
+        """ Compresses all queued segments immediately, without waiting for the grace delay, and
+            blocks until done. """
+        if not self.is_alive():
+            return not self._queue
+
+        deadline = None if timeout is None else time.time() + timeout
+        with self._condition:
+            self._queue = collections.deque([(0, p, cb) for (t, p, cb) in self._queue])
+            self._condition.notify_all()
+            while self._queue or self._busy:
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+#___________________________________________________________________________________________________ close
+    def close(self, timeout =None):
+        self.drain(timeout)
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+        if self.is_alive():
+            self.join(timeout)
+
+#___________________________________________________________________________________________________ run
+    def run(self):
+        while True:
+            with self._condition:
+                while not self._closing:
+                    if self._queue:
+                        remaining = self._queue[0][0] - time.time()
+                        if remaining <= 0:
+                            break
+                        self._condition.wait(remaining)
+                    else:
+                        self._condition.wait()
+
+                if self._closing and not self._queue:
+                    return
+
+                ready, path, callback = self._queue.popleft()
+                self._busy = True
+
+            try:
+                archivePath = self.compress(path)
+                if callback:
+                    callback(archivePath)
+            except Exception as err:
+                print('LOGGER ERROR: Unable to compress log archive "%s".' % path)
+                print(err)
+
+            with self._condition:
+                self._busy = False
+                self._condition.notify_all()
+
+#___________________________________________________________________________________________________ compress
+    @classmethod
+    def compress(cls, path):
+        """ Compresses the file into path.gz, writing to a temporary file that is renamed into
+            place so that a partial archive never exists under the final name. """
+        if not os.path.exists(path):
+            return None
+
+        archivePath = path + '.gz'
+        tempPath    = archivePath + '.tmp'
+        with open(path, 'rb') as source:
+            with gzip.open(tempPath, 'wb') as target:
+                shutil.copyfileobj(source, target)
+
+        os.rename(tempPath, archivePath)
+        os.remove(path)
+        return archivePath
+
+#___________________________________________________________________________________________________ getInstance
+    @classmethod
+    def getInstance(cls):
+        """ Returns the shared compressor, starting it if necessary. """
+        with cls._INSTANCE_LOCK:
+            if cls._INSTANCE is None:
+                cls._INSTANCE = cls()
+                cls._INSTANCE.start()
+            return cls._INSTANCE
+
+#___________________________________________________________________________________________________ closeInstance
+    @classmethod
+    def closeInstance(cls, timeout =10.0):
+        instance = cls._INSTANCE
+        if instance is not None:
+            instance.close(timeout)
+
+atexit.register(LogArchiveCompressor.closeInstance)
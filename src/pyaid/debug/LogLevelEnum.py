@@ -0,0 +1,44 @@
+# LogLevelEnum.py
+# (C)2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+#___________________________________________________________________________________________________ LogLevelEnum
+class LogLevelEnum(object):
+    """ Severity levels for Logger messages. A Logger discards messages below its threshold
+        level before doing any formatting work. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    DEBUG = 10
+
+    INFO = 20
+
+    WARN = 30
+
+    ERROR = 40
+
+    _NAMES = {10:'DEBUG', 20:'INFO', 30:'WARN', 40:'ERROR'}
+
+#___________________________________________________________________________________________________ getName
+    @classmethod
+    def getName(cls, level):
+        return cls._NAMES.get(level, 'LEVEL %s' % level)
+
+#___________________________________________________________________________________________________ fromName
+    @classmethod
+    def fromName(cls, name, default =None):
+        """ Returns the level for the specified name, or the value itself if it is already a
+            level number. """
+        if isinstance(name, int):
+            return name
+
+        name = str(name).upper()
+        for level, levelName in cls._NAMES.items():
+            if levelName == name:
+                return level
+        if name == 'WARNING':
+            return cls.WARN
+        return default
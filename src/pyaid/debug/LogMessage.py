@@ -0,0 +1,100 @@
+# LogMessage.py
+# (C)2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+#___________________________________________________________________________________________________ LogMessage
+class LogMessage(dict):
+    """ A log message dictionary whose formatted values are rendered on first access. The
+        formatter is a callable returning the dictionary of formatted values, which is merged
+        into the message the first time any key is read, so messages that are never serialized
+        are never formatted. """
+
+    __slots__ = ('_formatter',)
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, formatter, **kwargs):
+        """Creates a new instance of LogMessage."""
+        dict.__init__(self, **kwargs)
+        self._formatter = formatter
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: isResolved
+    @property
+    def isResolved(self):
+        return self._formatter is None
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ resolve
+    def resolve(self):
+        """ Runs the deferred formatting if it has not already been run. """
+        formatter = self._formatter
+        if formatter is None:
+            return self
+
+        self._formatter = None
+        dict.update(self, formatter())
+        return self
+
+#___________________________________________________________________________________________________ get
+    def get(self, key, default =None):
+        self.resolve()
+        return dict.get(self, key, default)
+
+#___________________________________________________________________________________________________ keys
+    def keys(self):
+        self.resolve()
+        return dict.keys(self)
+
+#___________________________________________________________________________________________________ values
+    def values(self):
+        self.resolve()
+        return dict.values(self)
+
+#___________________________________________________________________________________________________ items
+    def items(self):
+        self.resolve()
+        return dict.items(self)
+
+#___________________________________________________________________________________________________ copy
+    def copy(self):
+        self.resolve()
+        return dict(self)
+
+#===================================================================================================
+#                                                                               I N T R I N S I C
+
+#___________________________________________________________________________________________________ __missing__
+    def __missing__(self, key):
+        if self._formatter is None:
+            raise KeyError(key)
+        self.resolve()
+        return self[key]
+
+#___________________________________________________________________________________________________ __contains__
+    def __contains__(self, key):
+        self.resolve()
+        return dict.__contains__(self, key)
+
+#___________________________________________________________________________________________________ __iter__
+    def __iter__(self):
+        self.resolve()
+        return dict.__iter__(self)
+
+#___________________________________________________________________________________________________ __len__
+    def __len__(self):
+        self.resolve()
+        return dict.__len__(self)
+
+#___________________________________________________________________________________________________ __repr__
+    def __repr__(self):
+        self.resolve()
+        return dict.__repr__(self)
@@ -0,0 +1,21 @@
+# LogQueuePolicyEnum.py
+# (C)2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+#___________________________________________________________________________________________________ LogQueuePolicyEnum
+class LogQueuePolicyEnum(object):
+    """ Backpressure policies applied by the AsyncLogWriter when its queue is full. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    # Wait for the writer thread to free space in the queue before returning
+    BLOCK = 'block'
+
+    # Discard the oldest queued message to make room for the new one
+    DROP_OLDEST = 'dropOldest'
+
+    # Discard the new message and leave the queue untouched
+    DROP_NEWEST = 'dropNewest'
@@ -0,0 +1,141 @@
+# LogRecordCodec.py
+# (C)2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import json
+import re
+import struct
+
+from pyaid.debug.LogRecordFormatEnum import LogRecordFormatEnum
+from pyaid.string.StringUtils import StringUtils
+
+#___________________________________________________________________________________________________ LogRecordCodec
+class LogRecordCodec(object):
+    """ Encodes Logger message dictionaries into structured NDJSON or binary log records and
+        decodes them again.
+
+        NDJSON records are written with a fixed key order beginning with the time, level and
+        error flag so that readers can filter on those fields with an anchored regular
+        expression before parsing the full record.
+
+        Binary records consist of a little-endian header followed by the UTF-8 encoded prefix,
+        message and stack text:
+
+            uint32  record length, excluding this field
+            float64 time in seconds since the epoch
+            uint8   flags, where bit 0 is the error flag
+            uint8   level, 0 when unspecified
+            uint16  prefix length
+            uint32  message length
+            uint32  stack length """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    BINARY_HEADER     = struct.Struct(str('<IdBBHII'))
+    BINARY_LENGTH     = struct.Struct(str('<I'))
+    ERROR_FLAG        = 1
+
+    NDJSON_HEADER_PATTERN = re.compile(
+        br'\{"time":(-?[0-9.eE+-]+),"level":(\d+|null),"error":(true|false)')
+
+#___________________________________________________________________________________________________ encode
+    @classmethod
+    def encode(cls, logMessage, logFormat):
+        """ Returns the bytes of the record for the log message in the specified format. """
+        if logFormat == LogRecordFormatEnum.BINARY:
+            return cls.encodeBinary(logMessage)
+        return cls.encodeNdjson(logMessage)
+
+#___________________________________________________________________________________________________ encodeAll
+    @classmethod
+    def encodeAll(cls, logMessages, logFormat):
+        return b''.join([cls.encode(m, logFormat) for m in logMessages])
+
+#___________________________________________________________________________________________________ encodeNdjson
+    @classmethod
+    def encodeNdjson(cls, logMessage):
+        level = logMessage.get('level', None)
+        out = '{"time":%s,"level":%s,"error":%s,"prefix":%s,"log":%s,"stack":%s}\n' % (
+            repr(float(logMessage.get('time', 0.0))),
+            'null' if level is None else int(level),
+            'true' if logMessage.get('error', False) else 'false',
+            cls._toJson(logMessage.get('prefix', None)),
+            cls._toJson(logMessage.get('log', None)),
+            cls._toJson(logMessage.get('stack', None)) )
+        return out.encode('utf-8')
+
+#___________________________________________________________________________________________________ encodeBinary
+    @classmethod
+    def encodeBinary(cls, logMessage):
+        prefix  = cls._toBytes(logMessage.get('prefix', None))
+        message = cls._toBytes(logMessage.get('log', None))
+        stack   = cls._toBytes(logMessage.get('stack', None))
+        level   = logMessage.get('level', None)
+
+        # The prefix length field is 16 bits, so longer prefixes are truncated at a character
+        # boundary before the record length is computed
+        if len(prefix) > 0xFFFF:
+            prefix = prefix[:0xFFFF].decode('utf-8', 'ignore').encode('utf-8')
+
+        length = cls.BINARY_HEADER.size - cls.BINARY_LENGTH.size \
+            + len(prefix) + len(message) + len(stack)
+        header = cls.BINARY_HEADER.pack(
+            length,
+            float(logMessage.get('time', 0.0)),
+            cls.ERROR_FLAG if logMessage.get('error', False) else 0,
+            min(255, max(0, int(level))) if level is not None else 0,
+            len(prefix),
+            len(message),
+            len(stack))
+        return header + prefix + message + stack
+
+#___________________________________________________________________________________________________ decodeNdjson
+    @classmethod
+    def decodeNdjson(cls, data):
+        record = json.loads(StringUtils.toUnicode(data))
+        for key in ('prefix', 'stack'):
+            if record.get(key) is None:
+                del record[key]
+        return record
+
+#___________________________________________________________________________________________________ decodeBinary
+    @classmethod
+    def decodeBinary(cls, data, offset =0):
+        """ Decodes the binary record starting at offset within data, which can be any buffer
+            including an mmap. """
+        length, time, flags, level, prefixLength, messageLength, stackLength = \
+            cls.BINARY_HEADER.unpack_from(data, offset)
+
+        index  = offset + cls.BINARY_HEADER.size
+        record = dict(time=time, level=level if level else None, error=bool(flags & cls.ERROR_FLAG))
+
+        if prefixLength:
+            record['prefix'] = data[index:index + prefixLength].decode('utf-8', 'replace')
+        index += prefixLength
+
+        record['log'] = data[index:index + messageLength].decode('utf-8', 'replace')
+        index += messageLength
+
+        if stackLength:
+            record['stack'] = data[index:index + stackLength].decode('utf-8', 'replace')
+        return record
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _toJson
+    @classmethod
+    def _toJson(cls, value):
+        if value is None:
+            return 'null'
+        return json.dumps(StringUtils.toUnicode(value), ensure_ascii=False)
+
+#___________________________________________________________________________________________________ _toBytes
+    @classmethod
+    def _toBytes(cls, value):
+        if value is None:
+            return b''
+        return StringUtils.toUnicode(value).encode('utf-8')
@@ -0,0 +1,42 @@
+# LogRecordFormatEnum.py
+# (C)2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+#___________________________________________________________________________________________________ LogRecordFormatEnum
+class LogRecordFormatEnum(object):
+    """ Formats in which a Logger writes its entries to the log file. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    # Human-readable text entries
+    TEXT = 'text'
+
+    # One JSON object per line with a fixed key order
+    NDJSON = 'ndjson'
+
+    # Length-prefixed binary records
+    BINARY = 'binary'
+
+    _EXTENSIONS = {'text':'log', 'ndjson':'ndjson', 'binary':'logb'}
+
+#___________________________________________________________________________________________________ getExtension
+    @classmethod
+    def getExtension(cls, logFormat):
+        """ Returns the default log file extension for the format. """
+        return cls._EXTENSIONS.get(logFormat, 'log')
+
+#___________________________________________________________________________________________________ fromPath
+    @classmethod
+    def fromPath(cls, path, default =None):
+        """ Returns the format implied by the file extension of path, ignoring a .gz suffix. """
+        if path.endswith('.gz'):
+            path = path[:-3]
+        extension = path.rsplit('.', 1)[-1].lower()
+        if extension in ('ndjson', 'jsonl'):
+            return cls.NDJSON
+        if extension == 'logb':
+            return cls.BINARY
+        return default
@@ -0,0 +1,236 @@
+# LogRecordReader.py
+# (C)2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import gzip
+import mmap
+import os
+
+from pyaid.debug.LogRecordCodec import LogRecordCodec
+from pyaid.debug.LogRecordFormatEnum import LogRecordFormatEnum
+
+#___________________________________________________________________________________________________ LogRecordReader
+class LogRecordReader(object):
+    """ Lazily iterates over the records of a structured NDJSON or binary log file through a
+        read-only memory map. Records are filtered on their time and error flag before the rest
+        of the record is decoded, so scanning a large log for a few matching entries touches
+        little more than the record headers. Compressed archives with a .gz suffix, such as
+        rotated log segments, are decompressed as a stream instead. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, path, logFormat =None):
+        """ Creates a reader for the log file at path. The format defaults to the one implied
+            by the file extension. """
+        self._path      = path
+        self._logFormat = logFormat if logFormat else LogRecordFormatEnum.fromPath(path)
+        self._file      = None
+        self._map       = None
+
+        if self._logFormat not in (LogRecordFormatEnum.NDJSON, LogRecordFormatEnum.BINARY):
+            raise ValueError('Unable to read structured log records from "%s"' % path)
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: path
+    @property
+    def path(self):
+        return self._path
+
+#___________________________________________________________________________________________________ GS: logFormat
+    @property
+    def logFormat(self):
+        return self._logFormat
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ open
+    def open(self):
+        if self._file is not None:
+            return
+
+        if self._isCompressed():
+            self._file = gzip.open(self._path, 'rb')
+            return
+
+        self._file = open(self._path, 'rb')
+        if os.fstat(self._file.fileno()).st_size > 0:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._map = b''
+
+#___________________________________________________________________________________________________ close
+    def close(self):
+        if self._map is not None and not isinstance(self._map, bytes):
+            self._map.close()
+        self._map = None
+
+        if self._file:
+            self._file.close()
+            self._file = None
+
+#___________________________________________________________________________________________________ iterRecords
+    def iterRecords(self, startTime =None, endTime =None, errorsOnly =False):
+        """ A generator yielding the record dictionaries whose time lies within the optional
+            [startTime, endTime) range and, if errorsOnly, whose error flag is set. """
+        self.open()
+        if self._isCompressed():
+            if self._logFormat == LogRecordFormatEnum.BINARY:
+                return self._iterBinaryStream(startTime, endTime, errorsOnly)
+            return self._iterNdjsonStream(startTime, endTime, errorsOnly)
+
+        if self._logFormat == LogRecordFormatEnum.BINARY:
+            return self._iterBinary(startTime, endTime, errorsOnly)
+        return self._iterNdjson(startTime, endTime, errorsOnly)
+
+#___________________________________________________________________________________________________ countRecords
+    def countRecords(self, **kwargs):
+        count = 0
+        for record in self.iterRecords(**kwargs):
+            count += 1
+        return count
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _iterNdjson
+    def _iterNdjson(self, startTime, endTime, errorsOnly):
+        data  = self._map
+        size  = len(data)
+        index = 0
+
+        while index < size:
+            end = data.find(b'\n', index)
+            if end == -1:
+                end = size
+
+            record = self._decodeNdjsonLine(data, index, end, startTime, endTime, errorsOnly)
+            if record is not None:
+                yield record
+            index = end + 1
+
+#___________________________________________________________________________________________________ _iterNdjsonStream
+    def _iterNdjsonStream(self, startTime, endTime, errorsOnly):
+        self._file.seek(0)
+        for line in self._file:
+            end    = len(line) - 1 if line.endswith(b'\n') else len(line)
+            record = self._decodeNdjsonLine(line, 0, end, startTime, endTime, errorsOnly)
+            if record is not None:
+                yield record
+
+#___________________________________________________________________________________________________ _decodeNdjsonLine
+    def _decodeNdjsonLine(self, data, index, end, startTime, endTime, errorsOnly):
+        """ Returns the record of the line between index and end within data, or None if the
+            line is empty, truncated or filtered out. """
+        match = LogRecordCodec.NDJSON_HEADER_PATTERN.match(data, index, end)
+        if match:
+            if errorsOnly and match.group(3) != b'true':
+                return None
+
+            time = float(match.group(1))
+            if (startTime is not None and time < startTime) or \
+                    (endTime is not None and time >= endTime):
+                return None
+
+        if end <= index:
+            return None
+
+        try:
+            record = LogRecordCodec.decodeNdjson(data[index:end])
+        except ValueError:
+            # Skips lines truncated by a crash mid-write
+            return None
+
+        if match or self._accept(record, startTime, endTime, errorsOnly):
+            return record
+        return None
+
+#___________________________________________________________________________________________________ _iterBinary
+    def _iterBinary(self, startTime, endTime, errorsOnly):
+        data       = self._map
+        size       = len(data)
+        header     = LogRecordCodec.BINARY_HEADER
+        errorFlag  = LogRecordCodec.ERROR_FLAG
+        lengthSize = LogRecordCodec.BINARY_LENGTH.size
+        index      = 0
+
+        while index + header.size <= size:
+            length, time, flags = header.unpack_from(data, index)[:3]
+            nextIndex = index + lengthSize + length
+            if nextIndex > size:
+                # A truncated final record
+                return
+
+            if (errorsOnly and not flags & errorFlag) or \
+                    (startTime is not None and time < startTime) or \
+                    (endTime is not None and time >= endTime):
+                index = nextIndex
+                continue
+
+            yield LogRecordCodec.decodeBinary(data, index)
+            index = nextIndex
+
+#___________________________________________________________________________________________________ _iterBinaryStream
+    def _iterBinaryStream(self, startTime, endTime, errorsOnly):
+        header     = LogRecordCodec.BINARY_HEADER
+        errorFlag  = LogRecordCodec.ERROR_FLAG
+        lengthSize = LogRecordCodec.BINARY_LENGTH.size
+
+        self._file.seek(0)
+        while True:
+            head = self._file.read(header.size)
+            if len(head) < header.size:
+                return
+
+            length, time, flags = header.unpack_from(head)[:3]
+            bodySize = lengthSize + length - header.size
+            body     = self._file.read(bodySize)
+            if len(body) < bodySize:
+                # A truncated final record
+                return
+
+            if (errorsOnly and not flags & errorFlag) or \
+                    (startTime is not None and time < startTime) or \
+                    (endTime is not None and time >= endTime):
+                continue
+
+            yield LogRecordCodec.decodeBinary(head + body)
+
+#___________________________________________________________________________________________________ _isCompressed
+    def _isCompressed(self):
+        return self._path.endswith('.gz')
+
+#___________________________________________________________________________________________________ _accept
+    @classmethod
+    def _accept(cls, record, startTime, endTime, errorsOnly):
+        if errorsOnly and not record.get('error', False):
+            return False
+
+        time = record.get('time', 0.0)
+        if startTime is not None and time < startTime:
+            return False
+        if endTime is not None and time >= endTime:
+            return False
+        return True
+
+#===================================================================================================
+#                                                                               I N T R I N S I C
+
+#___________________________________________________________________________________________________ __iter__
+    def __iter__(self):
+        return self.iterRecords()
+
+#___________________________________________________________________________________________________ __enter__
+    def __enter__(self):
+        self.open()
+        return self
+
+#___________________________________________________________________________________________________ __exit__
+    def __exit__(self, type, value, traceback):
+        self.close()
@@ -0,0 +1,125 @@
+# LogRingBuffer.py
+# (C)2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import collections
+import threading
+
+#___________________________________________________________________________________________________ LogRingBuffer
+class LogRingBuffer(object):
+    """ A fixed-capacity storage buffer for log message dictionaries. Appending is O(1) and the
+        oldest entries are evicted once either the entry count or the total size, measured in
+        characters of the prefix, message and stack text, exceeds its limit. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, capacity =1000, maxBytes =0):
+        """ Creates a new LogRingBuffer. A maxBytes of zero bounds the buffer by capacity only,
+            which avoids having to format deferred log messages to measure them. """
+        self._capacity     = max(1, int(capacity))
+        self._maxBytes     = max(0, int(maxBytes or 0))
+        self._entries      = collections.deque()
+        self._sizes        = collections.deque()
+        self._totalBytes   = 0
+        self._evictedCount = 0
+        self._lock         = threading.Lock()
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: capacity
+    @property
+    def capacity(self):
+        return self._capacity
+
+#___________________________________________________________________________________________________ GS: maxBytes
+    @property
+    def maxBytes(self):
+        return self._maxBytes
+
+#___________________________________________________________________________________________________ GS: totalBytes
+    @property
+    def totalBytes(self):
+        return self._totalBytes
+
+#___________________________________________________________________________________________________ GS: evictedCount
+    @property
+    def evictedCount(self):
+        """ The number of entries evicted since the buffer was created. """
+        return self._evictedCount
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ append
+    def append(self, logMessage):
+        size = self.getEntrySize(logMessage) if self._maxBytes else 0
+
+        with self._lock:
+            self._entries.append(logMessage)
+            self._sizes.append(size)
+            self._totalBytes += size
+
+            while len(self._entries) > self._capacity or (
+                    self._maxBytes and self._totalBytes > self._maxBytes and
+                    len(self._entries) > 1):
+                self._entries.popleft()
+                self._totalBytes -= self._sizes.popleft()
+                self._evictedCount += 1
+
+#___________________________________________________________________________________________________ snapshot
+    def snapshot(self, count =None):
+        """ Returns a list of the most recent count entries, or all entries if count is None,
+            ordered oldest first. """
+        with self._lock:
+            if count is None or count >= len(self._entries):
+                return list(self._entries)
+            if count <= 0:
+                return []
+
+            out = []
+            for entry in reversed(self._entries):
+                out.append(entry)
+                if len(out) >= count:
+                    break
+            out.reverse()
+            return out
+
+#___________________________________________________________________________________________________ clear
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._totalBytes = 0
+
+#___________________________________________________________________________________________________ getEntrySize
+    @classmethod
+    def getEntrySize(cls, logMessage):
+        size = 0
+        for key in ('prefix', 'log', 'stack'):
+            value = logMessage.get(key, None)
+            if value:
+                size += len(value)
+        return size
+
+#===================================================================================================
+#                                                                               I N T R I N S I C
+
+#___________________________________________________________________________________________________ __len__
+    def __len__(self):
+        return len(self._entries)
+
+#___________________________________________________________________________________________________ __iter__
+    def __iter__(self):
+        return iter(self.snapshot())
+
+#___________________________________________________________________________________________________ __getitem__
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.snapshot()[index]
+        with self._lock:
+            return self._entries[index]
@@ -0,0 +1,188 @@
+# LogRotator.py
+# (C)2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import datetime
+import os
+import threading
+import time
+
+from pyaid.debug.LogArchiveCompressor import LogArchiveCompressor
+from pyaid.file.FileLock import FileLock
+from pyaid.file.FileLockBackendEnum import FileLockBackendEnum
+
+#___________________________________________________________________________________________________ LogRotator
+class LogRotator(object):
+    """ Rolls a log file over into timestamped segments once it exceeds a maximum size or once
+        the wall clock crosses a maximum age boundary, keeping the newest keepCount segments.
+
+        Rollover renames the log file, which is atomic, while holding an exclusive lock on a
+        companion .rotate file so that only one of the processes sharing the log path performs
+        it. The rotation condition is checked again under the lock, so processes that lose the
+        race see the fresh file and skip. Closed segments are compressed on the shared
+        LogArchiveCompressor thread. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    SEGMENT_TIMESTAMP = '%Y%m%d-%H%M%S-%f'
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, path, maxBytes =0, maxAge =0, keepCount =10, compress =True):
+        """ Creates a new LogRotator for the log file at path.
+
+            maxBytes:   Rotates once the file reaches this size. Zero disables size rotation.
+            maxAge:     Rotates the first time the file is written after crossing a multiple of
+                        this many seconds since the epoch, so every process sharing the file
+                        agrees on the boundaries. Zero disables age rotation.
+            keepCount:  The number of rotated segments to keep. Zero keeps all of them. """
+
+        self._path      = path
+        self._maxBytes  = max(0, int(maxBytes or 0))
+        self._maxAge    = max(0, float(maxAge or 0))
+        self._keepCount = max(0, int(keepCount or 0))
+        self._compress  = compress
+        self._lock      = threading.Lock()
+
+        root, extension = os.path.splitext(path)
+        self._segmentRoot      = root
+        self._segmentExtension = extension
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: path
+    @property
+    def path(self):
+        return self._path
+
+#___________________________________________________________________________________________________ GS: maxBytes
+    @property
+    def maxBytes(self):
+        return self._maxBytes
+
+#___________________________________________________________________________________________________ GS: maxAge
+    @property
+    def maxAge(self):
+        return self._maxAge
+
+#___________________________________________________________________________________________________ GS: keepCount
+    @property
+    def keepCount(self):
+        return self._keepCount
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ shouldRotate
+    def shouldRotate(self, pendingBytes =0, now =None):
+        """ Whether or not the log file meets a rotation condition, including when writing
+            pendingBytes more to it would exceed the size limit. """
+        try:
+            stat = os.stat(self._path)
+        except OSError:
+            return False
+
+        if stat.st_size <= 0:
+            return False
+
+        if self._maxBytes and stat.st_size + pendingBytes > self._maxBytes:
+            return True
+
+        if self._maxAge:
+            now = time.time() if now is None else now
+            return int(stat.st_mtime//self._maxAge) < int(now//self._maxAge)
+
+        return False
+
+#___________________________________________________________________________________________________ check
+    def check(self, pendingBytes =0):
+        """ Rotates the log file if needed before pendingBytes are written to it. Returns the
+            path of the new segment, or None if no rotation took place in this process. """
+        if not self.shouldRotate(pendingBytes):
+            return None
+        return self.rotate(pendingBytes=pendingBytes)
+
+#___________________________________________________________________________________________________ rotate
+    def rotate(self, force =False, pendingBytes =0):
+        """ Renames the log file to a new segment while holding the cross-process rotation lock
+            and schedules the segment for compression and pruning. """
+
+        with self._lock:
+            lock = self._acquireLock()
+            try:
+                if not force and not self.shouldRotate(pendingBytes):
+                    return None
+                if not os.path.exists(self._path):
+                    return None
+
+                segment = self.createSegmentPath()
+                os.rename(self._path, segment)
+            finally:
+                self._releaseLock(lock)
+
+        if self._compress:
+            LogArchiveCompressor.getInstance().enqueue(segment, lambda path: self.prune())
+        else:
+            self.prune()
+        return segment
+
+#___________________________________________________________________________________________________ createSegmentPath
+    def createSegmentPath(self):
+        stamp = datetime.datetime.utcnow().strftime(self.SEGMENT_TIMESTAMP)
+        return '%s.%s-%s%s' % (self._segmentRoot, stamp, os.getpid(), self._segmentExtension)
+
+#___________________________________________________________________________________________________ getSegments
+    def getSegments(self):
+        """ Returns the rotated segment paths, compressed or not, ordered oldest first. """
+        folder = os.path.dirname(self._segmentRoot) or '.'
+        prefix = os.path.basename(self._segmentRoot) + '.'
+        suffixes = (self._segmentExtension, self._segmentExtension + '.gz')
+
+        try:
+            names = os.listdir(folder)
+        except OSError:
+            return []
+
+        out = []
+        for name in names:
+            if not name.startswith(prefix):
+                continue
+            for suffix in suffixes:
+                if name.endswith(suffix) and len(name) > len(prefix) + len(suffix):
+                    out.append(os.path.join(folder, name))
+                    break
+        return sorted(out, key=lambda p: os.path.basename(p))
+
+#___________________________________________________________________________________________________ prune
+    def prune(self):
+        """ Removes the oldest segments beyond the keep count. """
+        if not self._keepCount:
+            return []
+
+        segments = self.getSegments()
+        removed  = segments[:max(0, len(segments) - self._keepCount)]
+        for path in removed:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        return removed
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _acquireLock
+    def _acquireLock(self):
+        lock = FileLock(
+            self._path + '.rotate', ioMode=None, timeout=None,
+            backend=FileLockBackendEnum.KERNEL)
+        lock.acquire()
+        return lock
+
+#___________________________________________________________________________________________________ _releaseLock
+    @classmethod
+    def _releaseLock(cls, lock):
+        lock.release()
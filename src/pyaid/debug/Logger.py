@@ -7,13 +7,24 @@ from __future__ import print_function, absolute_import, unicode_literals, divisi
 import sys
 import os
 import datetime
+import linecache
+import time
 import traceback
 import unicodedata
+from collections import OrderedDict
 
 # WHEN AVAILABLE: import pytz
 
 from pyaid.ArgsUtils import ArgsUtils
 from pyaid.OsUtils import OsUtils
+from pyaid.debug.AsyncLogWriter import AsyncLogWriter
+from pyaid.debug.LogLevelEnum import LogLevelEnum
+from pyaid.debug.LogMessage import LogMessage
+from pyaid.debug.LogRecordCodec import LogRecordCodec
+from pyaid.debug.LogRecordFormatEnum import LogRecordFormatEnum
+from pyaid.debug.LogRingBuffer import LogRingBuffer
+from pyaid.debug.LogRotator import LogRotator
+from pyaid.file.AppendFile import AppendFile
 from pyaid.file.FileLock import FileLock
 from pyaid.file.FileUtils import FileUtils
 from pyaid.string.StringUtils import StringUtils
@@ -27,12 +38,19 @@ class Logger(object):
 
     PACIFIC_TIMEZONE = 'US/Pacific'
 
+    # File information of the most recently logged code objects, bounded so that code objects
+    # generated at runtime are not kept alive by the cache
+    _CODE_INFO_CACHE      = OrderedDict()
+    _CODE_INFO_CACHE_SIZE = 1024
+
 #___________________________________________________________________________________________________ __init__
     def __init__(self, name=None, **kwargs):
         """Initializes settings."""
         self.timezone            = kwargs.get('timezone', None)
         self.headerless          = kwargs.get('headerless', False)
-        self.logFileExtension    = kwargs.get('extension', 'log').lstrip('.')
+        self.logFormat           = kwargs.get('logFormat', LogRecordFormatEnum.TEXT)
+        self.logFileExtension    = kwargs.get(
+            'extension', LogRecordFormatEnum.getExtension(self.logFormat)).lstrip('.')
         self.timestampFileSuffix = kwargs.get('timestampFileSuffix', True)
         self.removeIfExists      = kwargs.get('removeIfExists', kwargs.get('reset', False))
 
@@ -40,13 +58,28 @@ class Logger(object):
         self._timeCode          = self._time.strftime('%y-%U')
         self._timestamp         = self._time.strftime('%Y|%m|%d|%H|%M|%S')
         self._htmlEscape        = kwargs.get('htmlEscape', False)
-        self._storageBuffer     = [] if kwargs.get('useStorageBuffer', False) else None
+        self._storageCapacity   = kwargs.get('storageCapacity', 0)
+        self._storageMaxBytes   = kwargs.get('storageMaxBytes', 0)
+        self._storageBuffer     = self._createStorageBuffer() \
+            if kwargs.get('useStorageBuffer', False) else None
         self._locationPrefix    = kwargs.get('locationPrefix', False)
         self._traceLogs         = kwargs.get('printOut', False)
         self._buffer            = []
         self._hasError          = False
         self._logPath           = None
         self._logFile           = None
+        self._asyncWriter       = None
+        self._persistentFile    = kwargs.get('persistentFile', False)
+        self._useFlock          = kwargs.get('useFlock', True)
+        self._appendFile        = None
+        self._rotator           = None
+        self._rotation          = dict(
+            maxBytes=kwargs.get('maxBytes', 0),
+            maxAge=kwargs.get('maxAge', 0),
+            keepCount=kwargs.get('keepCount', 10),
+            compress=kwargs.get('compressArchives', True))
+        self._level             = LogLevelEnum.fromName(
+            kwargs.get('level', LogLevelEnum.DEBUG), LogLevelEnum.DEBUG)
 
         writeCallbacks = kwargs.get('writeCallbacks', None)
         if writeCallbacks:
@@ -65,6 +98,18 @@ class Logger(object):
         self._name = self.createLogName(name)
         self.loggingPath = kwargs.get('logFolder', None)
 
+        if kwargs.get('asyncWrite', False):
+            self._asyncWriter = AsyncLogWriter(
+                writeHandler=self._writeLogItems,
+                syncHandler=self._syncLogFile,
+                maxSize=kwargs.get('asyncQueueSize', 1000),
+                policy=kwargs.get('asyncPolicy', None),
+                batchSize=kwargs.get('asyncBatchSize', 256),
+                fsyncInterval=kwargs.get('fsyncInterval', 1.0),
+                blockTimeout=kwargs.get('asyncBlockTimeout', None),
+                name='AsyncLogWriter-' + self._name)
+            self._asyncWriter.start()
+
 #===================================================================================================
 #                                                                                   G E T / S E T
 
@@ -79,6 +124,7 @@ class Logger(object):
         return self._logPath
     @loggingPath.setter
     def loggingPath(self, value):
+        self._closeAppendFile()
         self._logPath = FileUtils.cleanupPath(value)
 
         logFolder = self.getLogFolder()
@@ -93,9 +139,23 @@ class Logger(object):
         else:
             self._logFile = None
 
+        if self._logFile and (self._rotation['maxBytes'] or self._rotation['maxAge']):
+            self._rotator = LogRotator(self._logFile, **self._rotation)
+        else:
+            self._rotator = None
+
+#___________________________________________________________________________________________________ GS: rotator
+    @property
+    def rotator(self):
+        """ The LogRotator for the log file, which exists when a maxBytes or maxAge rotation
+            limit was specified. """
+        return self._rotator
+
 #___________________________________________________________________________________________________ GS: storageBuffer
     @property
     def storageBuffer(self):
+        """ The stored log messages, which is a list unless a storageCapacity or
+            storageMaxBytes limit was specified, in which case it is a LogRingBuffer. """
         return self._storageBuffer
 
 #___________________________________________________________________________________________________ GS: hasError
@@ -103,6 +163,27 @@ class Logger(object):
     def hasError(self):
         return self._hasError
 
+#___________________________________________________________________________________________________ GS: isAsync
+    @property
+    def isAsync(self):
+        return self._asyncWriter is not None
+
+#___________________________________________________________________________________________________ GS: droppedCount
+    @property
+    def droppedCount(self):
+        """ The number of log messages discarded by the asynchronous writer's backpressure
+            policy. Always zero for synchronous loggers. """
+        return self._asyncWriter.droppedCount if self._asyncWriter else 0
+
+#___________________________________________________________________________________________________ GS: level
+    @property
+    def level(self):
+        """ The threshold LogLevelEnum level below which messages are discarded. """
+        return self._level
+    @level.setter
+    def level(self, value):
+        self._level = LogLevelEnum.fromName(value, LogLevelEnum.DEBUG)
+
 #___________________________________________________________________________________________________ GS: trace
     @property
     def trace(self):
@@ -116,6 +197,7 @@ class Logger(object):
 
 #___________________________________________________________________________________________________ resetLogFile
     def resetLogFile(self):
+        self._closeAppendFile()
         if self._logFile and os.path.exists(self._logFile):
             try:
                 os.remove(StringUtils.toUnicode(self._logFile))
@@ -152,7 +234,7 @@ class Logger(object):
 
 #___________________________________________________________________________________________________ getLog
     def getLog(self):
-        return ''.join(self._buffer)
+        return '\n'.join([self.logMessageToString(logMessage=m) for m in self._buffer])
 
 #___________________________________________________________________________________________________ getLogFolder
     def getLogFolder(self):
@@ -166,14 +248,13 @@ class Logger(object):
 
 #___________________________________________________________________________________________________ getPrefix
     def getPrefix(self, *args, **kwargs):
-        if self._locationPrefix:
-            item = self.getStackData()[-1]
-            loc  = ' -> %s #%s]' % (item['file'], StringUtils.toUnicode(item['line']))
-        else:
-            loc = ']'
+        location = self.getLocation() if self._locationPrefix else None
+        return self.formatPrefix(self.getTime(self.timezone), location)
 
-        return StringUtils.toUnicode(
-            self.getTime(self.timezone).strftime('[%a %H:%M <%S.%f>') + loc)
+#___________________________________________________________________________________________________ isEnabledFor
+    def isEnabledFor(self, level):
+        """ Whether or not messages of the specified LogLevelEnum level pass the threshold. """
+        return level >= self._level
 
 #___________________________________________________________________________________________________ clear
     def clear(self, storage =False):
@@ -181,7 +262,19 @@ class Logger(object):
         self._buffer    = []
         self._hasError  = False
         if storage and self._storageBuffer is not None:
-            self._storageBuffer = []
+            self._storageBuffer = self._createStorageBuffer()
+
+#___________________________________________________________________________________________________ getStorageSnapshot
+    def getStorageSnapshot(self, count =None):
+        """ Returns a list of the most recent count stored log messages, or all of them if
+            count is None, ordered oldest first. """
+        if self._storageBuffer is None:
+            return []
+        if isinstance(self._storageBuffer, LogRingBuffer):
+            return self._storageBuffer.snapshot(count)
+        if count is None:
+            return list(self._storageBuffer)
+        return self._storageBuffer[-count:] if count > 0 else []
 
 #___________________________________________________________________________________________________ clearLogFile
     def clearLogFile(self):
@@ -190,29 +283,69 @@ class Logger(object):
 
 #___________________________________________________________________________________________________ add
     def add(self, s, traceStack =False, shaveStackTrace =0, htmlEscape =None, **kwargs):
-        """Prints s to standard output and a log file."""
+        """ Prints s to standard output and a log file. A level keyword argument discards the
+            message, returning None, when it is below the logger's threshold level. """
+
+        level = kwargs.get('level', None)
+        if level is not None and level < self._level:
+            return None
 
         out = self.createLogMessage(
             logValue=s,
             traceStack=traceStack,
             shaveStackTrace=shaveStackTrace,
             htmlEscape=self._htmlEscape if htmlEscape is None else htmlEscape,
-            prefix=self.getPrefix() if not self.headerless else None, **kwargs)
-
-        if self._traceLogs:
-            self.traceLogMessage(out, self._printCallbacks, self)
+            prefix=self.getPrefix() if not self.headerless else None,
+            time=time.time(), **kwargs)
 
-        self._buffer.append(out)
-        if self._storageBuffer is not None:
-            self._storageBuffer.append(out)
+        self._addLogMessage(out)
         return out['log']
 
+#___________________________________________________________________________________________________ log
+    def log(self, level, s, *args, **kwargs):
+        """ Adds a message at the specified LogLevelEnum level. Messages below the threshold
+            level are discarded before any work is done. Otherwise s may be a %-style format
+            string for the positional arguments or a callable returning the message. In either
+            case the formatting is deferred until the message is serialized, which happens on
+            the writer thread in asynchronous mode. """
+
+        if level < self._level:
+            return
+        self._addDeferred(level, s, args, kwargs)
+
+#___________________________________________________________________________________________________ debug
+    def debug(self, s, *args, **kwargs):
+        if self._level > LogLevelEnum.DEBUG:
+            return
+        self._addDeferred(LogLevelEnum.DEBUG, s, args, kwargs)
+
+#___________________________________________________________________________________________________ info
+    def info(self, s, *args, **kwargs):
+        if self._level > LogLevelEnum.INFO:
+            return
+        self._addDeferred(LogLevelEnum.INFO, s, args, kwargs)
+
+#___________________________________________________________________________________________________ warn
+    def warn(self, s, *args, **kwargs):
+        if self._level > LogLevelEnum.WARN:
+            return
+        self._addDeferred(LogLevelEnum.WARN, s, args, kwargs)
+
+#___________________________________________________________________________________________________ error
+    def error(self, s, *args, **kwargs):
+        if self._level > LogLevelEnum.ERROR:
+            return
+        self._hasError = True
+        ArgsUtils.addIfMissing('traceStack', True, kwargs)
+        self._addDeferred(LogLevelEnum.ERROR, s, args, kwargs)
+
 #___________________________________________________________________________________________________ echo
     def echo(self, s, traceStack =False, shaveStackTrace =0, htmlEscape =None, **kwargs):
         out = self.createLogMessage(
             s, traceStack, shaveStackTrace,
             self._htmlEscape if htmlEscape is None else htmlEscape,
-            prefix=self.getPrefix() if not self.headerless else None, **kwargs)
+            prefix=self.getPrefix() if not self.headerless else None,
+            time=time.time(), **kwargs)
 
         if self._traceLogs:
             self.traceLogMessage(out, self._printCallbacks, self)
@@ -227,6 +360,7 @@ class Logger(object):
     def addError(self, s, err, htmlEscape =False, **kwargs):
         self._hasError = True
         ArgsUtils.addIfMissing('traceStack', True, kwargs)
+        ArgsUtils.addIfMissing('level', LogLevelEnum.ERROR, kwargs)
         return self.add(self.createErrorMessage(s, err), htmlEscape=htmlEscape, **kwargs)
 
 #___________________________________________________________________________________________________ write
@@ -244,45 +378,35 @@ class Logger(object):
 
 #___________________________________________________________________________________________________ flush
     def flush(self, **kwargs):
-        if not self._buffer:
-            return
-
-        items = []
-        for logItem in self._buffer:
-            item = self.logMessageToString(logMessage=logItem) + '\n'
-            item = StringUtils.toStr2(item)
-            items.append(item)
-
-        for cb in self._writeCallbacks:
-            try:
-                cb(self, items)
-            except Exception:
-                pass
+        """ Writes the buffered log entries to the log file. In asynchronous mode the entries
+            have already been queued for the writer thread, so the buffer is only cleared unless
+            the wait keyword argument is True, which also blocks until the queue is drained. """
 
-        if not self._logPath:
+        if self._asyncWriter:
+            if kwargs.get('wait', False):
+                self._asyncWriter.drain(kwargs.get('timeout', None))
             self.clear()
             return
 
-        elif self._logFile:
-            try:
-                out = StringUtils.toStr2('\n').join(items)
-                exists = os.path.exists(self._logFile)
-                with FileLock(self._logFile, 'a') as lock:
-                    lock.file.write(out)
-                    lock.release()
-
-                try:
-                    if not exists and not OsUtils.isWindows():
-                        os.system('chmod 775 %s' % self._logFile)
-                except Exception:
-                    pass
-
-            except Exception as err:
-                print("LOGGER ERROR: Unable to write log file.")
-                print(err)
+        if not self._buffer:
+            return
 
+        self._writeLogItems(self._buffer)
         self.clear()
 
+#___________________________________________________________________________________________________ close
+    def close(self, timeout =None):
+        """ Flushes the buffer and, in asynchronous mode, drains and stops the writer thread.
+            Further log entries are written synchronously. """
+        writer = self._asyncWriter
+        if writer:
+            self._asyncWriter = None
+            writer.close(timeout)
+            self.clear()
+        else:
+            self.flush()
+        self._closeAppendFile()
+
 #___________________________________________________________________________________________________ createLogName
     @classmethod
     def createLogName(cls, name):
@@ -305,11 +429,18 @@ class Logger(object):
     @classmethod
     def getFormattedStackTrace(cls, skipStackLevels =0, maxLevels =0, stackSource =None):
         """ Get the exception stack trace if it exists, otherwise extract the generic stack trace
-            instead. """
+            instead. When no stackSource is specified the stack capture stops as soon as the
+            skipped and maximum number of levels have been walked. """
+
+        if stackSource is None:
+            stack = Logger.getStackData(Logger.captureStack(skipStackLevels, maxLevels))
+            start = 0
+            stop  = len(stack)
+        else:
+            stack = Logger.getStackData(stackSource)
+            stop  = len(stack) - skipStackLevels
+            start = max(0, stop - maxLevels) if maxLevels > 0 else 0
 
-        stack = Logger.getStackData(stackSource)
-        stop  = len(stack) - skipStackLevels
-        start = max(0, stop - maxLevels) if maxLevels > 0 else 0
         s     = ''
         index = start
         for item in stack[start:stop]:
@@ -326,14 +457,39 @@ class Logger(object):
 
         return s
 
+#___________________________________________________________________________________________________ getLocation
+    @staticmethod
+    def getLocation():
+        """ Returns the stack data item for the innermost frame outside of the Logger. """
+        stack = Logger.getStackData(Logger.captureStack(maxLevels=1))
+        return stack[-1] if stack else dict(
+            path='', internal=True, dir='', file='', line=0, function='', code='')
+
 #___________________________________________________________________________________________________ getStackData
     @staticmethod
     def getStackData(stackSource =None):
+        """ Converts a raw stack into a list of stack data dictionaries. The stackSource can
+            either be a traceback-style list of (path, line, function, code) items or a list
+            of (code object, line) pairs created by captureStack, in which case the file and
+            source line lookups are cached per code object. """
+
         res = []
         if not stackSource:
-            stackSource = Logger.getRawStack()
+            stackSource = Logger.captureStack()
 
         for item in stackSource:
+            if hasattr(item[0], 'co_filename'):
+                info = Logger._getCodeInfo(item[0])
+                res.append(dict(
+                    path=info['path'],
+                    internal=True,
+                    dir=info['dir'],
+                    file=info['file'],
+                    line=item[1],
+                    function=info['function'],
+                    code=Logger._getSourceLine(info, item[1]) ))
+                continue
+
             path = StringUtils.toUnicode(item[0])
             res.append(dict(
                 path=path,
@@ -346,7 +502,46 @@ class Logger(object):
 
         return res
 
-#___________________________________________________________________________________________________ getFormattedStackTrace
+#___________________________________________________________________________________________________ captureStack
+    @staticmethod
+    def captureStack(skipStackLevels =0, maxLevels =0):
+        """ Captures the exception stack if it exists, otherwise the current stack, as a list of
+            (code object, line) pairs ordered from the outermost frame inward. Frames within the
+            Logger are excluded. The walk starts at the innermost frame and stops once the
+            skipped levels and maxLevels have been collected. """
+
+        isLogger = Logger._isLoggerCode
+        exceptStack = sys.exc_info()[2]
+        if exceptStack is not None:
+            # Traceback chains link from the outermost frame inward
+            stack = []
+            while exceptStack is not None:
+                code = exceptStack.tb_frame.f_code
+                if not isLogger(code):
+                    stack.append((code, exceptStack.tb_lineno))
+                exceptStack = exceptStack.tb_next
+
+            stop = len(stack) - skipStackLevels
+            start = max(0, stop - maxLevels) if maxLevels > 0 else 0
+            return stack[start:max(0, stop)]
+
+        stack = []
+        frame = sys._getframe(1)
+        while frame is not None:
+            code = frame.f_code
+            if not isLogger(code):
+                if skipStackLevels > 0:
+                    skipStackLevels -= 1
+                else:
+                    stack.append((code, frame.f_lineno))
+                    if maxLevels and len(stack) >= maxLevels:
+                        break
+            frame = frame.f_back
+
+        stack.reverse()
+        return stack
+
+#___________________________________________________________________________________________________ getRawStack
     @staticmethod
     def getRawStack():
         exceptStack = sys.exc_info()[2]
@@ -357,7 +552,7 @@ class Logger(object):
 
         stack    = []
         for item in rawStack:
-            if item[0].find('Logger') != -1:
+            if Logger._isLoggerPath(item[0]):
                 continue
             stack.append(item)
 
@@ -489,9 +684,21 @@ class Logger(object):
     def createLogMessage(
             cls, logValue, traceStack, shaveStackTrace, htmlEscape, prefix =None, **kwargs
     ):
-        """ Formats log message data into a string for output """
+        """ Formats log message data into a string for output. The logValue may be a callable
+            returning the value to log and the args keyword argument holds %-style format
+            arguments for it. """
         doIndent = kwargs.get('indent', True)
 
+        if callable(logValue):
+            logValue = logValue()
+
+        args = kwargs.get('args', None)
+        if args:
+            try:
+                logValue = logValue % args
+            except Exception:
+                logValue = '%s %s' % (logValue, ' '.join([StringUtils.toUnicode(a) for a in args]))
+
         if doIndent:
             logValue = cls.formatAsString(logValue)
         elif isinstance(logValue, (list, tuple)):
@@ -507,7 +714,13 @@ class Logger(object):
         if not StringUtils.isStringType(logValue):
             logValue = 'FAILED TO LOG RESPONSE'
 
-        out = {'log':logValue}
+        out = {'log':logValue, 'time':kwargs.get('time') or time.time()}
+
+        level = kwargs.get('level', None)
+        if level is not None:
+            out['level'] = level
+            if level >= LogLevelEnum.ERROR:
+                out['error'] = True
 
         if prefix:
             logPrefix = StringUtils.strToUnicode(prefix)
@@ -517,13 +730,26 @@ class Logger(object):
 
         if traceStack:
             logStack = StringUtils.strToUnicode(
-                'Stack Trace:\n' + cls.getFormattedStackTrace(shaveStackTrace))
+                'Stack Trace:\n' + cls.getFormattedStackTrace(
+                    shaveStackTrace, stackSource=kwargs.get('stackSource', None)))
             if not StringUtils.isStringType(logStack):
                 logStack = 'FAILED TO CREATE STACK'
             out['stack'] = logStack
 
         return out
 
+#___________________________________________________________________________________________________ formatPrefix
+    @classmethod
+    def formatPrefix(cls, time, location =None):
+        """ Creates the log entry prefix for the specified time and optional stack data item of
+            the logging location. """
+        if location:
+            loc = ' -> %s #%s]' % (location['file'], StringUtils.toUnicode(location['line']))
+        else:
+            loc = ']'
+
+        return StringUtils.toUnicode(time.strftime('[%a %H:%M <%S.%f>') + loc)
+
 #___________________________________________________________________________________________________ getTime
     @classmethod
     def getTime(cls, timezone =None):
@@ -571,6 +797,203 @@ class Logger(object):
 
         return ''.join(out)
 
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _createStorageBuffer
+    def _createStorageBuffer(self):
+        if not self._storageCapacity and not self._storageMaxBytes:
+            return []
+        return LogRingBuffer(
+            capacity=self._storageCapacity if self._storageCapacity else 1000,
+            maxBytes=self._storageMaxBytes)
+
+#___________________________________________________________________________________________________ _addLogMessage
+    def _addLogMessage(self, logMessage):
+        if self._traceLogs:
+            self.traceLogMessage(logMessage, self._printCallbacks, self)
+
+        self._buffer.append(logMessage)
+        if self._storageBuffer is not None:
+            self._storageBuffer.append(logMessage)
+        if self._asyncWriter:
+            self._asyncWriter.enqueue(logMessage)
+
+#___________________________________________________________________________________________________ _addDeferred
+    def _addDeferred(self, level, s, args, kwargs):
+        """ Captures the time, location and stack of a log call, which cannot be recovered
+            later, and defers the remaining formatting to a LogMessage. """
+
+        htmlEscape = kwargs.pop('htmlEscape', None)
+        traceStack = kwargs.pop('traceStack', False)
+        shaveStackTrace = kwargs.pop('shaveStackTrace', 0)
+
+        logTime = time.time()
+        prefixTime = None if self.headerless else self.getTime(self.timezone)
+        location = self.getLocation() if self._locationPrefix and prefixTime else None
+        stackSource = self.captureStack(shaveStackTrace) if traceStack else None
+
+        def formatter():
+            return self.createLogMessage(
+                logValue=s,
+                traceStack=traceStack,
+                shaveStackTrace=0,
+                htmlEscape=self._htmlEscape if htmlEscape is None else htmlEscape,
+                prefix=self.formatPrefix(prefixTime, location) if prefixTime else None,
+                args=args,
+                stackSource=stackSource,
+                time=logTime,
+                **kwargs)
+
+        self._addLogMessage(LogMessage(formatter, level=level))
+
+#___________________________________________________________________________________________________ _writeLogItems
+    def _writeLogItems(self, logItems):
+        """ Serializes the log message dictionaries and appends them to the log file, either as
+            text or as structured records depending on the logFormat. Called on the writer thread
+            in asynchronous mode. """
+
+        isText = self.logFormat == LogRecordFormatEnum.TEXT
+
+        items = []
+        if isText or self._writeCallbacks:
+            for logItem in logItems:
+                item = self.logMessageToString(logMessage=logItem) + '\n'
+                item = StringUtils.toStr2(item)
+                items.append(item)
+
+        for cb in self._writeCallbacks:
+            try:
+                cb(self, items)
+            except Exception:
+                pass
+
+        if not self._logPath or not self._logFile:
+            return
+
+        try:
+            if isText:
+                out = StringUtils.toStr2('\n').join(items)
+            else:
+                out = LogRecordCodec.encodeAll(logItems, self.logFormat)
+
+            if self._rotator and self._rotator.check(len(out)) and self._appendFile:
+                self._appendFile.checkRotation(force=True)
+
+            if self._persistentFile:
+                self._getAppendFile().write(out)
+                return
+
+            exists = os.path.exists(self._logFile)
+            with FileLock(self._logFile, 'a' if isText else 'ab') as lock:
+                lock.file.write(out)
+                lock.release()
+
+            try:
+                if not exists and not OsUtils.isWindows():
+                    os.system('chmod 775 %s' % self._logFile)
+            except Exception:
+                pass
+
+        except Exception as err:
+            print("LOGGER ERROR: Unable to write log file.")
+            print(err)
+
+#___________________________________________________________________________________________________ _syncLogFile
+    def _syncLogFile(self):
+        """ Commits the log file contents to disk. """
+        if self._appendFile:
+            self._appendFile.sync()
+            return
+
+        if not self._logFile or not os.path.exists(self._logFile):
+            return
+
+        fd = os.open(self._logFile, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+#___________________________________________________________________________________________________ _getAppendFile
+    def _getAppendFile(self):
+        """ Returns the persistent append handle for the current log file, opening it and
+            setting the file permissions on first use. """
+        if self._appendFile and self._appendFile.path == self._logFile:
+            return self._appendFile
+
+        self._closeAppendFile()
+        exists = os.path.exists(self._logFile)
+        self._appendFile = AppendFile(self._logFile, useFlock=self._useFlock, mode=0o775)
+        self._appendFile.open()
+
+        try:
+            if not exists and not OsUtils.isWindows():
+                os.chmod(self._logFile, 0o775)
+        except Exception:
+            pass
+
+        return self._appendFile
+
+#___________________________________________________________________________________________________ _closeAppendFile
+    def _closeAppendFile(self):
+        appendFile = getattr(self, '_appendFile', None)
+        if appendFile:
+            self._appendFile = None
+            appendFile.close()
+
+#___________________________________________________________________________________________________ _isLoggerCode
+    @staticmethod
+    def _isLoggerCode(code):
+        return Logger._getCodeInfo(code)['isLogger']
+
+#___________________________________________________________________________________________________ _isLoggerPath
+    @staticmethod
+    def _isLoggerPath(path):
+        return os.path.basename(path).startswith('Logger.')
+
+#___________________________________________________________________________________________________ _getCodeInfo
+    @staticmethod
+    def _getCodeInfo(code):
+        """ Returns the cached file information for the code object, creating it if needed.
+            The least recently used entries are discarded once the cache is full. """
+        # Equal code objects compiled from different files compare equal, so entries are keyed
+        # by identity and hold their code object to keep the identity from being reused
+        cache = Logger._CODE_INFO_CACHE
+        key   = id(code)
+        entry = cache.pop(key, None)
+        if entry is not None and entry[0] is code:
+            cache[key] = entry
+            return entry[1]
+
+        path = StringUtils.toUnicode(code.co_filename)
+        info = dict(
+            path=path,
+            dir=StringUtils.toUnicode(os.path.dirname(path)),
+            file=StringUtils.toUnicode(os.path.basename(path).replace('.py','')),
+            function=StringUtils.toUnicode(code.co_name),
+            isLogger=Logger._isLoggerPath(path),
+            lines=dict() )
+        cache[key] = (code, info)
+
+        # Entries may be discarded concurrently by other logging threads
+        while len(cache) > Logger._CODE_INFO_CACHE_SIZE:
+            try:
+                cache.popitem(last=False)
+            except KeyError:
+                break
+        return info
+
+#___________________________________________________________________________________________________ _getSourceLine
+    @staticmethod
+    def _getSourceLine(info, line):
+        lines = info['lines']
+        code  = lines.get(line)
+        if code is None:
+            code = StringUtils.toUnicode(linecache.getline(info['path'], line).strip())
+            lines[line] = code
+        return code
+
 #===================================================================================================
 #                                                                               I N T R I N S I C
 
@@ -597,7 +1020,9 @@ class Logger(object):
 
 #___________________________________________________________________________________________________ __del__
     def __del__(self):
-        """ Attempt to flush the buffer if not empty as part of the deletion process."""
+        """ Attempt to flush the buffer if not empty as part of the deletion process. Loggers
+            in asynchronous mode are drained by the AsyncLogWriter at interpreter shutdown
+            instead. """
         try:
             self.flush()
         except Exception:
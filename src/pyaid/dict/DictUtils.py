@@ -50,7 +50,7 @@ class DictUtils(object):
         elif not a and not b:
             return dict()
 
-        keys = tuple(set(a.keys() + b.keys()))
+        keys = tuple(set(a.keys()) | set(b.keys()))
         out  = dict()
         for k in keys:
             out[k] = cls._mergeValues(a.get(k), b.get(k))
@@ -0,0 +1,185 @@
+# AppendFile.py
+# (C)2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    from select import PIPE_BUF
+except ImportError:
+    PIPE_BUF = 512
+
+from pyaid.string.StringUtils import StringUtils
+
+#*************************************************************************************************** AppendFile
+class AppendFile(object):
+    """ A persistent O_APPEND file descriptor for multi-process log appends. Writes no larger
+        than PIPE_BUF are issued as a single write call, which the kernel appends atomically.
+        Larger writes are serialized across processes with an exclusive flock when fcntl is
+        available. The file is reopened when it is removed or replaced by an external log
+        rotation, which is detected by comparing device and inode numbers. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    ATOMIC_WRITE_SIZE = PIPE_BUF
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, path, useFlock =True, rotationCheckInterval =1.0, mode =0o664):
+        """Creates a new instance of AppendFile."""
+        self._path                  = path
+        self._useFlock              = bool(useFlock) and fcntl is not None
+        self._rotationCheckInterval = rotationCheckInterval
+        self._mode                  = mode
+        self._fd                    = None
+        self._identity              = None
+        self._lastCheck             = 0.0
+        self._lock                  = threading.RLock()
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: path
+    @property
+    def path(self):
+        return self._path
+
+#___________________________________________________________________________________________________ GS: isOpen
+    @property
+    def isOpen(self):
+        return self._fd is not None
+
+#___________________________________________________________________________________________________ GS: fileno
+    @property
+    def fileno(self):
+        return self._fd
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ open
+    def open(self):
+        """ Opens the file descriptor if it is not already open. """
+        with self._lock:
+            if self._fd is not None:
+                return
+
+            self._fd = os.open(self._path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, self._mode)
+            stat = os.fstat(self._fd)
+            self._identity  = (stat.st_dev, stat.st_ino)
+            self._lastCheck = time.time()
+
+#___________________________________________________________________________________________________ close
+    def close(self):
+        with self._lock:
+            if self._fd is None:
+                return
+
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+            self._fd       = None
+            self._identity = None
+
+#___________________________________________________________________________________________________ reopen
+    def reopen(self):
+        with self._lock:
+            self.close()
+            self.open()
+
+#___________________________________________________________________________________________________ checkRotation
+    def checkRotation(self, force =False):
+        """ Reopens the file if the path no longer refers to the open file. Unless forced, the
+            check is skipped when it last ran less than rotationCheckInterval seconds ago.
+            Returns True if the file was reopened. """
+
+        with self._lock:
+            if self._fd is None:
+                return False
+
+            now = time.time()
+            if not force and now - self._lastCheck < self._rotationCheckInterval:
+                return False
+            self._lastCheck = now
+
+            try:
+                stat = os.stat(self._path)
+                identity = (stat.st_dev, stat.st_ino)
+            except OSError:
+                identity = None
+
+            if identity == self._identity:
+                return False
+
+            self.reopen()
+            return True
+
+#___________________________________________________________________________________________________ write
+    def write(self, data):
+        """ Appends the data to the file, opening it first if necessary. """
+        data = StringUtils.toBytes(data)
+        if not data:
+            return 0
+
+        with self._lock:
+            if self._fd is None:
+                self.open()
+            else:
+                self.checkRotation()
+
+            if len(data) <= self.ATOMIC_WRITE_SIZE or not self._useFlock:
+                return self._writeAll(data)
+
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                return self._writeAll(data)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+#___________________________________________________________________________________________________ sync
+    def sync(self):
+        """ Commits the written data to disk. """
+        with self._lock:
+            if self._fd is not None:
+                os.fsync(self._fd)
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _writeAll
+    def _writeAll(self, data):
+        view  = memoryview(data)
+        total = len(data)
+        index = 0
+        while index < total:
+            index += os.write(self._fd, view[index:])
+        return total
+
+#===================================================================================================
+#                                                                               I N T R I N S I C
+
+#___________________________________________________________________________________________________ __enter__
+    def __enter__(self):
+        self.open()
+        return self
+
+#___________________________________________________________________________________________________ __exit__
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+#___________________________________________________________________________________________________ __del__
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
@@ -5,30 +5,78 @@
 from __future__ import print_function, absolute_import, unicode_literals, division
 
 import os
+import json
 import time
 import errno
+import socket
+import threading
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from pyaid.OsUtils import OsUtils
+from pyaid.file.FileLockBackendEnum import FileLockBackendEnum
 from pyaid.number.IntUtils import IntUtils
 
 #___________________________________________________________________________________________________ FileLock
 class FileLock(object):
-    """A FIFO lock file implementation for atomic multi-threaded file IO."""
+    """ A FIFO lock file implementation for atomic multi-threaded file IO. The lock is held
+        either through a polled lock file or through a kernel flock, depending on the
+        FileLockBackendEnum backend. """
 
 #===================================================================================================
 #                                                                                       C L A S S
 
+    DEFAULT_BACKEND = FileLockBackendEnum.LOCKFILE
+
+    # Seconds an empty lock file, whose owner has not yet written its metadata, is given before
+    # it is considered abandoned
+    METADATA_GRACE = 5.0
+
+    _HOSTNAME        = socket.gethostname()
+    _STATISTICS      = None
+    _STATISTICS_LOCK = threading.Lock()
+
 #___________________________________________________________________________________________________ __init__
-    def __init__(self, fileName, ioMode ='a', timeout =10, delay =None):
+    def __init__(
+            self, fileName, ioMode ='a', timeout =10, delay =None, backend =None, shared =False,
+            maxHoldTime =None
+    ):
         """ Prepare the file locker. Specify the file to lock and optionally the maximum timeout
-        and the _delay between each attempt to lock."""
+        and the _delay between each attempt to lock. A timeout of None waits indefinitely.
+
+        The kernel backend blocks in the kernel until the lock is available instead of polling,
+        and supports shared locks for readers. The lockfile backend, which is the default, is
+        kept for network filesystems where flock is unreliable and always locks exclusively.
+        An ioMode of None acquires the lock without opening the file.
+
+        Lock files of the lockfile backend record the owner's PID, hostname and acquisition
+        time. Acquirers break lock files whose owner process on this host no longer exists or,
+        if a maxHoldTime is specified, which have been held longer than that many seconds."""
+
+        if backend is None:
+            backend = self.DEFAULT_BACKEND
+        if backend == FileLockBackendEnum.KERNEL and fcntl is None:
+            backend = FileLockBackendEnum.LOCKFILE
+
         self._isLocked      = False
-        self._lockFileName  = fileName + '.lock'
+        self._backend       = backend
+        self._shared        = bool(shared)
+        self._lockFileName  = fileName + (
+            '.flock' if backend == FileLockBackendEnum.KERNEL else '.lock')
         self._fileName      = fileName
         self._timeout       = timeout
-        self._delay         = float(IntUtils.jitter(50, 0.1))
+        self._delay         = float(delay) if delay else IntUtils.jitter(50, 0.1)/1000.0
         self._ioMode        = ioMode
         self._lockFile      = None
         self._file          = None
+        self._maxHoldTime   = maxHoldTime
+        self._waitTime      = 0.0
+        self._holdTime      = 0.0
+        self._acquiredAt    = None
+        self._owner         = None
 
 #===================================================================================================
 #                                                                                   G E T / S E T
@@ -48,7 +96,31 @@ class FileLock(object):
     def fileName(self):
         return self._fileName
 
-#___________________________________________________________________________________________________ GS: fileName
+#___________________________________________________________________________________________________ GS: backend
+    @property
+    def backend(self):
+        return self._backend
+
+#___________________________________________________________________________________________________ GS: shared
+    @property
+    def shared(self):
+        return self._shared
+
+#___________________________________________________________________________________________________ GS: waitTime
+    @property
+    def waitTime(self):
+        """ Seconds spent waiting for the most recent acquisition. """
+        return self._waitTime
+
+#___________________________________________________________________________________________________ GS: holdTime
+    @property
+    def holdTime(self):
+        """ Seconds the lock has been held, or was held during the most recent acquisition. """
+        if self._acquiredAt is not None:
+            return time.time() - self._acquiredAt
+        return self._holdTime
+
+#___________________________________________________________________________________________________ GS: file
     @property
     def file(self):
         return self._file
@@ -63,23 +135,19 @@ class FileLock(object):
             seconds, in which case it throws an exception.
         """
         start = time.time()
-        while True:
-            try:
-                self._lockFile = os.open(self._lockFileName, os.O_CREAT|os.O_EXCL|os.O_RDWR)
-                try:
-                    self._file = open(self._fileName, self._ioMode)
-                except Exception:
-                    continue
-                break
+        try:
+            if self._backend == FileLockBackendEnum.KERNEL:
+                self._acquireKernelLock()
+            else:
+                self._acquireLockFile(start)
+        except FileLockException:
+            self._recordStatistics(wait=time.time() - start, timedOut=True)
+            raise
 
-            except OSError as e:
-                if e.errno != errno.EEXIST:
-                    raise
-                if (time.time() - start) >= self._timeout:
-                    raise FileLockException('Lock acquisition exceeded specified timeout.')
-                time.sleep(self._delay)
-
-        self._isLocked = True
+        self._acquiredAt = time.time()
+        self._waitTime   = self._acquiredAt - start
+        self._isLocked   = True
+        self._recordStatistics(wait=self._waitTime)
 
 #___________________________________________________________________________________________________ release
     def release(self):
@@ -95,16 +163,301 @@ class FileLock(object):
                 except Exception:
                     pass
 
-            try:
-                os.close(self._lockFile)
-                os.unlink(self._lockFileName)
-            except Exception as err:
-                pass
+            if self._backend == FileLockBackendEnum.KERNEL:
+                # The lock file is never removed, since unlinking it would let another process
+                # lock a new file of the same name while this one is still held
+                try:
+                    fcntl.flock(self._lockFile, fcntl.LOCK_UN)
+                except Exception:
+                    pass
+                try:
+                    os.close(self._lockFile)
+                except Exception:
+                    pass
+            else:
+                # A lock file broken by another acquirer may since have been recreated by it,
+                # in which case it is not this lock's to remove
+                owner = self._readOwner(self._lockFileName)[0]
+                try:
+                    os.close(self._lockFile)
+                    if owner is None or owner == self._owner:
+                        os.unlink(self._lockFileName)
+                except Exception as err:
+                    pass
+                self._owner = None
+            self._lockFile = None
             self._isLocked = False
 
+            if self._acquiredAt is not None:
+                self._holdTime   = time.time() - self._acquiredAt
+                self._acquiredAt = None
+                self._recordStatistics(hold=self._holdTime)
+
+#___________________________________________________________________________________________________ getOwner
+    def getOwner(self):
+        """ Returns the owner metadata dictionary of the current lock file, with pid, host and
+            time keys, or None if the lock file does not exist or has no metadata. """
+        return self._readOwner(self._lockFileName)[0]
+
+#___________________________________________________________________________________________________ getStatistics
+    @classmethod
+    def getStatistics(cls):
+        """ Returns a dictionary of the wait and hold time statistics accumulated by every
+            FileLock in this process. """
+        with cls._STATISTICS_LOCK:
+            if cls._STATISTICS is None:
+                cls._STATISTICS = cls._createStatistics()
+            out = dict(cls._STATISTICS)
+
+        out['meanWaitTime'] = out['totalWaitTime']/max(1, out['acquisitions'] + out['timeouts'])
+        out['meanHoldTime'] = out['totalHoldTime']/max(1, out['releases'])
+        return out
+
+#___________________________________________________________________________________________________ resetStatistics
+    @classmethod
+    def resetStatistics(cls):
+        with cls._STATISTICS_LOCK:
+            cls._STATISTICS = cls._createStatistics()
+
 #===================================================================================================
 #                                                                               P R O T E C T E D
 
+#___________________________________________________________________________________________________ _acquireLockFile
+    def _acquireLockFile(self, start):
+        """ Creates the lock file exclusively, polling until the timeout expires and breaking
+            the lock file whenever its owner is found to be stale. """
+
+        while True:
+            try:
+                self._lockFile = os.open(self._lockFileName, os.O_CREAT|os.O_EXCL|os.O_RDWR)
+            except OSError as e:
+                if e.errno != errno.EEXIST:
+                    raise
+                if self._breakStaleLock():
+                    continue
+                if self._timeout is not None and (time.time() - start) >= self._timeout:
+                    raise FileLockException('Lock acquisition exceeded specified timeout.')
+                time.sleep(self._delay)
+                continue
+
+            self._writeOwner()
+            try:
+                self._file = open(self._fileName, self._ioMode) if self._ioMode else None
+            except Exception:
+                self._removeLockFile()
+                raise
+            return
+
+#___________________________________________________________________________________________________ _writeOwner
+    def _writeOwner(self):
+        self._owner = dict(pid=os.getpid(), host=self._HOSTNAME, time=time.time())
+        try:
+            os.write(self._lockFile, json.dumps(self._owner).encode('utf-8'))
+        except Exception:
+            pass
+
+#___________________________________________________________________________________________________ _removeLockFile
+    def _removeLockFile(self):
+        try:
+            os.close(self._lockFile)
+            os.unlink(self._lockFileName)
+        except Exception:
+            pass
+        self._lockFile = None
+
+#___________________________________________________________________________________________________ _isStale
+    def _isStale(self, owner, modified):
+        """ Whether or not the lock file with the owner metadata and modification time has been
+            abandoned by its owner. """
+        now = time.time()
+        if owner is None:
+            if modified is None:
+                return False
+            limit = self.METADATA_GRACE
+            if self._maxHoldTime is not None:
+                limit = max(limit, self._maxHoldTime)
+            return now - modified > limit
+
+        if self._maxHoldTime is not None and now - owner.get('time', now) > self._maxHoldTime:
+            return True
+
+        if owner.get('host') != self._HOSTNAME:
+            return False
+        return not self._isProcessAlive(owner.get('pid'))
+
+#___________________________________________________________________________________________________ _breakStaleLock
+    def _breakStaleLock(self):
+        """ Removes the lock file if it is stale. The check is repeated while holding a separate
+            break lock so that two acquirers cannot both judge the same lock file stale and then
+            remove a fresh lock file created by one of them. Returns True if a lock was broken. """
+
+        owner, modified = self._readOwner(self._lockFileName)
+        if not self._isStale(owner, modified):
+            return False
+
+        breakName = self._lockFileName + '.break'
+        try:
+            fd = os.open(breakName, os.O_CREAT|os.O_EXCL|os.O_RDWR)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                return False
+            # A break lock is held only for a moment, so an old one was left by a crash
+            try:
+                if time.time() - os.path.getmtime(breakName) > self.METADATA_GRACE:
+                    os.unlink(breakName)
+            except OSError:
+                pass
+            return False
+
+        try:
+            recheck, modified = self._readOwner(self._lockFileName)
+            if recheck != owner or not self._isStale(recheck, modified):
+                return False
+            os.unlink(self._lockFileName)
+            self._recordStatistics(broken=True)
+            return True
+        except OSError:
+            return False
+        finally:
+            os.close(fd)
+            try:
+                os.unlink(breakName)
+            except OSError:
+                pass
+
+#___________________________________________________________________________________________________ _readOwner
+    @classmethod
+    def _readOwner(cls, path):
+        """ Returns a tuple of the owner metadata, or None if missing, and the modification time
+            of the lock file, or None if it does not exist. """
+        try:
+            modified = os.path.getmtime(path)
+            with open(path, 'rb') as f:
+                data = f.read()
+        except (IOError, OSError):
+            return None, None
+
+        try:
+            owner = json.loads(data.decode('utf-8')) if data else None
+        except Exception:
+            owner = None
+        return (owner if isinstance(owner, dict) else None), modified
+
+#___________________________________________________________________________________________________ _isProcessAlive
+    @classmethod
+    def _isProcessAlive(cls, pid):
+        if not pid or OsUtils.isWindows():
+            # Signalling a process on Windows terminates it, so its liveness cannot be tested
+            return True
+
+        try:
+            os.kill(int(pid), 0)
+        except OSError as err:
+            return err.errno == errno.EPERM
+        except Exception:
+            return True
+        return True
+
+#___________________________________________________________________________________________________ _createStatistics
+    @classmethod
+    def _createStatistics(cls):
+        return dict(
+            acquisitions=0, releases=0, timeouts=0, brokenLocks=0,
+            totalWaitTime=0.0, maxWaitTime=0.0, totalHoldTime=0.0, maxHoldTime=0.0)
+
+#___________________________________________________________________________________________________ _recordStatistics
+    @classmethod
+    def _recordStatistics(cls, wait =None, hold =None, timedOut =False, broken =False):
+        with cls._STATISTICS_LOCK:
+            stats = cls._STATISTICS
+            if stats is None:
+                stats = cls._STATISTICS = cls._createStatistics()
+
+            if broken:
+                stats['brokenLocks'] += 1
+            if wait is not None:
+                stats['timeouts' if timedOut else 'acquisitions'] += 1
+                stats['totalWaitTime'] += wait
+                stats['maxWaitTime'] = max(stats['maxWaitTime'], wait)
+            if hold is not None:
+                stats['releases'] += 1
+                stats['totalHoldTime'] += hold
+                stats['maxHoldTime'] = max(stats['maxHoldTime'], hold)
+
+#___________________________________________________________________________________________________ _acquireKernelLock
+    def _acquireKernelLock(self):
+        """ Acquires the flock, waiting in the kernel rather than polling. Opens the target file
+            once the lock is held. """
+
+        operation = fcntl.LOCK_SH if self._shared else fcntl.LOCK_EX
+        fd = os.open(self._lockFileName, os.O_RDWR | os.O_CREAT, 0o666)
+
+        try:
+            fcntl.flock(fd, operation | fcntl.LOCK_NB)
+        except (IOError, OSError) as err:
+            if err.errno not in (errno.EAGAIN, errno.EACCES, errno.EWOULDBLOCK):
+                os.close(fd)
+                raise
+
+            if self._timeout is None:
+                try:
+                    fcntl.flock(fd, operation)
+                except Exception:
+                    os.close(fd)
+                    raise
+            else:
+                self._waitForKernelLock(fd, operation)
+
+        try:
+            self._file = open(self._fileName, self._ioMode) if self._ioMode else None
+        except Exception:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+            raise
+
+        self._lockFile = fd
+
+#___________________________________________________________________________________________________ _waitForKernelLock
+    def _waitForKernelLock(self, fd, operation):
+        """ Waits up to the timeout for a blocking flock call made on a helper thread, because
+            flock itself cannot time out. If the timeout expires first, the helper is abandoned
+            and releases the lock and closes the descriptor as soon as it gets the lock. """
+
+        state = dict(acquired=False, abandoned=False, error=None)
+        stateLock = threading.Lock()
+        event = threading.Event()
+
+        def waiter():
+            try:
+                fcntl.flock(fd, operation)
+            except Exception as err:
+                state['error'] = err
+
+            with stateLock:
+                if state['abandoned']:
+                    if state['error'] is None:
+                        fcntl.flock(fd, fcntl.LOCK_UN)
+                    os.close(fd)
+                    return
+                state['acquired'] = state['error'] is None
+            event.set()
+
+        thread = threading.Thread(target=waiter, name='FileLockWaiter')
+        thread.daemon = True
+        thread.start()
+        event.wait(max(0.0, self._timeout))
+
+        with stateLock:
+            if state['acquired']:
+                return
+
+            if state['error'] is not None:
+                os.close(fd)
+                raise state['error']
+
+            state['abandoned'] = True
+        raise FileLockException('Lock acquisition exceeded specified timeout.')
+
 #___________________________________________________________________________________________________ __enter__
     def __enter__(self):
         """ Activated when used in the with statement. Should automatically acquire a lock to be
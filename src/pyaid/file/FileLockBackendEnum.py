@@ -0,0 +1,20 @@
+# FileLockBackendEnum.py
+# (C)2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+#___________________________________________________________________________________________________ FileLockBackendEnum
+class FileLockBackendEnum(object):
+    """ Locking mechanisms available to the FileLock. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    # An O_EXCL-created .lock file that is polled for. Works on network filesystems, but a lock
+    # file left behind by a crashed process blocks acquirers until it is removed.
+    LOCKFILE = 'lockfile'
+
+    # A kernel flock on a persistent .flock file with blocking waits and shared or exclusive
+    # modes. The kernel releases the lock when the owning process dies.
+    KERNEL = 'kernel'
@@ -0,0 +1,239 @@
+# FileWatcher.py
+# (C)2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import errno
+import os
+import select
+import struct
+import time
+
+try:
+    import ctypes
+    import ctypes.util
+    libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+    libc.inotify_init1
+    libc.inotify_add_watch
+except (ImportError, OSError, AttributeError):
+    libc = None
+
+from pyaid.file.FileWatcherBackendEnum import FileWatcherBackendEnum
+from pyaid.string.StringUtils import StringUtils
+
+#___________________________________________________________________________________________________ FileWatcher
+class FileWatcher(object):
+    """ Watches the files within a folder and its subfolders for changes, which are returned in
+        debounced sets of changed paths. Changes are detected by the inotify backend where it is
+        available and otherwise by polling the watched files, depending on the
+        FileWatcherBackendEnum backend. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    DEFAULT_BACKEND = FileWatcherBackendEnum.INOTIFY
+
+    _IN_MODIFY      = 0x00000002
+    _IN_CLOSE_WRITE = 0x00000008
+    _IN_MOVED_FROM  = 0x00000040
+    _IN_MOVED_TO    = 0x00000080
+    _IN_CREATE      = 0x00000100
+    _IN_DELETE      = 0x00000200
+    _IN_Q_OVERFLOW  = 0x00004000
+    _IN_IGNORED     = 0x00008000
+    _IN_ISDIR       = 0x40000000
+    _IN_CLOEXEC     = 0o2000000
+
+    _IN_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE \
+        | _IN_DELETE
+
+    _EVENT_HEADER = struct.Struct(str('iIII'))
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(
+            self, path, extensions =None, backend =None, debounce =0.25, pollInterval =0.5
+    ):
+        """ Starts watching the folder at the specified path. Only files with one of the
+            specified extensions are watched if extensions are specified. Each set of changes is
+            returned once no further changes have been detected for the debounce interval in
+            seconds. The polling backend scans the files every pollInterval seconds. """
+        if backend is None:
+            backend = self.DEFAULT_BACKEND
+
+        self._path         = os.path.abspath(path)
+        self._extensions   = None
+        self._backend      = backend
+        self._debounce     = debounce
+        self._pollInterval = pollInterval
+        self._changeTime   = None
+        self._fd           = None
+        self._folders      = dict()
+        self._snapshot     = None
+
+        if extensions:
+            self._extensions = tuple('.' + e.lstrip('.').lower() for e in extensions)
+
+        if backend == FileWatcherBackendEnum.INOTIFY:
+            self._fd = libc.inotify_init1(self._IN_CLOEXEC) if libc is not None else -1
+            if self._fd < 0:
+                self._fd      = None
+                self._backend = FileWatcherBackendEnum.POLLING
+            else:
+                self._addFolder(self._path)
+
+        if self._backend == FileWatcherBackendEnum.POLLING:
+            self._snapshot = self._scan()
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: path
+    @property
+    def path(self):
+        return self._path
+
+#___________________________________________________________________________________________________ GS: backend
+    @property
+    def backend(self):
+        """ The backend in use, which is the polling backend if inotify is unavailable. """
+        return self._backend
+
+#___________________________________________________________________________________________________ GS: changeTime
+    @property
+    def changeTime(self):
+        """ The time at which the first change of the most recent set of changes was detected. """
+        return self._changeTime
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ wait
+    def wait(self, timeout =None):
+        """ Waits for changes to the watched files and returns a sorted list of the paths that
+            were created, modified or removed, once the changes have stopped for the debounce
+            interval. Returns an empty list if no changes were detected within the timeout. """
+        deadline = None if timeout is None else time.time() + timeout
+        changes  = set()
+        while not changes:
+            remaining = None if deadline is None else deadline - time.time()
+            if remaining is not None and remaining <= 0:
+                return []
+            changes.update(self._read(remaining))
+
+        self._changeTime = time.time()
+        quietTime        = self._changeTime + self._debounce
+        while True:
+            remaining = quietTime - time.time()
+            if remaining <= 0:
+                return sorted(changes)
+
+            more = self._read(remaining)
+            if more:
+                changes.update(more)
+                quietTime = time.time() + self._debounce
+
+#___________________________________________________________________________________________________ close
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        self._folders = dict()
+
+#___________________________________________________________________________________________________ __enter__
+    def __enter__(self):
+        return self
+
+#___________________________________________________________________________________________________ __exit__
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _read
+    def _read(self, timeout):
+        """ Returns the set of watched paths that changed within the timeout, which may return
+            early and empty. """
+        if self._fd is None:
+            time.sleep(self._pollInterval if timeout is None else min(timeout, self._pollInterval))
+            snapshot       = self._scan()
+            previous       = self._snapshot
+            self._snapshot = snapshot
+            return set(
+                p for p in set(snapshot) | set(previous) if snapshot.get(p) != previous.get(p))
+
+        try:
+            ready = select.select([self._fd], [], [], timeout)[0]
+        except select.error as err:
+            if err.args[0] == errno.EINTR:
+                return set()
+            raise
+        if not ready:
+            return set()
+        return self._readEvents(os.read(self._fd, 64*1024))
+
+#___________________________________________________________________________________________________ _readEvents
+    def _readEvents(self, data):
+        """ Returns the set of watched paths changed by the inotify events within the data. """
+        changes = set()
+        offset  = 0
+        while offset + self._EVENT_HEADER.size <= len(data):
+            wd, mask, cookie, size = self._EVENT_HEADER.unpack_from(data, offset)
+            offset += self._EVENT_HEADER.size
+            name    = data[offset:offset + size].rstrip(b'\0')
+            offset += size
+
+            if mask & self._IN_Q_OVERFLOW:
+                # Events were lost, so every watched file is reported as changed
+                changes.update(self._scan())
+                continue
+
+            folder = self._folders.get(wd)
+            if folder is None:
+                continue
+
+            if mask & self._IN_IGNORED:
+                del self._folders[wd]
+                continue
+
+            path = os.path.join(folder, StringUtils.toUnicode(name))
+            if mask & self._IN_ISDIR:
+                # Folders created or moved into a watched folder are watched in turn and any
+                # files already within them are reported as changed
+                if mask & (self._IN_CREATE | self._IN_MOVED_TO):
+                    self._addFolder(path)
+                    changes.update(self._scan(path))
+            elif self._isWatched(path):
+                changes.add(path)
+        return changes
+
+#___________________________________________________________________________________________________ _addFolder
+    def _addFolder(self, path):
+        """ Adds inotify watches to the folder and every folder within it. """
+        for folder, names, files in os.walk(path):
+            wd = libc.inotify_add_watch(
+                self._fd, StringUtils.toBytes(folder), self._IN_MASK)
+            if wd >= 0:
+                self._folders[wd] = folder
+
+#___________________________________________________________________________________________________ _scan
+    def _scan(self, path =None):
+        """ Returns a dictionary of the modification times and sizes of the watched files within
+            the path, which defaults to the watched folder. """
+        result = dict()
+        for folder, names, files in os.walk(path or self._path):
+            for name in files:
+                filePath = os.path.join(folder, name)
+                if not self._isWatched(filePath):
+                    continue
+                try:
+                    stat = os.stat(filePath)
+                except OSError:
+                    continue
+                result[filePath] = (stat.st_mtime, stat.st_size)
+        return result
+
+#___________________________________________________________________________________________________ _isWatched
+    def _isWatched(self, path):
+        return self._extensions is None or path.lower().endswith(self._extensions)
@@ -0,0 +1,20 @@
+# FileWatcherBackendEnum.py
+# (C)2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+#___________________________________________________________________________________________________ FileWatcherBackendEnum
+class FileWatcherBackendEnum(object):
+    """ Change detection mechanisms available to the FileWatcher. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    # Linux inotify watches on every folder, which report changes as they happen without
+    # scanning the watched folders
+    INOTIFY = 'inotify'
+
+    # Periodic scans of the modification times and sizes of the watched files. Works on every
+    # platform and filesystem, at the cost of a full scan on each poll.
+    POLLING = 'polling'
@@ -4,14 +4,14 @@
 
 from __future__ import print_function, absolute_import, unicode_literals, division
 
-import sys
 import os
 import datetime
+import heapq
 import math
-import random
+import threading
 
-from lockfile import FileLock
 from pyaid.dict.DictUtils import DictUtils
+from pyaid.file.AppendFile import AppendFile
 
 from pyaid.json.JSON import JSON
 from pyaid.radix.Base64 import Base64
@@ -20,7 +20,12 @@ from pyaid.time.TimeUtils import TimeUtils
 
 #___________________________________________________________________________________________________ Reporter
 class Reporter(object):
-    """A class for reporting JSON-encoded string data to the operations/reports directory."""
+    """ A class for reporting JSON-encoded string data to the operations/reports directory.
+
+        Reports are written to timecode folders that rotate every _ROTATION_INTERVAL minutes.
+        Within a folder each process and thread appends to its own shard file, so no locking
+        is needed between writers. The mergeShards and iterMergedReports methods combine the
+        shards of a timecode folder into a single stream sorted by report time. """
 
 #===================================================================================================
 #                                                                                       C L A S S
@@ -34,7 +39,7 @@ class Reporter(object):
         """Initializes settings."""
         self._buffer     = []
         self._meta       = dict()
-        self._fileCount  = kwargs.get('fileCount', 10)
+        self._shards     = dict()
         self._zeroTime   = kwargs.get('zeroTime', self._ZERO_TIME)
         self._reportPath = kwargs.get('path', self._REPORT_PATH)
         self._time       = datetime.datetime.utcnow()
@@ -83,12 +88,11 @@ class Reporter(object):
 
 #___________________________________________________________________________________________________ flush
     def flush(self):
+        """ Appends the buffered reports to this process and thread's shard of the current
+            timecode folder. Returns True if the reports were written. """
         if not self._buffer:
             return
 
-        if sys.platform.startswith('win'):
-            return
-
         items = []
         for b in self._buffer:
             try:
@@ -96,49 +100,72 @@ class Reporter(object):
                 item = b['prefix'] + ' ' + JSON.asString(d)
             except Exception as err:
                 item = '>> EXCEPTION: JSON ENCODING FAILED >> ' + str(err).replace('\n', '\t')
-
-            try:
-                item = item.encode('utf8', 'ignore')
-            except Exception as err:
-                item = '>> EXCEPTION: UNICODE DECODING FAILED >> ' + str(err).replace('\n', '\t')
-
             items.append(item)
 
-        count   = self._fileCount
-        offset  = random.randint(0, count - 1)
         success = False
-        path    = self.getReportFolder() + self._timeCode + '/'
-        if not os.path.exists(path):
-            os.makedirs(path)
+        try:
+            out = StringUtils.toUnicode('\n'.join(items) + '\n').encode('utf8', 'ignore')
+            self._getShard().write(out)
+            success = True
+        except Exception as err:
+            print("REPORTER ERROR: Unable to write report file.")
+            print(err)
 
-        for i in range(count):
-            index = (i + offset) % count
-            p     = path + str(index) + '.report'
-            lock  = FileLock(p)
-            if lock.i_am_locking() and i < count - 1:
-                continue
+        self.clear()
+        return success
 
-            try:
-                lock.acquire()
-            except Exception:
+#___________________________________________________________________________________________________ close
+    def close(self):
+        """ Flushes the buffer and closes the open shard files. """
+        self.flush()
+        shards = self._shards
+        self._shards = dict()
+        for shard in shards.values():
+            shard[1].close()
+
+#___________________________________________________________________________________________________ getShardName
+    @classmethod
+    def getShardName(cls):
+        """ Returns the shard file name owned by the current process and thread. """
+        return '%s-%s.report' % (os.getpid(), Base64.to64(threading.current_thread().ident))
+
+#___________________________________________________________________________________________________ iterMergedReports
+    @classmethod
+    def iterMergedReports(cls, folder):
+        """ A generator yielding the report lines of every shard in the timecode folder ordered
+            by report time. Each shard is sorted on its own, since several reporters in one
+            thread share a shard and flush independently, and the shards are then merged. """
+
+        sources = []
+        for name in sorted(os.listdir(folder)):
+            if not name.endswith('.report'):
                 continue
 
-            try:
-                out = StringUtils.toUnicode('\n'.join(items) + '\n')
-                f   = open(p, 'a+')
-                f.write(out.encode('utf8'))
-                f.close()
-                success = True
-            except Exception as err:
-                print("REPORTER ERROR: Unable to write report file.")
-                print(err)
+            with open(os.path.join(folder, name), 'rb') as f:
+                lines = f.read().decode('utf8', 'ignore').split('\n')
 
-            lock.release()
-            if success:
-                break
+            index  = len(sources)
+            keyed  = []
+            for order, line in enumerate(lines):
+                if line:
+                    keyed.append((cls._getReportLineTime(line), index, order, line))
+            keyed.sort()
+            sources.append(keyed)
 
-        self.clear()
-        return success
+        for item in heapq.merge(*sources):
+            yield item[-1]
+
+#___________________________________________________________________________________________________ mergeShards
+    @classmethod
+    def mergeShards(cls, folder, outputPath):
+        """ Writes the report lines of every shard in the timecode folder to the output path,
+            ordered by report time. Returns the number of lines written. """
+        count = 0
+        with open(outputPath, 'wb') as f:
+            for line in cls.iterMergedReports(folder):
+                f.write((line + '\n').encode('utf8'))
+                count += 1
+        return count
 
 #___________________________________________________________________________________________________ __call__
     def __call__(self, data):
@@ -147,7 +174,10 @@ class Reporter(object):
 #___________________________________________________________________________________________________ __del__
     def __del__(self):
         """ Flush the buffer if not empty."""
-        self.flush()
+        try:
+            self.close()
+        except Exception:
+            pass
 
 #___________________________________________________________________________________________________ getSecondsFromTimecode
     @classmethod
@@ -175,3 +205,49 @@ class Reporter(object):
         t = float(TimeUtils.datetimeToSeconds(time) - zeroTime)/60.0
         t = float(rotationInterval)*math.floor(t/float(rotationInterval))
         return Base64.to64(int(t))
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _getShard
+    def _getShard(self):
+        """ Returns the AppendFile of this process and thread's shard in the current timecode
+            folder, opening a new shard when the timecode rotates. """
+        timeCode = Reporter.getTimecodeFromDatetime(zeroTime=self._zeroTime)
+        pid      = os.getpid()
+        key      = (pid, threading.current_thread().ident)
+        shard    = self._shards.get(key)
+        if shard and shard[0] == timeCode:
+            return shard[1]
+
+        if shard:
+            shard[1].close()
+        else:
+            # Shards inherited from the parent of a forked process are closed so that the child
+            # only writes to its own shards
+            for inherited in [k for k in self._shards if k[0] != pid]:
+                shard = self._shards.pop(inherited, None)
+                if shard:
+                    shard[1].close()
+
+        path = os.path.join(self.getReportFolder(), timeCode)
+        if not os.path.exists(path):
+            try:
+                os.makedirs(path)
+            except OSError:
+                # Another process created the folder first
+                if not os.path.isdir(path):
+                    raise
+
+        self._timeCode = timeCode
+        appendFile = AppendFile(os.path.join(path, self.getShardName()), useFlock=False)
+        self._shards[key] = (timeCode, appendFile)
+        return appendFile
+
+#___________________________________________________________________________________________________ _getReportLineTime
+    @classmethod
+    def _getReportLineTime(cls, line):
+        prefix = line.split(' ', 1)[0]
+        if line.startswith('>>') or Base64.ILLEGAL_CHAR_RE.search(prefix):
+            return -1
+        return Base64.from64(prefix)
@@ -0,0 +1,87 @@
+# FenwickTree.py
+# (C)2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+#___________________________________________________________________________________________________ FenwickTree
+class FenwickTree(object):
+    """ A binary indexed tree over a fixed number of values that supports adding to a value and
+        summing a prefix of the values in O(log n) time. Used as a difference array, adding to a
+        single index adds to every value in the suffix starting at that index and the prefix sum
+        at an index returns its value. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, values =None, size =0):
+        """Creates a new instance of FenwickTree with the specified values, or size zero values
+            if no values are specified."""
+        if values is not None:
+            size = len(values)
+
+        self._size = size
+        self._tree = [0]*(size + 1)
+
+        if values is not None:
+            # Builds the tree in O(n) by pushing each partial sum up to its parent
+            tree = self._tree
+            for i, value in enumerate(values):
+                tree[i + 1] += value
+                parent = (i + 1) + ((i + 1) & -(i + 1))
+                if parent <= size:
+                    tree[parent] += tree[i + 1]
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: total
+    @property
+    def total(self):
+        """ The sum of all values in the tree. """
+        return self.prefixSum(self._size - 1)
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ add
+    def add(self, index, value):
+        """ Adds the value to the value at the specified zero-based index. """
+        tree = self._tree
+        i    = index + 1
+        while i <= self._size:
+            tree[i] += value
+            i += i & -i
+
+#___________________________________________________________________________________________________ prefixSum
+    def prefixSum(self, index):
+        """ Returns the sum of the values from zero through the specified index, inclusive. """
+        tree   = self._tree
+        result = 0
+        i      = min(index + 1, self._size)
+        while i > 0:
+            result += tree[i]
+            i -= i & -i
+        return result
+
+#___________________________________________________________________________________________________ findPrefix
+    def findPrefix(self, value):
+        """ Returns the smallest index at which the prefix sum exceeds the value, or the size of
+            the tree if no prefix sum does. Requires that all values are non-negative. """
+        tree  = self._tree
+        index = 0
+        step  = 1
+        while step*2 <= self._size:
+            step *= 2
+
+        while step > 0:
+            if index + step <= self._size and tree[index + step] <= value:
+                index += step
+                value -= tree[index]
+            step //= 2
+        return index
+
+#___________________________________________________________________________________________________ __len__
+    def __len__(self):
+        return self._size
@@ -20,6 +20,11 @@ class SystemDaemon(object):
     RUN_PATH      = '/var/run/'
     LOG_PATH      = '/var/log/'
 
+    # Log rotation limits (see pyaid.debug.LogRotator). Zero disables the limit.
+    LOG_MAX_BYTES  = 0
+    LOG_MAX_AGE    = 0
+    LOG_KEEP_COUNT = 10
+
 #___________________________________________________________________________________________________ __init__
     def __init__(self, contextRunner, logger =None, **kwargs):
         """ Creates a new instance of SystemDaemon.
@@ -82,7 +87,9 @@ class SystemDaemon(object):
     @classmethod
     def getLogger(cls):
         """getLogger doc..."""
-        return Logger(cls, printOut=False, logFolder=cls.LOG_PATH)
+        return Logger(
+            cls, printOut=False, logFolder=cls.LOG_PATH,
+            maxBytes=cls.LOG_MAX_BYTES, maxAge=cls.LOG_MAX_AGE, keepCount=cls.LOG_KEEP_COUNT)
 
 #===================================================================================================
 #                                                                               P R O T E C T E D
@@ -55,6 +55,17 @@ class BlockDefinition(object):
 
             self.chainBreakers.append(b)
 
+#___________________________________________________________________________________________________ getSignature
+    def getSignature(self):
+        """ Returns a list of plain values identifying the behavior of the definition, which is
+            equal for definitions that find the same blocks. """
+        p = MatchLookDefinition.getPatternSignature
+        return [
+            self.name, p(self.pattern), self.blockType, p(self._terminator), self.findState,
+            self.chainBlocks, [p(b) for b in self.chainBreakers], self.closeAtEnd,
+            self._getRequirementsSignature(self.matchReqs),
+            self._getRequirementsSignature(self.terminatorReqs) ]
+
 #___________________________________________________________________________________________________ createRegexDefinition
     @staticmethod
     def createDocTagDef(findState =None):
@@ -216,3 +227,15 @@ class BlockDefinition(object):
             chainBlocks=True,
             findState=findState
         )
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _getRequirementsSignature
+    @classmethod
+    def _getRequirementsSignature(cls, reqs):
+        if reqs is None:
+            return None
+        if isinstance(reqs, list):
+            return [r.getSignature() for r in reqs]
+        return reqs.getSignature()
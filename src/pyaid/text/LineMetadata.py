@@ -6,34 +6,26 @@ from __future__ import print_function, absolute_import, unicode_literals, divisi
 
 import re
 
-from pyaid.text.BlockSyntaxEnum import BlockSyntaxEnum
 
 #___________________________________________________________________________________________________ LineMetadata
 class LineMetadata(object):
     """A class representing a line of text within the analyzed result of a LineTextAnalyzer. The
-    LineMetadata provides functionality for parsing the analyzed results on a per line basis."""
+    LineMetadata provides functionality for parsing the analyzed results on a per line basis.
+
+    A LineMetadata is a view of a row in the line table of the analyzer, which stores the line
+    data, and is created by the analyzer on demand. The previous and next lines are the adjacent
+    rows of the table."""
+
+    __slots__ = ('_analyzer', '_lineIndex', '__weakref__')
 
 #===================================================================================================
 #                                                                                       C L A S S
 
-    # Used to find the indentation for the line
-    _INDENT_PATTERN = re.compile('^(?P<indent>[\s\t]*)')
-
 #___________________________________________________________________________________________________ __init__
-    def __init__(self, analyzer, previousLine):
+    def __init__(self, analyzer, lineIndex):
         """Creates a new instance of LineMetadata."""
-        self._analyzer         = analyzer
-        self._previousLine     = previousLine
-        self._nextLine         = None
-
-        self._blockChecked     = False
-        self._inBlocks         = []
-        self._overInBlocks     = []
-        self._overOutBlocks    = []
-
-        self._startIndex    = None
-        self._endIndex      = None
-        self._dead          = False
+        self._analyzer  = analyzer
+        self._lineIndex = lineIndex
 
 #===================================================================================================
 #                                                                                   G E T / S E T
@@ -42,35 +34,33 @@ class LineMetadata(object):
     @property
     def previousLine(self):
         """The line appears before this line."""
-        return self._previousLine
-    @previousLine.setter
-    def previousLine(self, value):
-        self._previousLine = value
+        if self._lineIndex < 1:
+            return None
+        return self._analyzer.getLine(self._lineIndex - 1)
 
 #___________________________________________________________________________________________________ GS: nextLine
     @property
     def nextLine(self):
         """The line that follows this line."""
-        return self._nextLine
-    @nextLine.setter
-    def nextLine(self, value):
-        self._nextLine = value
+        if self._lineIndex == -1 or self._lineIndex + 1 >= self._analyzer.lineCount:
+            return None
+        return self._analyzer.getLine(self._lineIndex + 1)
 
 #___________________________________________________________________________________________________ GS: source
     @property
     def source(self):
         """The raw (unmodified) line of text that was provided to the analyzer."""
-        return self._analyzer.source[self.startIndex:self.endIndex]
+        if self.dead:
+            return ''
+
+        return self._analyzer.getLineSource(self._lineIndex)
 
 #___________________________________________________________________________________________________ GS: redacted
     @property
     def redacted(self):
         """The current redaction line returned by the analyzer and then modified by any explicit
         changes to the line."""
-        if self._analyzer.redacted:
-            return self._analyzer.redacted[self.startIndex:self.endIndex]
-        else:
-            return ''
+        return self._analyzer.getRedactedSlice(self.startIndex, self.endIndex)
 
 #___________________________________________________________________________________________________ GS: lineNumber
     @property
@@ -82,25 +72,7 @@ class LineMetadata(object):
     @property
     def lineIndex(self):
         """The 0-based index for the line as it is stored within the analyzer list."""
-        if self.dead:
-            return -1
-
-        try:
-            return self._analyzer.lines.index(self)
-        except Exception:
-            pass
-
-        try:
-            return 1 + self._analyzer.lines.index(self.previousLine)
-        except Exception:
-            pass
-
-        try:
-            return self._analyzer.lines.index(self.nextLine) - 1
-        except Exception:
-            pass
-
-        return -1
+        return self._lineIndex
 
 #___________________________________________________________________________________________________ GS: startIndex
     @property
@@ -109,20 +81,13 @@ class LineMetadata(object):
         if self.dead:
             return 0
 
-        if not self._startIndex is None:
-            return self._startIndex
-
-        if self._analyzer.lineStartIndices is None:
-            self._analyzer.refreshStartIndices()
-
-        self._startIndex = self._analyzer.lineStartIndices[self.lineIndex]
-        return self._startIndex
+        return self._analyzer.getLineStartIndex(self._lineIndex)
 
 #___________________________________________________________________________________________________ GS: strippedStartIndex
     @property
     def strippedStartIndex(self):
         """The character index at which the indented line begins."""
-        if self._dead:
+        if self.dead:
             return 0
 
         return self.startIndex + self.indentLength
@@ -134,34 +99,26 @@ class LineMetadata(object):
         index is not included in the line, the last character in the line is actually endIndex - 1
         so slicing of the full source text fullSource[line.startIndex:line.endIndex] will return
         the correct, complete line."""
-        if self._dead:
+        if self.dead:
             return 0
 
-        if not self._endIndex is None:
-            return self._endIndex
-
-        end = self._analyzer.source.find('\n', self.startIndex)
-        end = len(self._analyzer.source) if end == -1 else end + 1
-
-        self._endIndex = end
-        return self._endIndex
+        return self._analyzer.getLineEndIndex(self._lineIndex)
 
 #___________________________________________________________________________________________________ GS: strippedEndIndex
     @property
     def strippedEndIndex(self):
         """The character index at which the line ends with whitespae and newlines stripped off the
         end. This follows slicing notation, so the end index is not included in the line."""
-        if self._dead:
+        if self.dead:
             return 0
 
-        return self.endIndex - len(self.source) + len(self.source.rstrip())
+        return self.startIndex + len(self.source.rstrip())
 
 #___________________________________________________________________________________________________ GS: indent
     @property
     def indent(self):
         """The whitespace indentation characters for the line."""
-        res = LineMetadata._INDENT_PATTERN.search(self.source)
-        return '' if res is None else res.group('indent')
+        return self.source[:self.indentLength]
 
 #___________________________________________________________________________________________________ GS: indentLength
     @property
@@ -169,7 +126,10 @@ class LineMetadata(object):
         """The character length of indentation for the line. Note, tab characters are counted as a
         single character. If you want the length of the line in terms of spaces, see the
         indentSpacesLength property."""
-        return len(self.indent)
+        if self.dead:
+            return 0
+
+        return self._analyzer.getLineIndentLength(self._lineIndex)
 
 #___________________________________________________________________________________________________ GS: indentSpacesLength
     @property
@@ -183,69 +143,60 @@ class LineMetadata(object):
     def isComment(self):
         """Specifies whether or not the line is entirely a comment. This is true when the line
         is part of a multi-line comment or is a line containing nothing but a comment."""
-        for b in self._inBlocks:
-            if b.blockType == BlockSyntaxEnum.COMMENT:
-                return True
-
-        return False
+        return bool(self._getFlags() & self._analyzer.COMMENT_FLAG)
 
 #___________________________________________________________________________________________________ GS: isString
     @property
     def isString(self):
         """Specifies whether or not the line is entirely a string. This is true when the line
         is part of a multi-line string or when the line contains nothing but a string."""
-        for b in self._inBlocks:
-            if b.blockType == BlockSyntaxEnum.STRING:
-                return True
-
-        return False
+        return bool(self._getFlags() & self._analyzer.STRING_FLAG)
 
 #___________________________________________________________________________________________________ GS: dead
     @property
     def dead(self):
         """Specifies whether or not the line has been set dead in which case it is no longer an
         active line in the analyzer result."""
-        return self._dead
+        return self._lineIndex == -1
 
 #___________________________________________________________________________________________________ GS: isEmpty
     @property
     def isEmpty(self):
         """Specifies whether or not the line is empty. Empty lines contain no characters or any
         number of whitespace and newline characters."""
-        return len(self.redacted.strip()) == 0
+        if self.dead:
+            return True
+
+        return bool(self._getFlags() & self._analyzer.EMPTY_FLAG)
 
 #___________________________________________________________________________________________________ GS: blocks
     @property
     def blocks(self):
         """The block(s) that contains the line if such a block exists."""
-
-        self.refreshBlocks()
-        return self._inBlocks if len(self._inBlocks) > 0 else None
+        return self._getBlocks(0)
 
 #___________________________________________________________________________________________________ GS: overlapInBlocks
     @property
     def overlapInBlocks(self):
         """The block(s) that overlap the line at the beginning if such a block exists."""
-
-        self.refreshBlocks()
-        return self._overInBlocks if len(self._overInBlocks) > 0 else None
+        return self._getBlocks(1)
 
 #___________________________________________________________________________________________________ GS: overlapOutBlocks
     @property
     def overlapOutBlocks(self):
         """The block(s) that overlap the line at the end if such a block exists."""
+        return self._getBlocks(2)
 
-        self.refreshBlocks()
-        return self._overOutBlocks if len(self._overOutBlocks) > 0 else None
-
-#___________________________________________________________________________________________________ GS: isEmpty
+#___________________________________________________________________________________________________ GS: isSignificant
     @property
     def isSignificant(self):
         """Specifies whether or not the line contains significant text, i.e. text that is not part
         of a block (comment, string, or other depending on the blocks defined by the analyzer)."""
+        if self.dead:
+            return False
 
-        self.refreshBlocks()
-        return not self.isEmpty and not self.isComment and not self.isString
+        a = self._analyzer
+        return not self._getFlags() & (a.EMPTY_FLAG | a.COMMENT_FLAG | a.STRING_FLAG)
 
 #===================================================================================================
 #                                                                                     P U B L I C
@@ -260,22 +211,10 @@ class LineMetadata(object):
 
 #___________________________________________________________________________________________________ destroy
     def destroy(self):
-        """Destroys the line by removing it from the analyzer, extracting it from the previous
-        and next line chain. The destruction preserves the line chain by connecting the destroyed
-        lines previousLine and nextLines together."""
-
-        if self._previousLine:
-            self._previousLine.nextLine = self._nextLine
-
-        if self._nextLine:
-            self._nextLine.previousLine = self.previousLine
+        """Destroys the line by removing it from the analyzer, which connects the lines before and
+        after it in the line chain."""
 
-        self._dead         = True
-        self._previousLine = None
-        self._nextLine     = None
-        self.setDirty()
-
-        self._analyzer.lines.remove(self)
+        self._analyzer.removeLine(self)
 
 #___________________________________________________________________________________________________ setDirty
     def setDirty(self, propagate =False):
@@ -286,22 +225,11 @@ class LineMetadata(object):
             If true every line that follows this line will also be marked dirty.
         """
 
-        self._analyzer.lineStartIndices = None
-        self._endIndex      = None
-        self._startIndex    = None
-
-        self._blockChecked  = False
-        self._inBlocks      = []
-        self._overInBlocks  = []
-        self._overOutBlocks = []
-
-        if not propagate:
+        if self.dead:
             return
 
-        l = self.nextLine
-        while l:
-            l.setDirty()
-            l = l.nextLine
+        self._analyzer.clearLineData(
+            self._lineIndex, None if propagate else self._lineIndex + 1)
 
 #___________________________________________________________________________________________________ startsWithStripped
     def startsWithStripped(self, search, stripChars =None, redacted =False, regex =False):
@@ -468,61 +396,24 @@ class LineMetadata(object):
 #___________________________________________________________________________________________________ refreshBlocks
     def refreshBlocks(self):
         """Used primarly by the analyzer class that owns this line, the checks through a list of
-        blocks and finds the block that contains this line if such a block exists. If a block
-        does exist it is stored in this line and the line properties are adjusted to account for
-        the existance of the block.
+        blocks and finds the blocks that contain this line, storing the resulting line flags in the
+        analyzer unless they are already stored for the current line version.
         """
-        if self._blockChecked:
-            return
-
-        for b in self._analyzer.blocks:
-            overStart = b.start <= self.strippedStartIndex and b.end > self.strippedStartIndex
-            overEnd   = b.start < self.strippedEndIndex and b.end >= self.strippedEndIndex
-
-            if overStart and overEnd:
-                self._isComment = b.blockType == BlockSyntaxEnum.COMMENT
-                self._isString  = b.blockType == BlockSyntaxEnum.STRING
-                self._inBlocks.append(b)
-            elif overStart and b.start < self.strippedStartIndex:
-                self._overInBlocks.append(b)
-            elif overEnd and b.end > self.strippedEndIndex:
-                self._overOutBlocks.append(b)
+        self._getFlags()
 
-        self._blockChecked = True
-
-#___________________________________________________________________________________________________ addLineAfter
+#___________________________________________________________________________________________________ addLineBefore
     def addLineBefore(self):
         """Adds a new line to the line chain at the index prior to this line. This new line becomes
         the previousLine for this line."""
 
-        pl                = LineMetadata(self._analyzer, self)
-        pl.previousLine   = self.previousLine
-        self.previousLine = pl
-
-        l = pl
-        while l:
-            l.setDirty()
-            l = l.nextLine
-
-        self._analyzer.lines.insert(pl.lineIndex, pl)
-        return pl
+        return self._analyzer.insertLine(self._lineIndex)
 
 #___________________________________________________________________________________________________ addLineAfter
     def addLineAfter(self):
         """Adds a new line to the line chain after this line. This new line becomes the nextLine
         for this line."""
 
-        nl            = LineMetadata(self._analyzer, self)
-        nl.nextLine   = self.nextLine
-        self.nextLine = nl
-
-        l = self
-        while l:
-            l.setDirty()
-            l = l.nextLine
-
-        self._analyzer.lines.insert(nl.lineIndex, nl)
-        return nl
+        return self._analyzer.insertLine(self._lineIndex + 1)
 
 #___________________________________________________________________________________________________ removeLineBefore
     def removeLineBefore(self):
@@ -541,3 +432,20 @@ class LineMetadata(object):
         dead = self.nextLine
         dead.destroy()
         return dead
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _getFlags
+    def _getFlags(self):
+        if self.dead:
+            return 0
+        return self._analyzer.getLineFlags(self._lineIndex)
+
+#___________________________________________________________________________________________________ _getBlocks
+    def _getBlocks(self, group):
+        if self.dead:
+            return None
+
+        blocks = self._analyzer.getLineBlocks(self._lineIndex)[group]
+        return blocks if len(blocks) > 0 else None
@@ -4,42 +4,66 @@
 
 from __future__ import print_function, absolute_import, unicode_literals, division
 
+import bisect
+import re
+import weakref
+from array import array
+
+from pyaid.text.BlockSyntaxEnum import BlockSyntaxEnum
 from pyaid.text.LineMetadata import LineMetadata
 from pyaid.text.RedactionTextAnalyzer import RedactionTextAnalyzer
+from pyaid.text.TextLineIndex import TextLineIndex
 
 #___________________________________________________________________________________________________ LineTextAnalyzer
 class LineTextAnalyzer(RedactionTextAnalyzer):
-    """A class for..."""
+    """A class for...
+
+    The lines are stored as rows of a table of parallel integer arrays, with the line starts held
+    by a TextLineIndex and the indentation and block flags of each line computed lazily into
+    array columns. The LineMetadata objects returned for the lines are lightweight views of those
+    rows that are created on demand. A view is shared while it is referenced and follows its row
+    as lines are added or removed before it."""
 
 #===================================================================================================
 #                                                                                       C L A S S
 
+    # Flags stored for each line in the line flags column
+    COMMENT_FLAG = 1
+    STRING_FLAG  = 2
+    EMPTY_FLAG   = 4
+
+    # Used to find the indentation for a line
+    _INDENT_PATTERN = re.compile(r'[\s\t]*')
+
+    # The largest number of lines computed together by a sequential pass over the lines
+    _MAX_LINE_BATCH_SIZE = 256
+
 #___________________________________________________________________________________________________ __init__
-    def __init__(self, src ='', debug =False, blockDefs =None):
+    def __init__(self, src ='', debug =False, blockDefs =None, **kwargs):
         """Creates a new instance of ClassTemplate."""
-        RedactionTextAnalyzer.__init__(self, src, debug, blockDefs)
-
-        self._lines        = []
-        self._lineCursor   = 0
-        self._startIndices = None
-        self.refreshStartIndices()
-        if debug:
-            print('START INDICES:', self._startIndices)
+        RedactionTextAnalyzer.__init__(self, src, debug, blockDefs, **kwargs)
 
-        prev = None
-        while True:
-            line = LineMetadata(self, prev)
-            if prev:
-                prev.nextLine = line
+        self._lineCursor  = 0
+        self._lineVersion = 0
 
-            prev = line
-            self._lines.append(line)
+        # Line columns, where the cached indent and flags of a line are only valid while its
+        # version matches the line version
+        self._lineIndents  = array('l')
+        self._lineFlags    = array('B')
+        self._lineVersions = array('l')
+        self._lineViews    = weakref.WeakValueDictionary()
 
-            if debug:
-                print('LINE: ',line.startIndex,line.endIndex,'of',len(self._raw))
+        self._lineBatchSize    = 1
+        self._lineBatchEnd     = 0
+        self._lineBatchVersion = -1
 
-            if not line.endIndex < len(self._raw) - 1:
-                break
+        self._lineIndex = TextLineIndex()
+        self.refreshStartIndices()
+        if debug:
+            print('START INDICES:', self.lineStartIndices)
+            for i in range(self._lineIndex.count):
+                print('LINE: ', self._lineIndex.getStart(i), self._lineIndex.getEnd(i), 'of',
+                      len(self._raw))
 
 #===================================================================================================
 #                                                                                   G E T / S E T
@@ -50,15 +74,26 @@ class LineTextAnalyzer(RedactionTextAnalyzer):
         return self._lineCursor
     @index.setter
     def index(self, value):
-        self._lineCursor = max(0, min(value, len(self._lines) - 1))
+        self._lineCursor = max(0, min(value, self.lineCount - 1))
 
 #___________________________________________________________________________________________________ GS: lineStartIndices
     @property
     def lineStartIndices(self):
-        return self._startIndices
+        return self._lineIndex.getStarts()
     @lineStartIndices.setter
     def lineStartIndices(self, value):
-        self._startIndices = value
+        if value is None:
+            self.refreshStartIndices()
+        else:
+            self._lineIndex.setStarts(value, len(self._raw))
+            self._syncLineRows()
+
+#___________________________________________________________________________________________________ GS: lineVersion
+    @property
+    def lineVersion(self):
+        """ Incremented whenever the source or the list of lines changes. Line data cached for
+            earlier versions is discarded. """
+        return self._lineVersion
 
 #___________________________________________________________________________________________________ GS: previousLine
     @property
@@ -66,30 +101,32 @@ class LineTextAnalyzer(RedactionTextAnalyzer):
         if self._lineCursor == 0:
             return None
 
-        return self._lines[self._lineCursor - 1]
+        return self.getLine(self._lineCursor - 1)
 
 #___________________________________________________________________________________________________ GS: nextLine
     @property
     def nextLine(self):
-        if self._lineCursor < len(self._lines) + 1:
-            return self._lines[self._lineCursor + 1]
+        if self._lineCursor < self.lineCount + 1:
+            return self.getLine(self._lineCursor + 1)
 
         return None
 
 #___________________________________________________________________________________________________ GS: line
     @property
     def line(self):
-        return self._lines[self._lineCursor]
+        return self.getLine(self._lineCursor)
 
 #___________________________________________________________________________________________________ GS: lines
     @property
     def lines(self):
-        return self._lines
+        """ A new list of the views of every line. Iterating the analyzer or using getLine avoids
+            creating a view for every line at once. """
+        return [self.getLine(i) for i in range(self.lineCount)]
 
 #___________________________________________________________________________________________________ GS: lineCount
     @property
     def lineCount(self):
-        return len(self._lines)
+        return len(self._lineVersions)
 
 #===================================================================================================
 #                                                                                     P U B L I C
@@ -97,25 +134,7 @@ class LineTextAnalyzer(RedactionTextAnalyzer):
 #___________________________________________________________________________________________________ changeOffsets
     def changeOffsets(self, index, amount):
         RedactionTextAnalyzer.changeOffsets(self, index, amount)
-
-        for l in self._lines:
-            if l.contains(index):
-                l.setDirty(True)
-                break
-
-        # Updates the lines, adding or removing them as needed.
-        lastLine = self._lines[-1]
-
-        # REMOVE LINES
-        while lastLine.startIndex == len(self.source):
-            lastLine.destroy()
-            lastLine = self._lines[-1]
-
-        # ADD LINES
-        while lastLine.endIndex < len(self.source):
-            l                 = LineMetadata(self, lastLine)
-            lastLine.nextLine = l
-            lastLine          = l
+        self._lineVersion += 1
 
 #___________________________________________________________________________________________________ __iter__
     def __iter__(self):
@@ -123,59 +142,297 @@ class LineTextAnalyzer(RedactionTextAnalyzer):
 
 #___________________________________________________________________________________________________ next
     def next(self):
-        if self._lineCursor < len(self._lines):
-            res = self._lines[self._lineCursor]
+        if self._lineCursor < self.lineCount:
+            res = self.getLine(self._lineCursor)
             self._lineCursor += 1
             return res
 
         self._lineCursor = 0
         raise StopIteration
 
+#___________________________________________________________________________________________________ __next__
+    def __next__(self):
+        return self.next()
+
 #___________________________________________________________________________________________________ read
     def read(self, lineIndex =-1):
         if lineIndex != -1:
-            return self._lines[max(0, min(lineIndex, len(self._lines) - 1))]
-
-        return self._lines[self._lineCursor]
+            return self.getLine(max(0, min(lineIndex, self.lineCount - 1)))
+
+        return self.getLine(self._lineCursor)
+
+#___________________________________________________________________________________________________ getLine
+    def getLine(self, lineIndex):
+        """ Returns the view of the line at the specified line index, where negative indexes count
+            back from the last line. """
+        count = self.lineCount
+        if lineIndex < 0:
+            lineIndex += count
+        if not 0 <= lineIndex < count:
+            raise IndexError('Line %s out of range for %s lines' % (lineIndex, count))
+
+        line = self._lineViews.get(lineIndex)
+        if line is None:
+            line = LineMetadata(self, lineIndex)
+            self._lineViews[lineIndex] = line
+        return line
 
 #___________________________________________________________________________________________________ getLineAtIndex
     def getLineAtIndex(self, index):
-        for l in self._lines:
-            if l.contains(index):
-                return l
+        position = self._lineIndex.findLine(index)
+        if 0 <= position < self.lineCount:
+            return self.getLine(position)
 
         return None
 
+#___________________________________________________________________________________________________ getLinesInRange
+    def getLinesInRange(self, start, end):
+        """ Returns a list of the lines that contain any of the characters from start to end,
+            which follows slicing notation. """
+        start = max(0, start)
+        end   = min(end, self._lineIndex.length)
+        if end <= start:
+            return []
+
+        return [self.getLine(i) for i in range(
+            self._lineIndex.findLine(start), self._lineIndex.findLine(end - 1) + 1)]
+
+#___________________________________________________________________________________________________ getLineStartIndex
+    def getLineStartIndex(self, lineIndex):
+        """ Returns the character index at which the line at the specified line index begins. """
+        return self._lineIndex.getStart(lineIndex)
+
+#___________________________________________________________________________________________________ getLineEndIndex
+    def getLineEndIndex(self, lineIndex):
+        """ Returns the character index at which the line at the specified line index ends,
+            following slicing notation. """
+        return self._lineIndex.getEnd(lineIndex)
+
+#___________________________________________________________________________________________________ getLineSource
+    def getLineSource(self, lineIndex):
+        """ Returns the source text of the line at the specified line index. """
+        return self._getSourceSlice(
+            self._lineIndex.getStart(lineIndex), self._lineIndex.getEnd(lineIndex))
+
+#___________________________________________________________________________________________________ getLineIndentLength
+    def getLineIndentLength(self, lineIndex):
+        """ Returns the number of leading whitespace characters in the line at the specified line
+            index. """
+        self._refreshLine(lineIndex)
+        return self._lineIndents[lineIndex]
+
+#___________________________________________________________________________________________________ getLineFlags
+    def getLineFlags(self, lineIndex):
+        """ Returns the COMMENT_FLAG, STRING_FLAG and EMPTY_FLAG bits that apply to the line at the
+            specified line index. """
+        self._refreshLine(lineIndex)
+        return self._lineFlags[lineIndex]
+
+#___________________________________________________________________________________________________ getLineBlocks
+    def getLineBlocks(self, lineIndex):
+        """ Returns a tuple of the lists of blocks that contain the stripped line at the specified
+            line index, that overlap only its beginning and that overlap only its end. """
+        return self._getLineBlocks(
+            lineIndex, self.getLineSource(lineIndex), self.getLineIndentLength(lineIndex))
+
+#___________________________________________________________________________________________________ clearLineData
+    def clearLineData(self, start =0, end =None):
+        """ Discards the indent and flags cached for the lines from start to end, which follows
+            slicing notation. """
+        versions = self._lineVersions
+        for i in range(start, len(versions) if end is None else end):
+            versions[i] = -1
+
+#___________________________________________________________________________________________________ getLinePosition
+    def getLinePosition(self, line):
+        """ Returns the index of the line within the lines or -1 if it is not one of them. """
+        if self._lineViews.get(line.lineIndex) is not line:
+            return -1
+        return line.lineIndex
+
+#___________________________________________________________________________________________________ insertLine
+    def insertLine(self, lineIndex):
+        """ Inserts a new empty line at the specified line index without changing the source and
+            returns its view. """
+        self._lineIndex.insertLine(lineIndex)
+        self._insertLineRows(lineIndex, 1)
+        self._lineVersion += 1
+        return self.getLine(lineIndex)
+
+#___________________________________________________________________________________________________ removeLine
+    def removeLine(self, line):
+        """ Removes the line without changing the source, after which its view is dead. """
+        position = self.getLinePosition(line)
+        if position == -1:
+            raise ValueError('Line is not in the lines list')
+
+        self._lineIndex.removeLine(position)
+        self._removeLineRows(position, position + 1)
+        self._lineVersion += 1
+
 #___________________________________________________________________________________________________ refreshStartIndices
     def refreshStartIndices(self):
-        self._startIndices = [0]
-        index = 0
-        while True:
-            index = self.source.find('\n', index + 1)
-            if index == -1:
-                return
-
-            self._startIndices.append(min(index + 1, len(self.source) - 1))
+        self._lineIndex.setText(self._raw)
+        self._syncLineRows()
 
 #===================================================================================================
 #                                                                               P R O T E C T E D
 
 #___________________________________________________________________________________________________ _insertImpl
     def _insertImpl(self, start, end, value):
-        add = value.count('\n') - self.source[start:end].count('\n')
-        RedactionTextAnalyzer._insertImpl(self, start, end, value)
+        index = self._lineIndex
+        first = self._getLinePositionAt(start)
+        last  = self._getLinePositionAt(max(start, end))
 
-        if add == 0:
+        RedactionTextAnalyzer._insertImpl(self, start, end, value)
+        index.replace(start, end, value)
+
+        # Lines reached by the replaced range are merged into the first of them and each newline
+        # in the value adds a line after it
+        if last > first:
+            self._removeLineRows(first + 1, last + 1)
+        if '\n' in value:
+            self._insertLineRows(first + 1, value.count('\n'))
+
+        # A trailing newline ends the last line instead of starting an empty one
+        self._syncLineRows()
+
+#___________________________________________________________________________________________________ _postAnalyzeImpl
+    def _postAnalyzeImpl(self):
+        RedactionTextAnalyzer._postAnalyzeImpl(self)
+        self._lineVersion += 1
+
+#___________________________________________________________________________________________________ _refreshLine
+    def _refreshLine(self, lineIndex):
+        """ Computes the indent and flags of the line at the specified line index unless they
+            are cached for the current line version. Lines read in order without changes between
+            them are computed in growing batches that share a single block query. """
+        version = self._lineVersion
+        if self._lineVersions[lineIndex] == version:
             return
 
-        for l in self._lines:
-            if l.contains(start):
-                nl = l
-                if add > 0:
-                    for i in range(0, add):
-                        nl = nl.addLineAfter()
-                else:
-                    for i in range(0, abs(add)):
-                        l.removeLineAfter()
-                break
-
+        if self._lineBatchVersion == version and self._lineBatchEnd == lineIndex:
+            self._lineBatchSize = min(2*self._lineBatchSize, self._MAX_LINE_BATCH_SIZE)
+        else:
+            self._lineBatchSize = 1
+
+        end = min(lineIndex + self._lineBatchSize, self.lineCount)
+        self._refreshLines(lineIndex, end)
+        self._lineBatchVersion = version
+        self._lineBatchEnd     = end
+
+#___________________________________________________________________________________________________ _refreshLines
+    def _refreshLines(self, start, end):
+        """ Computes the indent and flags of the lines from start to end, following slicing
+            notation, from one query of the blocks that span them. """
+        index          = self._lineIndex
+        lineStarts     = [index.getStart(i) for i in range(start, end)]
+        lineEnds       = lineStarts[1:] + [index.getEnd(end - 1)]
+        source         = self._getSourceSlice(lineStarts[0], lineEnds[-1])
+        redacted       = self.getRedactedSlice(lineStarts[0], lineEnds[-1])
+        offset         = lineStarts[0]
+        indents        = []
+        flags          = []
+        strippedStarts = []
+        strippedEnds   = []
+
+        for lineStart, lineEnd in zip(lineStarts, lineEnds):
+            lineSource = source[lineStart - offset:lineEnd - offset]
+            indent     = self._INDENT_PATTERN.match(lineSource).end()
+            indents.append(indent)
+            strippedStarts.append(lineStart + indent)
+            strippedEnds.append(lineStart + len(lineSource.rstrip()))
+            empty = not redacted[lineStart - offset:lineEnd - offset].strip()
+            flags.append(self.EMPTY_FLAG if empty else 0)
+
+        # A block contains a stripped line when it spans both its stripped start and end. The
+        # stripped starts are sorted, so the lines starting inside a block are found by bisection.
+        blocks = self.getBlocksInRange(
+            min(strippedStarts[0], strippedEnds[0]), max(strippedStarts[-1], strippedEnds[-1]),
+            [BlockSyntaxEnum.COMMENT, BlockSyntaxEnum.STRING])
+        for b in blocks:
+            flag = self.COMMENT_FLAG if b.blockType == BlockSyntaxEnum.COMMENT else self.STRING_FLAG
+            for i in range(bisect.bisect_left(strippedStarts, b.start),
+                           bisect.bisect_left(strippedStarts, b.end)):
+                if b.start < strippedEnds[i] <= b.end:
+                    flags[i] |= flag
+
+        self._lineIndents[start:end]  = array('l', indents)
+        self._lineFlags[start:end]    = array('B', flags)
+        self._lineVersions[start:end] = array('l', [self._lineVersion])*(end - start)
+
+#___________________________________________________________________________________________________ _getLineBlocks
+    def _getLineBlocks(self, lineIndex, source, indentLength):
+        lineStart = self._lineIndex.getStart(lineIndex)
+        start     = lineStart + indentLength
+        end       = lineStart + len(source.rstrip())
+
+        inBlocks      = []
+        overInBlocks  = []
+        overOutBlocks = []
+
+        # Only blocks touching the stripped range can overlap either end of the line
+        for b in self.getBlocksInRange(min(start, end), max(start, end)):
+            overStart = b.start <= start and b.end > start
+            overEnd   = b.start < end and b.end >= end
+
+            if overStart and overEnd:
+                inBlocks.append(b)
+            elif overStart and b.start < start:
+                overInBlocks.append(b)
+            elif overEnd and b.end > end:
+                overOutBlocks.append(b)
+
+        return inBlocks, overInBlocks, overOutBlocks
+
+#___________________________________________________________________________________________________ _syncLineRows
+    def _syncLineRows(self):
+        """ Adds or removes rows at the end of the line columns until there is one for each line
+            of the line index. """
+        count = self.lineCount
+        if count < self._lineIndex.count:
+            self._insertLineRows(count, self._lineIndex.count - count)
+        elif count > self._lineIndex.count:
+            self._removeLineRows(self._lineIndex.count, count)
+
+#___________________________________________________________________________________________________ _insertLineRows
+    def _insertLineRows(self, lineIndex, count):
+        """ Inserts count rows into the line columns at the specified line index. """
+        self._lineIndents[lineIndex:lineIndex]  = array('l', [0])*count
+        self._lineFlags[lineIndex:lineIndex]    = array('B', [0])*count
+        self._lineVersions[lineIndex:lineIndex] = array('l', [-1])*count
+        self._moveLineViews(lineIndex, lineIndex, count)
+
+#___________________________________________________________________________________________________ _removeLineRows
+    def _removeLineRows(self, start, end):
+        """ Removes the rows from start to end, following slicing notation, from the line
+            columns. """
+        del self._lineIndents[start:end]
+        del self._lineFlags[start:end]
+        del self._lineVersions[start:end]
+        self._moveLineViews(start, end, start - end)
+
+#___________________________________________________________________________________________________ _moveLineViews
+    def _moveLineViews(self, start, end, amount):
+        """ Kills the views of the removed rows from start to end and moves the views of the rows
+            that follow them by amount. """
+        views = self._lineViews
+        moved = [line for line in list(views.values()) if line.lineIndex >= start]
+        for line in moved:
+            del views[line.lineIndex]
+
+        for line in moved:
+            if line.lineIndex < end:
+                line._lineIndex = -1
+            else:
+                line._lineIndex += amount
+                views[line.lineIndex] = line
+
+#___________________________________________________________________________________________________ _getLinePositionAt
+    def _getLinePositionAt(self, index):
+        """ Returns the position of the line that an insert at the specified index falls within,
+            which is the last line for the end of the source. """
+        index = max(0, min(index, self._lineIndex.length))
+        if index == self._lineIndex.length:
+            return max(0, self._lineIndex.findLine(index - 1))
+        return self._lineIndex.findLine(index)
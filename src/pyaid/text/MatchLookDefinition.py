@@ -4,6 +4,10 @@
 
 from __future__ import print_function, absolute_import, unicode_literals, division
 
+import re
+
+from pyaid.string.StringUtils import StringUtils
+
 #___________________________________________________________________________________________________ MatchLookDefinition
 class MatchLookDefinition(object):
     """A class for..."""
@@ -11,18 +15,64 @@ class MatchLookDefinition(object):
 #===================================================================================================
 #                                                                                       C L A S S
 
+    # The number of characters before an index that are searched by look back patterns
+    DEFAULT_LOOK_BACK_WINDOW = 512
+
+    _COMPILED_PATTERNS = dict()
+
 #___________________________________________________________________________________________________ __init__
-    def __init__(self, pattern, ignoreIfFound =True, lookAhead =False, escapeCharacter =None):
+    def __init__(self, pattern, ignoreIfFound =True, lookAhead =False, escapeCharacter =None,
+                 lookBackWindow =None):
         """Creates a new instance of ClassTemplate."""
 
         self.pattern         = pattern
         self.ignoreIfFound   = ignoreIfFound
         self.lookAhead       = lookAhead
         self.escapeCharacter = escapeCharacter
+        self.lookBackWindow  = lookBackWindow
+
+        self.compiledPattern = MatchLookDefinition.compileLookPattern(pattern, lookAhead)
 
 #===================================================================================================
 #                                                                                     P U B L I C
 
+#___________________________________________________________________________________________________ compileLookPattern
+    @classmethod
+    def compileLookPattern(cls, pattern, lookAhead):
+        """ Returns the compiled form of the look pattern, which is anchored for use with
+            match(src, index) when looking ahead and search(src, start, index) when looking back.
+            Compiled patterns are recompiled from their source with the same flags. """
+
+        if pattern is None:
+            return None
+
+        flags = 0
+        if not StringUtils.isStringType(pattern):
+            flags   = pattern.flags
+            pattern = pattern.pattern
+
+        key = (pattern, flags, bool(lookAhead))
+        if key not in cls._COMPILED_PATTERNS:
+            cls._COMPILED_PATTERNS[key] = re.compile(
+                '(?:%s)' % pattern if lookAhead else '(?:%s)$' % pattern, flags)
+        return cls._COMPILED_PATTERNS[key]
+
+#___________________________________________________________________________________________________ getSignature
+    def getSignature(self):
+        """ Returns a list of plain values identifying the behavior of the definition, which is
+            equal for definitions that match identically. """
+        return [
+            self.getPatternSignature(self.pattern), self.ignoreIfFound, bool(self.lookAhead),
+            self.escapeCharacter, self.lookBackWindow]
+
+#___________________________________________________________________________________________________ getPatternSignature
+    @classmethod
+    def getPatternSignature(cls, pattern):
+        """ Returns the pattern string, or the source and flags of a compiled pattern. """
+        if pattern is None or StringUtils.isStringType(pattern):
+            return pattern
+        return [pattern.pattern, pattern.flags]
+
 #___________________________________________________________________________________________________ createRegexDefinition
     @staticmethod
     def createIgnoreEscapes():
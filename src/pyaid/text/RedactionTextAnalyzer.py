@@ -8,6 +8,7 @@ import re
 
 from pyaid.text.BlockSyntaxEnum import BlockSyntaxEnum
 from pyaid.text.TextAnalyzer import TextAnalyzer
+from pyaid.text.TextRope import TextRope
 
 #___________________________________________________________________________________________________ RedactionTextAnalyzer
 class RedactionTextAnalyzer(TextAnalyzer):
@@ -16,48 +17,93 @@ class RedactionTextAnalyzer(TextAnalyzer):
 #===================================================================================================
 #                                                                                       C L A S S
 
+    REDACTED_BLOCK_TYPES = [BlockSyntaxEnum.COMMENT, BlockSyntaxEnum.STRING, BlockSyntaxEnum.REGEX]
+
+    _REDACT_PATTERN = re.compile('[^\n]{1}')
+
 #___________________________________________________________________________________________________ __init__
-    def __init__(self, src ='', debug =False, blockDefs =None, redactionCharacter =' '):
+    def __init__(self, src ='', debug =False, blockDefs =None, redactionCharacter =' ', **kwargs):
         """Creates a new instance of ClassTemplate."""
-        TextAnalyzer.__init__(self, src, debug, blockDefs)
-        self._redacted   = ''
+        TextAnalyzer.__init__(self, src, debug, blockDefs, **kwargs)
+        self._redacted   = TextRope()
         self._redactChar = redactionCharacter
 
+        # The range of the source replaced by the pending insert, which is re-redacted by the
+        # following offset change instead of redacting the entire source
+        self._redactRange = None
+
+        # Incremental redaction is only possible when every redacted block lies within the
+        # source and redacts to the same length, as recorded by the last full redaction
+        self._redactBlockCount = None
+
 #===================================================================================================
 #                                                                                   G E T / S E T
 
 #___________________________________________________________________________________________________ GS: redacted
     @property
     def redacted(self):
-        return self._redacted
+        return self._redacted.getText()
 
 #===================================================================================================
 #                                                                                     P U B L I C
 
+#___________________________________________________________________________________________________ getRedactedSlice
+    def getRedactedSlice(self, start, end):
+        """ Returns the redacted text from start to end without joining the entire redacted
+            text. """
+        return self._redacted.getSlice(start, end)
+
 #___________________________________________________________________________________________________ lookAhead
     def lookAhead(self, index, pattern, redacted =False):
-        return self._lookAhead(self._redacted if redacted else self._raw, index, pattern)
+        return self._queryLookAhead(self._getQueryText(redacted), index, pattern)
 
 #___________________________________________________________________________________________________ lookBack
     def lookBack(self, index, pattern, redacted =False):
-        return self._lookBack(self._redacted if redacted else self._raw, index, pattern)
+        return self._queryLookBack(self._getQueryText(redacted), index, pattern)
 
 #___________________________________________________________________________________________________ matches
     def matches(self, index, pattern, matchReqs =None, redacted =False):
-        return self._matches(self._redacted if redacted else self._raw, index, pattern, matchReqs)
+        return self._queryMatches(self._getQueryText(redacted), index, pattern, matchReqs)
 
 #___________________________________________________________________________________________________ changeOffsets
     def changeOffsets(self, index, amount):
         TextAnalyzer.changeOffsets(self, index, amount)
-        self._postAnalyzeImpl()
+
+        editRange         = self._redactRange
+        self._redactRange = None
+        if editRange is None or self._redactBlockCount != len(self._blocks):
+            self._postAnalyzeImpl()
+            return
+
+        # Removals move any block boundaries inside the removed range back by up to the length
+        # of the removal, changing which blocks cover the characters before the insert
+        start, end = editRange
+        if amount < 0:
+            start = min(start, index + amount)
+        self._redactSection(start, end)
 
 #===================================================================================================
 #                                                                               P R O T E C T E D
 
+#___________________________________________________________________________________________________ _getQueryText
+    def _getQueryText(self, redacted =False):
+        """ Returns the source or redacted text searched by the public queries, which is the
+            rope of the text in edit mode. """
+        if not redacted:
+            return TextAnalyzer._getQueryText(self)
+        return self.redacted if self._rope is None else self._redacted
+
 #___________________________________________________________________________________________________ _insertImpl
     def _insertImpl(self, start, end, value):
-        self._raw      = self._raw[:start] + value + self._raw[end:]
-        self._redacted = self._redacted[:start] + value + self._redacted[end:]
+        length = len(self._redacted)
+        TextAnalyzer._insertImpl(self, start, end, value)
+        self._redacted.replace(start, end, value)
+
+        # Ranges outside of the source change the offsets by more than the text changes
+        if 0 <= start <= end <= length:
+            self._redactRange = (start, start + len(value))
+        else:
+            self._redactRange = None
 
 #___________________________________________________________________________________________________ _redactBlockImpl
     def _redactBlockImpl(self, block, source, replace):
@@ -65,19 +111,72 @@ class RedactionTextAnalyzer(TextAnalyzer):
 
 #___________________________________________________________________________________________________ _postAnalyzeImpl
     def _postAnalyzeImpl(self):
-        res = self._raw
-        p   = re.compile('[^\n]{1}')
+        raw    = self._raw
+        buffer = list(raw)
+        exact  = True
         for b in self._blocks:
-            if not b.blockType in [BlockSyntaxEnum.COMMENT, BlockSyntaxEnum.STRING,
-                                   BlockSyntaxEnum.REGEX]:
+            if not b.blockType in self.REDACTED_BLOCK_TYPES:
                 continue
 
             start = b.start
             end   = b.end
-            blen  = end - start
-            src   = self._raw[start:end]
-            rep   = p.sub(self._redactChar, src)
-            rep   = self._redactBlockImpl(b, src, rep)
-            res   = res[:start] + rep + res[end:]
+            src   = raw[start:end]
+            rep   = self._redactBlock(b, src)
+            if exact and 0 <= start <= end <= len(raw) and len(rep) == len(src):
+                buffer[start:end] = rep
+                continue
+
+            # Open blocks and redactions that change the length overlap the following blocks
+            # differently, which only replacing each block in the joined text reproduces.
+            if exact:
+                exact = False
+                res   = ''.join(buffer)
+            res = res[:start] + rep + res[end:]
+
+        self._redacted         = TextRope(''.join(buffer) if exact else res)
+        self._redactBlockCount = len(self._blocks) if exact else None
+        self._redactRange      = None
+
+#___________________________________________________________________________________________________ _redactBlock
+    def _redactBlock(self, block, source):
+        replace = self._REDACT_PATTERN.sub(self._redactChar, source)
+        return self._redactBlockImpl(block, source, replace)
+
+#___________________________________________________________________________________________________ _redactSection
+    def _redactSection(self, start, end):
+        """ Redacts the source from start to end again along with every redacted block that
+            overlaps it. Later blocks overwrite earlier ones, so every redacted block overlapping
+            the widened section is reapplied to it in order. """
+        types  = self.REDACTED_BLOCK_TYPES
+        blocks = self.getBlocksInRange(start, end, types)
+        for b in blocks:
+            start = min(start, b.start)
+            end   = max(end, b.end)
+        if blocks:
+            blocks = self.getBlocksInRange(start, end, types)
+
+        # Removals can also move blocks past the start of the source, which only the full
+        # redaction reproduces
+        length = len(self._redacted)
+        for b in blocks:
+            if not 0 <= b.start <= b.end <= length:
+                self._postAnalyzeImpl()
+                return
+        start = max(0, start)
+        end   = min(length, end)
+
+        buffer = list(self._getSourceSlice(start, end))
+        for b in blocks:
+            low  = max(start, b.start)
+            high = min(end, b.end)
+            if high <= low:
+                continue
+
+            src = self._getSourceSlice(b.start, b.end)
+            rep = self._redactBlock(b, src)
+            if len(rep) != len(src):
+                self._postAnalyzeImpl()
+                return
+            buffer[low - start:high - start] = rep[low - b.start:high - b.start]
 
-        self._redacted = res
+        self._redacted.replace(start, end, ''.join(buffer))
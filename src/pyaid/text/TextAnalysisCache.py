@@ -0,0 +1,214 @@
+# TextAnalysisCache.py
+# (C)2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import errno
+import hashlib
+import json
+import os
+import tempfile
+import zlib
+
+from pyaid.string.StringUtils import StringUtils
+
+#___________________________________________________________________________________________________ TextAnalysisCache
+class TextAnalysisCache(object):
+    """ An on-disk cache of the analysis states of TextAnalyzer instances within a cache folder.
+        Entries are keyed by a hash of the source, the analyzer class and the signatures of its
+        block definitions, so that unchanged sources are restored without analyzing them again.
+        Each entry is stored as compressed JSON in its own file, which is replaced atomically so
+        that the cache can be shared by multiple processes.
+
+        The cache is limited to maxSize bytes by evicting the least recently used entries, where
+        the modification time of an entry file is updated whenever it is read. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    DEFAULT_MAX_SIZE = 64*1024*1024
+
+    # Changes to the stored format must increment the version to invalidate existing entries
+    FORMAT_VERSION = 1
+
+    _EXTENSION = '.analysis'
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, path, maxSize =None):
+        """Creates a new instance of TextAnalysisCache."""
+        self._path    = path
+        self._maxSize = self.DEFAULT_MAX_SIZE if maxSize is None else maxSize
+        self._size    = None
+        self._hits    = 0
+        self._misses  = 0
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: path
+    @property
+    def path(self):
+        return self._path
+
+#___________________________________________________________________________________________________ GS: maxSize
+    @property
+    def maxSize(self):
+        return self._maxSize
+
+#___________________________________________________________________________________________________ GS: hits
+    @property
+    def hits(self):
+        return self._hits
+
+#___________________________________________________________________________________________________ GS: misses
+    @property
+    def misses(self):
+        return self._misses
+
+#___________________________________________________________________________________________________ GS: size
+    @property
+    def size(self):
+        """ The total number of bytes of the entries in the cache folder. """
+        return sum(entry[2] for entry in self._listEntries())
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ analyze
+    def analyze(self, analyzer):
+        """ Restores the analysis of the analyzer from the cache if an entry exists for its
+            source, or analyzes it and stores the result. Returns True if the analysis was
+            restored from the cache. """
+        if self.load(analyzer):
+            return True
+        analyzer.analyze()
+        self.store(analyzer)
+        return False
+
+#___________________________________________________________________________________________________ load
+    def load(self, analyzer):
+        """ Restores the analysis of the analyzer from its cache entry, returning False if no
+            valid entry exists. Entries that cannot be restored are removed and count as misses,
+            leaving the analyzer unanalyzed. """
+        path = self._getEntryPath(self.getKey(analyzer))
+        try:
+            with open(path, 'rb') as fh:
+                state = json.loads(StringUtils.toUnicode(zlib.decompress(fh.read())))
+            os.utime(path, None)
+        except (IOError, OSError, ValueError, zlib.error):
+            self._misses += 1
+            return False
+
+        try:
+            analyzer.restoreAnalysisState(state)
+        except (KeyError, IndexError, TypeError, ValueError, AttributeError):
+            self._misses += 1
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return False
+
+        self._hits += 1
+        return True
+
+#___________________________________________________________________________________________________ store
+    def store(self, analyzer):
+        """ Writes the analysis state of the analyzed analyzer to its cache entry and evicts the
+            least recently used entries if the cache has grown larger than the maximum size. """
+        data = zlib.compress(StringUtils.toBytes(
+            json.dumps(analyzer.getAnalysisState(), separators=(',', ':'))))
+
+        try:
+            os.makedirs(self._path)
+        except OSError as e:
+            # The folder may already exist or be created by another process in the meantime
+            if e.errno != errno.EEXIST:
+                return False
+
+        path = self._getEntryPath(self.getKey(analyzer))
+        fd, tempPath = tempfile.mkstemp(suffix='.tmp', dir=self._path)
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                fh.write(data)
+            if hasattr(os, 'replace'):
+                os.replace(tempPath, path)
+            else:
+                os.rename(tempPath, path)
+        except (IOError, OSError):
+            if os.path.exists(tempPath):
+                os.remove(tempPath)
+            return False
+
+        # The size is counted from the cache folder once and then estimated until the next
+        # prune, as other processes may be writing entries to the same folder
+        if self._size is None:
+            self._size = self.size
+        else:
+            self._size += len(data)
+
+        if self._size > self._maxSize:
+            self.prune()
+        return True
+
+#___________________________________________________________________________________________________ prune
+    def prune(self, maxSize =None):
+        """ Removes the least recently used entries until the cache is no larger than maxSize,
+            which defaults to the maximum size of the cache. """
+        maxSize = self._maxSize if maxSize is None else maxSize
+        entries = sorted(self._listEntries(), key=lambda e: e[1])
+        size    = sum(e[2] for e in entries)
+
+        for path, modified, entrySize in entries:
+            if size <= maxSize:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            size -= entrySize
+
+        self._size = size
+
+#___________________________________________________________________________________________________ clear
+    def clear(self):
+        self.prune(0)
+
+#___________________________________________________________________________________________________ getKey
+    def getKey(self, analyzer):
+        """ Returns the hexadecimal key of the cache entry for the source of the analyzer. """
+        analyzerClass = analyzer.__class__
+        signature     = json.dumps([
+            self.FORMAT_VERSION,
+            '%s.%s' % (analyzerClass.__module__, analyzerClass.__name__),
+            [d.getSignature() for d in analyzer.getBlockDefinitions()] ], separators=(',', ':'))
+
+        result = hashlib.sha1(StringUtils.toBytes(signature))
+        result.update(StringUtils.toBytes(analyzer.source))
+        return result.hexdigest()
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _getEntryPath
+    def _getEntryPath(self, key):
+        return os.path.join(self._path, key + self._EXTENSION)
+
+#___________________________________________________________________________________________________ _listEntries
+    def _listEntries(self):
+        """ Returns a list of (path, modified time, size) tuples for the entries of the cache. """
+        if not os.path.exists(self._path):
+            return []
+
+        entries = []
+        for name in os.listdir(self._path):
+            if not name.endswith(self._EXTENSION):
+                continue
+            path = os.path.join(self._path, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, stat.st_mtime, stat.st_size))
+        return entries
@@ -0,0 +1,170 @@
+# TextAnalysisPool.py
+# (C)2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import codecs
+import time
+import traceback
+
+try:
+    from concurrent.futures import ProcessPoolExecutor
+except ImportError:
+    ProcessPoolExecutor = None
+
+from pyaid.ArgsUtils import ArgsUtils
+from pyaid.text.TextAnalysisCache import TextAnalysisCache
+from pyaid.text.TextAnalysisResult import TextAnalysisResult
+from pyaid.text.TextAnalyzer import TextAnalyzer
+
+#___________________________________________________________________________________________________ TextAnalysisPool
+class TextAnalysisPool(object):
+    """ Analyzes many independent files or source strings with a TextAnalyzer class, fanning the
+        analysis out over a ProcessPoolExecutor in chunks of sources. Each worker creates its own
+        analyzer and returns a picklable TextAnalysisResult for every source, which are returned in
+        the order of the sources along with the time spent on each source.
+
+        Without the concurrent.futures module, with a maxWorkers of 0 or when every source fits
+        within a single chunk, the sources are analyzed serially within the calling process. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    DEFAULT_CHUNK_SIZE = 8
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, analyzerClass =None, blockDefs =None, maxWorkers =None, **kwargs):
+        """Creates a new instance of TextAnalysisPool. The chunkSize, redacted and attributes
+            keyword arguments set the number of sources analyzed by each task, whether or not
+            redacted sources are returned and the names of the analyzer attributes returned in
+            the data of each result. When a cachePath is specified the analyses are restored from
+            and stored in a TextAnalysisCache at that path. The remaining keyword arguments are
+            passed to the analyzer constructor."""
+        self._analyzerClass = analyzerClass if analyzerClass else TextAnalyzer
+        self._blockDefs     = blockDefs
+        self._maxWorkers    = maxWorkers
+        self._chunkSize     = max(
+            1, ArgsUtils.extract('chunkSize', self.DEFAULT_CHUNK_SIZE, kwargs))
+        self._redacted      = ArgsUtils.extract('redacted', False, kwargs)
+        self._attributes    = ArgsUtils.extract('attributes', [], kwargs)
+        self._cachePath     = ArgsUtils.extract('cachePath', None, kwargs)
+        self._cacheSize     = ArgsUtils.extract('cacheSize', None, kwargs)
+        self._analyzerArgs  = kwargs
+        self._elapsed       = 0.0
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: analyzerClass
+    @property
+    def analyzerClass(self):
+        return self._analyzerClass
+
+#___________________________________________________________________________________________________ GS: maxWorkers
+    @property
+    def maxWorkers(self):
+        return self._maxWorkers
+
+#___________________________________________________________________________________________________ GS: chunkSize
+    @property
+    def chunkSize(self):
+        return self._chunkSize
+
+#___________________________________________________________________________________________________ GS: elapsed
+    @property
+    def elapsed(self):
+        """ The number of seconds taken by the most recent analysis of all of its sources. """
+        return self._elapsed
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ analyzePaths
+    def analyzePaths(self, paths):
+        """ Analyzes the utf-8 files at the specified paths and returns a list of their
+            TextAnalysisResult instances in the same order. """
+        return self._analyze([(i, p, None) for i, p in enumerate(paths)])
+
+#___________________________________________________________________________________________________ analyzeSources
+    def analyzeSources(self, sources):
+        """ Analyzes the specified source strings and returns a list of their TextAnalysisResult
+            instances in the same order. """
+        return self._analyze([(i, None, s) for i, s in enumerate(sources)])
+
+#___________________________________________________________________________________________________ getSlowestResults
+    @classmethod
+    def getSlowestResults(cls, results, count =10):
+        """ Returns the count results that took the longest to analyze, slowest first. """
+        return sorted(results, key=lambda r: r.elapsed, reverse=True)[:count]
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _analyze
+    def _analyze(self, items):
+        start    = time.time()
+        settings = (
+            self._analyzerClass, self._blockDefs, self._analyzerArgs, self._redacted,
+            self._attributes, self._cachePath, self._cacheSize)
+        chunks   = [
+            items[i:i + self._chunkSize] for i in range(0, len(items), self._chunkSize)]
+
+        results = []
+        if ProcessPoolExecutor is None or self._maxWorkers == 0 or len(chunks) < 2:
+            for chunk in chunks:
+                results.extend(_analyzeChunk(settings, chunk))
+        else:
+            executor = ProcessPoolExecutor(max_workers=self._maxWorkers)
+            try:
+                # Futures are collected in the order of their chunks, which preserves the order
+                # of the sources regardless of the order in which the chunks complete
+                futures = [executor.submit(_analyzeChunk, settings, c) for c in chunks]
+                for future in futures:
+                    results.extend(future.result())
+            finally:
+                executor.shutdown(wait=True)
+
+        self._elapsed = time.time() - start
+        return results
+
+####################################################################################################
+####################################################################################################
+
+#___________________________________________________________________________________________________ _analyzeChunk
+def _analyzeChunk(settings, chunk):
+    """ Analyzes each (key, path, source) item of the chunk within a worker process and returns a
+        list of their results. Defined at the module level so that it can be pickled by the
+        executor. """
+    analyzerClass, blockDefs, analyzerArgs, redacted, attributes, cachePath, cacheSize = settings
+    if blockDefs is not None:
+        analyzerArgs = dict(analyzerArgs, blockDefs=blockDefs)
+    cache = TextAnalysisCache(cachePath, cacheSize) if cachePath else None
+
+    results = []
+    for key, path, source in chunk:
+        start = time.time()
+        try:
+            if path is not None:
+                with codecs.open(path, 'r', 'utf-8') as fh:
+                    source = fh.read()
+
+            analyzer = analyzerClass(source, **analyzerArgs)
+            if cache:
+                cache.analyze(analyzer)
+            else:
+                analyzer.analyze()
+
+            results.append(TextAnalysisResult(
+                key=key,
+                path=path,
+                blocks=[(b.start, b.end, b.blockType, b.name) for b in analyzer.blocks],
+                errors=list(analyzer.syntaxErrors),
+                redacted=getattr(analyzer, 'redacted', None) if redacted else None,
+                data=dict((name, getattr(analyzer, name, None)) for name in attributes),
+                elapsed=time.time() - start))
+        except Exception:
+            results.append(TextAnalysisResult(
+                key=key, path=path, elapsed=time.time() - start,
+                exception=traceback.format_exc()))
+    return results
@@ -0,0 +1,115 @@
+# TextAnalysisResult.py
+# (C)2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+#___________________________________________________________________________________________________ TextAnalysisResult
+class TextAnalysisResult(object):
+    """ The compact result of analyzing a single source within a TextAnalysisPool. The result
+        holds only plain values so that it can be pickled back from a worker process. Blocks are
+        stored as (start, end, blockType, name) tuples in the order they were found. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    __slots__ = (
+        '_key', '_path', '_blocks', '_errors', '_redacted', '_data', '_elapsed', '_exception')
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, key, path =None, blocks =None, errors =None, redacted =None, data =None,
+                 elapsed =0.0, exception =None):
+        """Creates a new instance of TextAnalysisResult."""
+        self._key       = key
+        self._path      = path
+        self._blocks    = blocks if blocks is not None else []
+        self._errors    = errors if errors is not None else []
+        self._redacted  = redacted
+        self._data      = data if data is not None else dict()
+        self._elapsed   = elapsed
+        self._exception = exception
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: key
+    @property
+    def key(self):
+        """ The index of the source within the analyzed list of sources. """
+        return self._key
+
+#___________________________________________________________________________________________________ GS: path
+    @property
+    def path(self):
+        """ The path of the analyzed file, or None if a source string was analyzed. """
+        return self._path
+
+#___________________________________________________________________________________________________ GS: blocks
+    @property
+    def blocks(self):
+        return self._blocks
+
+#___________________________________________________________________________________________________ GS: syntaxErrors
+    @property
+    def syntaxErrors(self):
+        return self._errors
+
+#___________________________________________________________________________________________________ GS: redacted
+    @property
+    def redacted(self):
+        """ The redacted source, which is only returned when requested from the pool and the
+            analyzer class is a RedactionTextAnalyzer. """
+        return self._redacted
+
+#___________________________________________________________________________________________________ GS: data
+    @property
+    def data(self):
+        """ A dictionary of the values of the analyzer attributes requested from the pool. """
+        return self._data
+
+#___________________________________________________________________________________________________ GS: elapsed
+    @property
+    def elapsed(self):
+        """ The number of seconds spent reading and analyzing the source within the worker. """
+        return self._elapsed
+
+#___________________________________________________________________________________________________ GS: exception
+    @property
+    def exception(self):
+        """ The formatted traceback of an exception raised while analyzing the source, or None if
+            the analysis completed. """
+        return self._exception
+
+#___________________________________________________________________________________________________ GS: success
+    @property
+    def success(self):
+        return self._exception is None
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ getBlocksByType
+    def getBlocksByType(self, blockType):
+        return [b for b in self._blocks if b[2] == blockType]
+
+#___________________________________________________________________________________________________ __getstate__
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+#___________________________________________________________________________________________________ __setstate__
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+#___________________________________________________________________________________________________ __repr__
+    def __repr__(self):
+        return self.__str__()
+
+#___________________________________________________________________________________________________ __str__
+    def __str__(self):
+        return '<TextAnalysisResult:%s %s blocks %s errors %.3fs%s>' % (
+            str(self._path if self._path else self._key),
+            str(len(self._blocks)),
+            str(len(self._errors)),
+            self._elapsed,
+            '' if self.success else ' FAILED')
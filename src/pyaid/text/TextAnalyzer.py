@@ -10,8 +10,13 @@ from pyaid.ArgsUtils import ArgsUtils
 from pyaid.string.StringUtils import StringUtils
 from pyaid.text.BlockDefinition import BlockDefinition
 from pyaid.text.BlockSyntaxEnum import BlockSyntaxEnum
+from pyaid.text.MatchLookDefinition import MatchLookDefinition
 from pyaid.text.TextBlock import TextBlock
 from pyaid.text.TextBookmark import TextBookmark
+from pyaid.text.TextIntervalIndex import TextIntervalIndex
+from pyaid.text.TextOffsetTracker import TextOffsetTracker
+from pyaid.text.TextRope import TextRope
+from pyaid.text.TextScanEngineEnum import TextScanEngineEnum
 
 #___________________________________________________________________________________________________ TextAnalyzer
 class TextAnalyzer(object):
@@ -21,6 +26,19 @@ class TextAnalyzer(object):
 #===================================================================================================
 #                                                                                       C L A S S
 
+    DEFAULT_SCAN_ENGINE = TextScanEngineEnum.REGEX
+
+    # Matches nothing, used as the scanner for find states without any patterns
+    _NO_MATCH_PATTERN = re.compile('(?!)')
+
+    # Identifies patterns with back references, which cannot be renumbered within a scanner
+    _BACK_REFERENCE_PATTERN = re.compile(r'\\[1-9]|\(\?P=')
+
+    # The initial number of characters around an index that the public queries read from the
+    # rope in edit mode, and the window size beyond which they join the rope instead
+    _QUERY_WINDOW     = 512
+    _MAX_QUERY_WINDOW = 8192
+
 #___________________________________________________________________________________________________ __init__
     def __init__(self, src ='', debug =False, blockDefs =None, debugData =None, **kwargs):
         """Creates a new instance of ClassTemplate."""
@@ -31,15 +49,30 @@ class TextAnalyzer(object):
 
         src = StringUtils.toUnicode(src)
 
-        self._raw = src.replace('\r','')
+        self._rope   = None
+        self._source = None
+        self._raw    = src.replace('\r','')
         if ArgsUtils.get('stripSource', True, kwargs):
             self._raw = self._raw.strip('\n')
 
+        # In edit mode the source is stored in a rope and offset changes are applied lazily
+        self._editMode      = ArgsUtils.get('editMode', False, kwargs)
+        self._offsetTracker = None
+        if self._editMode:
+            self._rope   = TextRope(self._source)
+            self._source = None
+
         self._analyzed  = False
         self._errors    = []
         self._blocks    = []
         self._bookmarks = []
         self._initialBlock = ArgsUtils.get('initialBlock', None, kwargs)
+        self._openBlocks   = []
+        self._scanEngine   = ArgsUtils.get('scanEngine', self.DEFAULT_SCAN_ENGINE, kwargs)
+        self._scanners     = dict()
+
+        self._blockIndex    = TextIntervalIndex(self._blocks, groupAttribute='blockType')
+        self._bookmarkIndex = TextIntervalIndex(self._bookmarks)
 
         if isinstance(blockDefs, BlockDefinition):
             self._blockDefs = {'root':blockDefs}
@@ -78,6 +111,32 @@ class TextAnalyzer(object):
     def source(self):
         return self._raw
 
+#___________________________________________________________________________________________________ GS: _raw
+    @property
+    def _raw(self):
+        """The source text, which is joined from the rope in edit mode."""
+        return self._source if self._rope is None else self._rope.getText()
+    @_raw.setter
+    def _raw(self, value):
+        if self._rope is None:
+            self._source = value
+        else:
+            self._rope = TextRope(value)
+
+#___________________________________________________________________________________________________ GS: editMode
+    @property
+    def editMode(self):
+        """Whether or not the source is stored in a rope with offset changes applied lazily, which
+            makes insertCharacters cost O(log n) in the length of the source and the number of
+            blocks and bookmarks rather than O(n)."""
+        return self._editMode
+
+#___________________________________________________________________________________________________ GS: scanEngine
+    @property
+    def scanEngine(self):
+        """The TextScanEngineEnum value for the engine used to identify blocks during analysis."""
+        return self._scanEngine
+
 #___________________________________________________________________________________________________ GS: analyzed
     @property
     def analyzed(self):
@@ -101,47 +160,27 @@ class TextAnalyzer(object):
 #___________________________________________________________________________________________________ GS: parensBlocks
     @property
     def parensBlocks(self):
-        res = []
-        for b in self.blocks:
-            if b.blockType == BlockSyntaxEnum.PARENS:
-                res.append(b)
-        return res
+        return self.getBlocksByType(BlockSyntaxEnum.PARENS)
 
 #___________________________________________________________________________________________________ GS: bracketBlocks
     @property
     def bracketBlocks(self):
-        res = []
-        for b in self.blocks:
-            if b.blockType == BlockSyntaxEnum.BRACKETS:
-                res.append(b)
-        return res
+        return self.getBlocksByType(BlockSyntaxEnum.BRACKETS)
 
 #___________________________________________________________________________________________________ GS: bracesBlocks
     @property
     def bracesBlocks(self):
-        res = []
-        for b in self.blocks:
-            if b.blockType == BlockSyntaxEnum.BRACES:
-                res.append(b)
-        return res
+        return self.getBlocksByType(BlockSyntaxEnum.BRACES)
 
 #___________________________________________________________________________________________________ GS: commentBlocks
     @property
     def commentBlocks(self):
-        res = []
-        for b in self.blocks:
-            if b.blockType == BlockSyntaxEnum.COMMENT:
-                res.append(b)
-        return res
+        return self.getBlocksByType(BlockSyntaxEnum.COMMENT)
 
 #___________________________________________________________________________________________________ GS: stringBlocks
     @property
     def stringBlocks(self):
-        res = []
-        for b in self.blocks:
-            if b.blockType == BlockSyntaxEnum.STRING:
-                res.append(b)
-        return res
+        return self.getBlocksByType(BlockSyntaxEnum.STRING)
 
 #===================================================================================================
 #                                                                                     P U B L I C
@@ -171,32 +210,50 @@ class TextAnalyzer(object):
 
 #___________________________________________________________________________________________________ changeOffsets
     def changeOffsets(self, index, amount):
-        for b in self._blocks + self._bookmarks:
-            b.changeOffset(index, amount)
+        if self._editMode and self._shiftOffsets(index, amount):
+            return
+
+        for items, itemIndex in [
+                (self._blocks, self._blockIndex), (self._bookmarks, self._bookmarkIndex)]:
+            version = itemIndex.modificationCount
+            if self._changeItemOffsets(items, index, amount):
+                itemIndex.shift(index, amount, version)
 
 #___________________________________________________________________________________________________ indexInBlock
     def indexInBlock(self, index, blockTypes =None):
-        if blockTypes and not isinstance(blockTypes, list):
-            blockTypes = [blockTypes]
-
-        for b in self._blocks:
-            if (blockTypes is None or (blockTypes and b.blockType in blockTypes)) \
-               and b.start <= index and b.end > index:
-                return b
-
-        return None
+        blocks = self.getBlocksAtIndex(index, blockTypes)
+        return blocks[0] if blocks else None
+
+#___________________________________________________________________________________________________ getBlocksAtIndex
+    def getBlocksAtIndex(self, index, blockTypes =None):
+        """ Returns a list of the blocks, optionally limited to the specified block types, that
+            contain the index. """
+        blockTypes = self._getBlockTypesList(blockTypes)
+        if blockTypes is not None and not blockTypes:
+            return []
+        return self._blockIndex.findContaining(index, blockTypes)
+
+#___________________________________________________________________________________________________ getBlocksInRange
+    def getBlocksInRange(self, start, end, blockTypes =None):
+        """ Returns a list of the blocks, optionally limited to the specified block types, that
+            overlap or touch the range from start to end, i.e. where the block starts at or before
+            end and ends at or after start. """
+        blockTypes = self._getBlockTypesList(blockTypes)
+        if blockTypes is not None and not blockTypes:
+            return []
+        return self._blockIndex.findInRange(start, end, blockTypes)
 
 #___________________________________________________________________________________________________ lookAhead
     def lookAhead(self, index, pattern):
-        return self._lookAhead(self._raw, index, pattern)
+        return self._queryLookAhead(self._getQueryText(), index, pattern)
 
 #___________________________________________________________________________________________________ lookBack
     def lookBack(self, index, pattern):
-        return self._lookBack(self._raw, index, pattern)
+        return self._queryLookBack(self._getQueryText(), index, pattern)
 
 #___________________________________________________________________________________________________ matches
     def matches(self, index, pattern, matchReqs =None):
-        return self._matches(self._raw, index, pattern, matchReqs)
+        return self._queryMatches(self._getQueryText(), index, pattern, matchReqs)
 
 #___________________________________________________________________________________________________ findNearestBlock
     def findNearestBlock(self, index, blockTypes =None, contains =True, searchAhead =True,
@@ -206,8 +263,14 @@ class TextAnalyzer(object):
 
 #___________________________________________________________________________________________________ addBookmark
     def addBookmark(self, start, end =None, name =None, data =None):
+        self._releaseOffsets()
         newBook = TextBookmark(start, end, name, data)
 
+        index = self._bookmarkIndex.getInsertPosition(start)
+        if index is not None:
+            self._bookmarkIndex.insert(index, newBook)
+            return newBook
+
         for b in self._bookmarks:
             if b.start > start:
                 self._bookmarks.insert(self._bookmarks.index(b), newBook)
@@ -234,6 +297,7 @@ class TextAnalyzer(object):
 
 #___________________________________________________________________________________________________ insertBlock
     def insertBlock(self, block, index =-1, afterBlock =None, beforeBlock =None):
+        self._releaseOffsets()
         if afterBlock:
             try:
                 self._blocks.insert(self._blocks.index(afterBlock) + 1, block)
@@ -249,6 +313,19 @@ class TextAnalyzer(object):
             self._blocks.insert(index, block)
             return
 
+        index = self._blockIndex.getInsertPosition(block.start, before=True)
+        if index is not None:
+            # Matches the behavior of the unordered search below, which inserts nothing when every
+            # existing block starts before the new block
+            if index == len(self._blocks):
+                return block
+
+            b = self._blocks[index]
+            if b.start == block.start and block.start != block.end and b.end >= block.end:
+                index += 1
+            self._blockIndex.insert(index, block)
+            return block
+
         index = 0
         for b in self._blocks:
             if b.start > block.start:
@@ -284,12 +361,7 @@ class TextAnalyzer(object):
 
 #___________________________________________________________________________________________________ getBlocksByType
     def getBlocksByType(self, blockType):
-        res = []
-        for b in self._blocks:
-            if b.blockType == blockType:
-                res.append(b)
-
-        return res
+        return self._blockIndex.getGroupItems(blockType)
 
 #___________________________________________________________________________________________________ getBlocksByPattern
     def getBlocksByPattern(self, pattern):
@@ -302,7 +374,67 @@ class TextAnalyzer(object):
 
 #___________________________________________________________________________________________________ getBlocksByPattern
     def getBlocksText(self, block):
-        return self.source[block.start:block.end]
+        return self._getSourceSlice(block.start, block.end)
+
+#___________________________________________________________________________________________________ getBlockDefinitions
+    def getBlockDefinitions(self):
+        """ Returns a list of every distinct block definition of the analyzer, starting with the
+            initial block definition followed by the definitions of each find state in order of
+            the state names. """
+        defs = [self._initialBlock] if self._initialBlock else []
+        for key in sorted(self._blockDefs.keys()):
+            value = self._blockDefs[key]
+            for d in (value if isinstance(value, list) else [value]):
+                if not any(d is existing for existing in defs):
+                    defs.append(d)
+        return defs
+
+#___________________________________________________________________________________________________ getAnalysisState
+    def getAnalysisState(self):
+        """ Returns the results of the analysis as a dictionary of plain values that can be
+            serialized and later passed to restoreAnalysisState() for the same source and block
+            definitions. Blocks are stored as a flat list of start, end and the index of the block
+            definition within getBlockDefinitions() for each block. """
+        self._releaseOffsets()
+        defIndexes = dict((id(d), i) for i, d in enumerate(self.getBlockDefinitions()))
+
+        blocks = []
+        for b in self._blocks:
+            if id(b.blockDef) not in defIndexes:
+                raise ValueError('Block definition of %s is not defined in the analyzer' % b)
+            blocks.extend([b.start, b.end, defIndexes[id(b.blockDef)]])
+
+        state = {'blocks':blocks, 'errors':[dict(e) for e in self._errors]}
+        self._getAnalysisStateImpl(state)
+        return state
+
+#___________________________________________________________________________________________________ restoreAnalysisState
+    def restoreAnalysisState(self, state):
+        """ Replaces the analysis with the blocks and errors of an analysis state returned by
+            getAnalysisState(), which leaves the analyzer ready to query without analyzing the
+            source again. An invalid state raises an exception and leaves the analyzer without
+            any analysis. """
+        self._releaseOffsets()
+        defs   = self.getBlockDefinitions()
+        blocks = state['blocks']
+
+        del self._openBlocks[:]
+        try:
+            self._blocks[:] = [
+                TextBlock(defs[blocks[i + 2]], blocks[i], blocks[i + 1])
+                for i in range(0, len(blocks), 3)]
+            self._errors[:] = [dict(e) for e in state['errors']]
+            self._blockIndex.invalidate()
+
+            self._analyzed = True
+            self._restoreAnalysisStateImpl(state)
+            self._postAnalyzeImpl()
+        except Exception:
+            del self._blocks[:]
+            del self._errors[:]
+            self._blockIndex.invalidate()
+            self._analyzed = False
+            raise
 
 #===================================================================================================
 #                                                                               P R O T E C T E D
@@ -315,9 +447,216 @@ class TextAnalyzer(object):
     def _postAnalyzeImpl(self):
         pass
 
+#___________________________________________________________________________________________________ _getAnalysisStateImpl
+    def _getAnalysisStateImpl(self, state):
+        """ Adds any analysis results of subclasses to the analysis state dictionary. """
+        pass
+
+#___________________________________________________________________________________________________ _restoreAnalysisStateImpl
+    def _restoreAnalysisStateImpl(self, state):
+        """ Restores any analysis results of subclasses from the analysis state dictionary in
+            place of _preAnalyzeImpl(). """
+        pass
+
 #___________________________________________________________________________________________________ _insertImpl
     def _insertImpl(self, start, end, value):
-        self._raw = self._raw[:start] + value + self._raw[end:]
+        if self._rope is None:
+            self._raw = self._raw[:start] + value + self._raw[end:]
+        else:
+            self._rope.replace(start, end, value)
+
+#___________________________________________________________________________________________________ _getSourceSlice
+    def _getSourceSlice(self, start, end):
+        """ Returns the source from start to end without joining the rope in edit mode. """
+        if self._rope is None:
+            return self._source[start:end]
+        return self._rope.getSlice(start, end)
+
+#___________________________________________________________________________________________________ _getQueryText
+    def _getQueryText(self):
+        """ Returns the text searched by the public queries, which is the rope in edit mode. """
+        return self._source if self._rope is None else self._rope
+
+#___________________________________________________________________________________________________ _queryLookAhead
+    def _queryLookAhead(self, text, index, pattern):
+        """ Looks ahead of the index within the text, which is searched in windows read from the
+            rope if it is a TextRope instead of a string. """
+        if not isinstance(text, TextRope):
+            return self._lookAhead(text, index, pattern)
+
+        if index > len(text) - 1:
+            return None
+
+        if StringUtils.isStringType(pattern):
+            pattern = MatchLookDefinition.compileLookPattern(pattern, True)
+
+        return self._matchRope(text, index + 1, pattern) is not None
+
+#___________________________________________________________________________________________________ _queryLookBack
+    def _queryLookBack(self, text, index, pattern):
+        """ Looks back from the index over the text before it. Matches are searched for in
+            windows of doubling size before the index, so that only the characters needed are
+            read from the rope when the text is a TextRope. Each search begins within the window,
+            where the start of the window does not match the start of the text. """
+        if index == 0:
+            return None
+
+        if StringUtils.isStringType(pattern):
+            pattern = MatchLookDefinition.compileLookPattern(pattern, False)
+
+        window = self._QUERY_WINDOW
+        while True:
+            pos = max(0, index - window)
+            if isinstance(text, TextRope) and window > self._MAX_QUERY_WINDOW:
+                text = text.getText()
+
+            if isinstance(text, TextRope):
+                start = max(0, pos - window)
+                found = pattern.search(text.getSlice(start, index), pos - start)
+            else:
+                found = pattern.search(text, pos, index)
+
+            if found is not None:
+                return True
+            if pos == 0:
+                return False
+            window *= 2
+
+#___________________________________________________________________________________________________ _queryMatches
+    def _queryMatches(self, text, index, pattern, matchReqs =None):
+        """ Matches the pattern and match requirements at the index within the text, which is read
+            in windows from the rope if it is a TextRope instead of a string. """
+        if not isinstance(text, TextRope):
+            return self._matches(text, index, pattern, matchReqs)
+
+        if StringUtils.isStringType(pattern):
+            offset = len(pattern)
+            if text.getSlice(index, index + offset) != pattern:
+                return False
+        else:
+            try:
+                span = self._matchRope(text, index, pattern)
+            except Exception:
+                return False
+            if span is None:
+                return False
+            offset = span[1] - span[0]
+
+        if not matchReqs:
+            return True
+
+        if not isinstance(matchReqs, list):
+            matchReqs = [matchReqs]
+
+        for m in matchReqs:
+            if m.escapeCharacter and self._isEscapedRope(text, index, m.escapeCharacter):
+                return False
+
+            if m.pattern:
+                if m.lookAhead:
+                    res = self._queryLookAhead(text, index + offset - 1, m.compiledPattern)
+                else:
+                    # The look back window is preceded by enough of the text that its start is
+                    # not taken for the start of the text
+                    window = m.lookBackWindow or MatchLookDefinition.DEFAULT_LOOK_BACK_WINDOW
+                    start  = max(0, index - window - self._QUERY_WINDOW)
+                    res    = self._lookBack(
+                        text.getSlice(start, index), index - start, m.compiledPattern, window)
+
+                if not res is None and res == m.ignoreIfFound:
+                    return False
+
+        return True
+
+#___________________________________________________________________________________________________ _matchRope
+    def _matchRope(self, rope, pos, pattern):
+        """ Returns the (start, end) span of the match of the pattern at the position within the
+            rope, or None if it does not match. The pattern is matched against windows of
+            doubling size around the position, where the end of a window is only taken for the
+            end of the text if it is. A match is decided by a window once it ends within the first
+            half of the window, and the rope is joined when no window up to the maximum size
+            decides it. """
+        length = len(rope)
+        window = self._QUERY_WINDOW
+        while window <= self._MAX_QUERY_WINDOW:
+            start = max(0, pos - window)
+            end   = min(length, pos + window)
+            match = pattern.match(rope.getSlice(start, end), pos - start)
+            if end == length or (match is not None and match.end() - match.start() <= window//2):
+                return None if match is None else (start + match.start(), start + match.end())
+            window *= 2
+
+        match = pattern.match(rope.getText(), pos)
+        return None if match is None else match.span()
+
+#___________________________________________________________________________________________________ _isEscapedRope
+    def _isEscapedRope(self, rope, index, escapeCharacter):
+        """ Determines whether or not the character at the index of the rope is escaped, reading
+            windows of doubling size before it until one contains the start of the escapes. """
+        window = self._QUERY_WINDOW
+        while True:
+            start = max(0, index - window)
+            src   = rope.getSlice(start, index)
+            if start == 0 or src.rstrip('\\'):
+                return self._isEscaped(src, index - start, escapeCharacter)
+            window *= 2
+
+#___________________________________________________________________________________________________ _shiftOffsets
+    def _shiftOffsets(self, index, amount):
+        """ Applies the offset change lazily to every block and bookmark, returning False if it
+            must instead be applied to each of them directly. """
+        count   = len(self._blocks) + len(self._bookmarks)
+        tracker = self._offsetTracker
+        if tracker is None or not tracker.active or tracker.count != count:
+            self._releaseOffsets()
+            tracker = TextOffsetTracker(self._blocks + self._bookmarks)
+            self._offsetTracker = tracker
+
+        blockVersion    = self._blockIndex.modificationCount
+        bookmarkVersion = self._bookmarkIndex.modificationCount
+        if tracker.shift(index, amount):
+            if not tracker.pinnedCount:
+                # Every start and end moved in order, so the indexes translate their queries
+                # instead of being rebuilt
+                self._blockIndex.shift(index, amount, blockVersion)
+                self._bookmarkIndex.shift(index, amount, bookmarkVersion)
+            else:
+                self._blockIndex.invalidate()
+                self._bookmarkIndex.invalidate()
+            return True
+
+        self._releaseOffsets()
+        return False
+
+#___________________________________________________________________________________________________ _changeItemOffsets
+    @classmethod
+    def _changeItemOffsets(cls, items, index, amount):
+        """ Applies the offset change to each of the items directly, returning True if the
+            change preserved the order of their starts and of their ends so that an index over
+            them can record it with TextIntervalIndex.shift(). """
+        limit   = index - amount
+        ordered = True
+        for b in items:
+            if ordered:
+                start = b.start
+                end   = b.end
+
+                # Open blocks do not move with changes before their start, and removals move
+                # any start or end inside the removed range out of order
+                if end is None or end < start or \
+                        (amount < 0 and (index < start < limit or index < end < limit)):
+                    ordered = False
+
+            b.changeOffset(index, amount)
+        return ordered
+
+#___________________________________________________________________________________________________ _releaseOffsets
+    def _releaseOffsets(self):
+        """ Stores lazily applied offset changes in the blocks and bookmarks, which is required
+            before blocks or bookmarks are added. """
+        if self._offsetTracker is not None:
+            self._offsetTracker.release()
+            self._offsetTracker = None
 
 #___________________________________________________________________________________________________ _findNearestBlock
     def _findNearestBlock(self, index, blocks, blockTypes =None, contains =True, searchAhead =True,
@@ -325,6 +664,11 @@ class TextAnalyzer(object):
         if blockTypes and not isinstance(blockTypes, list):
             blockTypes = [blockTypes]
 
+        if blocks is self._blocks:
+            if blockTypes is not None and not blockTypes:
+                return None
+            return self._blockIndex.findNearest(index, searchAhead, searchBack, blockTypes)
+
         res     = None
         prevSep = float('inf')
         for b in blocks:
@@ -345,6 +689,13 @@ class TextAnalyzer(object):
 
         return res
 
+#___________________________________________________________________________________________________ _getBlockTypesList
+    @classmethod
+    def _getBlockTypesList(cls, blockTypes):
+        if blockTypes and not isinstance(blockTypes, list):
+            return [blockTypes]
+        return blockTypes
+
 #___________________________________________________________________________________________________ _writeDebugLog
     def _writeDebugLog(self, *args, **kwargs):
         if self._debug:
@@ -352,8 +703,11 @@ class TextAnalyzer(object):
 
 #___________________________________________________________________________________________________ _addBlock
     def _addBlock(self, start, end, blockDef):
+        self._releaseOffsets()
         b = TextBlock(blockDef, start, end)
         self._blocks.append(b)
+        if end == -1 or end is None:
+            self._openBlocks.append(b)
         return b
 
 #___________________________________________________________________________________________________ _addError
@@ -401,9 +755,10 @@ class TextAnalyzer(object):
 
                 if m.pattern:
                     if m.lookAhead:
-                        res = self._lookAhead(src, endIndex, m.pattern)
+                        res = self._lookAhead(src, endIndex, m.compiledPattern)
                     else:
-                        res = self._lookBack(src, endIndex, m.pattern)
+                        res = self._lookBack(
+                            src, endIndex, m.compiledPattern, m.lookBackWindow)
 
                     if not res is None and res == m.ignoreIfFound:
                         return self._findTerminator(src, endIndex+1, pattern, matchReqs)
@@ -413,7 +768,7 @@ class TextAnalyzer(object):
 #___________________________________________________________________________________________________ _lookAhead
     def _isEscaped(self, src, index, escapeCharacter):
         count = 0
-        while True:
+        while index > 0:
             index -= 1
             if src[index] != '\\':
                 break
@@ -424,25 +779,36 @@ class TextAnalyzer(object):
 
 #___________________________________________________________________________________________________ _lookAhead
     def _lookAhead(self, src, index, pattern):
+        """ Determines whether or not the pattern matches the source immediately after the index.
+            String patterns are compiled and cached, while compiled patterns must already be look
+            ahead patterns created by MatchLookDefinition.compileLookPattern. """
+
         if index > len(src) - 1:
             return None
 
-        p = re.compile('^' + pattern)
-        if p.search(src[index+1:]):
-            return True
+        if StringUtils.isStringType(pattern):
+            pattern = MatchLookDefinition.compileLookPattern(pattern, True)
 
-        return False
+        return pattern.match(src, index + 1) is not None
 
 #___________________________________________________________________________________________________ _lookBack
-    def _lookBack(self, src, index, pattern):
+    def _lookBack(self, src, index, pattern, window =None):
+        """ Determines whether or not the pattern matches the source ending immediately before the
+            index. Only the window characters preceding the index are searched so that the cost of
+            the check does not grow with the length of the source. String patterns are compiled
+            and cached, while compiled patterns must already be look back patterns created by
+            MatchLookDefinition.compileLookPattern. """
+
         if index == 0:
             return None
 
-        p = re.compile(pattern + '$')
-        if p.search(src[:index]):
-            return True
+        if StringUtils.isStringType(pattern):
+            pattern = MatchLookDefinition.compileLookPattern(pattern, False)
 
-        return False
+        if window is None:
+            window = MatchLookDefinition.DEFAULT_LOOK_BACK_WINDOW
+
+        return pattern.search(src, max(0, index - window), index) is not None
 
 #___________________________________________________________________________________________________ _matches
     def _matches(self, src, index, pattern, matchReqs =None):
@@ -477,9 +843,9 @@ class TextAnalyzer(object):
 
             if m.pattern:
                 if m.lookAhead:
-                    res = self._lookAhead(src, index + offset - 1, m.pattern)
+                    res = self._lookAhead(src, index + offset - 1, m.compiledPattern)
                 else:
-                    res = self._lookBack(src, index, m.pattern)
+                    res = self._lookBack(src, index, m.compiledPattern, m.lookBackWindow)
 
                 if not res is None and res == m.ignoreIfFound:
                     return False
@@ -495,44 +861,22 @@ class TextAnalyzer(object):
         s        = self._raw
         block    = self._addBlock(0, -1, self._initialBlock) if self._initialBlock else None
         findDefs = self._getFindBlockDefs(block) if block else self._blockDefs['root']
+        useRegex = self._scanEngine == TextScanEngineEnum.REGEX
 
         while index < len(s):
-            #---------------------------------------------------------------------------------------
-            # IDENTIFY BLOCKS
-            for d in findDefs:
-                if self._matches(s, index, d.pattern, matchReqs=d.matchReqs):
-                    # Handles the same block open twice at the start
-                    if index == 0 and block and block.blockDef == d:
-                        continue
-
-                    if block and block.blockDef.chainBlocks and block.blockDef == d:
-                        block.end = index + 1
-
-                    self._addBlock(index, -1, d)
-                    block    = self._blocks[-1]
-                    findDefs = self._getFindBlockDefs(block)
-                    break
-
-                #-----------------------------------------------------------------------------------
-                # CLOSE THE MATCHING OPEN BLOCK
-                if block and block.blockDef == d \
-                   and self._matches(s, index, d.terminator, matchReqs=d.terminatorReqs):
-                    block.end = index + 1
-                    block     = self._getNextOpenBlock()
-                    findDefs  = self._getFindBlockDefs(block)
-                    break
-
-            #---------------------------------------------------------------------------------------
-            # CLOSE "BLOCKED" BLOCKS
-            if block and block.findState == BlockDefinition.BLOCKED:
-                d          = block.blockDef
-                index      = self._findTerminator(s, index, d.terminator, d.terminatorReqs)
-                block.end  = index
-                block      = self._getNextOpenBlock()
-                findDefs   = self._getFindBlockDefs(block)
-                continue
-
-            index += 1
+            if useRegex and not (block and block.findState == BlockDefinition.BLOCKED):
+                # Jumps ahead to the next index where a block could open or close. Indexes
+                # skipped over would not have matched any of the find definitions.
+                scanner = self._getBlockScanner(block, findDefs)
+                if scanner is not None:
+                    result = scanner.search(s, index)
+                    if result is None:
+                        break
+                    index = result.start()
+                    if index >= len(s):
+                        break
+
+            index, block, findDefs = self._analyzeIndex(s, index, block, findDefs)
 
         # If the block should be closed by the last character, whether or not a terminator is found
         # set the end appropriately.
@@ -540,6 +884,101 @@ class TextAnalyzer(object):
             if b.blockDef.closeAtEnd and b.end == -1 or b.end == None:
                 b.end = len(s)
 
+#___________________________________________________________________________________________________ _analyzeIndex
+    def _analyzeIndex(self, s, index, block, findDefs):
+        """ Opens and closes blocks at the specified index and returns a tuple containing the next
+            index to analyze and the resulting open block and find definitions. """
+
+        #-------------------------------------------------------------------------------------------
+        # IDENTIFY BLOCKS
+        for d in findDefs:
+            if self._matches(s, index, d.pattern, matchReqs=d.matchReqs):
+                # Handles the same block open twice at the start
+                if index == 0 and block and block.blockDef == d:
+                    continue
+
+                if block and block.blockDef.chainBlocks and block.blockDef == d:
+                    block.end = index + 1
+
+                self._addBlock(index, -1, d)
+                block    = self._blocks[-1]
+                findDefs = self._getFindBlockDefs(block)
+                break
+
+            #---------------------------------------------------------------------------------------
+            # CLOSE THE MATCHING OPEN BLOCK
+            if block and block.blockDef == d \
+               and self._matches(s, index, d.terminator, matchReqs=d.terminatorReqs):
+                block.end = index + 1
+                block     = self._getNextOpenBlock()
+                findDefs  = self._getFindBlockDefs(block)
+                break
+
+        #-------------------------------------------------------------------------------------------
+        # CLOSE "BLOCKED" BLOCKS
+        if block and block.findState == BlockDefinition.BLOCKED:
+            d          = block.blockDef
+            index      = self._findTerminator(s, index, d.terminator, d.terminatorReqs)
+            block.end  = index
+            block      = self._getNextOpenBlock()
+            findDefs   = self._getFindBlockDefs(block)
+            return index, block, findDefs
+
+        return index + 1, block, findDefs
+
+#___________________________________________________________________________________________________ _getBlockScanner
+    def _getBlockScanner(self, openBlock, findDefs):
+        """ Returns the compiled scanner expression that finds the next index at which any of the
+            find definitions could open a block or the open block could be terminated, or None if
+            the patterns cannot be combined and every index must be analyzed instead. """
+
+        # The find definitions are determined entirely by the block definition of the open block
+        key = openBlock.blockDef if openBlock else None
+        if key in self._scanners:
+            return self._scanners[key]
+
+        closeDef = openBlock.blockDef if openBlock and openBlock.blockDef in findDefs else None
+        patterns = [d.pattern for d in findDefs]
+        if closeDef:
+            patterns.append(closeDef.terminator)
+
+        groups = []
+        for p in patterns:
+            source = self._getScannerSource(p)
+            if source is None:
+                groups = None
+                break
+            groups.append('(?P<_scan%s>%s)' % (len(groups), source))
+
+        scanner = None
+        if groups is not None:
+            try:
+                scanner = re.compile('|'.join(groups)) if groups else self._NO_MATCH_PATTERN
+            except Exception:
+                scanner = None
+
+        self._scanners[key] = scanner
+        return scanner
+
+#___________________________________________________________________________________________________ _getScannerSource
+    def _getScannerSource(self, pattern):
+        """ Returns the regular expression source for the block pattern that can be included in a
+            block scanner, or None if the pattern cannot be included. """
+
+        if StringUtils.isStringType(pattern):
+            return re.escape(pattern)
+
+        source = getattr(pattern, 'pattern', None)
+        if not StringUtils.isStringType(source):
+            return None
+
+        # Flags other than unicode would be lost when combined, and back references would no
+        # longer refer to the correct group after renumbering.
+        if pattern.flags & ~re.UNICODE or self._BACK_REFERENCE_PATTERN.search(source):
+            return None
+
+        return source
+
 #___________________________________________________________________________________________________ _getFindBlockDefs
     def _getFindBlockDefs(self, openBlock):
         if openBlock is None or openBlock.findState is None:
@@ -552,9 +991,13 @@ class TextAnalyzer(object):
 
 #___________________________________________________________________________________________________ _getNextOpenBlock
     def _getNextOpenBlock(self):
-        for b in reversed(self._blocks):
+        # Blocks are only ever closed from the top of the open block stack, so closed blocks can
+        # be discarded as they are encountered instead of searching back through all blocks.
+        while self._openBlocks:
+            b = self._openBlocks[-1]
             if b.end == -1 or b.end == None:
                 return b
+            self._openBlocks.pop()
         return None
 
 
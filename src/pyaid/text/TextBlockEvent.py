@@ -0,0 +1,54 @@
+# TextBlockEvent.py
+# (C)2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+#___________________________________________________________________________________________________ TextBlockEvent
+class TextBlockEvent(object):
+    """ The opening or closing of a block found by a TextStreamAnalyzer. The block of the event
+        has absolute offsets within the streamed text and is shared by the open and close events
+        for the block, so its end is set once the block has closed. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    OPEN  = 'open'
+    CLOSE = 'close'
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, eventType, block):
+        """Creates a new instance of TextBlockEvent."""
+        self._eventType = eventType
+        self._block     = block
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: eventType
+    @property
+    def eventType(self):
+        """ Either TextBlockEvent.OPEN or TextBlockEvent.CLOSE. """
+        return self._eventType
+
+#___________________________________________________________________________________________________ GS: block
+    @property
+    def block(self):
+        return self._block
+
+#___________________________________________________________________________________________________ GS: index
+    @property
+    def index(self):
+        """ The absolute offset at which the block opened or closed. """
+        return self._block.start if self._eventType == self.OPEN else self._block.end
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ __repr__
+    def __repr__(self):
+        return self.__str__()
+
+#___________________________________________________________________________________________________ __str__
+    def __str__(self):
+        return '<BlockEvent:%s %s %s>' % (self._eventType, str(self.index), str(self._block))
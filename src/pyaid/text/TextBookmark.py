@@ -25,28 +25,51 @@ class TextBookmark(object):
         self._originalStart = ArgsUtils.get('originalStart', self._start, kwargs)
         self._originalEnd   = ArgsUtils.get('originalEnd', self._end, kwargs)
 
+        # Set while a TextOffsetTracker resolves the start and end of the bookmark
+        self._tracker   = None
+        self._startSlot = None
+        self._endSlot   = None
+
+        # The TextIntervalIndex instances over the bookmark, which are notified when its
+        # position is modified
+        self._indexes = None
+
 #===================================================================================================
 #                                                                                   G E T / S E T
 
 #___________________________________________________________________________________________________ GS: start
     @property
     def start(self):
+        if self._tracker is not None:
+            return self._tracker.getStart(self._startSlot)
         return self._start
     @start.setter
     def start(self, value):
+        self._release()
         self._start = value
+        self._markModified()
 
 #___________________________________________________________________________________________________ GS: end
     @property
     def end(self):
+        if self._tracker is not None:
+            return self._tracker.getEnd(self._endSlot)
         return self._end
     @end.setter
     def end(self, value):
+        self._release()
         if (self._end is None and self._originalEnd is None) or \
                 (self._end < self.start and self._originalEnd < self._originalStart):
             self._originalEnd = value
 
         self._end = value
+        self._markModified()
+
+#___________________________________________________________________________________________________ GS: tracker
+    @property
+    def tracker(self):
+        """ The TextOffsetTracker resolving the position of the bookmark, if any. """
+        return self._tracker
 
 #___________________________________________________________________________________________________ GS: name
     @property
@@ -78,9 +101,11 @@ class TextBookmark(object):
 #___________________________________________________________________________________________________ changeOffset
     def changeOffset(self, index, amount):
         """Doc..."""
+        self._release()
         if index > self.end:
             return
 
+        self._markModified()
         if index < self.start:
             self._start += amount
 
@@ -107,11 +132,23 @@ class TextBookmark(object):
 #___________________________________________________________________________________________________ _cloneImpl
     def _cloneImpl(self, **kwargs):
         return self.__class__(
-            start=self._start,
-            end=self._end,
+            start=self.start,
+            end=self.end,
             name=self._name,
             data=self._data,
             originalStart=self._originalStart,
             originalEnd=self._originalEnd,
             **kwargs
         )
+
+#___________________________________________________________________________________________________ _markModified
+    def _markModified(self):
+        if self._indexes:
+            for index in self._indexes:
+                index.markModified()
+
+#___________________________________________________________________________________________________ _release
+    def _release(self):
+        """ Stops offset tracking for the bookmark before its position is modified directly. """
+        if self._tracker is not None:
+            self._tracker.release()
@@ -0,0 +1,438 @@
+# TextIntervalIndex.py
+# (C)2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import bisect
+
+#___________________________________________________________________________________________________ TextIntervalIndex
+class TextIntervalIndex(object):
+    """ An index over a list of TextBookmark or TextBlock instances that answers containment,
+        range and nearest queries in O(log n + k) time. The items are sorted by start and an
+        implicit interval tree, which stores the maximum end beneath each node, prunes the search
+        for intervals that reach the query. Results are returned in the order of the indexed list.
+
+        The indexed list is referenced rather than copied and the index rebuilds itself on the
+        next query after the list changes length or the position of an indexed bookmark changes,
+        which each bookmark reports to the indexes over it. Changes that do neither, like
+        replacing list items in place, require an explicit call to invalidate(). Offset changes
+        that preserve the order of every start and end can instead be recorded with shift(),
+        which translates the queries until the next rebuild. When a group
+        attribute is specified a secondary index is also maintained for each distinct value of
+        that attribute on the items. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    # Fills the unused leaves of the interval tree
+    _NO_END = float('-inf')
+
+    # The number of recorded offset changes after which the index is rebuilt instead, as every
+    # recorded change adds to the cost of each query
+    MAX_SHIFTS = 256
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, items, groupAttribute =None):
+        """Creates a new instance of TextIntervalIndex."""
+        self._items          = items
+        self._groupAttribute = groupAttribute
+        self._groups         = dict()
+
+        # The start of each item in list order, used to find insertion positions when the list
+        # is sorted by start
+        self._listStarts   = []
+        self._sorted       = False
+        self._orderVersion = None
+        self._treeVersion  = None
+
+        # Incremented whenever the position of an indexed bookmark changes
+        self._modificationCount = 0
+
+        # Item values sorted by start, along with the interval tree over them
+        self._starts    = []
+        self._ends      = []
+        self._positions = []
+        self._entries   = []
+        self._maxEnds   = []
+        self._size      = 0
+
+        # Indexes into the start sorted values ordered by end for nearest end queries
+        self._sortedEnds = []
+        self._endIndexes = []
+
+        # Offset changes applied to the items since the values were built, in order, and the
+        # number of shifts translated by the queries since then
+        self._shifts    = []
+        self._shiftCost = 0
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: modificationCount
+    @property
+    def modificationCount(self):
+        """ A count that changes whenever the position of an indexed bookmark is modified. """
+        return self._modificationCount
+
+#___________________________________________________________________________________________________ GS: isSorted
+    @property
+    def isSorted(self):
+        """ Whether or not the indexed list is ordered by start. """
+        self._refreshOrder()
+        return self._sorted
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ markModified
+    def markModified(self):
+        """ Records that the position of an indexed bookmark has changed. """
+        self._modificationCount += 1
+
+#___________________________________________________________________________________________________ invalidate
+    def invalidate(self):
+        """ Forces the index to be rebuilt by the next query. """
+        self._orderVersion = None
+        self._treeVersion  = None
+
+#___________________________________________________________________________________________________ refresh
+    def refresh(self):
+        """ Rebuilds the index if the indexed list or any bookmark position has changed. """
+        version = self._getVersion()
+        if self._treeVersion == version:
+            return
+
+        self._refreshOrder()
+
+        entries = [
+            (item.start, position, self._getEnd(item), item)
+            for position, item in enumerate(self._items) ]
+        if not self._sorted:
+            entries.sort(key=lambda e: (e[0], e[1]))
+        self._build(entries)
+
+        self._groups = dict()
+        if self._groupAttribute:
+            grouped = dict()
+            for e in entries:
+                grouped.setdefault(getattr(e[3], self._groupAttribute), []).append(e)
+
+            for key, groupEntries in grouped.items():
+                group = TextIntervalIndex([])
+                group._build(groupEntries)
+                group._shifts = self._shifts
+                group._items = [e[3] for e in sorted(groupEntries, key=lambda e: e[1])]
+                self._groups[key] = group
+
+        self._treeVersion = version
+
+#___________________________________________________________________________________________________ shift
+    def shift(self, index, amount, version):
+        """ Records an offset change that was just applied to every indexed item with the
+            results of TextBookmark.changeOffset, which must have preserved the order of the
+            starts and of the ends. The version is the modificationCount from before the change;
+            if the index was not up to date at that count it is rebuilt as usual. """
+        if self._treeVersion != (version, len(self._items)):
+            return
+
+        if len(self._shifts) >= self.MAX_SHIFTS:
+            self.invalidate()
+            return
+
+        self._shifts.append((index, amount))
+        self._treeVersion = self._getVersion()
+
+#___________________________________________________________________________________________________ getGroupItems
+    def getGroupItems(self, key):
+        """ Returns a list of the items with the specified group attribute value in list order. """
+        self.refresh()
+        group = self._groups.get(key)
+        return list(group._items) if group else []
+
+#___________________________________________________________________________________________________ findContaining
+    def findContaining(self, index, groups =None):
+        """ Returns a list of the items where start <= index < end in list order. If groups is
+            specified only items with one of the listed group attribute values are returned. """
+        results = []
+        for subIndex in self._getIndexes(groups):
+            results.extend(subIndex._findContaining(index))
+        return self._toItems(results)
+
+#___________________________________________________________________________________________________ findInRange
+    def findInRange(self, start, end, groups =None):
+        """ Returns a list of the items that overlap or touch the closed range from start to end,
+            where item.start <= end and item.end >= start, in list order. If groups is specified
+            only items with one of the listed group attribute values are returned. """
+        results = []
+        for subIndex in self._getIndexes(groups):
+            results.extend(subIndex._findInRange(start, end))
+        return self._toItems(results)
+
+#___________________________________________________________________________________________________ findNearest
+    def findNearest(self, index, searchAhead =True, searchBack =False, groups =None):
+        """ Returns the item nearest to the index, or None if there are no items. Items that
+            contain the index have a distance of zero, otherwise the distance is measured to the
+            start of the item when searchAhead is True and to the end of the item when searchBack
+            is True. Ties go to the item earliest in list order. """
+        best = None
+        for subIndex in self._getIndexes(groups):
+            result = subIndex._findNearest(index, searchAhead, searchBack)
+            if result and (best is None or result[:2] < best[:2]):
+                best = result
+        return best[2] if best else None
+
+#___________________________________________________________________________________________________ getInsertPosition
+    def getInsertPosition(self, start, before =False):
+        """ Returns the list position at which an item with the specified start should be
+            inserted to keep the list ordered by start, following any items with the same start
+            unless before is True. Returns None if the list is not ordered by start. """
+        self._refreshOrder()
+        if not self._sorted:
+            return None
+
+        if before:
+            return bisect.bisect_left(self._listStarts, start)
+        return bisect.bisect_right(self._listStarts, start)
+
+#___________________________________________________________________________________________________ insert
+    def insert(self, position, item):
+        """ Inserts the item into the indexed list at the specified position, updating the start
+            order incrementally instead of rebuilding it on the next query. """
+        version = self._getVersion()
+        self._items.insert(position, item)
+        self._watch([item])
+        if self._orderVersion != version:
+            return
+
+        starts = self._listStarts
+        starts.insert(position, item.start)
+        if position > 0 and starts[position - 1] > item.start:
+            self._sorted = False
+        elif position < len(starts) - 1 and starts[position + 1] < item.start:
+            self._sorted = False
+        self._orderVersion = self._getVersion()
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _getVersion
+    def _getVersion(self):
+        return self._modificationCount, len(self._items)
+
+#___________________________________________________________________________________________________ _getEnd
+    @classmethod
+    def _getEnd(cls, item):
+        # Open blocks have an end of -1 or None and contain no indexes
+        return -1 if item.end is None else item.end
+
+#___________________________________________________________________________________________________ _getIndexes
+    def _getIndexes(self, groups):
+        self.refresh()
+
+        # Once the queries have spent more translating recorded shifts than a rebuild costs,
+        # the index is rebuilt instead
+        if self._shifts:
+            self._shiftCost += len(self._shifts)
+            if self._shiftCost > len(self._items):
+                self.invalidate()
+                self.refresh()
+        if groups is None:
+            return [self]
+        return [self._groups[key] for key in groups if key in self._groups]
+
+#___________________________________________________________________________________________________ _toItems
+    @classmethod
+    def _toItems(cls, results):
+        results.sort(key=lambda r: r[0])
+        return [r[1] for r in results]
+
+#___________________________________________________________________________________________________ _refreshOrder
+    def _refreshOrder(self):
+        version = self._getVersion()
+        if self._orderVersion == version:
+            return
+
+        self._watch(self._items)
+        starts       = [item.start for item in self._items]
+        self._sorted = all(starts[i] <= starts[i + 1] for i in range(len(starts) - 1))
+        self._listStarts   = starts
+        self._orderVersion = version
+
+#___________________________________________________________________________________________________ _watch
+    def _watch(self, items):
+        """ Adds the index to the indexes notified of position changes by each of the items. """
+        for item in items:
+            indexes = item._indexes
+            if indexes is None:
+                item._indexes = (self,)
+            elif self not in indexes:
+                item._indexes = indexes + (self,)
+
+#___________________________________________________________________________________________________ _build
+    def _build(self, entries):
+        """ Builds the start sorted values and the interval tree from a list of
+            (start, position, end, item) tuples sorted by start and position. """
+        self._shifts    = []
+        self._shiftCost = 0
+        self._starts    = [e[0] for e in entries]
+        self._positions = [e[1] for e in entries]
+        self._ends      = [e[2] for e in entries]
+        self._entries   = [e[3] for e in entries]
+
+        count = len(entries)
+        size  = 1
+        while size < count:
+            size *= 2
+
+        # Leaves hold the item ends and every other node the maximum end of its children
+        tree = [self._NO_END]*(2*size)
+        tree[size:size + count] = self._ends
+        for i in range(size - 1, 0, -1):
+            tree[i] = max(tree[2*i], tree[2*i + 1])
+        self._maxEnds = tree
+        self._size    = size
+
+        ends = self._ends
+        positions = self._positions
+        self._endIndexes = sorted(range(count), key=lambda i: (ends[i], positions[i]))
+        self._sortedEnds = [ends[i] for i in self._endIndexes]
+
+#___________________________________________________________________________________________________ _toCurrent
+    def _toCurrent(self, value):
+        """ Returns the current position of a stored value. """
+        for index, amount in self._shifts:
+            if value > index:
+                value += amount
+        return value
+
+#___________________________________________________________________________________________________ _toStored
+    def _toStored(self, value):
+        """ Returns the largest stored value with a current position at or before value, which
+            is valid as a threshold because every shift preserves the order of the stored
+            values and moves none of them inside a removed range. """
+        for index, amount in reversed(self._shifts):
+            if amount > 0:
+                value = max(min(value, index), value - amount)
+            elif value >= index:
+                value -= amount
+        return value
+
+#___________________________________________________________________________________________________ _bisectLeft
+    def _bisectLeft(self, values, value):
+        """ Returns the number of stored values with a current position before value. """
+        if not self._shifts:
+            return bisect.bisect_left(values, value)
+        return bisect.bisect_right(values, self._toStored(value - 1))
+
+#___________________________________________________________________________________________________ _bisectRight
+    def _bisectRight(self, values, value):
+        """ Returns the number of stored values with a current position at or before value. """
+        if not self._shifts:
+            return bisect.bisect_right(values, value)
+        return bisect.bisect_right(values, self._toStored(value))
+
+#___________________________________________________________________________________________________ _collect
+    def _collect(self, count, threshold, inclusive):
+        """ Returns the start sorted indexes below count where the end is greater than the
+            threshold, or greater than or equal to it if inclusive is True. """
+        results = []
+        if count <= 0:
+            return results
+
+        tree  = self._maxEnds
+        nodes = [(1, 0, self._size)]
+        while nodes:
+            node, low, high = nodes.pop()
+            if low >= count:
+                continue
+
+            maxEnd = tree[node]
+            if maxEnd < threshold or (maxEnd == threshold and not inclusive):
+                continue
+
+            if high - low == 1:
+                results.append(low)
+                continue
+
+            middle = (low + high)//2
+            nodes.append((2*node + 1, middle, high))
+            nodes.append((2*node, low, middle))
+
+        return results
+
+#___________________________________________________________________________________________________ _findContaining
+    def _findContaining(self, index):
+        indexes = self._collectContaining(index)
+        return [(self._positions[i], self._entries[i]) for i in indexes]
+
+#___________________________________________________________________________________________________ _findInRange
+    def _findInRange(self, start, end):
+        count = self._bisectRight(self._starts, end)
+        if self._shifts:
+            indexes = self._collect(count, self._toStored(start - 1), False)
+        else:
+            indexes = self._collect(count, start, True)
+        return [(self._positions[i], self._entries[i]) for i in indexes]
+
+#___________________________________________________________________________________________________ _collectContaining
+    def _collectContaining(self, index):
+        """ Returns the start sorted indexes of the items that contain the index. """
+        count = self._bisectRight(self._starts, index)
+        return self._collect(count, self._toStored(index) if self._shifts else index, False)
+
+#___________________________________________________________________________________________________ _findNearest
+    def _findNearest(self, index, searchAhead, searchBack):
+        """ Returns a (distance, position, item) tuple for the nearest item or None if empty. """
+        if not self._entries:
+            return None
+
+        # Candidates are start sorted indexes of the items at the nearest distance
+        distance   = float('inf')
+        candidates = []
+
+        containing = self._collectContaining(index)
+        if containing:
+            distance   = 0
+            candidates = containing
+
+        if searchAhead:
+            d, indexes = self._findNearestValues(self._starts, index)
+            if d < distance:
+                distance, candidates = d, []
+            if d == distance:
+                candidates.extend(indexes)
+
+        if searchBack:
+            d, indexes = self._findNearestValues(self._sortedEnds, index)
+            if d < distance:
+                distance, candidates = d, []
+            if d == distance:
+                candidates.extend(self._endIndexes[i] for i in indexes)
+
+        if not candidates:
+            # Without a search direction every item is equally distant
+            candidates = range(len(self._entries))
+
+        i = min(candidates, key=lambda i: self._positions[i])
+        return distance, self._positions[i], self._entries[i]
+
+#___________________________________________________________________________________________________ _findNearestValues
+    def _findNearestValues(self, values, index):
+        """ Returns the smallest distance between the index and the current positions of the
+            sorted values along with the indexes of the values at that distance. """
+        i    = self._bisectLeft(values, index)
+        best = float('inf')
+        if i < len(values):
+            best = self._toCurrent(values[i]) - index
+        if i > 0:
+            best = min(best, index - self._toCurrent(values[i - 1]))
+        if best == float('inf'):
+            return best, []
+
+        indexes = []
+        for target in sorted(set([index - best, index + best])):
+            low  = self._bisectLeft(values, target)
+            high = self._bisectRight(values, target)
+            indexes.extend(range(low, high))
+        return best, indexes
@@ -0,0 +1,226 @@
+# TextLineIndex.py
+# (C)2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import bisect
+from array import array
+
+#___________________________________________________________________________________________________ TextLineIndex
+class TextLineIndex(object):
+    """ A sorted array of the indexes at which the lines of a text begin that answers index to
+        line and line to range queries by bisection and follows replacements of the text without
+        rescanning it.
+
+        A replacement removes the line starts inside the replaced range, inserts those of the new
+        value and shifts every following line start. The shift is stored as a pending amount for
+        all starts from a cursor position onward and is only written into the array between the
+        cursor and the next replacement, so replacements that move forward through the text, as
+        in a line by line rewrite, cost O(1) each aside from the array splice. The starts are
+        held in a compact integer array rather than a list of integer objects.
+
+        Lines include their trailing newline. A text that ends with a newline has no empty line
+        following it, while an empty text has a single empty line. Empty lines can also be
+        inserted and lines removed without changing the text, which adds a zero-length line or
+        merges a line into its neighbour. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, text =''):
+        """Creates a new instance of TextLineIndex."""
+        self._starts = None
+        self._length = 0
+
+        # Empty lines inserted after the last line of the text, which have no start of their own
+        self._endLines = 0
+
+        # Starts at or after the cursor position are stored without the pending shift
+        self._cursor = 0
+        self._shift  = 0
+
+        self.setText(text)
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: count
+    @property
+    def count(self):
+        """ The number of lines in the text. """
+        return self._getTextCount() + self._endLines
+
+#___________________________________________________________________________________________________ GS: length
+    @property
+    def length(self):
+        """ The length of the indexed text. """
+        return self._length
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ setText
+    def setText(self, text):
+        """ Rebuilds the index for the specified text. """
+        starts = [0]
+        index  = text.find('\n')
+        while index != -1:
+            starts.append(index + 1)
+            index = text.find('\n', index + 1)
+
+        self.setStarts(starts, len(text))
+
+#___________________________________________________________________________________________________ setStarts
+    def setStarts(self, starts, length):
+        """ Replaces the indexed line starts, which must be sorted and begin with zero, for a text
+            of the specified length. """
+        self._starts   = array('l', starts)
+        self._length   = length
+        self._endLines = 0
+        self._cursor   = len(self._starts)
+        self._shift    = 0
+
+#___________________________________________________________________________________________________ getStarts
+    def getStarts(self):
+        """ Returns a list of the indexes at which each line begins. """
+        return [self.getStart(i) for i in range(self.count)]
+
+#___________________________________________________________________________________________________ getStart
+    def getStart(self, line):
+        """ Returns the index at which the line begins, where negative lines count back from the
+            last line. """
+        line = self._toLine(line)
+        if line < len(self._starts):
+            return self._getStart(line)
+        return self._length
+
+#___________________________________________________________________________________________________ getEnd
+    def getEnd(self, line):
+        """ Returns the index at which the line ends, which follows slicing notation so that the
+            end is the start of the next line. """
+        line = self._toLine(line)
+        if line + 1 < len(self._starts):
+            return self._getStart(line + 1)
+        return self._length
+
+#___________________________________________________________________________________________________ findLine
+    def findLine(self, index):
+        """ Returns the line containing the character at the specified index, or -1 if there is
+            no such character. The single line of an empty text contains every index from zero. """
+        if index < 0:
+            return -1
+        if self._length == 0:
+            return 0
+        if index >= self._length:
+            return -1
+        return self._bisectRight(index) - 1
+
+#___________________________________________________________________________________________________ replace
+    def replace(self, start, end, value):
+        """ Updates the index for a replacement of the text from start to end with the value. """
+        start = max(0, min(start, self._length))
+        end   = max(start, min(end, self._length))
+
+        # Starts in the replaced range follow removed newlines and are replaced by the starts
+        # following the newlines in the value
+        low    = self._bisectRight(start)
+        high   = self._bisectRight(end)
+        starts = []
+        index  = value.find('\n')
+        while index != -1:
+            starts.append(start + index + 1)
+            index = value.find('\n', index + 1)
+
+        self._moveCursor(high)
+        self._starts[low:high] = array('l', starts)
+        self._cursor  = low + len(starts)
+        self._shift  += len(value) - end + start
+        self._length += len(value) - end + start
+
+#___________________________________________________________________________________________________ insertLine
+    def insertLine(self, line):
+        """ Inserts an empty line before the specified line, or after the last line if the line
+            is the line count, without changing the text. """
+        count = self.count
+        if not 0 <= line <= count:
+            raise IndexError('Line %s out of range for %s lines' % (line, count))
+
+        if line >= self._getTextCount():
+            self._endLines += 1
+            return
+
+        start = self._getStart(line)
+        self._moveCursor(line)
+        self._starts.insert(line, start)
+        self._cursor = line + 1
+
+#___________________________________________________________________________________________________ removeLine
+    def removeLine(self, line):
+        """ Removes the specified line without changing the text, which merges its characters
+            into the previous line, or into the next line for the first line. """
+        line = self._toLine(line)
+        if line >= self._getTextCount():
+            self._endLines -= 1
+            return
+
+        # The first line takes over the characters of the line after it instead
+        position = max(1, line)
+        if position >= self._getTextCount():
+            if not self._endLines:
+                raise IndexError('The only line of the text cannot be removed')
+            self._endLines -= 1
+            return
+
+        self._moveCursor(position)
+        del self._starts[position]
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _getTextCount
+    def _getTextCount(self):
+        """ Returns the number of lines in the text without the inserted empty end lines. """
+        count = len(self._starts)
+        if count > 1 and self._getStart(count - 1) == self._length:
+            return count - 1
+        return count
+
+#___________________________________________________________________________________________________ _toLine
+    def _toLine(self, line):
+        count = self.count
+        if line < 0:
+            line += count
+        if not 0 <= line < count:
+            raise IndexError('Line %s out of range for %s lines' % (line, count))
+        return line
+
+#___________________________________________________________________________________________________ _getStart
+    def _getStart(self, position):
+        if position < self._cursor:
+            return self._starts[position]
+        return self._starts[position] + self._shift
+
+#___________________________________________________________________________________________________ _bisectRight
+    def _bisectRight(self, index):
+        """ Returns the number of line starts at or before the index. """
+        starts = self._starts
+        cursor = self._cursor
+        if cursor < len(starts) and starts[cursor] + self._shift <= index:
+            return bisect.bisect_right(starts, index - self._shift, cursor)
+        return bisect.bisect_right(starts, index, 0, cursor)
+
+#___________________________________________________________________________________________________ _moveCursor
+    def _moveCursor(self, position):
+        """ Moves the cursor to the specified position, writing the pending shift into the starts
+            that cross it. """
+        starts = self._starts
+        shift  = self._shift
+        if position > self._cursor:
+            for i in range(self._cursor, min(position, len(starts))):
+                starts[i] += shift
+        else:
+            for i in range(position, self._cursor):
+                starts[i] -= shift
+        self._cursor = position
@@ -0,0 +1,148 @@
+# TextOffsetTracker.py
+# (C)2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+from pyaid.list.FenwickTree import FenwickTree
+
+#___________________________________________________________________________________________________ TextOffsetTracker
+class TextOffsetTracker(object):
+    """ Applies offset changes to a set of bookmarks lazily. The tracked bookmarks are ordered once
+        by start and once by end, and an offset change becomes a suffix addition to a Fenwick tree
+        over each ordering instead of an update to every bookmark. Positions are resolved by the
+        bookmarks when they are read.
+
+        The result of every change matches TextBookmark.changeOffset. Removals that would move a
+        tracked start or end from inside the removed range cannot be expressed as a suffix
+        addition; shift() rejects them and the caller must release the tracker and apply the
+        change to each bookmark directly. Tracked bookmarks do not notify the indexes over them
+        of lazily applied changes, which the caller must shift or invalidate. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, bookmarks):
+        """Creates a new instance of TextOffsetTracker."""
+        self._active = True
+        self._count  = len(bookmarks)
+        self._pinned = []
+        tracked      = []
+
+        for b in bookmarks:
+            if b.tracker is not None:
+                b.tracker.release()
+
+            # Bookmarks ending before they start, like open blocks, do not move with changes
+            # before their start and are updated directly instead.
+            if b.start is None or b.end is None or b.end < b.start:
+                self._pinned.append(b)
+            else:
+                tracked.append(b)
+
+        self._startItems = sorted(tracked, key=lambda b: b.start)
+        self._startBase  = [b.start for b in self._startItems]
+        self._startDelta = FenwickTree(size=len(tracked))
+
+        self._endItems = sorted(tracked, key=lambda b: b.end)
+        self._endBase  = [b.end for b in self._endItems]
+        self._endDelta = FenwickTree(size=len(tracked))
+
+        for slot, b in enumerate(self._startItems):
+            b._startSlot = slot
+        for slot, b in enumerate(self._endItems):
+            b._endSlot = slot
+        for b in tracked:
+            b._tracker = self
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: active
+    @property
+    def active(self):
+        """ Whether or not the tracker still resolves the positions of its bookmarks. """
+        return self._active
+
+#___________________________________________________________________________________________________ GS: count
+    @property
+    def count(self):
+        """ The number of bookmarks, tracked or pinned, that the tracker was created with. """
+        return self._count
+
+#___________________________________________________________________________________________________ GS: pinnedCount
+    @property
+    def pinnedCount(self):
+        """ The number of bookmarks, like open blocks, that are updated directly by each change
+            instead of lazily. """
+        return len(self._pinned)
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ getStart
+    def getStart(self, slot):
+        return self._startBase[slot] + self._startDelta.prefixSum(slot)
+
+#___________________________________________________________________________________________________ getEnd
+    def getEnd(self, slot):
+        return self._endBase[slot] + self._endDelta.prefixSum(slot)
+
+#___________________________________________________________________________________________________ shift
+    def shift(self, index, amount):
+        """ Applies an offset change of amount at index to every bookmark, returning False without
+            changing anything if the change cannot be applied lazily. """
+        if not self._active:
+            return False
+
+        startSlot = self._findSlot(self.getStart, len(self._startBase), index)
+        endSlot   = self._findSlot(self.getEnd, len(self._endBase), index)
+
+        if amount < 0:
+            limit = index - amount
+            if startSlot < len(self._startBase) and self.getStart(startSlot) < limit:
+                return False
+            if endSlot < len(self._endBase) and self.getEnd(endSlot) < limit:
+                return False
+
+        if startSlot < len(self._startBase):
+            self._startDelta.add(startSlot, amount)
+        if endSlot < len(self._endBase):
+            self._endDelta.add(endSlot, amount)
+
+        for b in self._pinned:
+            b.changeOffset(index, amount)
+        return True
+
+#___________________________________________________________________________________________________ release
+    def release(self):
+        """ Stores the current position in each tracked bookmark and stops tracking them. """
+        if not self._active:
+            return
+
+        self._active = False
+        for b in self._startItems:
+            start = self.getStart(b._startSlot)
+            end   = self.getEnd(b._endSlot)
+            b._tracker = None
+            b._start   = start
+            b._end     = end
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _findSlot
+    @classmethod
+    def _findSlot(cls, getValue, count, index):
+        """ Returns the first slot with a value greater than the index in an ordering of count
+            slots, or count if there is none. """
+        low  = 0
+        high = count
+        while low < high:
+            middle = (low + high)//2
+            if getValue(middle) > index:
+                high = middle
+            else:
+                low = middle + 1
+        return low
@@ -0,0 +1,144 @@
+# TextRope.py
+# (C)2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+from pyaid.list.FenwickTree import FenwickTree
+
+#___________________________________________________________________________________________________ TextRope
+class TextRope(object):
+    """ Mutable text stored as a list of chunks with a Fenwick tree over the chunk lengths, so that
+        replacing a range of the text only rebuilds the chunks it touches rather than the entire
+        text. The full text is joined on demand and cached until the next replacement. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    DEFAULT_CHUNK_SIZE = 2048
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, text ='', chunkSize =None):
+        """Creates a new instance of TextRope."""
+        self._chunkSize = chunkSize if chunkSize else self.DEFAULT_CHUNK_SIZE
+        self._chunks    = []
+        self._lengths   = None
+        self._length    = 0
+        self._text      = None
+        self._setText(text)
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: chunkCount
+    @property
+    def chunkCount(self):
+        return len(self._chunks)
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ getText
+    def getText(self):
+        """ Returns the full text, which is joined from the chunks only when it has changed. """
+        if self._text is None:
+            self._text = ''.join(self._chunks)
+        return self._text
+
+#___________________________________________________________________________________________________ getSlice
+    def getSlice(self, start, end):
+        """ Returns the text from start to end, following slicing notation, without joining the
+            full text. """
+        if self._text is not None:
+            return self._text[start:end]
+
+        start, end, step = slice(start, end).indices(self._length)
+        if end <= start:
+            return ''
+
+        index, offset = self._findChunk(start)
+        parts = []
+        while index < len(self._chunks) and offset < end:
+            chunk = self._chunks[index]
+            parts.append(chunk[max(0, start - offset):end - offset])
+            offset += len(chunk)
+            index  += 1
+        return ''.join(parts)
+
+#___________________________________________________________________________________________________ replace
+    def replace(self, start, end, value):
+        """ Replaces the text from start to end with the value, which is equivalent to
+            text[:start] + value + text[end:]. """
+        length = self._length
+        start  = slice(start, None).indices(length)[0]
+        end    = slice(None, end).indices(length)[1]
+        if end < start:
+            # Reversed ranges duplicate text and are not worth handling in place
+            text = self.getText()
+            self._setText(text[:start] + value + text[end:])
+            return
+
+        first, offset = self._findChunk(start)
+        last          = first
+        lastOffset    = offset
+        while lastOffset + len(self._chunks[last]) < end:
+            lastOffset += len(self._chunks[last])
+            last       += 1
+
+        if first == last:
+            chunk = self._chunks[first]
+            chunk = chunk[:start - offset] + value + chunk[end - offset:]
+            self._lengths.add(first, len(chunk) - len(self._chunks[first]))
+            self._chunks[first] = chunk
+        else:
+            chunk = self._chunks[first][:start - offset] + value \
+                + self._chunks[last][end - lastOffset:]
+            self._chunks[first:last + 1] = [chunk]
+
+        self._length += len(value) - end + start
+        self._text    = None
+
+        if first != last or len(chunk) > 2*self._chunkSize:
+            self._rebuildChunks()
+
+#___________________________________________________________________________________________________ __len__
+    def __len__(self):
+        return self._length
+
+#___________________________________________________________________________________________________ __str__
+    def __str__(self):
+        return self.getText()
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _setText
+    def _setText(self, text):
+        size         = self._chunkSize
+        self._chunks = [text[i:i + size] for i in range(0, len(text), size)] or ['']
+        self._lengths = FenwickTree([len(c) for c in self._chunks])
+        self._length = len(text)
+        self._text   = text
+
+#___________________________________________________________________________________________________ _rebuildChunks
+    def _rebuildChunks(self):
+        """ Splits oversized chunks and drops empty ones, then rebuilds the chunk length tree. """
+        size   = self._chunkSize
+        chunks = []
+        for chunk in self._chunks:
+            if len(chunk) > 2*size:
+                chunks.extend(chunk[i:i + size] for i in range(0, len(chunk), size))
+            elif chunk:
+                chunks.append(chunk)
+
+        self._chunks  = chunks or ['']
+        self._lengths = FenwickTree([len(c) for c in self._chunks])
+
+#___________________________________________________________________________________________________ _findChunk
+    def _findChunk(self, index):
+        """ Returns the index of the chunk that contains the character at the specified index,
+            or the last chunk for the end of the text, along with the offset at which that chunk
+            begins. """
+        chunkIndex = min(self._lengths.findPrefix(index), len(self._chunks) - 1)
+        offset     = self._lengths.prefixSum(chunkIndex - 1) if chunkIndex > 0 else 0
+        return chunkIndex, offset
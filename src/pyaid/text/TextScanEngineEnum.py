@@ -0,0 +1,22 @@
+# TextScanEngineEnum.py
+# (C)2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+#___________________________________________________________________________________________________ TextScanEngineEnum
+class TextScanEngineEnum(object):
+    """ Block scanning engines available to the TextAnalyzer. Both engines produce identical
+        block lists for the same source and block definitions. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    # Visits every character of the source and tests each block definition of the active find
+    # state against it in turn.
+    CHARACTER = 'character'
+
+    # Compiles the patterns of each find state into a single alternation expression and jumps
+    # directly between the positions where a block could open or close, testing the block
+    # definitions only at those positions.
+    REGEX = 'regex'
@@ -0,0 +1,264 @@
+# TextStreamAnalyzer.py
+# (C)2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import codecs
+
+from pyaid.ArgsUtils import ArgsUtils
+from pyaid.string.StringUtils import StringUtils
+from pyaid.text.BlockDefinition import BlockDefinition
+from pyaid.text.MatchLookDefinition import MatchLookDefinition
+from pyaid.text.TextAnalyzer import TextAnalyzer
+from pyaid.text.TextBlock import TextBlock
+from pyaid.text.TextBlockEvent import TextBlockEvent
+from pyaid.text.TextScanEngineEnum import TextScanEngineEnum
+
+#___________________________________________________________________________________________________ TextStreamAnalyzer
+class TextStreamAnalyzer(TextAnalyzer):
+    """ Analyzes the blocks of a text read in chunks from a file or an iterator of strings without
+        holding the entire text, yielding a TextBlockEvent as each block opens and closes.
+
+        The text is analyzed through a buffer that holds the characters from the look back window
+        before the current index to the look ahead window after it, and the open blocks are
+        carried across the chunk boundaries. Blocks are reported with absolute offsets into the
+        text after carriage returns, and leading and trailing newlines unless stripSource is
+        False, are removed, matching the blocks found by analyze() for the entire text.
+
+        Block patterns and look ahead patterns must not match more than lookAheadWindow
+        characters. A BLOCKED block, like a string or comment, is closed by a single search for
+        its terminator, so memory use grows with the longest BLOCKED block rather than staying
+        within the chunk size. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    DEFAULT_CHUNK_SIZE = 65536
+
+    DEFAULT_LOOK_AHEAD_WINDOW = 512
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, source =None, debug =False, blockDefs =None, **kwargs):
+        """Creates a new instance of TextStreamAnalyzer."""
+        TextAnalyzer.__init__(self, '', debug, blockDefs, **kwargs)
+
+        self._streamSource    = source
+        self._streamLength    = 0
+        self._chunkSize       = ArgsUtils.get('chunkSize', self.DEFAULT_CHUNK_SIZE, kwargs)
+        self._lookAheadWindow = ArgsUtils.get(
+            'lookAheadWindow', self.DEFAULT_LOOK_AHEAD_WINDOW, kwargs)
+        self._stripStream     = ArgsUtils.get('stripSource', True, kwargs)
+
+        # While analyzing before the end of the stream, terminators found past the limit or not
+        # found at all mark the analysis of the current index for a retry with more text
+        self._streamLimit     = None
+        self._streamUnderflow = False
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: streamLength
+    @property
+    def streamLength(self):
+        """ The number of characters of the text read by the most recent stream analysis. """
+        return self._streamLength
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ streamBlockEvents
+    def streamBlockEvents(self, source =None):
+        """ A generator that analyzes the source, which is either a file path or an iterable of
+            strings and defaults to the source specified when the analyzer was created, and yields
+            a TextBlockEvent as each block opens and closes. """
+        chunks = self._readChunks(self._streamSource if source is None else source)
+
+        del self._blocks[:]
+        del self._openBlocks[:]
+        del self._errors[:]
+        self._streamLength = 0
+
+        buffer   = ''
+        offset   = 0
+        index    = 0
+        target   = 0
+        eof      = False
+        pending  = []
+        lookBack = max(1, self._getLookBackWindow())
+        useRegex = self._scanEngine == TextScanEngineEnum.REGEX
+
+        block    = self._addBlock(0, -1, self._initialBlock) if self._initialBlock else None
+        findDefs = self._getFindBlockDefs(block) if block else self._blockDefs['root']
+        for event in self._getEvents(pending, offset):
+            yield event
+
+        while True:
+            #---------------------------------------------------------------------------------------
+            # READ
+            # Reads until the look ahead window past the index is filled, discarding the text
+            # before the look back window
+            if not eof and (len(buffer) - index <= self._lookAheadWindow or len(buffer) < target):
+                chunk = next(chunks, None)
+                if chunk is None:
+                    eof = True
+                else:
+                    if index > lookBack:
+                        buffer  = buffer[index - lookBack:]
+                        offset += index - lookBack
+                        target -= index - lookBack
+                        index   = lookBack
+                    buffer += chunk
+                    self._streamLength = offset + len(buffer)
+                continue
+
+            limit = len(buffer) if eof else len(buffer) - self._lookAheadWindow
+            if index >= limit:
+                break
+
+            #---------------------------------------------------------------------------------------
+            # ANALYZE
+            if useRegex and not (block and block.findState == BlockDefinition.BLOCKED):
+                scanner = self._getBlockScanner(block, findDefs)
+                if scanner is not None:
+                    match = scanner.search(buffer, index)
+                    if match is None or match.start() >= limit:
+                        index = limit
+                        continue
+                    index = match.start()
+
+            openBlocks = list(self._openBlocks)
+            errorCount = len(self._errors)
+            blockEnd   = block.end if block else None
+
+            self._streamLimit     = None if eof else limit
+            self._streamUnderflow = False
+            result = self._analyzeIndex(buffer, index, block, findDefs)
+            self._streamLimit     = None
+
+            if self._streamUnderflow:
+                # Undoes the analysis of the index and retries once the buffer has doubled
+                del self._blocks[:]
+                del self._errors[errorCount:]
+                self._openBlocks[:] = openBlocks
+                if block:
+                    block.end = blockEnd
+                target = 2*len(buffer)
+                continue
+
+            if result[1] is not block or self._blocks:
+                for event in self._getEvents(pending, offset):
+                    yield event
+
+            index, block, findDefs = result
+
+        # If the block should be closed by the last character, whether or not a terminator is found
+        # set the end appropriately.
+        for b, event in pending:
+            if b.blockDef.closeAtEnd and b.end == -1 or b.end == None:
+                event.end = self._streamLength
+                yield TextBlockEvent(TextBlockEvent.CLOSE, event)
+
+        del self._openBlocks[:]
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _findTerminator
+    def _findTerminator(self, src, index, pattern, matchReqs =None):
+        errorCount = len(self._errors)
+        result     = TextAnalyzer._findTerminator(self, src, index, pattern, matchReqs)
+
+        # A terminator that is not found, or is found within the look ahead window, may be
+        # found differently once more of the stream has been read
+        limit = self._streamLimit
+        if limit is not None and (result > limit or len(self._errors) > errorCount):
+            self._streamUnderflow = True
+        return result
+
+#___________________________________________________________________________________________________ _getEvents
+    def _getEvents(self, pending, offset):
+        """ Returns a list of the events for the pending blocks that have closed and the blocks
+            added since the last call, which are added to the pending blocks while they remain
+            open. The pending blocks are tuples of each block and the block of its events, which
+            is offset from the buffer to the absolute position in the text. """
+        events = []
+        for item in list(pending):
+            if not self._isOpen(item[0]):
+                pending.remove(item)
+                item[1].end = offset + item[0].end
+                events.append(TextBlockEvent(TextBlockEvent.CLOSE, item[1]))
+
+        for b in self._blocks:
+            block = TextBlock(b.blockDef, offset + b.start, -1)
+            events.append(TextBlockEvent(TextBlockEvent.OPEN, block))
+            if self._isOpen(b):
+                pending.append((b, block))
+            else:
+                block.end = offset + b.end
+                events.append(TextBlockEvent(TextBlockEvent.CLOSE, block))
+
+        del self._blocks[:]
+        return events
+
+#___________________________________________________________________________________________________ _readChunks
+    def _readChunks(self, source):
+        """ A generator that yields the chunks of the source with carriage returns removed and,
+            unless stripSource is False, with leading and trailing newlines removed. """
+        started  = not self._stripStream
+        newlines = 0
+
+        for chunk in self._readSource(source):
+            chunk = StringUtils.toUnicode(chunk).replace('\r', '')
+            if not self._stripStream:
+                if chunk:
+                    yield chunk
+                continue
+
+            if not started:
+                chunk = chunk.lstrip('\n')
+                if not chunk:
+                    continue
+                started = True
+
+            # Trailing newlines are held back until text follows them
+            stripped = chunk.rstrip('\n')
+            if stripped:
+                yield '\n'*newlines + stripped
+                newlines = 0
+            newlines += len(chunk) - len(stripped)
+
+#___________________________________________________________________________________________________ _readSource
+    def _readSource(self, source):
+        if not StringUtils.isStringType(source):
+            for chunk in source:
+                yield chunk
+            return
+
+        fh = codecs.open(source, 'r', 'utf-8')
+        try:
+            while True:
+                chunk = fh.read(self._chunkSize)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            fh.close()
+
+#___________________________________________________________________________________________________ _getLookBackWindow
+    def _getLookBackWindow(self):
+        """ Returns the largest look back window of the match requirements of the block
+            definitions. """
+        window = MatchLookDefinition.DEFAULT_LOOK_BACK_WINDOW
+        for defs in self._blockDefs.values():
+            for d in (defs if isinstance(defs, list) else [defs]):
+                for reqs in [d.matchReqs, d.terminatorReqs]:
+                    for m in (reqs if isinstance(reqs, list) else [reqs]):
+                        if m is not None and m.lookBackWindow:
+                            window = max(window, m.lookBackWindow)
+        return window
+
+#___________________________________________________________________________________________________ _isOpen
+    @classmethod
+    def _isOpen(cls, block):
+        return block.end == -1 or block.end == None
@@ -0,0 +1,94 @@
+# ThreadOutputBuffer.py
+# (C)2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import sys
+import threading
+
+#___________________________________________________________________________________________________ ThreadOutputBuffer
+class ThreadOutputBuffer(object):
+    """ A stream that replaces sys.stdout while installed and collects the output printed by each
+        thread that has started a capture into a separate buffer for that thread, so that the
+        output of concurrent work can be written out in a deterministic order. Output printed by
+        threads that are not capturing is written through to the replaced stream. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self):
+        """Creates a new instance of ThreadOutputBuffer."""
+        self._stream = None
+        self._local  = threading.local()
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: stream
+    @property
+    def stream(self):
+        """ The stream replaced by the buffer while it is installed. """
+        return self._stream
+
+#___________________________________________________________________________________________________ GS: capturing
+    @property
+    def capturing(self):
+        """ Whether or not the current thread is capturing its output. """
+        return getattr(self._local, 'buffer', None) is not None
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ install
+    def install(self):
+        if sys.stdout is not self:
+            self._stream = sys.stdout
+            sys.stdout   = self
+        return self
+
+#___________________________________________________________________________________________________ uninstall
+    def uninstall(self):
+        if sys.stdout is self:
+            sys.stdout = self._stream
+
+#___________________________________________________________________________________________________ capture
+    def capture(self):
+        """ Starts collecting the output printed by the current thread. """
+        self._local.buffer = []
+
+#___________________________________________________________________________________________________ release
+    def release(self):
+        """ Stops collecting the output printed by the current thread and returns it. """
+        buffer = getattr(self._local, 'buffer', None)
+        self._local.buffer = None
+        return ''.join(buffer) if buffer else ''
+
+#___________________________________________________________________________________________________ write
+    def write(self, value):
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            self._stream.write(value)
+        else:
+            buffer.append(value)
+
+#___________________________________________________________________________________________________ flush
+    def flush(self):
+        if not self.capturing:
+            self._stream.flush()
+
+#___________________________________________________________________________________________________ __getattr__
+    def __getattr__(self, name):
+        # Attributes like encoding are read from the replaced stream
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self._stream, name)
+
+#___________________________________________________________________________________________________ __enter__
+    def __enter__(self):
+        return self.install()
+
+#___________________________________________________________________________________________________ __exit__
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.uninstall()
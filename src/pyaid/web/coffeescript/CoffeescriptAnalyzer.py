@@ -20,7 +20,7 @@ class CoffeescriptAnalyzer(LineTextAnalyzer):
     _GLOBALS_PATTERN = re.compile('\n[\s\t]*#[\s\t]*(global|ignore)s?[\s\t]*(?P<globals>.+)')
 
 #___________________________________________________________________________________________________ __init__
-    def __init__(self, src ='', debug =False):
+    def __init__(self, src ='', debug =False, **kwargs):
         """Creates a new instance of ClassTemplate."""
         blocks = {'root':[
             BlockDefinition.createTripleHashDef(BlockDefinition.BLOCKED),
@@ -34,7 +34,7 @@ class CoffeescriptAnalyzer(LineTextAnalyzer):
             BlockDefinition.createBracketsDef(),
             BlockDefinition.createBracesDef() ]}
 
-        LineTextAnalyzer.__init__(self, src, debug, blocks)
+        LineTextAnalyzer.__init__(self, src, debug, blocks, **kwargs)
         self._globalClasses = []
 
 #===================================================================================================
@@ -62,6 +62,16 @@ class CoffeescriptAnalyzer(LineTextAnalyzer):
                     if not g in self._globalClasses:
                         self._globalClasses.append(g)
 
+#___________________________________________________________________________________________________ _getAnalysisStateImpl
+    def _getAnalysisStateImpl(self, state):
+        LineTextAnalyzer._getAnalysisStateImpl(self, state)
+        state['globalObjects'] = list(self._globalClasses)
+
+#___________________________________________________________________________________________________ _restoreAnalysisStateImpl
+    def _restoreAnalysisStateImpl(self, state):
+        LineTextAnalyzer._restoreAnalysisStateImpl(self, state)
+        self._globalClasses = list(state.get('globalObjects', []))
+
 #___________________________________________________________________________________________________ _redactBlockImpl
     def _redactBlockImpl(self, block, source, replace):
         replace = LineTextAnalyzer._redactBlockImpl(self, block, source, replace)
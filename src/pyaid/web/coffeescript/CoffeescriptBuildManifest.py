@@ -0,0 +1,279 @@
+# CoffeescriptBuildManifest.py
+# (C)2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+from pyaid.string.StringUtils import StringUtils
+
+#___________________________________________________________________________________________________ CoffeescriptBuildManifest
+class CoffeescriptBuildManifest(object):
+    """ A record of the content hashes of the files created by the CoffeescriptBuilder. Each
+        compiled dependency fragment is recorded with the hash of the source it was compiled
+        from, and each target is recorded with a hash of all of its inputs and the hashes of its
+        assembled and compiled files. Cache files remain valid for as long as their sources are
+        unchanged, regardless of file timestamps, and targets whose inputs are unchanged are not
+        built again.
+
+        Entries are keyed by package, so the manifest does not depend on where the root path is
+        located. When a cache path is specified, the manifest is saved within it along with a
+        copy of every recorded file named by its hash, so that a cache path restored on another
+        machine provides the files that are missing from a new checkout. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    DEFAULT_FILENAME = '.coffeescriptManifest'
+
+    # Changes to the stored format must increment the version to invalidate existing manifests
+    FORMAT_VERSION = 1
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, rootPath, cachePath =None, path =None):
+        """Creates a new instance of CoffeescriptBuildManifest."""
+        self._cachePath = cachePath
+        self._path      = path
+        if path is None and (cachePath or rootPath):
+            self._path = os.path.join(cachePath or rootPath, self.DEFAULT_FILENAME)
+
+        self._fragments = None
+        self._targets   = None
+        self._hashes    = dict()
+        self._modified  = False
+        self._lock      = threading.RLock()
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: path
+    @property
+    def path(self):
+        """ The path of the file where the manifest is saved, or None if it is not saved. """
+        return self._path
+
+#___________________________________________________________________________________________________ GS: cachePath
+    @property
+    def cachePath(self):
+        """ The folder where copies of the recorded files are stored, or None. """
+        return self._cachePath
+
+#___________________________________________________________________________________________________ GS: modified
+    @property
+    def modified(self):
+        return self._modified
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ restoreFragment
+    def restoreFragment(self, package, sourceHash, path):
+        """ Returns True if the cache file at the specified path holds the fragment recorded for
+            the package when it was compiled from a source with the specified hash, restoring
+            the file from the cache path if necessary. """
+        with self._lock:
+            self._load()
+            entry = self._fragments.get(package)
+            if not sourceHash or not entry or entry[0] != sourceHash:
+                return False
+            return self._restoreFile(path, entry[1])
+
+#___________________________________________________________________________________________________ storeFragment
+    def storeFragment(self, package, sourceHash, path):
+        """ Records the cache file at the specified path as the fragment compiled for the
+            package from a source with the specified hash. """
+        with self._lock:
+            self._load()
+            digest = self._storeFile(path)
+            if sourceHash and digest:
+                self._fragments[package] = [sourceHash, digest]
+            else:
+                self._fragments.pop(package, None)
+            self._modified = True
+
+#___________________________________________________________________________________________________ restoreTarget
+    def restoreTarget(self, package, inputs, paths):
+        """ Returns the report value recorded for the target package if it was built from the
+            specified inputs hash and the files at the specified paths are unchanged since, or
+            can be restored from the cache path. Otherwise returns None. """
+        with self._lock:
+            self._load()
+            entry = self._targets.get(package)
+            if not inputs or not entry or entry['inputs'] != inputs:
+                return None
+
+            if len(paths) != len(entry['files']):
+                return None
+            for path, digest in zip(paths, entry['files']):
+                if not self._restoreFile(path, digest):
+                    return None
+            return entry['report']
+
+#___________________________________________________________________________________________________ storeTarget
+    def storeTarget(self, package, inputs, paths, report):
+        """ Records the files at the specified paths and the report value of the target package
+            built from the specified inputs hash. """
+        with self._lock:
+            self._load()
+            digests = [self._storeFile(path) for path in paths]
+            if inputs and all(digests):
+                self._targets[package] = {'inputs':inputs, 'files':digests, 'report':report}
+            else:
+                self._targets.pop(package, None)
+            self._modified = True
+
+#___________________________________________________________________________________________________ save
+    def save(self):
+        """ Writes the manifest to its path if it has been modified, replacing the existing
+            file atomically. Returns False if the manifest could not be written. """
+        with self._lock:
+            if not self._modified or not self._path:
+                return True
+
+            data = StringUtils.toBytes(json.dumps({
+                'version':self.FORMAT_VERSION,
+                'fragments':self._fragments,
+                'targets':self._targets }, separators=(',', ':'), sort_keys=True))
+
+            folder = os.path.dirname(self._path) or '.'
+            try:
+                if not os.path.exists(folder):
+                    os.makedirs(folder)
+                fd, tempPath = tempfile.mkstemp(suffix='.tmp', dir=folder)
+            except (IOError, OSError):
+                return False
+
+            try:
+                with os.fdopen(fd, 'wb') as fh:
+                    fh.write(data)
+                if hasattr(os, 'replace'):
+                    os.replace(tempPath, self._path)
+                else:
+                    if os.path.exists(self._path):
+                        os.remove(self._path)
+                    os.rename(tempPath, self._path)
+            except (IOError, OSError):
+                if os.path.exists(tempPath):
+                    os.remove(tempPath)
+                return False
+
+            self._modified = False
+            return True
+
+#___________________________________________________________________________________________________ clear
+    def clear(self):
+        """ Removes every entry from the manifest, including the saved manifest if one exists.
+            Copies of files within the cache path are left in place. """
+        with self._lock:
+            self._fragments = dict()
+            self._targets   = dict()
+            self._modified  = False
+            if self._path and os.path.exists(self._path):
+                os.remove(self._path)
+
+#___________________________________________________________________________________________________ getHash
+    @classmethod
+    def getHash(cls, values):
+        """ Returns the hexadecimal hash of a JSON serializable list of values. """
+        return hashlib.sha1(StringUtils.toBytes(
+            json.dumps(values, separators=(',', ':'), sort_keys=True))).hexdigest()
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _load
+    def _load(self):
+        """ Reads the saved manifest the first time it is needed. Manifests that cannot be read
+            or were saved in another format are ignored. """
+        if self._fragments is not None:
+            return
+
+        self._fragments = dict()
+        self._targets   = dict()
+        if not self._path:
+            return
+
+        try:
+            with open(self._path, 'rb') as fh:
+                data = json.loads(StringUtils.toUnicode(fh.read()))
+        except (IOError, OSError, ValueError):
+            return
+
+        if isinstance(data, dict) and data.get('version') == self.FORMAT_VERSION:
+            self._fragments = data.get('fragments') or dict()
+            self._targets   = data.get('targets') or dict()
+
+#___________________________________________________________________________________________________ _restoreFile
+    def _restoreFile(self, path, digest):
+        """ Returns True if the file at the path has the specified hash, replacing it with the
+            copy from the cache path when it does not. """
+        if self._getFileHash(path) == digest:
+            return True
+
+        cached = self._getCachedPath(path, digest)
+        if not cached or not os.path.exists(cached):
+            return False
+
+        try:
+            shutil.copyfile(cached, path)
+        except (IOError, OSError):
+            return False
+        return self._getFileHash(path) == digest
+
+#___________________________________________________________________________________________________ _storeFile
+    def _storeFile(self, path):
+        """ Returns the hash of the file at the path, or None if it does not exist, and copies
+            the file into the cache path if it is not already there. """
+        digest = self._getFileHash(path)
+        cached = self._getCachedPath(path, digest)
+        if not digest or not cached or os.path.exists(cached):
+            return digest
+
+        try:
+            if not os.path.exists(self._cachePath):
+                os.makedirs(self._cachePath)
+            fd, tempPath = tempfile.mkstemp(suffix='.tmp', dir=self._cachePath)
+            os.close(fd)
+            shutil.copyfile(path, tempPath)
+            if hasattr(os, 'replace'):
+                os.replace(tempPath, cached)
+            else:
+                os.rename(tempPath, cached)
+        except (IOError, OSError):
+            pass
+        return digest
+
+#___________________________________________________________________________________________________ _getCachedPath
+    def _getCachedPath(self, path, digest):
+        if not self._cachePath or not digest:
+            return None
+        return os.path.join(self._cachePath, digest + os.path.splitext(path)[-1])
+
+#___________________________________________________________________________________________________ _getFileHash
+    def _getFileHash(self, path):
+        """ Returns the hash of the contents of the file at the path, or None if it does not
+            exist. Hashes are reused for as long as the modification time and size of the file
+            are unchanged. """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        entry = self._hashes.get(path)
+        if entry and entry[0] == stat.st_mtime and entry[1] == stat.st_size:
+            return entry[2]
+
+        try:
+            with open(path, 'rb') as fh:
+                digest = hashlib.sha1(fh.read()).hexdigest()
+        except (IOError, OSError):
+            return None
+
+        self._hashes[path] = (stat.st_mtime, stat.st_size, digest)
+        return digest
@@ -8,14 +8,27 @@ import sys
 import os
 import re
 import getopt
+import threading
+import time
+
+try:
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+except ImportError:
+    ThreadPoolExecutor = None
+
 from pyaid.dict.DictUtils import DictUtils
 from pyaid.file.FileUtils import FileUtils
+from pyaid.file.FileWatcher import FileWatcher
 
 from pyaid.interactive.queries import queryYesNoQuit
 from pyaid.debug.Logger import Logger
-from pyaid.system.SystemUtils import SystemUtils
+from pyaid.threading.ThreadOutputBuffer import ThreadOutputBuffer
 from pyaid.web.coffeescript.CoffeescriptAnalyzer import CoffeescriptAnalyzer
+from pyaid.web.coffeescript.CoffeescriptBuildManifest import CoffeescriptBuildManifest
+from pyaid.web.coffeescript.CoffeescriptCompiler import CoffeescriptCompiler
+from pyaid.web.coffeescript.CoffeescriptCompilerWorker import CoffeescriptCompilerWorker
 from pyaid.web.coffeescript.CoffeescriptDependency import CoffeescriptDependency
+from pyaid.web.coffeescript.CoffeescriptDependencyGraph import CoffeescriptDependencyGraph
 
 # AS NEEDED: from pyaid.web.coffeescript.IncludeCompressor import IncludeCompressor
 
@@ -28,6 +41,9 @@ class CoffeescriptBuilder(object):
 
     _WARN_ID_MISSING_IMPORT = 'MISSING-IMPORT'
 
+    # Seconds between checks for a stop request while watching for changes
+    _WATCH_INTERVAL = 1.0
+
     _GLOBAL_CLASSES = [
         'SFLOW', 'PAGE', 'FB', 'Math', 'JSON', 'String', 'ActiveXObject', 'Date', 'DOMParser',
         'RegExp', 'Object', 'Number', 'Array', 'Function', 'XMLHttpRequest']
@@ -41,9 +57,16 @@ class CoffeescriptBuilder(object):
 #___________________________________________________________________________________________________ __init__
     def __init__(
             self, targetPackageOrPath, rootPath, verbose =True, debug =False, trace = False,
-            force =False, compress =False, buildOnly =False
+            force =False, compress =False, buildOnly =False, jobs =1, dependencyGraph =None,
+            cachePath =None, buildManifest =None, compiler =None
     ):
-        """Creates a new instance of CoffeescriptBuilder."""
+        """Creates a new instance of CoffeescriptBuilder. When jobs is greater than one the
+            targets are constructed concurrently by that many threads. The dependencies of the
+            source files are read from the dependencyGraph, which defaults to a graph saved
+            within the root path. The content hashes of the built files are recorded in the
+            buildManifest, which defaults to a manifest saved within the cachePath if one is
+            specified or the root path otherwise. Targets are compiled by the compiler, which
+            defaults to a CoffeescriptCompilerWorker that is closed after each construction."""
 
         self.buildOnly = buildOnly
 
@@ -61,31 +84,29 @@ class CoffeescriptBuilder(object):
         self._force    = force
         self._compress = compress
         self._rootPath = rootPath
+        self._jobs     = max(1, jobs or 1)
 
-        if not isinstance(targetPackageOrPath, CoffeescriptDependency):
-            target = CoffeescriptDependency(targetPackageOrPath, rootPath, None)
-        else:
-            target = targetPackageOrPath
+        if dependencyGraph is None:
+            dependencyGraph = CoffeescriptDependencyGraph(rootPath)
+        self._dependencyGraph = dependencyGraph
 
-        if target.exists:
-            self._targets.append(target)
-        else:
-            csFiles = CoffeescriptBuilder.getScriptsInPath(target.packagePath)
-
-            # Look for exec matches first
-            for f in csFiles:
-                testTarget = CoffeescriptDependency(f, rootPath, None)
-                if testTarget.isExec:
-                    self._targets.append(testTarget)
-
-            # Look for lib matches second. Lib matches are tested as a second pass because
-            # constructing all exec files first potentially optimizes the import process for
-            # the libraries.
-            for f in csFiles:
-                testTarget = CoffeescriptDependency(f, rootPath, None)
-                if testTarget.isLib:
-                    self._targets.append(testTarget)
+        if buildManifest is None:
+            buildManifest = CoffeescriptBuildManifest(rootPath, cachePath)
+        self._buildManifest = buildManifest
+        self._compiler      = compiler
+
+        # While constructing concurrently, the state of the target constructed by each thread,
+        # the events set as each target finishes with each of its dependencies and the buffer
+        # that collects the output of each target
+        self._buildState       = threading.local()
+        self._dependencyEvents = None
+        self._output           = None
 
+        # Watch mode rediscovers the targets of the original package or path on each rebuild
+        self._targetPackageOrPath = targetPackageOrPath
+        self._watching            = False
+
+        self._targets = self._findTargets(targetPackageOrPath)
         if len(self._targets) == 0:
             print('\n\n')
             self._log.write('No targets exist for: %s. Compilation aborted.' % targetPackageOrPath)
@@ -104,6 +125,27 @@ class CoffeescriptBuilder(object):
     def warnings(self):
         return self._warnings
 
+#___________________________________________________________________________________________________ GS: jobs
+    @property
+    def jobs(self):
+        """ The number of targets constructed concurrently. """
+        return self._jobs
+
+#___________________________________________________________________________________________________ GS: dependencyGraph
+    @property
+    def dependencyGraph(self):
+        return self._dependencyGraph
+
+#___________________________________________________________________________________________________ GS: buildManifest
+    @property
+    def buildManifest(self):
+        return self._buildManifest
+
+#___________________________________________________________________________________________________ GS: compiler
+    @property
+    def compiler(self):
+        return self._compiler
+
 #___________________________________________________________________________________________________ GS: imports
     @property
     def imports(self):
@@ -125,26 +167,106 @@ class CoffeescriptBuilder(object):
 #___________________________________________________________________________________________________ construct
     def construct(self):
         """Doc..."""
-        for t in self._targets:
-            self._report[t.package] = -1
-            if t.isLib:
-                self._constructLibrary(t)
-            else:
-                self._constructTarget(t)
-
-            if self._compress:
-                print('COMPRESSING:', t.package)
-                from pyaid.web.coffeescript.IncludeCompressor import IncludeCompressor
-                ic = IncludeCompressor()
-                if not ic.compressFile(t.compiledPath):
-                    print('COMPRESSION FAILURE:', t.compiledPath)
+        compiler = self._compiler
+        if compiler is None:
+            self._compiler = CoffeescriptCompilerWorker(workerCount=self._jobs)
 
+        try:
+            if self._jobs > 1 and ThreadPoolExecutor is not None and len(self._targets) > 1:
+                self._constructConcurrently()
+            else:
+                for t in self._targets:
+                    self._report[t.package] = -1
+                    self._buildTarget(t)
+        finally:
+            if compiler is None:
+                self._compiler.close()
+                self._compiler = None
+
+        self._dependencyGraph.save()
+        self._buildManifest.save()
         return self._targets
 
+#___________________________________________________________________________________________________ rebuild
+    def rebuild(self, paths):
+        """ Rebuilds the targets affected by changes to the files at the specified paths, which
+            are the targets whose dependency closure contains any of the files and any targets
+            created since the previous construction. Returns the list of rebuilt targets. """
+        changed  = set(self._normalizePath(p) for p in paths)
+        previous = set(t.package for t in self._targets)
+        found    = self._findTargets(self._targetPackageOrPath)
+
+        targets = []
+        for t in found:
+            if t.package not in previous or changed & self._getTargetClosure(t):
+                targets.append(t)
+
+        self._imports  = dict()
+        self._requires = dict()
+        self._includes = dict()
+        self._report   = dict()
+        self._warnings = []
+
+        self._targets = targets
+        try:
+            if targets:
+                self.construct()
+        finally:
+            self._targets = found
+        return targets
+
+#___________________________________________________________________________________________________ watch
+    def watch(self, debounce =0.25, pollInterval =0.5, backend =None):
+        """ Constructs the targets and then watches the CoffeeScript files within the root path,
+            rebuilding the targets affected by each debounced set of changes until interrupted
+            or stopped. The dependency graph, build manifest and compiler are kept between
+            rebuilds, and the latency from the detection of each set of changes to the end of
+            its rebuild is reported. """
+        compiler = self._compiler
+        if compiler is None:
+            self._compiler = CoffeescriptCompilerWorker(workerCount=self._jobs)
+
+        # The watcher is started first so that changes made during the first construction are
+        # rebuilt afterward
+        watcher = FileWatcher(
+            self._rootPath, [CoffeescriptDependency.EXTENSION], backend=backend,
+            debounce=debounce, pollInterval=pollInterval)
+        self._watching = True
+        try:
+            self.construct()
+            self._log.write('WATCHING: %s [%s]' % (self._rootPath, watcher.backend))
+
+            while self._watching:
+                paths = watcher.wait(self._WATCH_INTERVAL)
+                if not paths:
+                    continue
+
+                self._log.write('CHANGED:\n\t' + '\n\t'.join(paths))
+                start   = time.time()
+                targets = self.rebuild(paths)
+                end     = time.time()
+
+                self._log.write('REBUILT: %s of %s targets in %.3fs (latency %.3fs)' % (
+                    len(targets), len(self._targets), end - start, end - watcher.changeTime))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._watching = False
+            watcher.close()
+            if compiler is None:
+                self._compiler.close()
+                self._compiler = None
+
+#___________________________________________________________________________________________________ stop
+    def stop(self):
+        """ Stops watching after the current wait or rebuild finishes. """
+        self._watching = False
+
 #___________________________________________________________________________________________________ compileAllOnPath
     @staticmethod
     def compileAllOnPath(path, rootPath =None, recursive =False, debug =False, trace =False,
-                         force =False, compress=False):
+                         force =False, compress=False, jobs =1, cachePath =None,
+                         compiler =None):
 
         CoffeescriptBuilder._results = ''
         CoffeescriptBuilder._missing = {}
@@ -153,7 +275,8 @@ class CoffeescriptBuilder(object):
             def walker(paths, dirName, names):
                 out = CoffeescriptBuilder._compileAllInDirectory(
                     os.path.join(paths[0], dirName), paths[1], debug=debug, trace=trace,
-                    force=force, compress=compress
+                    force=force, compress=compress, jobs=jobs, cachePath=cachePath,
+                    compiler=compiler
                 )
                 CoffeescriptBuilder._results += out['res']
                 for n,v in DictUtils.iter(out['missing']):
@@ -171,7 +294,8 @@ class CoffeescriptBuilder(object):
         else:
             print('COMPILING DIRECTORY: ' + path)
             CoffeescriptBuilder._compileAllInDirectory(
-                path, rootPath, debug=debug, trace=trace, force=force, compress=compress)
+                path, rootPath, debug=debug, trace=trace, force=force, compress=compress,
+                jobs=jobs, cachePath=cachePath, compiler=compiler)
 
 #___________________________________________________________________________________________________ getScriptsInPath
     @staticmethod
@@ -187,6 +311,319 @@ class CoffeescriptBuilder(object):
 #===================================================================================================
 #                                                                               P R O T E C T E D
 
+#___________________________________________________________________________________________________ _findTargets
+    def _findTargets(self, targetPackageOrPath):
+        """ Returns the list of targets for the package or path, which is the target itself if
+            it exists and otherwise the exec and then lib files within its package folder. """
+        if not isinstance(targetPackageOrPath, CoffeescriptDependency):
+            target = CoffeescriptDependency(targetPackageOrPath, self._rootPath, None)
+        else:
+            target = targetPackageOrPath
+
+        if target.exists:
+            return [target]
+
+        targets = []
+        csFiles = CoffeescriptBuilder.getScriptsInPath(target.packagePath)
+
+        # Look for exec matches first
+        for f in csFiles:
+            testTarget = CoffeescriptDependency(f, self._rootPath, None)
+            if testTarget.isExec:
+                targets.append(testTarget)
+
+        # Look for lib matches second. Lib matches are tested as a second pass because
+        # constructing all exec files first potentially optimizes the import process for
+        # the libraries.
+        for f in csFiles:
+            testTarget = CoffeescriptDependency(f, self._rootPath, None)
+            if testTarget.isLib:
+                targets.append(testTarget)
+
+        return targets
+
+#___________________________________________________________________________________________________ _getTargetClosure
+    def _getTargetClosure(self, target):
+        """ Returns the set of normalized paths of the target and of every file it depends upon
+            directly or indirectly, as read from the dependency graph. """
+        closure = set()
+        pending = [target]
+        while pending:
+            dependency = pending.pop()
+            path       = self._normalizePath(dependency.path)
+            if path in closure:
+                continue
+            closure.add(path)
+
+            if dependency.isInclude:
+                continue
+
+            try:
+                pending.extend(self._dependencyGraph.getDependencies(dependency.path))
+            except (IOError, OSError):
+                continue
+
+        return closure
+
+#___________________________________________________________________________________________________ _normalizePath
+    @staticmethod
+    def _normalizePath(path):
+        return os.path.normcase(os.path.abspath(path))
+
+#___________________________________________________________________________________________________ _buildTarget
+    def _buildTarget(self, target):
+        if target.isLib:
+            inputs = self._constructLibrary(target)
+        else:
+            inputs = self._constructTarget(target)
+
+        # Targets that are up to date are not built again
+        if inputs is False:
+            return
+
+        if self._compress:
+            print('COMPRESSING:', target.package)
+            from pyaid.web.coffeescript.IncludeCompressor import IncludeCompressor
+            ic = IncludeCompressor()
+            if not ic.compressFile(target.compiledPath):
+                print('COMPRESSION FAILURE:', target.compiledPath)
+                return
+
+        if inputs:
+            self._buildManifest.storeTarget(
+                target.package, inputs, self._getTargetPaths(target),
+                self._report.get(target.package, -1))
+
+#___________________________________________________________________________________________________ _constructConcurrently
+    def _constructConcurrently(self):
+        """ Constructs the targets on a pool of threads. Targets are scheduled in order as the
+            earlier targets they conflict with finish, and each dependency shared by several
+            targets is processed by them in target order, so that the cache decisions and output
+            of each target match a serial construction. The output of each target is collected
+            and written once every earlier target has written its output. """
+        targets = self._targets
+        for t in targets:
+            self._report[t.package] = -1
+
+        self._output = ThreadOutputBuffer().install()
+        try:
+            waits, previous = self._getConstructionGraph()
+
+            self._dependencyEvents = dict()
+            for i, items in enumerate(previous):
+                for package, j in items.items():
+                    self._dependencyEvents[(j, package)] = threading.Event()
+
+            executor = ThreadPoolExecutor(max_workers=self._jobs)
+            pending  = list(range(len(targets)))
+            running  = dict()
+            results  = dict()
+            written  = 0
+            error    = None
+            try:
+                while pending or running:
+                    for i in list(pending):
+                        if error is not None or len(running) >= self._jobs:
+                            break
+                        if all(j in results for j in waits[i]):
+                            pending.remove(i)
+                            future = executor.submit(
+                                self._buildConcurrentTarget, i, targets[i], previous[i])
+                            running[future] = i
+
+                    if not running:
+                        break
+
+                    done = wait(list(running.keys()), return_when=FIRST_COMPLETED)[0]
+                    for future in done:
+                        results[running.pop(future)] = future.result()
+
+                    while written in results:
+                        output, warnings, targetError = results[written]
+                        self._output.stream.write(output)
+                        self._output.stream.flush()
+                        self._warnings.extend(warnings)
+                        if error is None:
+                            error = targetError
+                        written += 1
+            finally:
+                executor.shutdown(wait=True)
+
+            if error is not None:
+                raise error
+        finally:
+            self._output.uninstall()
+            self._output           = None
+            self._dependencyEvents = None
+
+#___________________________________________________________________________________________________ _buildConcurrentTarget
+    def _buildConcurrentTarget(self, index, target, previous):
+        """ Builds the target on a pool thread and returns a tuple of its output, warnings and
+            any exception raised while building it. """
+        state          = self._buildState
+        state.index    = index
+        state.previous = previous
+        state.warnings = []
+
+        self._output.capture()
+        error = None
+        try:
+            self._buildTarget(target)
+        except Exception as err:
+            error = err
+        finally:
+            # Releases the later targets waiting on dependencies that were never reached
+            for key, event in self._dependencyEvents.items():
+                if key[0] == index:
+                    event.set()
+            state.index = None
+
+        return self._output.release(), state.warnings, error
+
+#___________________________________________________________________________________________________ _getConstructionGraph
+    def _getConstructionGraph(self):
+        """ Parses the includes of every target to create the graph of the concurrent
+            construction, returned as a tuple of two lists indexed by target. The first lists
+            the earlier targets that must finish before each target can start, because both
+            targets parse includes into the same import lists. The second maps each dependency
+            package of a target to the nearest earlier target with the same dependency, which
+            must finish with that dependency before the target can process it. """
+        # The parsed includes and their output are discarded so that the construction of each
+        # target parses them exactly as it would when constructed serially
+        lists = [self._imports, self._requires, self._includes]
+        saved = [dict((k, list(v)) for k, v in DictUtils.iter(d)) for d in lists]
+
+        plans = []
+        for t in self._targets:
+            self._output.capture()
+            try:
+                plans.append(self._getConstructionPlan(t))
+            except Exception:
+                plans.append((None, set()))
+            self._output.release()
+
+        for d, values in zip(lists, saved):
+            d.clear()
+            d.update(values)
+
+        waits    = []
+        previous = []
+        for i, (keys, packages) in enumerate(plans):
+            waits.append([
+                j for j in range(i)
+                if keys is None or plans[j][0] is None or keys & plans[j][0]])
+
+            items = dict()
+            for package in packages:
+                for j in range(i - 1, -1, -1):
+                    if package in plans[j][1]:
+                        items[package] = j
+                        break
+            previous.append(items)
+
+        return waits, previous
+
+#___________________________________________________________________________________________________ _getConstructionPlan
+    def _getConstructionPlan(self, target):
+        """ Parses the includes of the target and returns a tuple of the set of import list
+            keys written while constructing the target and the set of dependency packages it
+            may process. """
+        if not target.isLib:
+            self._parseIncludes(target)
+            self._processRequires(target)
+            return {target.package}, set(d.package for d in self._imports[target.package])
+
+        targets, imports, modules, includes = self._getLibraryData(target)
+        for t in (targets + imports + modules):
+            self._processRequires(t)
+
+        packages = {target.package}
+        for t in (imports + modules):
+            packages.update(d.package for d in self._imports[t.package])
+        return set(d.package for d in (targets + imports + modules + includes)), packages
+
+#___________________________________________________________________________________________________ _waitForDependency
+    def _waitForDependency(self, dependency):
+        """ Blocks a concurrently constructed target until the nearest earlier target with the
+            same dependency has finished with it. """
+        if self._dependencyEvents is None:
+            return
+
+        j = self._buildState.previous.get(dependency.package)
+        if j is not None:
+            self._dependencyEvents[(j, dependency.package)].wait()
+
+#___________________________________________________________________________________________________ _releaseDependency
+    def _releaseDependency(self, dependency):
+        if self._dependencyEvents is None:
+            return
+
+        event = self._dependencyEvents.get((self._buildState.index, dependency.package))
+        if event is not None:
+            event.set()
+
+#___________________________________________________________________________________________________ _addWarning
+    def _addWarning(self, warning):
+        if getattr(self._buildState, 'index', None) is None:
+            self._warnings.append(warning)
+        else:
+            self._buildState.warnings.append(warning)
+
+#___________________________________________________________________________________________________ _useCache
+    def _useCache(self, dependency):
+        """ Whether or not the opened dependency can be assembled from its cache file, which is
+            valid if it was compiled from the current source of the dependency. """
+        if not dependency.allowCaching:
+            return False
+
+        return self._buildManifest.restoreFragment(
+            dependency.package,
+            self._dependencyGraph.getHash(dependency.path),
+            dependency.cachePath)
+
+#___________________________________________________________________________________________________ _getTargetInputs
+    def _getTargetInputs(self, target, imports, replacements, includes):
+        """ Returns a hash of the build settings and the sources that the target is assembled
+            and compiled from, or None if any of the sources are missing. """
+        values = [
+            CoffeescriptBuildManifest.FORMAT_VERSION, target.package,
+            self._debug, self._compress, self.buildOnly ]
+
+        try:
+            for label, dependencies in [
+                    ('import', imports), ('replace', replacements), ('include', includes) ]:
+                values.extend(
+                    [label, d.package, self._dependencyGraph.getHash(d.path)]
+                    for d in (dependencies or []) )
+        except (IOError, OSError):
+            return None
+
+        return CoffeescriptBuildManifest.getHash(values)
+
+#___________________________________________________________________________________________________ _getTargetPaths
+    def _getTargetPaths(self, target):
+        """ Returns a list of the paths of the files created when building the target. """
+        if self.buildOnly:
+            return [target.assembledPath]
+        return [target.assembledPath, target.compiledPath]
+
+#___________________________________________________________________________________________________ _restoreTarget
+    def _restoreTarget(self, target, inputs):
+        """ Returns True if the files of the target are unchanged since they were last built
+            from the same inputs, reporting the result of that build. """
+        if self._force:
+            return False
+
+        report = self._buildManifest.restoreTarget(
+            target.package, inputs, self._getTargetPaths(target))
+        if report is None:
+            return False
+
+        self._report[target.package] = report
+        if self._verbose:
+            self._log.write('UP TO DATE: ' + target.package)
+        return True
+
 #___________________________________________________________________________________________________ _constructLibrary
     def _constructLibrary(self, target):
         try:
@@ -278,6 +715,12 @@ class CoffeescriptBuilder(object):
                     s += '\n\tEXTERNAL: ' + inc.package
                 self._log.add(s)
 
+            #---------------------------------------------------------------------------------------
+            # Skip the library if its inputs are unchanged since it was last built
+            inputs = self._getTargetInputs(target, libImports, sharedImports, libIncludes)
+            if self._restoreTarget(target, inputs):
+                return False
+
             #---------------------------------------------------------------------------------------
             # Construct intermediate compilation file.
             assembledFile = self._assembleFile(
@@ -285,16 +728,19 @@ class CoffeescriptBuilder(object):
             )
             if assembledFile is None:
                 self._log.write('ERROR: File assembly failed.')
-                return
+                return None
 
             #---------------------------------------------------------------------------------------
             # Compile to Javascript
             if not self.buildOnly:
-                self._compileToJavascript(target, assembledFile, libIncludes)
+                if not self._compileToJavascript(target, assembledFile, libIncludes):
+                    inputs = None
 
             if self._verbose:
                 print("\n" + ('-'*100) + '\n')
 
+            return inputs
+
         except Exception as err:
             print("\n\n\n")
             self._log.writeError(
@@ -321,21 +767,31 @@ class CoffeescriptBuilder(object):
                     s += '\n\t' + imp.package
                 self._log.write(s)
 
+            #---------------------------------------------------------------------------------------
+            # Skip the target if its inputs are unchanged since it was last built
+            inputs = self._getTargetInputs(
+                target, self._imports[target.package], None, self._includes[target.package])
+            if self._restoreTarget(target, inputs):
+                return False
+
             #---------------------------------------------------------------------------------------
             # Construct intermediate compilation file.
             assembledFile = self._assembleFile(target)
             if assembledFile is None:
                 self._log.write('ERROR: File assembly failed.')
-                return
+                return None
 
             #---------------------------------------------------------------------------------------
             # Compile to Javascript
             if not self.buildOnly:
-                self._compileToJavascript(target, assembledFile)
+                if not self._compileToJavascript(target, assembledFile):
+                    inputs = None
 
             if self._verbose:
                 print("\n" + ('-'*100) + '\n')
 
+            return inputs
+
         except Exception as err:
             print("\n\n\n")
             self._log.writeError(
@@ -395,16 +851,20 @@ class CoffeescriptBuilder(object):
         # DEPENDENCY ASSEMBLY LOOP
         print('\n')
         for dep in targetImports:
+            self._waitForDependency(dep)
             dep.open()
 
-            if self._force or not dep.useCache:
+            if self._force or not self._useCache(dep):
                 if not self._compileDependency(dep, out, replacements, targetImports, classList):
+                    out.close()
                     return None
+                self._releaseDependency(dep)
                 continue
 
             self._log.write('\tFROM CACHE: ' + dep.package)
             out.write(dep.cacheSource)
             dep.close()
+            self._releaseDependency(dep)
 
         out.close()
 
@@ -516,7 +976,7 @@ class CoffeescriptBuilder(object):
                     if cn in CoffeescriptBuilder._GLOBAL_CLASSES + analyzer.globalObjects:
                         continue
 
-                    self._warnings.append({
+                    self._addWarning({
                         'id':CoffeescriptBuilder._WARN_ID_MISSING_IMPORT,
                         'class':cn,
                         'line':l.lineNumber,
@@ -616,6 +1076,8 @@ class CoffeescriptBuilder(object):
 
         if cacheOut:
             cacheOut.close()
+            self._buildManifest.storeFragment(
+                dep.package, self._dependencyGraph.getHash(dep.path), dep.cachePath)
 
         return True
 
@@ -623,9 +1085,9 @@ class CoffeescriptBuilder(object):
     def _compileToJavascript(self, target, assembledFile, jsIncludeOverrides =None):
 
         # Use the Coffeescript compiler to create a JS compilation of the assembled CS file
-        result = SystemUtils.executeCommand(['coffee', '-c', '--bare', assembledFile])
+        result = self._compiler.compile(assembledFile, target.compiledPath)
         status = result['code']
-        output = result['out']
+        output = result['out'] + result['error']
         errors         = 0
         forceVerbose   = False
 
@@ -655,13 +1117,12 @@ class CoffeescriptBuilder(object):
             else:
                 self._log.write('Compilation FAILED: ' + target.package)
 
-        f   = open(target.compiledPath, 'r')
-        res = f.read()
-        f.close()
+        return errors == 0 and status == 0
 
 #___________________________________________________________________________________________________ _parseIncludes
     def _parseIncludes(self, target, rootTarget =None):
-        """Doc..."""
+        """ Parses the import, require and include dependencies of the target, recursing into its
+            imports, and adds them to the dependency lists of the root target. """
         if rootTarget is None:
             rootTarget = target
 
@@ -674,6 +1135,15 @@ class CoffeescriptBuilder(object):
         if not rootTarget.package in self._includes:
             self._includes[rootTarget.package] = []
 
+        # Membership of the lists is tracked by package in sets alongside the lists
+        self._parseDependencies(
+            target,
+            rootTarget.package,
+            set(d.package for d in self._imports[rootTarget.package]),
+            set(d.package for d in self._includes[rootTarget.package]) )
+
+#___________________________________________________________________________________________________ _parseDependencies
+    def _parseDependencies(self, target, package, imported, included):
         if not os.path.exists(target.path):
             print("\n")
             self._log.add('WARNING: Missing import.\n\tPACKAGE: ' + target.package + '\n\tFILE: ' \
@@ -681,30 +1151,26 @@ class CoffeescriptBuilder(object):
             print("\n")
             return
 
-        f = open(target.path)
-        for line in f:
+        for dependency in self._dependencyGraph.getDependencies(target.path):
+            dependencyType = dependency.dependencyType
 
-            # import parse
-            dependency = CoffeescriptDependency.createImport(line, self._rootPath)
-            if dependency and not dependency.isInList(self._imports[rootTarget.package]):
-                self._parseIncludes(dependency, rootTarget)
-                self._imports[rootTarget.package].append(dependency)
-                continue
+            if dependencyType == CoffeescriptDependency.IMPORT_TYPE:
+                if not dependency.package in imported:
+                    self._parseDependencies(dependency, package, imported, included)
+                    self._imports[package].append(dependency)
+                    imported.add(dependency.package)
 
-            # require parse
-            dependency = CoffeescriptDependency.createRequire(line, self._rootPath)
-            if dependency and not dependency.isInList(self._imports[rootTarget.package]):
-                self._requires[rootTarget.package].append(dependency)
-                continue
+            elif dependencyType == CoffeescriptDependency.REQUIRE_TYPE:
+                if not dependency.package in imported:
+                    self._requires[package].append(dependency)
 
-            # include parse
-            dependency = CoffeescriptDependency.createInclude(line, self._rootPath)
-            if dependency and not dependency.isInList(self._includes[rootTarget.package]):
-                self._includes[rootTarget.package].append(dependency)
-                continue
+            elif dependencyType == CoffeescriptDependency.INCLUDE_TYPE:
+                if not dependency.package in included:
+                    self._includes[package].append(dependency)
+                    included.add(dependency.package)
 
-        f.close()
-        self._imports[rootTarget.package].append(target)
+        self._imports[package].append(target)
+        imported.add(target.package)
 
 #___________________________________________________________________________________________________ _processRequires
     def _processRequires(self, target):
@@ -712,10 +1178,12 @@ class CoffeescriptBuilder(object):
         while len(self._requires[target.package]) > 0:
             self._parseIncludes(self._requires[target.package].pop(0), target)
 
-        outlist = []
+        outlist  = []
+        packages = {currentTarget.package}
         for item in self._imports[target.package]:
-            if not item.isInList(outlist) and not item.compare(currentTarget):
+            if not item.package in packages:
                 outlist.append(item)
+                packages.add(item.package)
         self._imports[target.package] = outlist
         self._imports[target.package].append(currentTarget)
 
@@ -726,14 +1194,7 @@ class CoffeescriptBuilder(object):
         imports  = []
         includes = []
 
-        src = open(target.path, 'r')
-        for line in src:
-
-            # target parse
-            d = CoffeescriptDependency.create(line, self._rootPath)
-            if not d:
-                continue
-
+        for d in self._dependencyGraph.getDependencies(target.path):
             if d.dependencyType == CoffeescriptDependency.TARGET_TYPE:
                 targets.append(d)
             elif d.dependencyType == CoffeescriptDependency.IMPORT_TYPE:
@@ -749,24 +1210,26 @@ class CoffeescriptBuilder(object):
 
             self._parseIncludes(d)
 
-        src.close()
-
         return targets, imports, modules, includes
 
 #___________________________________________________________________________________________________ _compileAllInDirectory
     @staticmethod
     def _compileAllInDirectory(path, rootPath =None, debug =False, trace =False, force =False,
-                               compress=False):
+                               compress=False, jobs =1, cachePath =None, compiler =None):
         results = ''
         missing = {}
         count   = 0
+        graph   = CoffeescriptDependencyGraph(rootPath)
+        builds  = CoffeescriptBuildManifest(rootPath, cachePath)
+        backend = compiler or CoffeescriptCompilerWorker(workerCount=jobs)
         for f in CoffeescriptBuilder.getScriptsInPath(path):
             target = CoffeescriptDependency(f, rootPath)
             if not (target.exists and (target.isExec or target.isLib)):
                 continue
 
             c = CoffeescriptBuilder(
-                target, rootPath, debug=debug, trace=trace, force=force, compress=compress
+                target, rootPath, debug=debug, trace=trace, force=force, compress=compress,
+                jobs=jobs, dependencyGraph=graph, buildManifest=builds, compiler=backend
             )
             c.construct()
             count += 1
@@ -792,6 +1255,9 @@ class CoffeescriptBuilder(object):
 
                     missing[key] = v
 
+        if compiler is None:
+            backend.close()
+
         if len(results) > 0:
             print('\nDIRECTORY ' + path + ' COMPILE RESULTS [' + str(count) + ']:' + results)
         return {'res':results, 'missing':missing}
@@ -893,15 +1359,19 @@ def usage():
         -d | --debug     - Compiles in debug mode with explicit stack tracing.
         -c | --compress  - Compresses each file after it is compiled.
         -v | --verbose   - Verbose mode is used for debugging.
+        -j | --jobs      - Number of targets to construct concurrently.
+        --cache          - Path of a shared cache of build files and their manifest.
+        --no-worker      - Runs the compiler once for each target instead of in a worker.
+        -w | --watch     - Rebuilds the target or path as its files change until interrupted.
         --force          - Force compilation even if cache entries are valid.
     """)
 
 #___________________________________________________________________________________________________ main
 def main():
     try:
-        opts, args = getopt.gnu_getopt(sys.argv[1:], "hap:t:r:fdvc", [
+        opts, args = getopt.gnu_getopt(sys.argv[1:], "hap:t:r:fdvcj:w", [
             "help", "all", "path=","target=", "root=", "full", "debug", "verbose", "force",
-            "compress" ])
+            "compress", "jobs=", "cache=", "no-worker", "watch" ])
     except getopt.GetoptError as err:
         print(str(err) + "\n")
         usage()
@@ -916,6 +1386,10 @@ def main():
     debug     = False
     trace     = False
     force     = False
+    jobs      = 1
+    cachePath = None
+    compiler  = None
+    watch     = False
 
     for o, a in opts:
         if o in ("-h", "--help"):
@@ -942,14 +1416,33 @@ def main():
             trace = True
         elif o in ("-c", "--compress"):
             compress = True
+        elif o in ("-j", "--jobs"):
+            jobs = int(a)
+        elif o in ("--cache",):
+            if a:
+                cachePath = a
+        elif o in ("--no-worker",):
+            compiler = CoffeescriptCompiler()
+        elif o in ("-w", "--watch"):
+            watch = True
         else:
             print("\nUnknown argument: " + o + ". Unable to continue.\n\n")
             usage()
             sys.exit(2)
 
-    if full:
+    if watch:
+        if full or recursive or not (target or path):
+            print("\nWatch mode requires a target or a non-recursive path.\n\n")
+            usage()
+            sys.exit(2)
+
+        CoffeescriptBuilder(
+            target or path, root, debug=debug, trace=trace, force=force, compress=compress,
+            jobs=jobs, cachePath=cachePath, compiler=compiler).watch()
+    elif full:
         CoffeescriptBuilder.compileAllOnPath(
-            path, root, True, debug, trace, force, compress=compress)
+            path, root, True, debug, trace, force, compress=compress, jobs=jobs,
+            cachePath=cachePath, compiler=compiler)
     elif target:
         if recursive:
             CoffeescriptBuilder.compileAllOnPath(
@@ -959,13 +1452,18 @@ def main():
                 debug=debug,
                 trace=trace,
                 force=force,
-                compress=compress)
+                compress=compress,
+                jobs=jobs,
+                cachePath=cachePath,
+                compiler=compiler)
         else:
             CoffeescriptBuilder(
-                target, root, debug=debug, trace=trace, force=force, compress=compress).construct()
+                target, root, debug=debug, trace=trace, force=force, compress=compress,
+                jobs=jobs, cachePath=cachePath, compiler=compiler).construct()
     elif path:
         CoffeescriptBuilder.compileAllOnPath(
-            path, root, recursive, debug, trace, force, compress=compress)
+            path, root, recursive, debug, trace, force, compress=compress, jobs=jobs,
+            cachePath=cachePath, compiler=compiler)
     else:
         print("\nNo path was specified. Would you like to compile the entire vmi domain?")
         result = queryYesNoQuit('Yes to continue:')
@@ -973,7 +1471,9 @@ def main():
         if result != "yes":
             sys.exit()
 
-        CoffeescriptBuilder.compileAllOnPath(path, root, True, debug, trace, force)
+        CoffeescriptBuilder.compileAllOnPath(
+            path, root, True, debug, trace, force, jobs=jobs, cachePath=cachePath,
+            compiler=compiler)
 
     print("\nOperation complete.\n")
 
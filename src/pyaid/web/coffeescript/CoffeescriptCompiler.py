@@ -0,0 +1,62 @@
+# CoffeescriptCompiler.py
+# (C)2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+from pyaid.system.SystemUtils import SystemUtils
+
+#___________________________________________________________________________________________________ CoffeescriptCompiler
+class CoffeescriptCompiler(object):
+    """ Compiles assembled CoffeeScript files to JavaScript files for the CoffeescriptBuilder by
+        running the CoffeeScript compiler command once for each file. This is the base class of
+        other compiler backends, which return results in the same form. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    DEFAULT_COMMAND = ['coffee']
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, command =None):
+        """Creates a new instance of CoffeescriptCompiler."""
+        self._command      = list(command or self.DEFAULT_COMMAND)
+        self._compileCount = 0
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: command
+    @property
+    def command(self):
+        return self._command
+
+#___________________________________________________________________________________________________ GS: compileCount
+    @property
+    def compileCount(self):
+        """ The number of files compiled by the compiler. """
+        return self._compileCount
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ compile
+    def compile(self, assembledPath, compiledPath):
+        """ Compiles the assembled file to the compiled path, which for this compiler must be the
+            assembled path with a js extension, and returns a dictionary with the code, out,
+            error and command of the compilation. """
+        self._compileCount += 1
+        return SystemUtils.executeCommand(self._command + ['-c', '--bare', assembledPath])
+
+#___________________________________________________________________________________________________ close
+    def close(self):
+        """ Releases any resources held by the compiler. """
+        pass
+
+#___________________________________________________________________________________________________ __enter__
+    def __enter__(self):
+        return self
+
+#___________________________________________________________________________________________________ __exit__
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,310 @@
+# CoffeescriptCompilerWorker.py
+# (C)2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import json
+import os
+import subprocess
+import threading
+
+from pyaid.string.StringUtils import StringUtils
+from pyaid.web.coffeescript.CoffeescriptCompiler import CoffeescriptCompiler
+
+#___________________________________________________________________________________________________ CoffeescriptCompilerWorker
+class CoffeescriptCompilerWorker(CoffeescriptCompiler):
+    """ A CoffeescriptCompiler that compiles through long-running compiler processes instead of
+        starting the compiler once for each file. Up to workerCount processes are started as they
+        are needed and each compilation is sent to an idle process, so that the worker can be
+        shared by the threads of a concurrent build.
+
+        Requests and responses are JSON objects written to the standard input and output of a
+        process, each framed by its length in bytes on a line of its own. A process writes a
+        ready response when it has started. Requests have an id, path, source and bare flag and
+        are answered by responses with the same id, a code, the compiled js and any error.
+
+        If a process cannot be started, fails or does not respond within the read timeout, the
+        worker compiles that file and every following file with the fallback compiler, which runs
+        the compiler once for each file.
+
+        The default command loads the CoffeeScript module at the modulePath if one is specified
+        and otherwise the module of the coffee command on the PATH. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    WORKER_SCRIPT = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'coffeescriptWorker.js')
+
+    DEFAULT_COMMAND = ['node', WORKER_SCRIPT]
+
+    # The number of seconds to wait for a process to start or to respond to a request
+    DEFAULT_READ_TIMEOUT = 60
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(
+            self, command =None, workerCount =1, fallback =None, readTimeout =None,
+            modulePath =None
+    ):
+        """Creates a new instance of CoffeescriptCompilerWorker."""
+        if command is None and modulePath:
+            command = self.DEFAULT_COMMAND + [modulePath]
+
+        CoffeescriptCompiler.__init__(self, command)
+        self._workerCount   = max(1, workerCount or 1)
+        self._fallback      = CoffeescriptCompiler() if fallback is None else fallback
+        self._readTimeout   = self.DEFAULT_READ_TIMEOUT if readTimeout is None else readTimeout
+        self._processes     = []
+        self._idle          = []
+        self._startingCount = 0
+        self._startCount    = 0
+        self._requestCount  = 0
+        self._failed        = False
+        self._condition     = threading.Condition()
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: workerCount
+    @property
+    def workerCount(self):
+        """ The maximum number of compiler processes run by the worker. """
+        return self._workerCount
+
+#___________________________________________________________________________________________________ GS: fallback
+    @property
+    def fallback(self):
+        return self._fallback
+
+#___________________________________________________________________________________________________ GS: failed
+    @property
+    def failed(self):
+        """ Whether or not compilation has fallen back to the fallback compiler. """
+        return self._failed
+
+#___________________________________________________________________________________________________ GS: readTimeout
+    @property
+    def readTimeout(self):
+        """ The number of seconds to wait for a process to start or respond before falling back,
+            or zero to wait indefinitely. """
+        return self._readTimeout
+
+#___________________________________________________________________________________________________ GS: startCount
+    @property
+    def startCount(self):
+        """ The number of compiler processes that have been started. """
+        return self._startCount
+
+#___________________________________________________________________________________________________ GS: requestCount
+    @property
+    def requestCount(self):
+        """ The number of requests sent to the compiler processes. """
+        return self._requestCount
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ compile
+    def compile(self, assembledPath, compiledPath):
+        """ Compiles the assembled file to the compiled path and returns a dictionary with the
+            code, out, error and command of the compilation. """
+        with open(assembledPath, 'rb') as fh:
+            source = StringUtils.toUnicode(fh.read())
+
+        process = self._acquire()
+        if process is None:
+            return self._fallback.compile(assembledPath, compiledPath)
+
+        try:
+            with self._condition:
+                self._requestCount += 1
+                requestId = self._requestCount
+
+            self._writeFrame(process.stdin, {
+                'id':requestId, 'path':assembledPath, 'source':source, 'bare':True })
+            response = self._readResponse(process)
+            if response.get('id') != requestId:
+                raise ValueError('Unexpected response from compiler process')
+        except (IOError, OSError, ValueError):
+            self._fail(process)
+            return self._fallback.compile(assembledPath, compiledPath)
+
+        self._release(process)
+        with self._condition:
+            self._compileCount += 1
+
+        if response.get('code') == 0:
+            with open(compiledPath, 'wb') as fh:
+                fh.write(StringUtils.toBytes(response.get('js') or ''))
+
+        return {
+            'error':response.get('error') or '',
+            'out':'',
+            'code':response.get('code'),
+            'command':' '.join(self._command) }
+
+#___________________________________________________________________________________________________ close
+    def close(self):
+        """ Stops the compiler processes once they have finished their current compilations. """
+        with self._condition:
+            while self._startingCount or len(self._idle) < len(self._processes):
+                self._condition.wait()
+            processes       = self._processes
+            self._processes = []
+            self._idle      = []
+
+        for process in processes:
+            self._stop(process)
+        self._fallback.close()
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _acquire
+    def _acquire(self):
+        """ Returns an idle compiler process, starting a new one if fewer than the worker count
+            are running or waiting for one to become idle otherwise. Returns None if the worker
+            has failed. Processes are started outside of the lock so that other threads can
+            acquire and release processes in the meantime. """
+        with self._condition:
+            while True:
+                if self._failed:
+                    return None
+
+                if self._idle:
+                    return self._idle.pop()
+
+                if len(self._processes) + self._startingCount < self._workerCount:
+                    self._startingCount += 1
+                    break
+
+                self._condition.wait()
+
+        process = self._start()
+        with self._condition:
+            self._startingCount -= 1
+            self._condition.notify_all()
+            if process is not None and not self._failed:
+                self._startCount += 1
+                self._processes.append(process)
+                return process
+            self._failed = True
+
+        # The worker may have failed while the process was starting
+        if process is not None:
+            self._stop(process)
+        return None
+
+#___________________________________________________________________________________________________ _release
+    def _release(self, process):
+        with self._condition:
+            self._idle.append(process)
+            self._condition.notify_all()
+
+#___________________________________________________________________________________________________ _fail
+    def _fail(self, process):
+        """ Stops a process that has failed and falls back to the fallback compiler. """
+        with self._condition:
+            self._failed = True
+            if process in self._processes:
+                self._processes.remove(process)
+            self._condition.notify_all()
+        self._stop(process, kill=True)
+
+#___________________________________________________________________________________________________ _start
+    def _start(self):
+        """ Starts a compiler process and waits for it to be ready, returning None if it could
+            not be started. """
+        devnull = open(os.devnull, 'wb')
+        try:
+            process = subprocess.Popen(
+                self._command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=devnull)
+        except (IOError, OSError):
+            return None
+        finally:
+            devnull.close()
+
+        try:
+            if self._readResponse(process).get('ready'):
+                return process
+        except (IOError, OSError, ValueError):
+            pass
+
+        self._stop(process, kill=True)
+        return None
+
+#___________________________________________________________________________________________________ _readResponse
+    def _readResponse(self, process):
+        """ Reads a framed JSON object from the output of the process. A process that does not
+            write a complete frame within the read timeout is killed, which ends the read with a
+            ValueError so that the worker falls back to the fallback compiler. """
+        timer = None
+        if self._readTimeout:
+            timer = threading.Timer(self._readTimeout, self._kill, [process])
+            timer.daemon = True
+            timer.start()
+
+        try:
+            return self._readFrame(process.stdout)
+        finally:
+            if timer is not None:
+                timer.cancel()
+
+#___________________________________________________________________________________________________ _kill
+    @classmethod
+    def _kill(cls, process):
+        try:
+            process.kill()
+        except (IOError, OSError):
+            pass
+
+#___________________________________________________________________________________________________ _stop
+    @classmethod
+    def _stop(cls, process, kill =False):
+        """ Closes the input of the process, which ends a process that is working correctly,
+            and waits for it to exit. Processes that have failed are killed first. """
+        if kill:
+            cls._kill(process)
+        try:
+            process.stdin.close()
+        except (IOError, OSError):
+            pass
+
+        try:
+            process.wait()
+            process.stdout.close()
+        except (IOError, OSError):
+            pass
+
+#___________________________________________________________________________________________________ _writeFrame
+    @classmethod
+    def _writeFrame(cls, stream, value):
+        data = StringUtils.toBytes(json.dumps(value, separators=(',', ':')))
+        stream.write(StringUtils.toBytes('%s\n' % len(data)) + data)
+        stream.flush()
+
+#___________________________________________________________________________________________________ _readFrame
+    @classmethod
+    def _readFrame(cls, stream):
+        """ Reads a framed JSON object from the stream, raising a ValueError if the stream ends
+            or the frame is malformed. """
+        header = stream.readline()
+        if not header.endswith(b'\n'):
+            raise ValueError('Compiler process closed its output')
+
+        size = int(header.strip())
+        data = b''
+        while len(data) < size:
+            chunk = stream.read(size - len(data))
+            if not chunk:
+                raise ValueError('Compiler process closed its output')
+            data += chunk
+
+        result = json.loads(StringUtils.toUnicode(data))
+        if not isinstance(result, dict):
+            raise ValueError('Malformed response from compiler process')
+        return result
@@ -0,0 +1,214 @@
+# CoffeescriptDependencyGraph.py
+# (C)2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+from pyaid.string.StringUtils import StringUtils
+from pyaid.web.coffeescript.CoffeescriptDependency import CoffeescriptDependency
+
+#___________________________________________________________________________________________________ CoffeescriptDependencyGraph
+class CoffeescriptDependencyGraph(object):
+    """ A persistent record of the dependency comments declared by each of the CoffeeScript
+        files within a root path, so that only the files that have changed since the previous
+        build are opened and scanned again. Each file is recorded with its modification time,
+        size and a hash of its contents. Files whose modification time or size have changed are
+        hashed again and scanned only if their contents have changed as well.
+
+        The graph is saved as JSON within the root path by default and is safe to share between
+        the threads of a concurrent build. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    DEFAULT_FILENAME = '.coffeescriptDependencies'
+
+    # Changes to the stored format must increment the version to invalidate existing graphs
+    FORMAT_VERSION = 1
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, rootPath, path =None):
+        """Creates a new instance of CoffeescriptDependencyGraph."""
+        self._rootPath = rootPath
+        self._path     = path
+        if path is None and rootPath:
+            self._path = os.path.join(rootPath, self.DEFAULT_FILENAME)
+
+        self._entries  = None
+        self._modified = False
+        self._hits     = 0
+        self._misses   = 0
+        self._lock     = threading.Lock()
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: rootPath
+    @property
+    def rootPath(self):
+        return self._rootPath
+
+#___________________________________________________________________________________________________ GS: path
+    @property
+    def path(self):
+        """ The path of the file where the graph is saved, or None if it is not saved. """
+        return self._path
+
+#___________________________________________________________________________________________________ GS: hits
+    @property
+    def hits(self):
+        """ The number of files whose dependencies were read from the graph. """
+        return self._hits
+
+#___________________________________________________________________________________________________ GS: misses
+    @property
+    def misses(self):
+        """ The number of files that were scanned for their dependencies. """
+        return self._misses
+
+#___________________________________________________________________________________________________ GS: modified
+    @property
+    def modified(self):
+        """ Whether or not the graph has changed since it was loaded or saved. """
+        return self._modified
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ getDependencies
+    def getDependencies(self, path):
+        """ Returns a list of new CoffeescriptDependency instances for the dependency comments
+            declared by the file at the specified path, in the order they are declared. Raises
+            an IOError or OSError if the file cannot be read. """
+        return [
+            CoffeescriptDependency(package, self._rootPath, dependencyType)
+            for dependencyType, package in self._getEntry(path)[3] ]
+
+#___________________________________________________________________________________________________ getHash
+    def getHash(self, path):
+        """ Returns the hexadecimal hash of the contents of the file at the specified path.
+            Raises an IOError or OSError if the file cannot be read. """
+        return self._getEntry(path)[2]
+
+#___________________________________________________________________________________________________ save
+    def save(self):
+        """ Writes the graph to its path if it has been modified, replacing the existing file
+            atomically. Returns False if the graph could not be written. """
+        with self._lock:
+            if not self._modified or not self._path:
+                return True
+
+            data = StringUtils.toBytes(json.dumps({
+                'version':self.FORMAT_VERSION,
+                'rootPath':self._rootPath,
+                'entries':self._entries }, separators=(',', ':')))
+
+            folder = os.path.dirname(self._path) or '.'
+            try:
+                fd, tempPath = tempfile.mkstemp(suffix='.tmp', dir=folder)
+            except (IOError, OSError):
+                return False
+
+            try:
+                with os.fdopen(fd, 'wb') as fh:
+                    fh.write(data)
+                if hasattr(os, 'replace'):
+                    os.replace(tempPath, self._path)
+                else:
+                    if os.path.exists(self._path):
+                        os.remove(self._path)
+                    os.rename(tempPath, self._path)
+            except (IOError, OSError):
+                if os.path.exists(tempPath):
+                    os.remove(tempPath)
+                return False
+
+            self._modified = False
+            return True
+
+#___________________________________________________________________________________________________ clear
+    def clear(self):
+        """ Removes every file from the graph, including the saved graph if one exists. """
+        with self._lock:
+            self._entries  = dict()
+            self._modified = False
+            if self._path and os.path.exists(self._path):
+                os.remove(self._path)
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _load
+    def _load(self):
+        """ Returns the entries of the saved graph, or an empty dictionary if the graph has not
+            been saved or was saved in another format or for another root path. """
+        if not self._path:
+            return dict()
+
+        try:
+            with open(self._path, 'rb') as fh:
+                data = json.loads(StringUtils.toUnicode(fh.read()))
+        except (IOError, OSError, ValueError):
+            return dict()
+
+        if not isinstance(data, dict) \
+                or data.get('version') != self.FORMAT_VERSION \
+                or data.get('rootPath') != self._rootPath:
+            return dict()
+        return data.get('entries') or dict()
+
+#___________________________________________________________________________________________________ _getEntry
+    def _getEntry(self, path):
+        """ Returns the entry for the file at the specified path, updating it first if the file
+            has been modified since it was recorded. """
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._load()
+
+            stat  = os.stat(path)
+            entry = self._entries.get(path)
+            if entry is None or entry[0] != stat.st_mtime or entry[1] != stat.st_size:
+                return self._update(path, stat, entry)
+
+            self._hits += 1
+            return entry
+
+#___________________________________________________________________________________________________ _update
+    def _update(self, path, stat, entry):
+        """ Creates the entry for a file that is new to the graph or whose modification time or
+            size has changed, scanning its contents only if their hash has changed. """
+        with open(path, 'rb') as fh:
+            raw = fh.read()
+        digest = hashlib.sha1(raw).hexdigest()
+
+        if entry is not None and entry[2] == digest:
+            self._hits += 1
+            dependencies = entry[3]
+        else:
+            self._misses += 1
+            dependencies = self._scan(StringUtils.toUnicode(raw))
+
+        entry = [stat.st_mtime, stat.st_size, digest, dependencies]
+        self._entries[path] = entry
+        self._modified = True
+        return entry
+
+#___________________________________________________________________________________________________ _scan
+    def _scan(self, source):
+        """ Returns a list of [dependencyType, package] pairs for the dependency comments found
+            on each line of the source. """
+        dependencies = []
+        for line in source.replace('\r\n', '\n').replace('\r', '\n').split('\n'):
+            if line.find('#') == -1:
+                continue
+
+            dependency = CoffeescriptDependency.create(line, self._rootPath)
+            if dependency:
+                dependencies.append([dependency.dependencyType, dependency.package])
+        return dependencies
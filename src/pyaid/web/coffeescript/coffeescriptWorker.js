@@ -0,0 +1,137 @@
+// coffeescriptWorker.js
+// (C)2016
+// Scott Ernst
+//
+// A long-running CoffeeScript compiler process for the CoffeescriptCompilerWorker. Requests and
+// responses are JSON objects, each framed by its length in bytes on a line of its own. A ready
+// response is written once the compiler has loaded and the process exits when its input ends.
+//
+// Usage: node coffeescriptWorker.js [path of the CoffeeScript module]
+
+var fs = require('fs');
+var path = require('path');
+
+var NAMES = ['coffeescript', 'coffee-script'];
+
+function requireFirst(candidates) {
+    for (var i = 0; i < candidates.length; i++) {
+        try {
+            return require(candidates[i]);
+        } catch (err) {}
+    }
+    return null;
+}
+
+function isCompilerPackage(folder) {
+    try {
+        var name = JSON.parse(fs.readFileSync(path.join(folder, 'package.json'), 'utf8')).name;
+        return NAMES.indexOf(name) >= 0;
+    } catch (err) {
+        return false;
+    }
+}
+
+// Returns the folders of the CoffeeScript packages that provide the coffee commands on the PATH,
+// so that the worker compiles with the same version as the one-shot compiler. npm links the
+// command to a script within its package, or writes a shim beside a node_modules folder.
+function findCommandPackages() {
+    var folders = (process.env.PATH || '').split(path.delimiter);
+    var commands = process.platform === 'win32' ? ['coffee.cmd', 'coffee'] : ['coffee'];
+    var packages = [];
+    for (var i = 0; i < folders.length; i++) {
+        for (var j = 0; j < commands.length; j++) {
+            var command = path.join(folders[i], commands[j]);
+            if (!folders[i] || !fs.existsSync(command)) {
+                continue;
+            }
+
+            var folder = path.dirname(fs.realpathSync(command));
+            while (!isCompilerPackage(folder) && path.dirname(folder) !== folder) {
+                folder = path.dirname(folder);
+            }
+            if (isCompilerPackage(folder)) {
+                packages.push(folder);
+            }
+
+            for (var k = 0; k < NAMES.length; k++) {
+                packages.push(path.join(folders[i], 'node_modules', NAMES[k]));
+            }
+        }
+    }
+    return packages;
+}
+
+// Loads the CoffeeScript module from the path given as the first argument if there is one.
+// Otherwise the module behind the coffee command on the PATH is preferred over the modules
+// that can be required from the worker script, and global modules are only looked up with npm,
+// which is slow to run, when none of those can be loaded.
+function loadCompiler() {
+    if (process.argv[2]) {
+        return requireFirst([path.resolve(process.argv[2])]);
+    }
+
+    var compiler = requireFirst(findCommandPackages().concat(NAMES));
+    if (compiler) {
+        return compiler;
+    }
+
+    try {
+        var root = require('child_process').execSync(
+            'npm root -g', {stdio: ['ignore', 'pipe', 'ignore']}).toString().trim();
+        return requireFirst(NAMES.map(function (name) {
+            return path.join(root, name);
+        }));
+    } catch (err) {
+        return null;
+    }
+}
+
+function respond(response) {
+    var data = Buffer.from(JSON.stringify(response), 'utf8');
+    process.stdout.write(data.length + '\n');
+    process.stdout.write(data);
+}
+
+function compile(request) {
+    try {
+        var js = CoffeeScript.compile(
+            request.source, {bare: request.bare, filename: request.path});
+        respond({id: request.id, code: 0, js: js, error: ''});
+    } catch (err) {
+        // Errors are formatted like those of the coffee command
+        var error = 'Error: In ' + request.path + ', ';
+        if (err.location) {
+            error += 'Parse error on line ' + (err.location.first_line + 1) + ': ' + err.message;
+        } else {
+            error += err.message;
+        }
+        respond({id: request.id, code: 1, js: null, error: error});
+    }
+}
+
+var CoffeeScript = loadCompiler();
+if (!CoffeeScript) {
+    process.exit(1);
+}
+
+var buffer = Buffer.alloc(0);
+process.stdin.on('data', function (chunk) {
+    buffer = Buffer.concat([buffer, chunk]);
+    while (true) {
+        var end = buffer.indexOf(10);
+        if (end < 0) {
+            return;
+        }
+
+        var size = parseInt(buffer.slice(0, end).toString('ascii'), 10);
+        if (buffer.length < end + 1 + size) {
+            return;
+        }
+
+        var request = JSON.parse(buffer.slice(end + 1, end + 1 + size).toString('utf8'));
+        buffer = buffer.slice(end + 1 + size);
+        compile(request);
+    }
+});
+
+respond({ready: true, version: CoffeeScript.VERSION});
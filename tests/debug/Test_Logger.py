@@ -0,0 +1,310 @@
+# Test_Logger.py [UNIT TEST]
+# (C) 2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from pyaid.debug.AsyncLogWriter import AsyncLogWriter
+from pyaid.debug.LogArchiveCompressor import LogArchiveCompressor
+from pyaid.debug.LogLevelEnum import LogLevelEnum
+from pyaid.debug.LogRecordCodec import LogRecordCodec
+from pyaid.debug.LogRecordFormatEnum import LogRecordFormatEnum
+from pyaid.debug.LogRecordReader import LogRecordReader
+from pyaid.debug.LogQueuePolicyEnum import LogQueuePolicyEnum
+from pyaid.debug.Logger import Logger
+
+#*************************************************************************************************** Test_Logger
+class Test_Logger(unittest.TestCase):
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+#___________________________________________________________________________________________________ setUp
+    def setUp(self):
+        self.logFolder = tempfile.mkdtemp()
+
+#___________________________________________________________________________________________________ tearDown
+    def tearDown(self):
+        shutil.rmtree(self.logFolder, ignore_errors=True)
+
+#___________________________________________________________________________________________________ readLog
+    def readLog(self, logger):
+        with open(logger.logFilePath, 'r') as f:
+            return f.read()
+
+#___________________________________________________________________________________________________ test_asyncWrite
+    def test_asyncWrite(self):
+        """ Asynchronously written messages should all reach the log file once drained """
+        logger = Logger('asyncTest', logFolder=self.logFolder, asyncWrite=True)
+        self.assertTrue(logger.isAsync)
+
+        for i in range(100):
+            logger.write('Message #%s' % i)
+        logger.flush(wait=True)
+
+        contents = self.readLog(logger)
+        for i in range(100):
+            self.assertIn('Message #%s\n' % i, contents)
+        self.assertEqual(logger.droppedCount, 0)
+        logger.close()
+
+#___________________________________________________________________________________________________ test_asyncClose
+    def test_asyncClose(self):
+        """ Closing an asynchronous logger should drain its queue and stop the writer """
+        logger = Logger('asyncClose', logFolder=self.logFolder, asyncWrite=True)
+        logger.add('Before close')
+        logger.close()
+        self.assertFalse(logger.isAsync)
+        self.assertIn('Before close', self.readLog(logger))
+
+#___________________________________________________________________________________________________ test_dropPolicies
+    def test_dropPolicies(self):
+        """ Full queues should drop according to the policy and count the dropped items """
+        for policy, expected in [
+                (LogQueuePolicyEnum.DROP_NEWEST, [0, 1]),
+                (LogQueuePolicyEnum.DROP_OLDEST, [3, 4]) ]:
+            written = []
+            release = threading.Event()
+
+            def handler(batch):
+                release.wait()
+                written.extend(batch)
+
+            # The writer is not started until the queue is full so that nothing is consumed
+            writer = AsyncLogWriter(handler, maxSize=2, policy=policy)
+            for i in range(5):
+                writer.enqueue(i)
+            self.assertEqual(writer.droppedCount, 3)
+
+            writer.start()
+            release.set()
+            writer.close()
+            self.assertEqual(written, expected)
+
+#___________________________________________________________________________________________________ test_blockTimeout
+    def test_blockTimeout(self):
+        """ A blocked producer should give up after the block timeout and count a drop """
+        writer = AsyncLogWriter(
+            lambda batch: None, maxSize=1, policy=LogQueuePolicyEnum.BLOCK, blockTimeout=0.05)
+        self.assertTrue(writer.enqueue('a'))
+        self.assertFalse(writer.enqueue('b'))
+        self.assertEqual(writer.droppedCount, 1)
+        writer.start()
+        writer.close()
+        self.assertEqual(writer.writtenCount, 1)
+
+#___________________________________________________________________________________________________ test_persistentFile
+    def test_persistentFile(self):
+        """ The persistent append handle should reopen the log file after external rotation """
+        logger = Logger('persistent', logFolder=self.logFolder, persistentFile=True)
+        logger.write('First entry')
+
+        rotated = logger.logFilePath + '.1'
+        os.rename(logger.logFilePath, rotated)
+        logger._appendFile.checkRotation(force=True)
+        logger.write('Second entry')
+        logger.close()
+
+        with open(rotated, 'r') as f:
+            self.assertIn('First entry', f.read())
+        contents = self.readLog(logger)
+        self.assertIn('Second entry', contents)
+        self.assertNotIn('First entry', contents)
+
+#___________________________________________________________________________________________________ test_levelFiltering
+    def test_levelFiltering(self):
+        """ Messages below the threshold level should be discarded without being formatted """
+        calls = []
+
+        def createMessage():
+            calls.append(True)
+            return 'Expensive message'
+
+        logger = Logger('levels', level=LogLevelEnum.INFO)
+        logger.debug(createMessage)
+        logger.debug('Value: %s', 42)
+        self.assertEqual(logger.add('Added debug', level=LogLevelEnum.DEBUG), None)
+        self.assertEqual(len(logger._buffer), 0)
+
+        logger.info(createMessage)
+        logger.warn('Value: %s and %s', 'a', 12)
+        self.assertEqual(len(logger._buffer), 2)
+        self.assertEqual(calls, [])
+
+        self.assertEqual(logger._buffer[0]['log'], 'Expensive message')
+        self.assertEqual(logger._buffer[1]['log'], 'Value: a and 12')
+        self.assertEqual(logger._buffer[1]['level'], LogLevelEnum.WARN)
+        self.assertEqual(calls, [True])
+        logger.clear()
+
+#___________________________________________________________________________________________________ test_captureStack
+    def test_captureStack(self):
+        """ Captured stacks should match the traceback module and honor the level limits """
+
+        def inner(skip, maxLevels):
+            return Logger.captureStack(skip, maxLevels)
+
+        # The raw stack is taken one frame further out than the inner function
+        stack = inner(0, 0)
+        self.assertEqual(len(stack), len(Logger.getRawStack()) + 1)
+        self.assertEqual(stack[-1][0].co_name, 'inner')
+        self.assertEqual(stack[-2][0].co_name, 'test_captureStack')
+
+        stack = inner(1, 2)
+        self.assertEqual(len(stack), 2)
+        self.assertEqual(stack[-1][0].co_name, 'test_captureStack')
+
+        data = Logger.getStackData(inner(0, 1))
+        self.assertEqual(data[0]['function'], 'inner')
+        self.assertEqual(data[0]['code'], 'return Logger.captureStack(skip, maxLevels)')
+
+        try:
+            inner(None, None)
+        except Exception:
+            stack = Logger.captureStack()
+            self.assertEqual(stack[-1][0].co_name, 'inner')
+            self.assertEqual(stack[-2][0].co_name, 'test_captureStack')
+
+#___________________________________________________________________________________________________ test_codeInfoCacheSize
+    def test_codeInfoCacheSize(self):
+        """ Code objects generated at runtime should not grow the code information cache """
+        size  = Logger._CODE_INFO_CACHE_SIZE
+        codes = []
+        for i in range(size + 50):
+            namespace = dict(Logger=Logger)
+            exec(compile('def generated():\n    return Logger.captureStack(0, 1)\n',
+                         '<generated-%s>' % i, 'exec'), namespace)
+            data = Logger.getStackData(namespace['generated']())
+            self.assertEqual(data[0]['file'], '<generated-%s>' % i)
+            codes.append(namespace['generated'].__code__)
+
+        cached = [entry[0] for entry in Logger._CODE_INFO_CACHE.values()]
+        self.assertLessEqual(len(cached), size)
+        self.assertFalse(any(c is codes[0] for c in cached))
+        self.assertTrue(any(c is codes[-1] for c in cached))
+
+#___________________________________________________________________________________________________ test_sizeRotation
+    def test_sizeRotation(self):
+        """ Logs should roll over at the size limit and keep only the newest compressed segments """
+        logger = Logger(
+            'rotation', logFolder=self.logFolder, headerless=True, maxBytes=200, keepCount=2)
+
+        for i in range(20):
+            logger.write('Rotation test line %s %s' % (i, 'x'*40))
+        LogArchiveCompressor.getInstance().drain()
+
+        segments = logger.rotator.getSegments()
+        self.assertEqual(len(segments), 2)
+        for path in segments:
+            self.assertTrue(path.endswith('.log.gz'))
+        self.assertLess(os.path.getsize(logger.logFilePath), 200)
+        self.assertIn('Rotation test line 19', self.readLog(logger))
+
+#___________________________________________________________________________________________________ test_ageRotation
+    def test_ageRotation(self):
+        """ Logs last written before the age boundary should be rotated """
+        logger = Logger(
+            'ageRotation', logFolder=self.logFolder, maxAge=3600, compressArchives=False)
+        logger.write('Old entry')
+
+        old = time.time() - 7200
+        os.utime(logger.logFilePath, (old, old))
+        logger.write('New entry')
+
+        segments = logger.rotator.getSegments()
+        self.assertEqual(len(segments), 1)
+        self.assertNotIn('Old entry', self.readLog(logger))
+
+#___________________________________________________________________________________________________ test_structuredRecords
+    def test_structuredRecords(self):
+        """ Structured log files should be read back with time and error filtering """
+        for logFormat in [LogRecordFormatEnum.NDJSON, LogRecordFormatEnum.BINARY]:
+            logger = Logger('records', logFolder=self.logFolder, logFormat=logFormat)
+            logger.write('First entry')
+            try:
+                raise ValueError('Failure')
+            except Exception as err:
+                logger.writeError('Second entry', err)
+            middle = time.time()
+            logger.info('Third entry \u00e9')
+            logger.flush()
+
+            with LogRecordReader(logger.logFilePath) as reader:
+                records = list(reader)
+                self.assertEqual(len(records), 3)
+                self.assertEqual(records[0]['log'], 'First entry')
+                self.assertFalse(records[0]['error'])
+                self.assertEqual(records[2]['log'], 'Third entry \u00e9')
+                self.assertEqual(records[2]['level'], LogLevelEnum.INFO)
+
+                errors = list(reader.iterRecords(errorsOnly=True))
+                self.assertEqual(len(errors), 1)
+                self.assertTrue(errors[0]['log'].startswith('Second entry'))
+                self.assertIn('Stack Trace', errors[0]['stack'])
+
+                self.assertEqual(reader.countRecords(startTime=middle), 1)
+                self.assertEqual(reader.countRecords(endTime=middle), 2)
+
+            # Compressed archives of rotated segments are read back as a stream
+            logger.close()
+            archivePath = LogArchiveCompressor.compress(logger.logFilePath)
+            with LogRecordReader(archivePath) as reader:
+                self.assertEqual(reader.logFormat, logFormat)
+                self.assertEqual(list(reader), records)
+                self.assertEqual(reader.countRecords(errorsOnly=True), 1)
+                self.assertEqual(reader.countRecords(startTime=middle), 1)
+
+#___________________________________________________________________________________________________ test_binaryPrefixLimit
+    def test_binaryPrefixLimit(self):
+        """ Binary records with oversized prefixes should be truncated and keep their framing """
+        path    = os.path.join(self.logFolder, 'prefix.logb')
+        records = [
+            dict(time=1.0, prefix='\u00e9'*40000, log='First'),
+            dict(time=2.0, prefix='Short', log='Second') ]
+        with open(path, 'wb') as f:
+            f.write(LogRecordCodec.encodeAll(records, LogRecordFormatEnum.BINARY))
+
+        with LogRecordReader(path) as reader:
+            result = list(reader)
+        self.assertEqual([r['log'] for r in result], ['First', 'Second'])
+        self.assertEqual(result[0]['prefix'], '\u00e9'*(0xFFFF // 2))
+        self.assertEqual(result[1]['prefix'], 'Short')
+
+#___________________________________________________________________________________________________ test_storageRingBuffer
+    def test_storageRingBuffer(self):
+        """ Bounded storage buffers should evict the oldest entries by count and by size """
+        logger = Logger('storage', useStorageBuffer=True, storageCapacity=10, headerless=True)
+        for i in range(25):
+            logger.add('Entry %s' % i)
+        logger.clear()
+
+        self.assertEqual(len(logger.storageBuffer), 10)
+        self.assertEqual(logger.storageBuffer.evictedCount, 15)
+        self.assertEqual(
+            [m['log'] for m in logger.getStorageSnapshot(3)],
+            ['Entry 22', 'Entry 23', 'Entry 24'])
+
+        logger = Logger(
+            'storageBytes', useStorageBuffer=True, storageMaxBytes=100, headerless=True)
+        for i in range(25):
+            logger.add('x'*30)
+        logger.clear()
+        self.assertEqual(len(logger.storageBuffer), 3)
+        self.assertEqual(logger.storageBuffer.totalBytes, 90)
+
+        logger.clear(storage=True)
+        self.assertEqual(len(logger.storageBuffer), 0)
+
+####################################################################################################
+####################################################################################################
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(Test_Logger)
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,137 @@
+# Test_FileLock.py [UNIT TEST]
+# (C) 2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from pyaid.file.FileLock import FileLock
+from pyaid.file.FileLock import FileLockException
+from pyaid.file.FileLockBackendEnum import FileLockBackendEnum
+
+#___________________________________________________________________________________________________ holdLock
+def holdLock(path, readyEvent):
+    lock = FileLock(path, backend=FileLockBackendEnum.KERNEL)
+    lock.acquire()
+    readyEvent.set()
+    time.sleep(60)
+
+#*************************************************************************************************** Test_FileLock
+class Test_FileLock(unittest.TestCase):
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+#___________________________________________________________________________________________________ setUp
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path   = os.path.join(self.folder, 'locked.txt')
+
+#___________________________________________________________________________________________________ tearDown
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+#___________________________________________________________________________________________________ test_lockfileBackend
+    def test_lockfileBackend(self):
+        """ The lock file should exist only while the lock is held """
+        lock = FileLock(self.path, timeout=0.2)
+        with lock:
+            self.assertTrue(os.path.exists(lock.lockFileName))
+            self.assertRaises(FileLockException, FileLock(self.path, timeout=0.2).acquire)
+        self.assertFalse(os.path.exists(lock.lockFileName))
+
+#___________________________________________________________________________________________________ test_kernelExclusive
+    def test_kernelExclusive(self):
+        """ Exclusive kernel locks should time out while held and succeed once released """
+        lock = FileLock(self.path, backend=FileLockBackendEnum.KERNEL)
+        lock.acquire()
+
+        other = FileLock(self.path, timeout=0.1, backend=FileLockBackendEnum.KERNEL)
+        start = time.time()
+        self.assertRaises(FileLockException, other.acquire)
+        self.assertGreaterEqual(time.time() - start, 0.09)
+        self.assertFalse(other.isLocked)
+
+        lock.release()
+        with other:
+            self.assertTrue(other.isLocked)
+
+#___________________________________________________________________________________________________ test_kernelShared
+    def test_kernelShared(self):
+        """ Shared kernel locks should coexist and exclude writers """
+        kwargs = dict(ioMode='r', timeout=0.1, backend=FileLockBackendEnum.KERNEL, shared=True)
+        open(self.path, 'w').close()
+
+        readers = [FileLock(self.path, **kwargs), FileLock(self.path, **kwargs)]
+        for reader in readers:
+            reader.acquire()
+
+        writer = FileLock(self.path, timeout=0.1, backend=FileLockBackendEnum.KERNEL)
+        self.assertRaises(FileLockException, writer.acquire)
+
+        for reader in readers:
+            reader.release()
+        with writer:
+            self.assertTrue(writer.isLocked)
+
+#___________________________________________________________________________________________________ test_kernelProcessDeath
+    def test_kernelProcessDeath(self):
+        """ Kernel locks should be released when the owning process dies """
+        readyEvent = multiprocessing.Event()
+        process = multiprocessing.Process(target=holdLock, args=(self.path, readyEvent))
+        process.start()
+        self.assertTrue(readyEvent.wait(10))
+
+        lock = FileLock(self.path, timeout=0.1, backend=FileLockBackendEnum.KERNEL)
+        self.assertRaises(FileLockException, lock.acquire)
+
+        process.terminate()
+        process.join()
+        lock = FileLock(self.path, timeout=5, backend=FileLockBackendEnum.KERNEL)
+        with lock:
+            self.assertTrue(lock.isLocked)
+
+#___________________________________________________________________________________________________ test_staleLockFile
+    def test_staleLockFile(self):
+        """ Lock files left by dead processes or held too long should be broken """
+        FileLock.resetStatistics()
+        lock = FileLock(self.path, timeout=0.5)
+
+        # A lock file whose owner process does not exist
+        process = multiprocessing.Process(target=time.sleep, args=(0,))
+        process.start()
+        process.join()
+        with open(lock.lockFileName, 'w') as f:
+            f.write(json.dumps(dict(pid=process.pid, host=FileLock._HOSTNAME, time=time.time())))
+
+        with lock:
+            owner = lock.getOwner()
+            self.assertEqual(owner['pid'], os.getpid())
+
+        # A lock file held by this live process for longer than the max hold time
+        with open(lock.lockFileName, 'w') as f:
+            f.write(json.dumps(dict(pid=os.getpid(), host=FileLock._HOSTNAME, time=time.time())))
+        self.assertRaises(FileLockException, FileLock(self.path, timeout=0.1).acquire)
+        with FileLock(self.path, timeout=1, maxHoldTime=0.2):
+            pass
+
+        stats = FileLock.getStatistics()
+        self.assertEqual(stats['brokenLocks'], 2)
+        self.assertEqual(stats['timeouts'], 1)
+        self.assertEqual(stats['acquisitions'], 2)
+        self.assertEqual(stats['releases'], 2)
+        self.assertGreaterEqual(stats['maxWaitTime'], 0.1)
+
+####################################################################################################
+####################################################################################################
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(Test_FileLock)
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,95 @@
+# Test_FileWatcher.py [UNIT TEST]
+# (C) 2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from pyaid.file.FileWatcher import FileWatcher
+from pyaid.file.FileWatcherBackendEnum import FileWatcherBackendEnum
+
+#*************************************************************************************************** Test_FileWatcher
+class Test_FileWatcher(unittest.TestCase):
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+#___________________________________________________________________________________________________ setUp
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.folder, 'app'))
+        self._write('app/a.coffee', 'a = 1')
+        self._write('app/b.coffee', 'b = 1')
+
+#___________________________________________________________________________________________________ tearDown
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+#___________________________________________________________________________________________________ test_inotify
+    def test_inotify(self):
+        """ The inotify backend should report debounced changes, or fall back to polling """
+        self._testBackend(FileWatcherBackendEnum.INOTIFY)
+
+#___________________________________________________________________________________________________ test_polling
+    def test_polling(self):
+        """ The polling backend should report debounced changes """
+        self._testBackend(FileWatcherBackendEnum.POLLING)
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _testBackend
+    def _testBackend(self, backend):
+        with FileWatcher(
+                self.folder, ['coffee'], backend=backend, debounce=0.3, pollInterval=0.05
+        ) as watcher:
+            self.assertIn(watcher.backend, [backend, FileWatcherBackendEnum.POLLING])
+            self.assertEqual(watcher.wait(0.2), [])
+
+            # Changes spread over less than the debounce interval are returned together, while
+            # files without a watched extension are ignored
+            def change():
+                self._write('app/a.coffee', 'a = 2')
+                time.sleep(0.1)
+                os.remove(os.path.join(self.folder, 'app', 'b.coffee'))
+                self._write('app/c.js', 'c = 1')
+                time.sleep(0.1)
+                os.makedirs(os.path.join(self.folder, 'app', 'sub'))
+                self._write('app/sub/d.coffee', 'd = 1')
+
+            thread = threading.Thread(target=change)
+            thread.start()
+            start = time.time()
+            paths = watcher.wait(5)
+            thread.join()
+
+            self.assertEqual(paths, [
+                os.path.join(self.folder, 'app', n)
+                for n in ['a.coffee', 'b.coffee', os.path.join('sub', 'd.coffee')] ])
+            self.assertGreaterEqual(watcher.changeTime, start)
+
+            # Folders created after the watcher started are watched as well
+            self._write('app/sub/d.coffee', 'd = 22')
+            self.assertEqual(
+                watcher.wait(5), [os.path.join(self.folder, 'app', 'sub', 'd.coffee')])
+            self.assertEqual(watcher.wait(0.2), [])
+
+#___________________________________________________________________________________________________ _write
+    def _write(self, name, source):
+        path = os.path.join(self.folder, *name.split('/'))
+        with open(path, 'w') as f:
+            f.write(source)
+        return path
+
+####################################################################################################
+####################################################################################################
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(Test_FileWatcher)
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,115 @@
+# Test_Reporter.py [UNIT TEST]
+# (C) 2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from pyaid.file.Reporter import Reporter
+
+#*************************************************************************************************** Test_Reporter
+class Test_Reporter(unittest.TestCase):
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+#___________________________________________________________________________________________________ setUp
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+#___________________________________________________________________________________________________ tearDown
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+#___________________________________________________________________________________________________ test_shardedFlush
+    def test_shardedFlush(self):
+        """ Each thread should append to its own shard and the shards should merge in order """
+
+        # Threads are kept alive until all have flushed so that their identities are unique
+        flushed = threading.Semaphore(0)
+        finish  = threading.Event()
+
+        def report(index):
+            reporter = Reporter('shardTest', path=self.folder)
+            for i in range(50):
+                reporter.add({'thread':index, 'index':i})
+            reporter.flush()
+            reporter.close()
+            flushed.release()
+            finish.wait()
+
+        threads = [threading.Thread(target=report, args=(i,)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            flushed.acquire()
+        finish.set()
+        for t in threads:
+            t.join()
+
+        timeCodes = os.listdir(self.folder)
+        self.assertEqual(len(timeCodes), 1)
+        folder = os.path.join(self.folder, timeCodes[0])
+        self.assertEqual(len(os.listdir(folder)), 4)
+
+        lines = list(Reporter.iterMergedReports(folder))
+        self.assertEqual(len(lines), 200)
+
+        times = [Reporter._getReportLineTime(line) for line in lines]
+        self.assertEqual(times, sorted(times))
+
+        data = json.loads(lines[0].split(' ', 1)[1])
+        self.assertEqual(data['_vw'], 'shardTest')
+
+        output = os.path.join(self.folder, 'merged.txt')
+        self.assertEqual(Reporter.mergeShards(folder, output), 200)
+
+#___________________________________________________________________________________________________ test_forkedShards
+    @unittest.skipIf(not hasattr(os, 'fork'), 'Requires os.fork')
+    def test_forkedShards(self):
+        """ A forked child should write to its own shard instead of its parent's """
+        reporter = Reporter('forkTest', path=self.folder)
+        reporter.add({'owner':'parent', 'index':0})
+        reporter.flush()
+
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                reporter.add({'owner':'child', 'index':0})
+                code = 0 if reporter.flush() else 1
+                reporter.close()
+            finally:
+                os._exit(code)
+
+        self.assertEqual(os.waitpid(pid, 0)[1], 0)
+        reporter.add({'owner':'parent', 'index':1})
+        reporter.flush()
+        reporter.close()
+
+        timeCodes = os.listdir(self.folder)
+        self.assertEqual(len(timeCodes), 1)
+        folder = os.path.join(self.folder, timeCodes[0])
+
+        owners = dict()
+        for name in os.listdir(folder):
+            with open(os.path.join(folder, name)) as f:
+                entries = [json.loads(line.split(' ', 1)[1]) for line in f if line.strip()]
+            owners[name.split('-', 1)[0]] = [(e['owner'], e['index']) for e in entries]
+
+        self.assertEqual(owners, {
+            str(os.getpid()):[('parent', 0), ('parent', 1)],
+            str(pid):[('child', 0)] })
+
+####################################################################################################
+####################################################################################################
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(Test_Reporter)
+    unittest.TextTestRunner(verbosity=2).run(suite)
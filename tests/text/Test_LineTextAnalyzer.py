@@ -0,0 +1,171 @@
+# Test_LineTextAnalyzer.py [UNIT TEST]
+# (C) 2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import random
+import unittest
+
+from pyaid.text.LineTextAnalyzer import LineTextAnalyzer
+from pyaid.text.TextLineIndex import TextLineIndex
+from pyaid.web.coffeescript.CoffeescriptAnalyzer import CoffeescriptAnalyzer
+
+#*************************************************************************************************** Test_LineTextAnalyzer
+class Test_LineTextAnalyzer(unittest.TestCase):
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+#___________________________________________________________________________________________________ setUp
+    def setUp(self):
+        self.random = random.Random(16)
+
+#___________________________________________________________________________________________________ test_lineIndex
+    def test_lineIndex(self):
+        """ The line index should follow replacements without rescanning the text """
+        for trial in range(50):
+            text  = self._createText(30)
+            index = TextLineIndex(text)
+
+            for i in range(30):
+                start = self.random.randint(0, len(text))
+                end   = self.random.randint(start, len(text))
+                value = self._createText(4)
+                text  = text[:start] + value + text[end:]
+                index.replace(start, end, value)
+
+                ranges = self._getLineRanges(text)
+                self.assertEqual(index.getStarts(), [r[0] for r in ranges])
+                self.assertEqual(
+                    [index.getEnd(j) for j in range(index.count)], [r[1] for r in ranges])
+                for j in range(len(text)):
+                    lineStart, lineEnd = ranges[index.findLine(j)]
+                    self.assertTrue(lineStart <= j < lineEnd)
+                self.assertEqual(index.findLine(len(text)), 0 if not text else -1)
+
+#___________________________________________________________________________________________________ test_edits
+    def test_edits(self):
+        """ Lines should follow inserts that add and remove newlines """
+        analyzer = LineTextAnalyzer('first line\nsecond "line"\nthird (line)')
+        analyzer.analyze()
+        self.assertEqual(analyzer.lineCount, 3)
+
+        second = analyzer.getLineAtIndex(15)
+        self.assertEqual(second.lineNumber, 2)
+        self.assertEqual(analyzer.getLinesInRange(5, 15), analyzer.lines[:2])
+
+        for i in range(200):
+            source = analyzer.source
+            start  = self.random.randint(0, len(source))
+            end    = min(len(source), start + self.random.choice([0, 0, 1, 5]))
+            analyzer.insertCharacters(start, end, self._createText(3))
+
+            source = analyzer.source
+            lines  = analyzer.lines
+            self.assertEqual(
+                [(l.startIndex, l.endIndex) for l in lines], self._getLineRanges(source))
+            for j, l in enumerate(lines):
+                self.assertEqual(l.lineIndex, j)
+                self.assertIs(l.nextLine, lines[j + 1] if j + 1 < len(lines) else None)
+
+            index = self.random.randint(0, len(source))
+            line  = analyzer.getLineAtIndex(index)
+            self.assertIs(line, ([l for l in lines if l.contains(index)] or [None])[0])
+
+#___________________________________________________________________________________________________ test_lineViews
+    def test_lineViews(self):
+        """ Line views should be shared, follow their rows and read the line flags """
+        analyzer = CoffeescriptAnalyzer('a = 1\n  # comment\n"string"\n\nb = (2)')
+        analyzer.analyze()
+
+        comment = analyzer.getLine(1)
+        self.assertIs(comment, analyzer.getLineAtIndex(8))
+        self.assertIs(comment.previousLine.nextLine, comment)
+        self.assertEqual(comment.indent, '  ')
+        self.assertEqual(
+            [(l.isComment, l.isString, l.isEmpty, l.isSignificant) for l in analyzer],
+            [(False, False, False, True), (True, False, True, False),
+             (False, True, True, False), (False, False, True, False),
+             (False, False, False, True)])
+
+        first = analyzer.getLine(0)
+        analyzer.insertCharacters(0, 0, 'c = 0\n')
+        self.assertEqual(comment.lineIndex, 2)
+        self.assertEqual(comment.source, '  # comment\n')
+        self.assertTrue(comment.isComment)
+        self.assertEqual(first.source, 'c = 0\n')
+
+        # Removed lines are merged into the line where the removal begins
+        string = comment.nextLine
+        analyzer.insertCharacters(comment.startIndex, comment.endIndex, '')
+        self.assertTrue(string.dead)
+        self.assertEqual(string.lineIndex, -1)
+        self.assertEqual(comment.source, '"string"\n')
+        self.assertTrue(comment.isString)
+        self.assertFalse(comment.isSignificant)
+
+#___________________________________________________________________________________________________ test_insertedLines
+    def test_insertedLines(self):
+        """ Lines inserted and removed without changing the source should stay in the index """
+        analyzer = LineTextAnalyzer('a\nb\nc')
+        added    = analyzer.getLine(0).addLineAfter()
+        last     = analyzer.getLine(-1).addLineAfter()
+        self.assertEqual(
+            [(l.source, l.startIndex, l.endIndex) for l in analyzer],
+            [('a\n', 0, 2), ('', 2, 2), ('b\n', 2, 4), ('c', 4, 5), ('', 5, 5)])
+        self.assertIs(analyzer.getLineAtIndex(2).previousLine, added)
+        self.assertTrue(added.isEmpty)
+
+        # Removed lines merge into the previous line, or the next line for the first line
+        analyzer.getLine(2).removeLineBefore()
+        analyzer.getLine(0).destroy()
+        self.assertTrue(added.dead)
+        self.assertEqual(
+            [(l.source, l.startIndex, l.endIndex) for l in analyzer],
+            [('a\nb\n', 0, 4), ('c', 4, 5), ('', 5, 5)])
+        self.assertIs(analyzer.getLine(-1), last)
+
+        for i in range(200):
+            lineIndex = self.random.randint(0, analyzer.lineCount - 1)
+            action    = self.random.choice(['before', 'after', 'remove', 'edit', 'edit'])
+            if action == 'before':
+                analyzer.getLine(lineIndex).addLineBefore()
+            elif action == 'after':
+                analyzer.getLine(lineIndex).addLineAfter()
+            elif action == 'remove' and analyzer.lineCount > 1:
+                analyzer.getLine(lineIndex).destroy()
+            else:
+                source = analyzer.source
+                start  = self.random.randint(0, len(source))
+                end    = min(len(source), start + self.random.choice([0, 1, 5]))
+                analyzer.insertCharacters(start, end, self._createText(3))
+
+            lines = list(analyzer)
+            self.assertEqual(len(lines), analyzer.lineCount)
+            self.assertEqual(''.join(l.source for l in lines), analyzer.source)
+            for j, l in enumerate(lines):
+                self.assertEqual(l.startIndex, lines[j - 1].endIndex if j else 0)
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _createText
+    def _createText(self, maxLength):
+        length = self.random.randint(0, maxLength)
+        return ''.join(self.random.choice('ab \n') for i in range(length))
+
+#___________________________________________________________________________________________________ _getLineRanges
+    @classmethod
+    def _getLineRanges(cls, text):
+        starts = [0] + [i + 1 for i, c in enumerate(text) if c == '\n']
+        if len(starts) > 1 and starts[-1] == len(text):
+            starts.pop()
+        return list(zip(starts, starts[1:] + [len(text)]))
+
+####################################################################################################
+####################################################################################################
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(Test_LineTextAnalyzer)
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,144 @@
+# Test_TextAnalysisCache.py [UNIT TEST]
+# (C) 2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+import zlib
+
+from pyaid.text.BlockDefinition import BlockDefinition
+from pyaid.text.TextAnalysisCache import TextAnalysisCache
+from pyaid.text.TextAnalyzer import TextAnalyzer
+from pyaid.web.coffeescript.CoffeescriptAnalyzer import CoffeescriptAnalyzer
+
+#*************************************************************************************************** Test_TextAnalysisCache
+class Test_TextAnalysisCache(unittest.TestCase):
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    _SOURCE = '\n'.join([
+        '# Widget',
+        '# globals Widget, Base',
+        'class Widget extends Base',
+        '    ###',
+        '    A "block" comment',
+        '    ###',
+        '    constructor: (@name) -> @label = "Widget #{name}"',
+        '    items: [1, 2, (3, {a: 4})]',
+        '    broken: ("unclosed' ])
+
+#___________________________________________________________________________________________________ setUp
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+#___________________________________________________________________________________________________ tearDown
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+#___________________________________________________________________________________________________ test_restore
+    def test_restore(self):
+        """ A cache hit should restore the analysis without analyzing the source again """
+        cache    = TextAnalysisCache(self.folder)
+        analyzer = CoffeescriptAnalyzer(self._SOURCE)
+        self.assertFalse(cache.analyze(analyzer))
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+        restored = CoffeescriptAnalyzer(self._SOURCE)
+        restored.analyze = None
+        self.assertTrue(cache.analyze(restored))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        self.assertTrue(restored.analyzed)
+        self.assertEqual(self._getBlockKeys(restored), self._getBlockKeys(analyzer))
+        self.assertEqual(restored.syntaxErrors, analyzer.syntaxErrors)
+        self.assertEqual(len(restored.syntaxErrors), 1)
+        self.assertEqual(restored.globalObjects, ['Widget', 'Base'])
+        self.assertEqual(restored.redacted, analyzer.redacted)
+        self.assertEqual(
+            [(l.isComment, l.isString, l.indent) for l in restored],
+            [(l.isComment, l.isString, l.indent) for l in analyzer])
+        self.assertEqual(len(restored.getBlocksAtIndex(60)), len(analyzer.getBlocksAtIndex(60)))
+
+        # Restored analyzers should remain editable
+        for a in [analyzer, restored]:
+            a.insertCharacters(12, 12, '(\n')
+        self.assertEqual(self._getBlockKeys(restored), self._getBlockKeys(analyzer))
+        self.assertEqual(restored.getLine(1).source, analyzer.getLine(1).source)
+
+        # The source and block definitions are part of the key
+        self.assertFalse(cache.load(CoffeescriptAnalyzer(self._SOURCE + ' ')))
+        self.assertNotEqual(
+            cache.getKey(TextAnalyzer(self._SOURCE)),
+            cache.getKey(TextAnalyzer(
+                self._SOURCE, blockDefs=[BlockDefinition.createParensDef()])))
+        self.assertEqual(
+            cache.getKey(TextAnalyzer(self._SOURCE)), cache.getKey(TextAnalyzer(self._SOURCE)))
+
+#___________________________________________________________________________________________________ test_eviction
+    def test_eviction(self):
+        """ The least recently used entries should be evicted beyond the maximum size """
+        cache = TextAnalysisCache(self.folder)
+        sources = ['%s = (%s, "%s")\n' % (i, i, i) * (i + 1)*50 for i in range(4)]
+        for i, source in enumerate(sources):
+            cache.analyze(TextAnalyzer(source))
+            path = os.path.join(self.folder, cache.getKey(TextAnalyzer(source)) + '.analysis')
+            os.utime(path, (time.time() - 100 + i, time.time() - 100 + i))
+
+        # Reading the oldest entry makes the second entry the least recently used
+        self.assertTrue(cache.load(TextAnalyzer(sources[0])))
+        sizes = [
+            os.path.getsize(os.path.join(self.folder, cache.getKey(TextAnalyzer(s)) + '.analysis'))
+            for s in sources]
+        cache.prune(cache.size - sizes[1])
+
+        self.assertEqual(
+            [cache.load(TextAnalyzer(s)) for s in sources], [True, False, True, True])
+        self.assertEqual(cache.size, sum(sizes) - sizes[1])
+
+        cache.clear()
+        self.assertEqual(cache.size, 0)
+        self.assertFalse(cache.load(TextAnalyzer(sources[0])))
+
+#___________________________________________________________________________________________________ test_invalidEntries
+    def test_invalidEntries(self):
+        """ Entries that cannot be restored should be treated as misses and analyzed again """
+        folder   = os.path.join(self.folder, 'nested', 'cache')
+        expected = CoffeescriptAnalyzer(self._SOURCE)
+        self.assertFalse(TextAnalysisCache(folder).analyze(expected))
+
+        # Storing into a cache folder that already exists should succeed
+        self.assertTrue(TextAnalysisCache(folder).store(expected))
+        path = os.path.join(folder, TextAnalysisCache(folder).getKey(expected) + '.analysis')
+
+        for state in ['{"blocks":[0,5]', '{"blocks":[0,5,1]}', '{"blocks":[0,5,999],"errors":[]}']:
+            with open(path, 'wb') as fh:
+                fh.write(zlib.compress(state.encode('utf-8')))
+
+            cache    = TextAnalysisCache(folder)
+            analyzer = CoffeescriptAnalyzer(self._SOURCE)
+            self.assertFalse(cache.analyze(analyzer))
+            self.assertEqual((cache.hits, cache.misses), (0, 1))
+            self.assertEqual(self._getBlockKeys(analyzer), self._getBlockKeys(expected))
+            self.assertEqual(analyzer.syntaxErrors, expected.syntaxErrors)
+            self.assertTrue(cache.load(CoffeescriptAnalyzer(self._SOURCE)))
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _getBlockKeys
+    @classmethod
+    def _getBlockKeys(cls, analyzer):
+        return [(b.start, b.end, b.blockType, b.name) for b in analyzer.blocks]
+
+####################################################################################################
+####################################################################################################
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(Test_TextAnalysisCache)
+    unittest.TextTestRunner(verbosity=2).run(suite)
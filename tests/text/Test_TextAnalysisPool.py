@@ -0,0 +1,104 @@
+# Test_TextAnalysisPool.py [UNIT TEST]
+# (C) 2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import codecs
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+from pyaid.text.BlockDefinition import BlockDefinition
+from pyaid.text.BlockSyntaxEnum import BlockSyntaxEnum
+from pyaid.text.TextAnalysisPool import TextAnalysisPool
+from pyaid.text.TextAnalyzer import TextAnalyzer
+from pyaid.web.coffeescript.CoffeescriptAnalyzer import CoffeescriptAnalyzer
+
+#*************************************************************************************************** Test_TextAnalysisPool
+class Test_TextAnalysisPool(unittest.TestCase):
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+#___________________________________________________________________________________________________ setUp
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+#___________________________________________________________________________________________________ tearDown
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+#___________________________________________________________________________________________________ test_sources
+    def test_sources(self):
+        """ Results should match a serial analysis and be returned in the order of the sources """
+        sources   = ['a = (%s, "%s")\n[b] = {c: %s}' % (i, 'x'*i, i) for i in range(20)]
+        blockDefs = [
+            BlockDefinition.createQuoteDef(BlockDefinition.BLOCKED),
+            BlockDefinition.createParensDef(),
+            BlockDefinition.createBracketsDef() ]
+
+        pool    = TextAnalysisPool(TextAnalyzer, blockDefs, maxWorkers=2, chunkSize=3)
+        results = pool.analyzeSources(sources)
+        self.assertEqual([r.key for r in results], list(range(len(sources))))
+
+        for source, result in zip(sources, results):
+            analyzer = TextAnalyzer(source, blockDefs=blockDefs)
+            analyzer.analyze()
+            self.assertTrue(result.success)
+            self.assertEqual(
+                result.blocks,
+                [(b.start, b.end, b.blockType, b.name) for b in analyzer.blocks])
+            self.assertEqual(len(result.getBlocksByType(BlockSyntaxEnum.BRACES)), 0)
+            self.assertGreaterEqual(result.elapsed, 0.0)
+
+        copy = pickle.loads(pickle.dumps(results[5]))
+        self.assertEqual((copy.key, copy.blocks), (results[5].key, results[5].blocks))
+
+#___________________________________________________________________________________________________ test_paths
+    def test_paths(self):
+        """ Files should be read within the workers and failures reported per file """
+        paths = []
+        for i in range(4):
+            paths.append(os.path.join(self.folder, 'file%s.coffee' % i))
+            with codecs.open(paths[-1], 'w', 'utf-8') as fh:
+                fh.write('# File %s\n# globals Widget%s\nx = "value"\n' % (i, i))
+        paths.insert(2, os.path.join(self.folder, 'missing.coffee'))
+
+        pool = TextAnalysisPool(
+            CoffeescriptAnalyzer, chunkSize=2, redacted=True, attributes=['globalObjects'])
+        results = pool.analyzePaths(paths)
+
+        self.assertEqual([r.path for r in results], paths)
+        self.assertEqual([r.success for r in results], [True, True, False, True, True])
+        self.assertIn('missing.coffee', results[2].exception)
+        self.assertEqual(results[3].data['globalObjects'], ['Widget2'])
+        self.assertEqual(results[0].redacted.split('\n')[2], 'x = ' + ' '*7)
+        self.assertEqual(len(results[0].getBlocksByType(BlockSyntaxEnum.COMMENT)), 2)
+        self.assertEqual(TextAnalysisPool.getSlowestResults(results, 1)[0].elapsed,
+                         max(r.elapsed for r in results))
+
+        # Serial analysis without worker processes should produce the same results
+        serial = TextAnalysisPool(
+            CoffeescriptAnalyzer, maxWorkers=0, redacted=True).analyzePaths(paths)
+        self.assertEqual([r.redacted for r in serial], [r.redacted for r in results])
+        self.assertEqual(serial[1].data, dict())
+
+        # Cached analyses should produce the same results
+        cachePath = os.path.join(self.folder, 'cache')
+        for i in range(2):
+            cached = TextAnalysisPool(
+                CoffeescriptAnalyzer, cachePath=cachePath, attributes=['globalObjects'],
+                chunkSize=2).analyzePaths(paths)
+            self.assertEqual([r.blocks for r in cached], [r.blocks for r in results])
+            self.assertEqual([r.data for r in cached], [r.data for r in results])
+        self.assertEqual(len(os.listdir(cachePath)), 4)
+
+####################################################################################################
+####################################################################################################
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(Test_TextAnalysisPool)
+    unittest.TextTestRunner(verbosity=2).run(suite)
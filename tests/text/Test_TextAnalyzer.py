@@ -0,0 +1,257 @@
+# Test_TextAnalyzer.py [UNIT TEST]
+# (C) 2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import random
+import re
+import unittest
+
+from pyaid.text.BlockDefinition import BlockDefinition
+from pyaid.text.BlockSyntaxEnum import BlockSyntaxEnum
+from pyaid.text.MatchLookDefinition import MatchLookDefinition
+from pyaid.text.RedactionTextAnalyzer import RedactionTextAnalyzer
+from pyaid.text.TextAnalyzer import TextAnalyzer
+from pyaid.text.TextScanEngineEnum import TextScanEngineEnum
+from pyaid.web.coffeescript.CoffeescriptAnalyzer import CoffeescriptAnalyzer
+
+#*************************************************************************************************** Test_TextAnalyzer
+class Test_TextAnalyzer(unittest.TestCase):
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    COFFEE_SOURCE = '\n'.join([
+        '# globals: Widget, Gadget',
+        'class Widget extends Gadget',
+        '    ###',
+        '    A "block" comment with (unbalanced parens',
+        '    ###',
+        '    constructor: (@name, options ={}) ->',
+        '        @items = [1, 2, [3, 4], {a:(5)}]',
+        '        @label = "Escaped \\" quote and #{@name} (interpolated)"',
+        '        @other = \'single \\\' quote\'',
+        '        @ratio = (@items.length / 2) / 3',
+        '        @regex = /ab+[(]c/g',
+        '        @doc   = """',
+        '            Triple quoted (text) [here]',
+        '            """',
+        '        # trailing comment (with parens',
+        '        @call(1, (x) -> x*2)',
+        '    unterminated: "never closed' ])
+
+#___________________________________________________________________________________________________ test_regexEngineMatchesCharacterEngine
+    def test_regexEngineMatchesCharacterEngine(self):
+        """ Both scan engines should produce identical blocks for the default definitions """
+        for source in [self.COFFEE_SOURCE, 'a(b[c{d}e]f)g "h(i" \'j\\\'k\' (l']:
+            self.assertEqual(
+                self._analyze(TextAnalyzer, source, TextScanEngineEnum.CHARACTER),
+                self._analyze(TextAnalyzer, source, TextScanEngineEnum.REGEX) )
+
+#___________________________________________________________________________________________________ test_escapeAtStart
+    def test_escapeAtStart(self):
+        """ A block opening at the start of a source ending in a backslash is not escaped """
+        for scanEngine in [TextScanEngineEnum.CHARACTER, TextScanEngineEnum.REGEX]:
+            self.assertEqual(
+                self._analyze(TextAnalyzer, '"a" \\', scanEngine),
+                [('QUOTES', 'string', 0, 3)] )
+
+#___________________________________________________________________________________________________ test_coffeescriptEngines
+    def test_coffeescriptEngines(self):
+        """ CoffeescriptAnalyzer results should not depend on the scan engine """
+        blocks = self._analyze(CoffeescriptAnalyzer, self.COFFEE_SOURCE, TextScanEngineEnum.REGEX)
+        self.assertEqual(
+            blocks,
+            self._analyze(CoffeescriptAnalyzer, self.COFFEE_SOURCE, TextScanEngineEnum.CHARACTER))
+
+        types = [b[1] for b in blocks]
+        self.assertIn(BlockSyntaxEnum.COMMENT, types)
+        self.assertIn(BlockSyntaxEnum.REGEX, types)
+        self.assertIn(BlockSyntaxEnum.STRING, types)
+        self.assertEqual(CoffeescriptAnalyzer().scanEngine, TextScanEngineEnum.REGEX)
+
+#___________________________________________________________________________________________________ test_chainedFindStates
+    def test_chainedFindStates(self):
+        """ Chained, regular expression and nested find state definitions should match """
+        blockDefs = {
+            'root':[
+                BlockDefinition.createVizmeMLCommentDef(),
+                BlockDefinition.createVizmeMLOpenDef('attrs'),
+                BlockDefinition.createQuoteDef(BlockDefinition.BLOCKED) ],
+            'attrs':[
+                BlockDefinition.createVizmeMLAttributeDef(),
+                BlockDefinition.createCommaDelimitedListDef('attrs', True, True),
+                BlockDefinition(
+                    'BACKREF', re.compile('(<)\\1'), BlockSyntaxEnum.PARENS, '>>') ]}
+
+        source = '[#tag one, two,three <<x>>] text [##] "[#no]" [/##] [#b c]'
+        self.assertEqual(
+            self._analyze(TextAnalyzer, source, TextScanEngineEnum.CHARACTER, blockDefs),
+            self._analyze(TextAnalyzer, source, TextScanEngineEnum.REGEX, blockDefs) )
+
+#___________________________________________________________________________________________________ test_lookArounds
+    def test_lookArounds(self):
+        """ Look patterns should be compiled once and match adjacent to the index only """
+        self.assertIs(
+            MatchLookDefinition.compileLookPattern('[a-z]+', False),
+            MatchLookDefinition('[a-z]+').compiledPattern )
+
+        analyzer = TextAnalyzer('abc = 12 / 3')
+        self.assertTrue(analyzer.lookBack(3, '[a-z]+'))
+        self.assertFalse(analyzer.lookBack(4, '[a-z]+'))
+        self.assertIsNone(analyzer.lookBack(0, '[a-z]+'))
+        self.assertTrue(analyzer.lookAhead(3, '=\\s'))
+        self.assertFalse(analyzer.lookAhead(0, '=\\s'))
+        self.assertTrue(analyzer.lookBack(9, '[0-9]+[\\s]*'))
+
+        # Look backs only consider the window of characters preceding the index
+        self.assertFalse(analyzer._lookBack(analyzer.source, 9, '12[\\s]*', 2))
+        self.assertTrue(analyzer._lookBack(analyzer.source, 9, '12[\\s]*', 3))
+
+#___________________________________________________________________________________________________ test_editMode
+    def test_editMode(self):
+        """ Edits in edit mode should produce the same source, blocks and bookmarks """
+        rand      = random.Random(14)
+        analyzers = [
+            TextAnalyzer(self.COFFEE_SOURCE),
+            TextAnalyzer(self.COFFEE_SOURCE, editMode=True) ]
+        for analyzer in analyzers:
+            analyzer.analyze()
+            analyzer.addBookmark(40, 60, 'first')
+            analyzer.addBookmark(200, None, 'second')
+        self.assertTrue(analyzers[1].editMode)
+
+        for i in range(200):
+            start = rand.randint(0, len(analyzers[0].source))
+            end   = min(len(analyzers[0].source), start + rand.choice([0, 0, 1, 4]))
+            value = rand.choice(['', 'x', '(y)', '\n'])
+            for analyzer in analyzers:
+                analyzer.insertCharacters(start, end, value)
+
+            if i % 20 == 0:
+                self.assertEqual(self._getState(analyzers[0]), self._getState(analyzers[1]))
+                self.assertEqual(
+                    [(b.start, b.end) for b in analyzers[0].getBlocksInRange(start, start + 8)],
+                    [(b.start, b.end) for b in analyzers[1].getBlocksInRange(start, start + 8)])
+
+        self.assertEqual(self._getState(analyzers[0]), self._getState(analyzers[1]))
+
+#___________________________________________________________________________________________________ test_editModeQueries
+    def test_editModeQueries(self):
+        """ Queries in edit mode should match those of a plain analyzer without joining the rope """
+        rand      = random.Random(16)
+        analyzers = [
+            RedactionTextAnalyzer(self.COFFEE_SOURCE),
+            RedactionTextAnalyzer(self.COFFEE_SOURCE, editMode=True) ]
+        for analyzer in analyzers:
+            analyzer.analyze()
+
+        reqs  = [MatchLookDefinition.createIgnoreEscapes(), MatchLookDefinition('[a-z]')]
+        found = set()
+        for i in range(50):
+            start = rand.randint(0, len(analyzers[0].source))
+            end   = min(len(analyzers[0].source), start + rand.choice([0, 1]))
+            value = rand.choice(['', 'x', '"y"', '\n'])
+            for analyzer in analyzers:
+                analyzer.insertCharacters(start, end, value)
+            self.assertIsNone(analyzers[1]._rope._text)
+
+            index = rand.randint(0, len(analyzers[0].source))
+            if i % 2:
+                index = max(0, analyzers[0].source.find('"', index))
+            for redacted in [False, True]:
+                results = [[
+                    a.lookAhead(index, '[\\s]*[=(]', redacted),
+                    a.lookBack(index, '[a-z]+[\\s]*', redacted),
+                    a.matches(index, '"', reqs, redacted),
+                    a.matches(index, re.compile('[a-z]+'), None, redacted),
+                    [a.getBlocksText(b) for b in a.getBlocksInRange(index, index + 40)]
+                ] for a in analyzers]
+                self.assertEqual(results[0], results[1])
+                found.update(n for n, r in enumerate(results[0][:4]) if r)
+            self.assertIsNone(analyzers[1]._rope._text)
+        self.assertEqual(found, set(range(4)))
+
+#___________________________________________________________________________________________________ test_queryAnchors
+    def test_queryAnchors(self):
+        """ Queries should match against the whole source, where only its real ends are anchors """
+        for editMode in [False, True]:
+            for length in [1000, 2000, 20000]:
+                analyzer = self._createQueryAnalyzer('x' + 'a'*length + 'b', editMode)
+                self.assertFalse(analyzer.lookAhead(1, 'a+$'))
+                self.assertTrue(analyzer.lookAhead(1, 'a+b'))
+                self.assertTrue(analyzer.lookAhead(1, 'a+b$'))
+                self.assertTrue(analyzer.matches(1, re.compile('a+b')))
+                self.assertFalse(analyzer.matches(
+                    1, 'a', MatchLookDefinition('a+$', lookAhead=True, ignoreIfFound=False)))
+
+                analyzer = self._createQueryAnalyzer('q' + 'z'*length + 'x', editMode)
+                self.assertTrue(analyzer.lookBack(length + 1, '^qz+'))
+                self.assertFalse(analyzer.lookBack(length + 1, '^z+'))
+                self.assertTrue(analyzer.lookBack(length + 1, 'z+'))
+
+#___________________________________________________________________________________________________ test_incrementalRedaction
+    def test_incrementalRedaction(self):
+        """ Redaction after edits should match a full redaction of the edited source """
+        rand   = random.Random(15)
+        source = '\n'.join([
+            'value%s = "item %s" + \'/path\' + call(%s) // comment %s' % (i, i, i, i)
+            for i in range(20) ])
+
+        for editMode in [False, True]:
+            analyzer = RedactionTextAnalyzer(
+                source, editMode=editMode, redactionCharacter='*', blockDefs=[
+                    BlockDefinition.createQuoteDef(BlockDefinition.BLOCKED),
+                    BlockDefinition.createLiteralDef(BlockDefinition.BLOCKED),
+                    BlockDefinition.createCStyleDef(BlockDefinition.BLOCKED),
+                    BlockDefinition.createParensDef() ])
+            analyzer.analyze()
+            self.assertNotIn('item', analyzer.redacted)
+
+            for i in range(200):
+                start = rand.randint(0, len(analyzer.source))
+                end   = min(len(analyzer.source), start + rand.choice([0, 0, 1, 4, 12]))
+                analyzer.insertCharacters(start, end, rand.choice(['', 'x', '"', '\n']))
+
+                if i % 10 == 0:
+                    redacted = analyzer.redacted
+                    analyzer._postAnalyzeImpl()
+                    self.assertEqual(redacted, analyzer.redacted)
+                    self.assertEqual(
+                        analyzer.getRedactedSlice(start, start + 10), redacted[start:start + 10])
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _analyze
+    def _analyze(self, analyzerClass, source, scanEngine, blockDefs =None):
+        if blockDefs is None:
+            analyzer = analyzerClass(source, scanEngine=scanEngine)
+        else:
+            analyzer = analyzerClass(source, blockDefs=blockDefs, scanEngine=scanEngine)
+        analyzer.analyze()
+        return [(b.name, b.blockType, b.start, b.end) for b in analyzer.blocks]
+
+#___________________________________________________________________________________________________ _createQueryAnalyzer
+    def _createQueryAnalyzer(self, source, editMode):
+        """ Creates an analyzer of the source that has been edited, so that queries in edit mode
+            read the rope instead of a joined text. """
+        analyzer = TextAnalyzer(source[1:], editMode=editMode)
+        analyzer.insertCharacters(0, 0, source[0])
+        if editMode:
+            self.assertIsNone(analyzer._rope._text)
+        return analyzer
+
+#___________________________________________________________________________________________________ _getState
+    def _getState(self, analyzer):
+        return analyzer.source, \
+            [(b.start, b.end) for b in analyzer.blocks], \
+            [(b.start, b.end) for b in analyzer.bookmarks]
+
+####################################################################################################
+####################################################################################################
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(Test_TextAnalyzer)
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,169 @@
+# Test_TextIntervalIndex.py [UNIT TEST]
+# (C) 2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import random
+import unittest
+
+from pyaid.text.BlockDefinition import BlockDefinition
+from pyaid.text.BlockSyntaxEnum import BlockSyntaxEnum
+from pyaid.text.TextBlock import TextBlock
+from pyaid.text.TextAnalyzer import TextAnalyzer
+from pyaid.text.TextIntervalIndex import TextIntervalIndex
+
+#*************************************************************************************************** Test_TextIntervalIndex
+class Test_TextIntervalIndex(unittest.TestCase):
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+#___________________________________________________________________________________________________ setUp
+    def setUp(self):
+        self.random    = random.Random(16)
+        self.blockDefs = [
+            BlockDefinition.createParensDef(),
+            BlockDefinition.createQuoteDef(),
+            BlockDefinition.createHashDef() ]
+
+#___________________________________________________________________________________________________ test_queries
+    def test_queries(self):
+        """ Index queries should match linear scans over sorted and unsorted blocks """
+        for trial in range(50):
+            blocks = self._createBlocks(trial % 2 == 0)
+            index  = TextIntervalIndex(blocks, groupAttribute='blockType')
+
+            for i in range(-2, 90):
+                self.assertEqual(
+                    index.findContaining(i),
+                    [b for b in blocks if b.start <= i < b.end] )
+                self.assertEqual(
+                    index.findContaining(i, [BlockSyntaxEnum.STRING]),
+                    [b for b in blocks if b.start <= i < b.end
+                     and b.blockType == BlockSyntaxEnum.STRING] )
+                self.assertEqual(
+                    index.findInRange(i, i + 5),
+                    [b for b in blocks if b.start <= i + 5 and b.end >= i] )
+                self.assertIs(index.findNearest(i, True, True), self._findNearest(blocks, i))
+
+            self.assertEqual(
+                index.getGroupItems(BlockSyntaxEnum.PARENS),
+                [b for b in blocks if b.blockType == BlockSyntaxEnum.PARENS] )
+
+#___________________________________________________________________________________________________ test_changes
+    def test_changes(self):
+        """ The index should follow offset changes and insertions into the indexed list """
+        # Open blocks are excluded because offset changes do not move them
+        blocks = [b for b in self._createBlocks(True) if b.end != -1]
+        index  = TextIntervalIndex(blocks)
+        self.assertTrue(index.isSorted)
+
+        for i in range(20):
+            block    = TextBlock(self.blockDefs[0], self.random.randint(0, 80), None)
+            position = index.getInsertPosition(block.start)
+            index.insert(position, block)
+            self.assertEqual(blocks[position], block)
+            self.assertTrue(index.isSorted)
+
+            offset = self.random.randint(0, 5)
+            for b in blocks:
+                b.changeOffset(40, offset)
+            self.assertEqual(index.findContaining(45), [b for b in blocks if b.start <= 45 < b.end])
+
+#___________________________________________________________________________________________________ test_shift
+    def test_shift(self):
+        """ Queries should follow recorded offset changes without rebuilding the index """
+        for trial in range(50):
+            blocks = [b for b in self._createBlocks(trial % 2 == 0) if b.end != -1]
+            index  = TextIntervalIndex(blocks, groupAttribute='blockType')
+            index.refresh()
+
+            for i in range(10):
+                at     = self.random.randint(0, 100)
+                amount = self.random.randint(-5, 5)
+
+                # Removals that move a start or end from inside the removed range do not
+                # preserve the order of the values and cannot be recorded
+                if any(at < v < at - amount for b in blocks for v in (b.start, b.end)):
+                    continue
+
+                version = index.modificationCount
+                for b in blocks:
+                    b.changeOffset(at, amount)
+                index.shift(at, amount, version)
+
+                for q in range(-2, 110, 3):
+                    self.assertEqual(
+                        index.findContaining(q, [BlockSyntaxEnum.PARENS]),
+                        [b for b in blocks if b.start <= q < b.end
+                         and b.blockType == BlockSyntaxEnum.PARENS] )
+                    self.assertEqual(
+                        index.findInRange(q, q + 5),
+                        [b for b in blocks if b.start <= q + 5 and b.end >= q] )
+                    self.assertIs(index.findNearest(q, True, True), self._findNearest(blocks, q))
+
+#___________________________________________________________________________________________________ test_analyzerEdits
+    def test_analyzerEdits(self):
+        """ Analyzer edits should shift only that analyzer's index instead of rebuilding it """
+        source    = '\n'.join('x%s = f("s%s", [%s], (y))' % (i, i, i) for i in range(50))
+        analyzers = [TextAnalyzer(source), TextAnalyzer(source)]
+        for analyzer in analyzers:
+            analyzer.analyze()
+            analyzer.indexInBlock(0)
+
+        other = analyzers[1]._blockIndex
+        count = other.modificationCount
+        for i in range(100):
+            analyzer = analyzers[0]
+            at       = self.random.randint(0, len(analyzer.source) - 1)
+            end      = min(len(analyzer.source), at + self.random.choice([0, 0, 1]))
+            analyzer.insertCharacters(at, end, self.random.choice(['', 'z', '  ']))
+
+            q = self.random.randint(0, len(analyzer.source))
+            self.assertEqual(
+                analyzer.getBlocksAtIndex(q),
+                [b for b in analyzer.blocks if b.start <= q < b.end] )
+
+        analyzers[0].insertCharacters(0, 0, 'z')
+        self.assertTrue(analyzers[0]._blockIndex._shifts)
+        self.assertEqual(other.modificationCount, count)
+
+        # Direct changes to a block are reported to the index over it
+        block = analyzers[1].blocks[0]
+        block.end = block.start + 500
+        self.assertGreater(other.modificationCount, count)
+        self.assertIn(block, analyzers[1].getBlocksAtIndex(block.start + 400))
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _createBlocks
+    def _createBlocks(self, ordered):
+        blocks = []
+        for i in range(self.random.randint(0, 40)):
+            start = self.random.randint(0, 80)
+            end   = self.random.choice([-1, start, start + self.random.randint(1, 20)])
+            blocks.append(TextBlock(self.random.choice(self.blockDefs), start, end))
+
+        if ordered:
+            blocks.sort(key=lambda b: b.start)
+        return blocks
+
+#___________________________________________________________________________________________________ _findNearest
+    def _findNearest(self, blocks, index):
+        result   = None
+        distance = float('inf')
+        for b in blocks:
+            d = b.distanceFromIndex(index, True, True, True)
+            if d < distance:
+                result   = b
+                distance = d
+        return result
+
+####################################################################################################
+####################################################################################################
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(Test_TextIntervalIndex)
+    unittest.TextTestRunner(verbosity=2).run(suite)
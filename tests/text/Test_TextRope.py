@@ -0,0 +1,62 @@
+# Test_TextRope.py [UNIT TEST]
+# (C) 2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import random
+import unittest
+
+from pyaid.text.TextRope import TextRope
+
+#*************************************************************************************************** Test_TextRope
+class Test_TextRope(unittest.TestCase):
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+#___________________________________________________________________________________________________ setUp
+    def setUp(self):
+        self.random = random.Random(2016)
+
+#___________________________________________________________________________________________________ test_replace
+    def test_replace(self):
+        """ Replacements should match the equivalent string slicing """
+        for trial in range(20):
+            text = ''.join(self.random.choice('abc\n') for i in range(self.random.randint(0, 300)))
+            rope = TextRope(text, chunkSize=self.random.randint(1, 32))
+
+            for i in range(100):
+                start = self.random.randint(-5, len(text) + 5)
+                end   = self.random.randint(start, len(text) + 5)
+                value = ''.join(self.random.choice('xy\n') for i in range(self.random.randint(0, 40)))
+
+                rope.replace(start, end, value)
+                text = text[:start] + value + text[end:]
+                self.assertEqual(len(rope), len(text))
+
+                start = self.random.randint(0, len(text))
+                end   = self.random.randint(start, len(text) + 2)
+                self.assertEqual(rope.getSlice(start, end), text[start:end])
+
+            self.assertEqual(rope.getText(), text)
+
+#___________________________________________________________________________________________________ test_chunks
+    def test_chunks(self):
+        """ Chunks should be split as they grow and merged when replacements span them """
+        rope = TextRope('a'*100, chunkSize=10)
+        self.assertEqual(rope.chunkCount, 10)
+
+        rope.replace(5, 5, 'b'*50)
+        self.assertGreater(rope.chunkCount, 10)
+
+        rope.replace(0, len(rope), 'c')
+        self.assertEqual(rope.chunkCount, 1)
+        self.assertEqual(rope.getText(), 'c')
+
+####################################################################################################
+####################################################################################################
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(Test_TextRope)
+    unittest.TextTestRunner(verbosity=2).run(suite)
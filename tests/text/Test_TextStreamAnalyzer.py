@@ -0,0 +1,118 @@
+# Test_TextStreamAnalyzer.py [UNIT TEST]
+# (C) 2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import codecs
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from pyaid.text.BlockDefinition import BlockDefinition
+from pyaid.text.TextAnalyzer import TextAnalyzer
+from pyaid.text.TextBlockEvent import TextBlockEvent
+from pyaid.text.TextScanEngineEnum import TextScanEngineEnum
+from pyaid.text.TextStreamAnalyzer import TextStreamAnalyzer
+
+#*************************************************************************************************** Test_TextStreamAnalyzer
+class Test_TextStreamAnalyzer(unittest.TestCase):
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    _TOKENS = ['a', ' ', '(', ')', '"', '\\"', "'", '\\', '#', '###', '\n', '\r\n', '{', '}', '[',
+               ']', '/*', '*/', ',', 'x'*30]
+
+#___________________________________________________________________________________________________ setUp
+    def setUp(self):
+        self.random = random.Random(18)
+        self.folder = tempfile.mkdtemp()
+
+#___________________________________________________________________________________________________ tearDown
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+#___________________________________________________________________________________________________ test_chunks
+    def test_chunks(self):
+        """ Streamed chunks should produce the blocks found by analyzing the entire text """
+        for trial in range(150):
+            source     = ''.join(self.random.choice(self._TOKENS) for i in range(60))
+            scanEngine = self.random.choice(
+                [TextScanEngineEnum.REGEX, TextScanEngineEnum.CHARACTER])
+            blockDefs  = self._createBlockDefs()
+            chunkSize  = self.random.choice([1, 3, 16, 1000])
+
+            analyzer = TextAnalyzer(source, blockDefs=blockDefs, scanEngine=scanEngine)
+            analyzer.analyze()
+
+            stream = TextStreamAnalyzer(
+                [source[i:i + chunkSize] for i in range(0, len(source), chunkSize)],
+                blockDefs=blockDefs, scanEngine=scanEngine, lookAheadWindow=8)
+            events = list(stream.streamBlockEvents())
+
+            self.assertEqual(
+                self._getBlockKeys(e.block for e in events if e.eventType == TextBlockEvent.OPEN),
+                self._getBlockKeys(analyzer.blocks))
+            self.assertEqual(stream.streamLength, len(analyzer.source))
+
+            opened = []
+            for e in events:
+                if e.eventType == TextBlockEvent.OPEN:
+                    opened.append(e.block)
+                else:
+                    self.assertIn(e.block, opened)
+                    self.assertEqual(e.index, e.block.end)
+
+#___________________________________________________________________________________________________ test_file
+    def test_file(self):
+        """ A file path should be streamed in chunks of the specified size """
+        source = '\n\n' + '\n'.join('line %s ("value", [%s]) # comment\r' % (i, i)
+                                    for i in range(200)) + '\n'
+        path = os.path.join(self.folder, 'source.txt')
+        with codecs.open(path, 'w', 'utf-8') as fh:
+            fh.write(source)
+
+        analyzer = TextAnalyzer(source)
+        analyzer.analyze()
+
+        stream = TextStreamAnalyzer(path, chunkSize=100)
+        events = list(stream.streamBlockEvents())
+        self.assertEqual(len(events), 2*len(analyzer.blocks))
+        self.assertEqual(
+            [(e.eventType, e.index) for e in events[:4]],
+            [(TextBlockEvent.OPEN, 7), (TextBlockEvent.OPEN, 8), (TextBlockEvent.CLOSE, 15),
+             (TextBlockEvent.OPEN, 17)])
+        self.assertEqual(
+            self._getBlockKeys(e.block for e in events if e.eventType == TextBlockEvent.OPEN),
+            self._getBlockKeys(analyzer.blocks))
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _createBlockDefs
+    def _createBlockDefs(self):
+        return self.random.choice([
+            None,
+            [BlockDefinition.createCStyleDef(BlockDefinition.BLOCKED),
+             BlockDefinition.createQuoteDef(BlockDefinition.BLOCKED),
+             BlockDefinition.createTripleHashDef(BlockDefinition.BLOCKED),
+             BlockDefinition.createHashDef(BlockDefinition.BLOCKED),
+             BlockDefinition.createParensDef(),
+             BlockDefinition.createBracesDef()],
+            [BlockDefinition.createCommaDelimitedListDef(
+                startAtBeginning=True, continueToEnd=True)] ])
+
+#___________________________________________________________________________________________________ _getBlockKeys
+    @classmethod
+    def _getBlockKeys(cls, blocks):
+        return sorted((b.start, b.end, b.blockDef.name) for b in blocks)
+
+####################################################################################################
+####################################################################################################
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(Test_TextStreamAnalyzer)
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,143 @@
+# Test_CoffeescriptBuildManifest.py [UNIT TEST]
+# (C) 2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+from pyaid.web.coffeescript.CoffeescriptBuildManifest import CoffeescriptBuildManifest
+from pyaid.web.coffeescript.CoffeescriptBuilder import CoffeescriptBuilder
+
+#*************************************************************************************************** Test_CoffeescriptBuildManifest
+class Test_CoffeescriptBuildManifest(unittest.TestCase):
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    _SOURCES = {
+        'Base':'class Base\n    constructor: (@name) -> @items = [1, 2]\n',
+        'Widget':'# import app.Base\nclass Widget extends Base\n',
+        'Other':'class Other\n',
+        'first-exec':'# import app.Widget\nx = new Widget()\n',
+        'second-exec':'# import app.Other\nx = new Other()\n',
+        'bundle-lib':'# target app.first-exec\n# import app.Widget\n' }
+
+#___________________________________________________________________________________________________ setUp
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.cache  = os.path.join(self.folder, 'cache')
+
+#___________________________________________________________________________________________________ tearDown
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+#___________________________________________________________________________________________________ test_fragments
+    def test_fragments(self):
+        """ Fragments should be valid while their source hash matches, whatever their times """
+        path = os.path.join(self.folder, 'Base.ics')
+        with open(path, 'w') as f:
+            f.write('fragment')
+
+        manifest = CoffeescriptBuildManifest(self.folder, self.cache)
+        manifest.storeFragment('app.Base', 'abc', path)
+        self.assertTrue(manifest.save())
+        self.assertTrue(os.path.exists(os.path.join(self.cache, manifest.DEFAULT_FILENAME)))
+
+        os.utime(path, (0, 0))
+        manifest = CoffeescriptBuildManifest(self.folder, self.cache)
+        self.assertTrue(manifest.restoreFragment('app.Base', 'abc', path))
+        self.assertFalse(manifest.restoreFragment('app.Base', 'abd', path))
+
+        # Missing and modified fragments are restored from the cache path
+        os.remove(path)
+        self.assertTrue(manifest.restoreFragment('app.Base', 'abc', path))
+        with open(path, 'w') as f:
+            f.write('modified')
+        self.assertTrue(manifest.restoreFragment('app.Base', 'abc', path))
+        with open(path) as f:
+            self.assertEqual(f.read(), 'fragment')
+
+        shutil.rmtree(self.cache)
+        os.remove(path)
+        self.assertFalse(manifest.restoreFragment('app.Base', 'abc', path))
+
+#___________________________________________________________________________________________________ test_incrementalBuild
+    def test_incrementalBuild(self):
+        """ Unchanged targets should be skipped, including within a relocated checkout """
+        output, report, files = self._build('first')
+        self.assertEqual(output.count('COMPILING:'), 6)
+        self.assertEqual(output.count('UP TO DATE:'), 0)
+
+        # Rebuilding without changes skips every target
+        result = self._build('first', write=False)
+        self.assertEqual(result[0].count('UP TO DATE:'), 3)
+        self.assertEqual(result[0].count('COMPILING:'), 0)
+        self.assertEqual(result[1:], (report, files))
+
+        # A new checkout with the same cache path restores the assembled files
+        result = self._build('second')
+        self.assertEqual(result[0].count('UP TO DATE:'), 3)
+        self.assertEqual(result[1], report)
+        self.assertEqual(
+            dict((n, v) for n, v in result[2].items() if n.endswith('.ccs')),
+            dict((n, v) for n, v in files.items() if n.endswith('.ccs')))
+
+        # Only the targets importing a modified source are built again
+        self._write('second', 'Other', self._SOURCES['Other'] + '    run: -> 1\n')
+        result = self._build('second', write=False)
+        self.assertEqual(result[0].count('UP TO DATE:'), 2)
+        self.assertEqual(result[0].count('COMPILING: app.Other'), 1)
+        self.assertIn('run: -> 1', result[2]['second-exec.ccs'])
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _build
+    def _build(self, name, write =True):
+        """ Builds the sources within the named root path, returning the output, report and
+            files of the build. """
+        root = os.path.join(self.folder, name) + os.sep
+        if write:
+            if os.path.exists(root):
+                shutil.rmtree(root)
+            os.makedirs(os.path.join(root, 'app'))
+            for package, source in self._SOURCES.items():
+                self._write(name, package, source)
+
+        stdout     = sys.stdout
+        sys.stdout = io.StringIO()
+        try:
+            builder = CoffeescriptBuilder('app', root, buildOnly=True, cachePath=self.cache)
+            builder.construct()
+            output = sys.stdout.getvalue()
+        finally:
+            sys.stdout = stdout
+
+        files = dict()
+        for n in os.listdir(os.path.join(root, 'app')):
+            if not n.endswith('.coffee'):
+                with open(os.path.join(root, 'app', n)) as f:
+                    files[n] = f.read()
+        return output, builder.report, files
+
+#___________________________________________________________________________________________________ _write
+    def _write(self, name, package, source):
+        path = os.path.join(self.folder, name, 'app', package + '.coffee')
+        with open(path, 'w') as f:
+            f.write(source)
+        modified = time.time() + 10
+        os.utime(path, (modified, modified))
+
+####################################################################################################
+####################################################################################################
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(Test_CoffeescriptBuildManifest)
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,174 @@
+# Test_CoffeescriptBuilder.py [UNIT TEST]
+# (C) 2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+from pyaid.web.coffeescript.CoffeescriptBuilder import CoffeescriptBuilder
+
+#*************************************************************************************************** Test_CoffeescriptBuilder
+class Test_CoffeescriptBuilder(unittest.TestCase):
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    _SOURCES = {
+        'Base':'class Base\n    constructor: (@name) -> @items = [1, 2]\n',
+        'Widget':'# import app.Base\nclass Widget extends Base\n    run: -> Missing.value\n',
+        'Panel':'# import app.Widget\n# require app.Base\nclass Panel extends Widget\n',
+        'first-exec':'# import app.Panel\nx = new Panel()\n',
+        'second-exec':'# import app.Widget\nx = new Widget()\n',
+        'third-exec':'# import app.Base\n# import app.Nope\nx = new Base()\n',
+        'bundle-lib':'# target app.first-exec\n# import app.Widget\n# import app.Panel\n' }
+
+#___________________________________________________________________________________________________ setUp
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+#___________________________________________________________________________________________________ tearDown
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+#___________________________________________________________________________________________________ test_concurrentConstruct
+    def test_concurrentConstruct(self):
+        """ Concurrent construction should match the output and files of a serial construction """
+        serial = self._construct(1)
+        self.assertEqual(len(serial['report'][0]), 4)
+        self.assertEqual(serial['warnings'][0]['class'], 'Missing')
+        self.assertIn('FROM CACHE: app.Base', serial['output'])
+
+        for jobs in [2, 4]:
+            self.assertEqual(self._construct(jobs), serial)
+
+#___________________________________________________________________________________________________ test_rebuild
+    def test_rebuild(self):
+        """ Rebuilds should construct only the new targets and those depending on changed files """
+        root    = self._writeSources('rebuild')
+        builder = self._quietly(lambda: CoffeescriptBuilder('app', root, buildOnly=True))
+        self._quietly(builder.construct)
+
+        cases = [
+            ('Widget', '# import app.Base\nclass Widget extends Base\n', [
+                'app.first-exec', 'app.second-exec', 'app.bundle-lib']),
+            ('Base', 'class Base\n', [
+                'app.first-exec', 'app.second-exec', 'app.third-exec', 'app.bundle-lib']),
+            ('Other', 'class Other\n', []),
+            ('fourth-exec', '# import app.Other\nx = new Other()\n', ['app.fourth-exec']),
+            ('Other', 'class Other extends Base\n', ['app.fourth-exec']) ]
+
+        for name, source, expected in cases:
+            path = self._write(root, name, source)
+            targets = self._quietly(lambda: builder.rebuild([path]))
+            self.assertEqual(sorted(t.package for t in targets), sorted(expected))
+            self.assertEqual(sorted(builder.report.keys()), sorted(expected))
+
+        with open(os.path.join(root, 'app', 'second-exec.ccs')) as f:
+            source = f.read()
+        self.assertIn('class Base\n\n', source)
+        self.assertIn('class Widget extends SFLOW.r.Base\n\n', source)
+
+#___________________________________________________________________________________________________ test_watch
+    def test_watch(self):
+        """ Watching should rebuild the targets affected by each change and report the latency """
+        root    = self._writeSources('watch')
+        stdout  = sys.stdout
+        output  = io.StringIO()
+        builder = self._quietly(lambda: CoffeescriptBuilder('app', root, buildOnly=True))
+        thread  = threading.Thread(target=builder.watch, kwargs={'debounce':0.1})
+
+        sys.stdout = output
+        try:
+            thread.start()
+            self.assertTrue(self._waitFor(output, 'WATCHING'))
+            self._write(root, 'Panel', '# import app.Widget\nclass Panel extends Widget\n')
+            self.assertTrue(self._waitFor(output, 'REBUILT'))
+        finally:
+            builder.stop()
+            thread.join()
+            sys.stdout = stdout
+
+        self.assertIn('REBUILT: 2 of 4 targets', output.getvalue())
+        self.assertIn('latency', output.getvalue())
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _writeSources
+    def _writeSources(self, name):
+        root = os.path.join(self.folder, name) + os.sep
+        os.makedirs(os.path.join(root, 'app'))
+        for package, source in self._SOURCES.items():
+            self._write(root, package, source)
+        return root
+
+#___________________________________________________________________________________________________ _write
+    @classmethod
+    def _write(cls, root, package, source):
+        path = os.path.join(root, 'app', package + '.coffee')
+        with open(path, 'w') as f:
+            f.write(source)
+        return path
+
+#___________________________________________________________________________________________________ _quietly
+    @classmethod
+    def _quietly(cls, function):
+        stdout     = sys.stdout
+        sys.stdout = io.StringIO()
+        try:
+            return function()
+        finally:
+            sys.stdout = stdout
+
+#___________________________________________________________________________________________________ _waitFor
+    @classmethod
+    def _waitFor(cls, output, value, timeout =10):
+        end = time.time() + timeout
+        while time.time() < end:
+            if value in output.getvalue():
+                return True
+            time.sleep(0.05)
+        return False
+
+#___________________________________________________________________________________________________ _construct
+    def _construct(self, jobs):
+        """ Constructs the sources from scratch and then again from the dependency caches,
+            returning the output, reports, warnings and files of both constructions. """
+        root = os.path.join(self.folder, 'root%s' % jobs) + os.sep
+        os.makedirs(os.path.join(root, 'app'))
+        for name, source in self._SOURCES.items():
+            with open(os.path.join(root, 'app', name + '.coffee'), 'w') as f:
+                f.write(source)
+
+        result = {'output':'', 'report':[], 'warnings':[]}
+        for i in range(2):
+            stdout     = sys.stdout
+            sys.stdout = io.StringIO()
+            try:
+                builder = CoffeescriptBuilder('app', root, buildOnly=True, jobs=jobs)
+                builder.construct()
+                result['output'] += sys.stdout.getvalue().replace(root, '')
+            finally:
+                sys.stdout = stdout
+            result['report'].append(builder.report)
+            result['warnings'].extend(builder.warnings)
+
+        for name in sorted(os.listdir(os.path.join(root, 'app'))):
+            with open(os.path.join(root, 'app', name)) as f:
+                result[name] = f.read()
+        return result
+
+####################################################################################################
+####################################################################################################
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(Test_CoffeescriptBuilder)
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,238 @@
+# Test_CoffeescriptCompilerWorker.py [UNIT TEST]
+# (C) 2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+from pyaid.web.coffeescript.CoffeescriptBuilder import CoffeescriptBuilder
+from pyaid.web.coffeescript.CoffeescriptCompiler import CoffeescriptCompiler
+from pyaid.web.coffeescript.CoffeescriptCompilerWorker import CoffeescriptCompilerWorker
+
+#*************************************************************************************************** Test_CoffeescriptCompilerWorker
+class Test_CoffeescriptCompilerWorker(unittest.TestCase):
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    _FAKE_COMPILER = [
+        sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fakeCoffee.py')]
+
+    _SOURCES = {
+        'Base':'class Base\n    constructor: (@name) -> @items = [1, 2]\n',
+        'Widget':'# import app.Base\nclass Widget extends Base\n',
+        'first-exec':'# import app.Widget\nx = new Widget()\n',
+        'second-exec':'# import app.Base\nx = new Base()\n',
+        'third-exec':'# import app.Base\nx = SYNTAX-ERROR\n',
+        'bundle-lib':'# target app.first-exec\n# import app.Widget\n' }
+
+#___________________________________________________________________________________________________ setUp
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+#___________________________________________________________________________________________________ tearDown
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+#___________________________________________________________________________________________________ test_compile
+    def test_compile(self):
+        """ Compilations through the worker should match those of the one-shot compiler """
+        oneShot = CoffeescriptCompiler(self._FAKE_COMPILER)
+        paths   = [self._write('a.ccs', 'x = 1\ny = 2'), self._write('b.ccs', 'SYNTAX-ERROR')]
+
+        expected = []
+        for path in paths:
+            result = oneShot.compile(path, path[:-3] + 'js')
+            expected.append((result['code'], result['error'].strip(), self._read(path[:-3] + 'js')))
+            if os.path.exists(path[:-3] + 'js'):
+                os.remove(path[:-3] + 'js')
+
+        with CoffeescriptCompilerWorker(self._FAKE_COMPILER + ['--worker']) as worker:
+            for path, values in zip(paths, expected):
+                result = worker.compile(path, path[:-3] + 'js')
+                self.assertEqual(
+                    (result['code'], result['error'].strip(), self._read(path[:-3] + 'js')),
+                    values)
+
+            self.assertFalse(worker.failed)
+            self.assertEqual((worker.startCount, worker.requestCount), (1, 2))
+
+        self.assertEqual(expected[0][0], 0)
+        self.assertIn('line 1', expected[1][1])
+
+#___________________________________________________________________________________________________ test_fallback
+    def test_fallback(self):
+        """ Workers that cannot start or fail should fall back to the one-shot compiler """
+        path     = self._write('a.ccs', 'x = 1')
+        fallback = CoffeescriptCompiler(self._FAKE_COMPILER)
+
+        worker = CoffeescriptCompilerWorker(
+            [os.path.join(self.folder, 'missing')], fallback=fallback)
+        self.assertEqual(worker.compile(path, path[:-3] + 'js')['code'], 0)
+        self.assertTrue(worker.failed)
+        self.assertEqual((worker.startCount, fallback.compileCount), (0, 1))
+        worker.close()
+
+        worker = CoffeescriptCompilerWorker(
+            self._FAKE_COMPILER + ['--worker', '--crash-after', '1'], fallback=fallback)
+        for i in range(3):
+            self.assertEqual(worker.compile(path, path[:-3] + 'js')['code'], 0)
+        self.assertTrue(worker.failed)
+        self.assertEqual((worker.compileCount, fallback.compileCount), (1, 3))
+        worker.close()
+
+#___________________________________________________________________________________________________ test_timeout
+    def test_timeout(self):
+        """ Processes that do not start or respond within the read timeout should fall back """
+        path     = self._write('a.ccs', 'x = 1')
+        fallback = CoffeescriptCompiler(self._FAKE_COMPILER)
+        start    = time.time()
+
+        worker = CoffeescriptCompilerWorker(
+            [sys.executable, '-c', 'import time; time.sleep(60)'], fallback=fallback,
+            readTimeout=0.5)
+        self.assertEqual(worker.compile(path, path[:-3] + 'js')['code'], 0)
+        self.assertTrue(worker.failed)
+        self.assertEqual((worker.startCount, fallback.compileCount), (0, 1))
+        worker.close()
+
+        worker = CoffeescriptCompilerWorker(
+            self._FAKE_COMPILER + ['--worker', '--hang-after', '1'], fallback=fallback,
+            readTimeout=0.5)
+        for i in range(3):
+            self.assertEqual(worker.compile(path, path[:-3] + 'js')['code'], 0)
+        self.assertTrue(worker.failed)
+        self.assertEqual((worker.compileCount, fallback.compileCount), (1, 3))
+        worker.close()
+        self.assertLess(time.time() - start, 10)
+
+#___________________________________________________________________________________________________ test_concurrentStart
+    def test_concurrentStart(self):
+        """ Processes should start concurrently without blocking the other threads """
+        paths = [self._write('%s.ccs' % i, 'x = %s' % i) for i in range(4)]
+        with CoffeescriptCompilerWorker(
+                self._FAKE_COMPILER + ['--worker', '--start-delay', '1'], workerCount=2
+        ) as worker:
+            start   = time.time()
+            threads = [
+                threading.Thread(target=worker.compile, args=(p, p[:-3] + 'js')) for p in paths]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertLess(time.time() - start, 1.8)
+            self.assertEqual((worker.startCount, worker.requestCount), (2, 4))
+            self.assertFalse(worker.failed)
+        self.assertEqual([self._read(p[:-3] + 'js') for p in paths], [
+            '// x = %s\n' % i for i in range(4)])
+
+#___________________________________________________________________________________________________ test_moduleResolution
+    @unittest.skipIf(
+        not any(os.path.exists(os.path.join(p, 'node')) for p in os.environ.get(
+            'PATH', '').split(os.pathsep)),
+        'Node is not installed')
+    def test_moduleResolution(self):
+        """ The worker script should load the module of the coffee command on the PATH or the
+            module at the module path """
+        for name, version in [('global', 'command'), ('other', 'module')]:
+            folder = os.path.join(self.folder, name, 'coffeescript')
+            os.makedirs(os.path.join(folder, 'bin'))
+            self._write(os.path.join(folder, 'package.json'), '{"name":"coffeescript"}')
+            self._write(os.path.join(folder, 'bin', 'coffee'), '')
+            self._write(os.path.join(folder, 'index.js'), '\n'.join([
+                'exports.VERSION = "%s";' % version,
+                'exports.compile = function (s) { return "// %s " + s; };' % version ]))
+
+        binFolder = os.path.join(self.folder, 'bin')
+        os.makedirs(binFolder)
+        command = os.path.join(self.folder, 'global', 'coffeescript', 'bin', 'coffee')
+        if hasattr(os, 'symlink'):
+            os.symlink(command, os.path.join(binFolder, 'coffee'))
+        else:
+            shutil.copy(command, os.path.join(binFolder, 'coffee'))
+
+        path        = self._write('a.ccs', 'x = 1')
+        environPath = os.environ.get('PATH', '')
+        os.environ['PATH'] = binFolder + os.pathsep + environPath
+        try:
+            for modulePath, expected in [
+                    (None, '// command x = 1'),
+                    (os.path.join(self.folder, 'other', 'coffeescript'), '// module x = 1') ]:
+                with CoffeescriptCompilerWorker(modulePath=modulePath) as worker:
+                    self.assertEqual(worker.compile(path, path[:-3] + 'js')['code'], 0)
+                    self.assertFalse(worker.failed)
+                self.assertEqual(self._read(path[:-3] + 'js'), expected)
+        finally:
+            os.environ['PATH'] = environPath
+
+#___________________________________________________________________________________________________ test_construct
+    def test_construct(self):
+        """ Builds compiled by a shared worker should match those of the one-shot compiler """
+        expected = self._construct('serial', CoffeescriptCompiler(self._FAKE_COMPILER), 1)
+        self.assertEqual(expected[0]['app.third-exec'], 1)
+        self.assertEqual(expected[0]['app.first-exec'], 0)
+        self.assertIn('second-exec.js', expected[1])
+
+        with CoffeescriptCompilerWorker(
+                self._FAKE_COMPILER + ['--worker'], workerCount=2) as worker:
+            self.assertEqual(self._construct('worker', worker, 2), expected)
+            self.assertLessEqual(worker.startCount, 2)
+            self.assertEqual(worker.requestCount, 4)
+            self.assertFalse(worker.failed)
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _construct
+    def _construct(self, name, compiler, jobs):
+        """ Builds the sources within the named root path, returning the report and the compiled
+            files of the build. """
+        root = os.path.join(self.folder, name) + os.sep
+        os.makedirs(os.path.join(root, 'app'))
+        for package, source in self._SOURCES.items():
+            self._write(os.path.join(name, 'app', package + '.coffee'), source)
+
+        stdout     = sys.stdout
+        sys.stdout = io.StringIO()
+        try:
+            builder = CoffeescriptBuilder('app', root, jobs=jobs, compiler=compiler)
+            builder.construct()
+        finally:
+            sys.stdout = stdout
+
+        files = dict()
+        for n in os.listdir(os.path.join(root, 'app')):
+            if n.endswith('.js'):
+                files[n] = self._read(os.path.join(root, 'app', n)).replace(root, '')
+        return builder.report, files
+
+#___________________________________________________________________________________________________ _write
+    def _write(self, name, source):
+        path = os.path.join(self.folder, name)
+        with open(path, 'w') as f:
+            f.write(source)
+        return path
+
+#___________________________________________________________________________________________________ _read
+    @classmethod
+    def _read(cls, path):
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return f.read()
+
+####################################################################################################
+####################################################################################################
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(Test_CoffeescriptCompilerWorker)
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,109 @@
+# Test_CoffeescriptDependencyGraph.py [UNIT TEST]
+# (C) 2016
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from pyaid.web.coffeescript.CoffeescriptDependency import CoffeescriptDependency
+from pyaid.web.coffeescript.CoffeescriptDependencyGraph import CoffeescriptDependencyGraph
+
+#*************************************************************************************************** Test_CoffeescriptDependencyGraph
+class Test_CoffeescriptDependencyGraph(unittest.TestCase):
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    _SOURCE = '\r\n'.join([
+        '# import app.Base',
+        '# require app.Widget',
+        'class Panel extends Widget # not a dependency',
+        '    # include app.vendor',
+        '# module app.Tools',
+        '# target app.run-exec',
+        '' ])
+
+#___________________________________________________________________________________________________ setUp
+    def setUp(self):
+        self.folder = tempfile.mkdtemp() + os.sep
+        self.path   = os.path.join(self.folder, 'Panel.coffee')
+        self._write(self._SOURCE, time.time() - 100)
+
+#___________________________________________________________________________________________________ tearDown
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+#___________________________________________________________________________________________________ test_getDependencies
+    def test_getDependencies(self):
+        """ The dependencies should match those created from each line of the source """
+        expected = []
+        for line in self._SOURCE.split('\n'):
+            d = CoffeescriptDependency.create(line, self.folder)
+            if d:
+                expected.append((d.dependencyType, d.package, d.path))
+
+        graph = CoffeescriptDependencyGraph(self.folder)
+        self.assertEqual(self._getKeys(graph.getDependencies(self.path)), expected)
+        self.assertEqual(self._getKeys(graph.getDependencies(self.path)), expected)
+        self.assertEqual((graph.hits, graph.misses), (1, 1))
+        self.assertEqual(len(expected), 5)
+
+        self.assertRaises(OSError, graph.getDependencies, self.path + '.missing')
+
+#___________________________________________________________________________________________________ test_persistence
+    def test_persistence(self):
+        """ Saved graphs should only scan files whose contents have changed """
+        graph = CoffeescriptDependencyGraph(self.folder)
+        graph.getDependencies(self.path)
+        self.assertTrue(graph.modified)
+        self.assertTrue(graph.save())
+        self.assertFalse(graph.modified)
+        self.assertTrue(os.path.exists(graph.path))
+
+        graph = CoffeescriptDependencyGraph(self.folder)
+        graph.getDependencies(self.path)
+        self.assertEqual((graph.hits, graph.misses, graph.modified), (1, 0, False))
+
+        # Modified times that change without changing the contents are only hashed again
+        self._write(self._SOURCE, time.time() - 50)
+        self.assertEqual(len(graph.getDependencies(self.path)), 5)
+        self.assertEqual((graph.hits, graph.misses, graph.modified), (2, 0, True))
+
+        self._write('# import app.Other\n' + self._SOURCE, time.time() - 50)
+        self.assertEqual(graph.getDependencies(self.path)[0].package, 'app.Other')
+        self.assertEqual((graph.hits, graph.misses), (2, 1))
+        graph.save()
+
+        # Graphs saved for another root path are ignored
+        other = CoffeescriptDependencyGraph(self.folder + 'other' + os.sep, graph.path)
+        other.getDependencies(self.path)
+        self.assertEqual((other.hits, other.misses), (0, 1))
+
+        graph.clear()
+        self.assertFalse(os.path.exists(graph.path))
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _write
+    def _write(self, source, modified):
+        with open(self.path, 'w') as f:
+            f.write(source)
+        os.utime(self.path, (modified, modified))
+
+#___________________________________________________________________________________________________ _getKeys
+    @classmethod
+    def _getKeys(cls, dependencies):
+        return [(d.dependencyType, d.package, d.path) for d in dependencies]
+
+####################################################################################################
+####################################################################################################
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(Test_CoffeescriptDependencyGraph)
+    unittest.TextTestRunner(verbosity=2).run(suite)
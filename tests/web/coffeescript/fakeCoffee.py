@@ -0,0 +1,82 @@
+# fakeCoffee.py [UNIT TEST]
+# (C) 2016
+# Scott Ernst
+
+""" A stand-in for the CoffeeScript compiler used by the unit tests, which compiles sources by
+    commenting out each of their lines and fails on lines containing SYNTAX-ERROR.
+
+    Usage: python fakeCoffee.py -c --bare <path>
+           python fakeCoffee.py --worker [--crash-after <count>] [--hang-after <count>]
+                                         [--start-delay <seconds>] """
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import io
+import json
+import sys
+import time
+
+#___________________________________________________________________________________________________ compileSource
+def compileSource(source, path):
+    """ Returns a tuple of the compiled source, or None, and the error of the compilation. """
+    lines = source.split('\n')
+    for index, line in enumerate(lines):
+        if 'SYNTAX-ERROR' in line:
+            return None, "Error: In %s, Parse error on line %s: Unexpected 'INDENT'" % (
+                path, index + 1)
+    return ''.join('// %s\n' % line for line in lines), ''
+
+#___________________________________________________________________________________________________ writeFrame
+def writeFrame(stream, value):
+    data = json.dumps(value).encode('utf-8')
+    stream.write(('%s\n' % len(data)).encode('ascii') + data)
+    stream.flush()
+
+#___________________________________________________________________________________________________ runWorker
+def runWorker(crashAfter, hangAfter, startDelay):
+    stdin  = getattr(sys.stdin, 'buffer', sys.stdin)
+    stdout = getattr(sys.stdout, 'buffer', sys.stdout)
+    time.sleep(startDelay)
+    writeFrame(stdout, {'ready':True, 'version':'fake'})
+
+    count = 0
+    while True:
+        header = stdin.readline()
+        if not header:
+            return
+        request = json.loads(stdin.read(int(header)).decode('utf-8'))
+
+        count += 1
+        if crashAfter is not None and count > crashAfter:
+            sys.exit(1)
+        if hangAfter is not None and count > hangAfter:
+            time.sleep(3600)
+
+        js, error = compileSource(request['source'], request['path'])
+        writeFrame(stdout, {
+            'id':request['id'], 'code':0 if js is not None else 1, 'js':js, 'error':error })
+
+####################################################################################################
+####################################################################################################
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    if '--worker' in args:
+        options = dict(zip(args, args[1:]))
+        crash   = options.get('--crash-after')
+        hang    = options.get('--hang-after')
+        runWorker(
+            None if crash is None else int(crash),
+            None if hang is None else int(hang),
+            float(options.get('--start-delay', 0)))
+        sys.exit(0)
+
+    path = args[-1]
+    with io.open(path, 'r', encoding='utf-8') as f:
+        js, error = compileSource(f.read(), path)
+    if js is None:
+        sys.stderr.write(error + '\n')
+        sys.exit(1)
+
+    with io.open(path.rsplit('.', 1)[0] + '.js', 'w', encoding='utf-8') as f:
+        f.write(js)